@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark del fast path de clean_text frente a ftfy.fix_text.
+
+Mide sobre un corpus:
+- Exactitud: fracción de documentos donde ``fix_text`` == ``ftfy.fix_text``
+- Tasa de fast path: documentos que no necesitan pasar por ftfy
+- Tiempo total de ambos caminos
+
+Usage:
+    # Corpus sintético (markdown limpio, con comillas tipográficas y mojibake)
+    uv run python scripts/bench_clean_text.py
+
+    # Corpus real: directorio con .md / .md.zst producidos por una misión
+    uv run python scripts/bench_clean_text.py --corpus data/example-com/content
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import ftfy
+from rich.console import Console
+from rich.table import Table
+
+from uif_scraper.utils.text_utils import fix_text, needs_ftfy
+
+_PARAGRAPHS = [
+    "La documentación describe la configuración del servidor y sus parámetros.",
+    "Use `pip install` to set up the environment, then run the test suite.",
+    "El niño comió una paella en València durante la época de verano.",
+    "## Configuración avanzada\n\n- Opción A\n- Opción B\n",
+    "It’s a “quoted” example — with typographic punctuation…",
+    "Die Größe der Straße ist für Fußgänger geeignet.",
+    "[Enlace](https://example.com/docs) y ![imagen](/img/logo.png)",
+]
+
+
+def build_synthetic_corpus(size: int, seed: int = 42) -> list[str]:
+    """Genera documentos markdown; ~10% con mojibake UTF-8 leído como cp1252."""
+    rng = random.Random(seed)
+    corpus: list[str] = []
+    for i in range(size):
+        doc = "\n\n".join(rng.choice(_PARAGRAPHS) for _ in range(rng.randint(20, 200)))
+        if i % 10 == 0:
+            doc = doc.encode("utf-8").decode("cp1252", errors="ignore")
+        corpus.append(doc)
+    return corpus
+
+
+def load_corpus(path: Path) -> list[str]:
+    """Carga markdown (comprimido o no) desde un directorio."""
+    import zstandard as zstd
+
+    docs: list[str] = []
+    dctx = zstd.ZstdDecompressor()
+    for file in sorted(path.rglob("*.md*")):
+        data = file.read_bytes()
+        if file.suffix == ".zst":
+            data = dctx.decompress(data)
+        docs.append(data.decode("utf-8", errors="replace"))
+    return docs
+
+
+def run(corpus: list[str]) -> None:
+    console = Console()
+
+    start = time.perf_counter()
+    expected = [ftfy.fix_text(doc) for doc in corpus]
+    ftfy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [fix_text(doc) for doc in corpus]
+    fast_seconds = time.perf_counter() - start
+
+    matches = sum(1 for a, b in zip(actual, expected) if a == b)
+    fast_path = sum(1 for doc in corpus if not needs_ftfy(doc))
+    total_chars = sum(len(doc) for doc in corpus)
+
+    table = Table(title="clean_text: fast path vs ftfy.fix_text")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="green")
+    table.add_row("Documents", str(len(corpus)))
+    table.add_row("Characters", f"{total_chars:,}")
+    table.add_row("Fast path rate", f"{fast_path / len(corpus):.1%}")
+    table.add_row("Accuracy (== ftfy)", f"{matches / len(corpus):.2%}")
+    table.add_row("ftfy.fix_text", f"{ftfy_seconds * 1000:.1f} ms")
+    table.add_row("fix_text (fast path)", f"{fast_seconds * 1000:.1f} ms")
+    table.add_row("Speedup", f"{ftfy_seconds / max(fast_seconds, 1e-9):.1f}x")
+    console.print(table)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="clean_text fast path benchmark")
+    parser.add_argument("--corpus", type=Path, default=None, help="Directorio .md")
+    parser.add_argument("--size", type=int, default=500, help="Docs sintéticos")
+    args = parser.parse_args()
+
+    corpus = (
+        load_corpus(args.corpus) if args.corpus else build_synthetic_corpus(args.size)
+    )
+    if not corpus:
+        print("Empty corpus")
+        sys.exit(1)
+    run(corpus)
+
+
+if __name__ == "__main__":
+    main()
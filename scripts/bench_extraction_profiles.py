@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Benchmark de throughput por core de los perfiles de extracción.
+
+Ejecuta el pipeline por página de ``EngineCore._process_page`` (sin red)
+con los componentes reales para cada perfil: limpieza con el template
+learner, metadata completa o solo del ``<head>``, extracción de texto,
+frontmatter + TOC + links, compresión y escritura del markdown y, si el
+perfil lo incluye, el registro JSONL.
+
+Las páginas son documentación sintética de una misma plantilla; se
+reportan páginas por segundo en un solo core y el speedup frente a "full".
+
+Usage:
+    uv run python scripts/bench_extraction_profiles.py
+    uv run python scripts/bench_extraction_profiles.py --pages 400 --page-kb 120
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from loguru import logger
+from rich.console import Console
+from rich.table import Table
+
+from uif_scraper.config import EXTRACTION_PROFILES, ExtractionProfile
+from uif_scraper.core.engine_core import filter_metadata_for_frontmatter
+from uif_scraper.extractors.metadata_extractor import MetadataExtractor
+from uif_scraper.extractors.text_extractor import TextExtractor
+from uif_scraper.infrastructure.persistence import ScrapedRecord
+from uif_scraper.utils.compression import write_compressed_markdown
+from uif_scraper.utils.markdown_utils import render_markdown_document
+from uif_scraper.utils.serialization import dump_frontmatter, encode_jsonl
+from uif_scraper.utils.template_learner import TemplateLearner
+
+BASE_URL = "https://docs.example.com"
+
+
+def build_page(kb: int, seed: int) -> str:
+    """Página de documentación sintética de ~``kb`` KB."""
+    nav = "".join(f'<li><a href="/nav/{i}">Nav {i}</a></li>' for i in range(60))
+    blocks: list[str] = []
+    size = 0
+    i = 0
+    while size < kb * 1024:
+        block = (
+            f"<h2 id='s{i}'>Sección {seed}-{i}</h2>"
+            f"<p>Párrafo de documentación número {i} con texto suficiente para "
+            f"simular contenido real. Ver <a href='/doc/{seed}/{i}'>detalle</a> "
+            f"y <a href='../ref/{i}'>referencia</a>.</p>"
+            f"<pre><code>client.call({i})</code></pre>"
+        )
+        blocks.append(block)
+        size += len(block)
+        i += 1
+    return (
+        f"<html><head><title>Página {seed} | Docs</title>"
+        f"<meta name='description' content='Guía {seed}'>"
+        f"<meta property='og:title' content='Página {seed}'>"
+        f"<script type='application/ld+json'>"
+        f'{{"@type": "TechArticle", "headline": "Página {seed}"}}</script>'
+        f"</head><body><header><h1>Docs</h1></header><nav><ul>{nav}</ul></nav>"
+        f"<main><article><h1>Página {seed}</h1>{''.join(blocks)}</article></main>"
+        f"<footer>Footer</footer></body></html>"
+    )
+
+
+async def run_profile(
+    profile: ExtractionProfile, pages: list[str], out_dir: Path
+) -> float:
+    """Procesa todas las páginas con un perfil y devuelve páginas/segundo."""
+    learner = TemplateLearner()
+    metadata_extractor = MetadataExtractor()
+    text_extractor = TextExtractor()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    for n, raw_html in enumerate(pages):
+        url = f"{BASE_URL}/page-{n}"
+        clean_html, template_id = learner.clean(
+            raw_html, sanitize=profile.sanitize_html
+        )
+        if profile.full_metadata:
+            metadata = await metadata_extractor.extract(
+                raw_html, url, structured_data=profile.structured_data
+            )
+        else:
+            metadata = await metadata_extractor.extract_basic(raw_html, url)
+        text = await text_extractor.extract(
+            clean_html,
+            url,
+            preferred_engine=learner.preferred_engine(template_id),
+            fallbacks=profile.extraction_fallbacks,
+            fix_text=profile.fix_text,
+        )
+        learner.record_engine(template_id, text["engine"])
+
+        await write_compressed_markdown(
+            out_dir / f"page-{n}",
+            render_markdown_document(
+                text["markdown"],
+                metadata,
+                base_url=url,
+                frontmatter=dump_frontmatter(
+                    filter_metadata_for_frontmatter(metadata), sort_keys=True
+                ),
+                include_toc=profile.toc,
+                absolutize_links=profile.absolutize_links,
+            ).encode("utf-8"),
+            compression=profile.compression,
+        )
+        if profile.jsonl_sink:
+            encode_jsonl(
+                [
+                    ScrapedRecord(
+                        url=url,
+                        title=metadata.get("title"),
+                        content=text["markdown"],
+                        domain="docs.example.com",
+                        metadata=metadata,
+                    )
+                ]
+            )
+    return len(pages) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Extraction profiles benchmark")
+    parser.add_argument("--pages", type=int, default=200, help="Páginas por perfil")
+    parser.add_argument("--page-kb", type=int, default=60, help="Tamaño HTML (KB)")
+    args = parser.parse_args()
+
+    logger.remove()
+    pages = [build_page(args.page_kb, seed) for seed in range(args.pages)]
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, profile in EXTRACTION_PROFILES.items():
+            results[name] = asyncio.run(run_profile(profile, pages, Path(tmp) / name))
+
+    table = Table(title=f"Perfiles ({args.pages} páginas x {args.page_kb} KB, 1 core)")
+    table.add_column("Perfil", style="cyan")
+    table.add_column("Páginas/s", style="green")
+    table.add_column("vs full", style="magenta")
+    for name, pages_per_second in results.items():
+        table.add_row(
+            name,
+            f"{pages_per_second:,.1f}",
+            f"{pages_per_second / results['full']:.1f}x",
+        )
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
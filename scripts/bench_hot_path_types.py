@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Benchmark de los tipos del hot path por página: Pydantic vs msgspec/dicts.
+
+Reproduce los objetos que se crean por cada página procesada:
+- Metadata: ``ExtendedMetadata`` + N ``DocumentHeader`` + ``model_dump()``
+  frente al dict construido directamente.
+- Persistencia: ``ScrapedItem(**data).model_dump()`` en ``DataWriter.write``
+  frente a ``ScrapedRecord`` sin revalidar.
+- Progreso: ``EngineStats`` Pydantic por ``_notify_ui`` frente al Struct.
+
+Reporta tiempo por página y objetos rastreados por el GC que quedan vivos
+por página (presión sobre el recolector).
+
+Usage:
+    uv run python scripts/bench_hot_path_types.py
+    uv run python scripts/bench_hot_path_types.py --pages 20000 --headers 25
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pydantic import BaseModel
+from rich.console import Console
+from rich.table import Table
+
+from uif_scraper.core.types import EngineStats
+from uif_scraper.extractors.metadata_extractor import DocumentHeader, ExtendedMetadata
+from uif_scraper.infrastructure.persistence import ScrapedItem, ScrapedRecord
+
+
+class LegacyEngineStats(BaseModel):
+    """Copia del ``EngineStats`` Pydantic anterior (solo para comparar)."""
+
+    model_config = {"frozen": True}
+
+    pages_completed: int = 0
+    pages_total: int = 0
+    assets_completed: int = 0
+    assets_total: int = 0
+    pages_failed: int = 0
+    assets_failed: int = 0
+    seen_urls: int = 0
+    seen_assets: int = 0
+    error_count: int = 0
+    queue_pending: int = 0
+
+
+def _fields(i: int) -> dict[str, Any]:
+    return {
+        "url": f"https://docs.example.com/page-{i}",
+        "title": f"Página {i}",
+        "author": "Ana",
+        "date": "2024-05-01",
+        "sitename": "Example",
+        "description": "Descripción de la página",
+        "keywords": ["docs", "guía"],
+        "og_title": f"Página {i}",
+        "og_type": "article",
+    }
+
+
+def legacy_page(i: int, headers: list[dict[str, Any]]) -> Any:
+    metadata = ExtendedMetadata(
+        **_fields(i), headers=[DocumentHeader(**h) for h in headers]
+    ).model_dump()
+    item = ScrapedItem(
+        url=metadata["url"],
+        title=metadata["title"],
+        content="# Markdown",
+        domain="docs.example.com",
+        metadata=metadata,
+    ).model_dump()
+    stats = LegacyEngineStats(pages_completed=i, pages_total=i + 10)
+    return item, stats
+
+
+def struct_page(i: int, headers: list[dict[str, Any]]) -> Any:
+    metadata = {
+        **_fields(i),
+        "ingestion_engine": "UIF v3.0",
+        "headers": [
+            {"level": h["level"], "text": h["text"], "id": h.get("id")} for h in headers
+        ],
+    }
+    item = ScrapedRecord(
+        url=metadata["url"],
+        title=metadata["title"],
+        content="# Markdown",
+        domain="docs.example.com",
+        metadata=metadata,
+    )
+    stats = EngineStats(pages_completed=i, pages_total=i + 10)
+    return item, stats
+
+
+def measure(
+    fn: Callable[[int, list[dict[str, Any]]], Any],
+    pages: int,
+    headers: list[dict[str, Any]],
+) -> tuple[float, float]:
+    """Devuelve (µs por página, objetos GC vivos por página)."""
+    gc.collect()
+    gc.disable()
+    try:
+        before = len(gc.get_objects())
+        start = time.perf_counter()
+        kept = [fn(i, headers) for i in range(pages)]
+        elapsed = time.perf_counter() - start
+        objects = len(gc.get_objects()) - before
+    finally:
+        gc.enable()
+    del kept
+    return elapsed / pages * 1e6, objects / pages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hot path types benchmark")
+    parser.add_argument("--pages", type=int, default=5000, help="Páginas simuladas")
+    parser.add_argument("--headers", type=int, default=12, help="Headers por página")
+    args = parser.parse_args()
+
+    headers = [
+        {"level": 1 + k % 3, "text": f"Sección {k}", "id": f"s{k}"}
+        for k in range(args.headers)
+    ]
+    legacy_us, legacy_objs = measure(legacy_page, args.pages, headers)
+    struct_us, struct_objs = measure(struct_page, args.pages, headers)
+
+    table = Table(title=f"Tipos del hot path ({args.pages:,} páginas)")
+    table.add_column("Métrica", style="cyan")
+    table.add_column("Pydantic", style="red")
+    table.add_column("Structs/dicts", style="green")
+    table.add_row("µs por página", f"{legacy_us:.1f}", f"{struct_us:.1f}")
+    table.add_row("Objetos GC por página", f"{legacy_objs:.1f}", f"{struct_objs:.1f}")
+    table.add_row("Speedup", "", f"{legacy_us / max(struct_us, 1e-9):.1f}x")
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Benchmark de memoria pico por página en vuelo (pipeline por bytes).
+
+Compara dos órdenes del pipeline de ``EngineCore._process_page`` con los
+componentes reales (Response de scrapling, pre_clean_html, extractores,
+render del documento):
+
+- legacy: decode UTF-8 fijo, la respuesta de scrapling y los strings HTML
+  viven hasta el final (links al final) y la caché de metadata retiene el
+  HTML crudo de cada página.
+- current: decode único con charset, links justo tras el fetch, la
+  respuesta y el HTML se sueltan antes de los sinks y el documento final
+  se pasa codificado una sola vez.
+
+Cada variante corre en un subproceso y se reporta el pico de RSS (incluye
+el árbol lxml de scrapling, invisible para tracemalloc) y el pico del heap
+Python, ambos divididos por el número de páginas en vuelo.
+
+Usage:
+    uv run python scripts/bench_page_memory.py
+    uv run python scripts/bench_page_memory.py --concurrency 32 --page-kb 800
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+URL = "https://docs.example.com/guide/"
+
+
+def build_page(kb: int, seed: int) -> bytes:
+    """HTML sintético con nav/footer, links y párrafos hasta ~``kb`` KB."""
+    nav = "".join(f'<li><a href="/nav/{i}">Nav {i}</a></li>' for i in range(50))
+    blocks: list[str] = []
+    size = 0
+    i = 0
+    while size < kb * 1024:
+        block = (
+            f"<h2 id='s{i}'>Sección {seed}-{i}</h2>"
+            f"<p>Párrafo de documentación número {i} con texto suficiente para "
+            f"simular contenido real. <a href='/doc/{seed}/{i}'>más</a></p>"
+            f"<img src='/img/{seed}-{i}.png'>"
+        )
+        blocks.append(block)
+        size += len(block)
+        i += 1
+    html = (
+        f"<html><head><meta charset='utf-8'><title>Página {seed}</title></head>"
+        f"<body><nav><ul>{nav}</ul></nav><main>{''.join(blocks)}</main>"
+        f"<footer>Footer</footer></body></html>"
+    )
+    return html.encode("utf-8")
+
+
+def make_response(body: bytes) -> Any:
+    from scrapling.engines.toolbelt.custom import Response
+
+    return Response(
+        url=URL,
+        content=body,
+        status=200,
+        reason="OK",
+        cookies={},
+        headers={"content-type": "text/html; charset=utf-8"},
+        request_headers={},
+        encoding="utf-8",
+    )
+
+
+async def run_variant(variant: str, concurrency: int, page_kb: int) -> dict[str, float]:
+    from uif_scraper.extractors.metadata_extractor import MetadataExtractor
+    from uif_scraper.extractors.text_extractor import TextExtractor
+    from uif_scraper.navigation import NavigationService
+    from uif_scraper.utils.html_cleaner import pre_clean_html
+    from uif_scraper.utils.markdown_utils import render_markdown_document
+    from uif_scraper.utils.text_utils import decode_html
+
+    navigation = NavigationService(URL)
+    metadata_extractor = MetadataExtractor()
+    text_extractor = TextExtractor()
+    bodies = [build_page(page_kb, seed) for seed in range(concurrency)]
+    retained_by_cache: list[str] = []
+
+    async def sink(payload: Any) -> None:
+        # Simula la latencia de escritura/DB durante la cual otras páginas avanzan
+        await asyncio.sleep(0.05)
+
+    async def legacy(body: bytes) -> None:
+        page = make_response(body)
+        raw_html = page.body.decode("utf-8", errors="replace")
+        clean_html = pre_clean_html(raw_html)
+        metadata = await metadata_extractor.extract(raw_html, URL)
+        retained_by_cache.append(raw_html)  # clave de lru_cache con el HTML
+        text = await text_extractor.extract(clean_html, URL)
+        content = render_markdown_document(
+            text["markdown"], metadata, URL, frontmatter="title: x\n"
+        )
+        await sink(content.encode("utf-8"))
+        await sink(text["markdown"])
+        navigation.extract_links(page, URL)
+        await sink(None)
+
+    async def current(body: bytes) -> None:
+        page = make_response(body)
+        raw_html = decode_html(page.body, "text/html; charset=utf-8", page.encoding)
+        navigation.extract_links(page, URL)
+        del page
+        clean_html = pre_clean_html(raw_html)
+        metadata = await metadata_extractor.extract(raw_html, URL)
+        text = await text_extractor.extract(clean_html, URL)
+        del raw_html, clean_html
+        await sink(
+            render_markdown_document(
+                text["markdown"], metadata, URL, frontmatter="title: x\n"
+            ).encode("utf-8")
+        )
+        await sink(text["markdown"])
+        await sink(None)
+
+    pipeline = legacy if variant == "legacy" else current
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    async with asyncio.TaskGroup() as tg:
+        for body in bodies:
+            tg.create_task(pipeline(body))
+    _, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "rss_kb_per_page": (rss_peak - baseline_rss) / concurrency,
+        "heap_kb_per_page": heap_peak / 1024 / concurrency,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-page peak memory benchmark")
+    parser.add_argument("--concurrency", type=int, default=16, help="Páginas en vuelo")
+    parser.add_argument("--page-kb", type=int, default=400, help="Tamaño HTML (KB)")
+    parser.add_argument("--variant", choices=["legacy", "current"], default=None)
+    args = parser.parse_args()
+
+    if args.variant:
+        result = asyncio.run(run_variant(args.variant, args.concurrency, args.page_kb))
+        print(json.dumps(result))
+        return
+
+    results: dict[str, dict[str, float]] = {}
+    for variant in ("legacy", "current"):
+        out = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--variant",
+                variant,
+                "--concurrency",
+                str(args.concurrency),
+                "--page-kb",
+                str(args.page_kb),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        results[variant] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    table = Table(title=f"Pico por página ({args.concurrency} x {args.page_kb} KB)")
+    table.add_column("Métrica", style="cyan")
+    table.add_column("legacy", style="red")
+    table.add_column("current", style="green")
+    for key, label in (
+        ("rss_kb_per_page", "RSS pico (KB/página)"),
+        ("heap_kb_per_page", "Heap Python pico (KB/página)"),
+    ):
+        table.add_row(
+            label, f"{results['legacy'][key]:,.0f}", f"{results['current'][key]:,.0f}"
+        )
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Benchmark del pipeline por stages frente al worker secuencial.
+
+Simula el coste de cada clase de recurso por página: latencia de red
+(fetch), CPU (parse) y latencia de disco/DB (write).
+
+- sequential: ``default_workers`` workers hacen fetch → parse → write de
+  cada URL bajo un único semáforo (el ``_page_worker`` original, con el
+  parse bloqueando el event loop).
+- staged: los mismos workers solo hacen fetch y entregan a los pools
+  ``parse`` y ``write`` (``PipelineStage``) por colas acotadas. Como en el
+  engine, el parse corre en un ``ThreadPoolExecutor`` de ``parse_workers``
+  hilos, fuera del event loop.
+
+El CPU simulado es hashing de un buffer, que suelta el GIL como la parte
+nativa de lxml/selectolax/html-to-markdown. La parte Python del parse real
+no escala con los hilos: con ``--parse-workers`` > núcleos o parse casi todo
+en Python, la ganancia del stage parse es menor que la que mide este script.
+
+Reporta páginas/s y la utilización de cada stage en la variante staged.
+
+Usage:
+    uv run python scripts/bench_pipeline_stages.py
+    uv run python scripts/bench_pipeline_stages.py --pages 400 --fetch-ms 80
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+from uif_scraper.core.pipeline import PipelineStage, StageMeter
+from uif_scraper.core.types import StageMetrics
+
+# Bloques > 2 KiB: hashlib suelta el GIL mientras los procesa
+_CPU_BLOCK = b"x" * 64 * 1024
+
+
+def burn_cpu(ms: float) -> None:
+    """Ocupa el hilo actual ``ms`` milisegundos de CPU nativa (como convert)."""
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        hashlib.sha256(_CPU_BLOCK).digest()
+
+
+async def run_sequential(args: argparse.Namespace) -> float:
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(args.pages):
+        queue.put_nowait(i)
+
+    async def worker() -> None:
+        while not queue.empty():
+            queue.get_nowait()
+            await asyncio.sleep(args.fetch_ms / 1000)
+            burn_cpu(args.parse_ms)
+            await asyncio.sleep(args.write_ms / 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.workers)))
+    return args.pages / (time.perf_counter() - start)
+
+
+async def run_staged(args: argparse.Namespace) -> tuple[float, list[StageMetrics]]:
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(args.pages):
+        queue.put_nowait(i)
+
+    async def write(item: int) -> None:
+        await asyncio.sleep(args.write_ms / 1000)
+
+    write_stage: PipelineStage[int] = PipelineStage(
+        "write", args.write_workers, args.queue_size, write
+    )
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=args.parse_workers)
+
+    async def parse(item: int) -> None:
+        await loop.run_in_executor(executor, burn_cpu, args.parse_ms)
+        await write_stage.put(item)
+
+    parse_stage: PipelineStage[int] = PipelineStage(
+        "parse", args.parse_workers, args.queue_size, parse
+    )
+    fetch_meter = StageMeter("fetch", args.workers)
+    metrics: list[StageMetrics] = []
+
+    async def fetch_worker() -> None:
+        while not queue.empty():
+            item = queue.get_nowait()
+            with fetch_meter.track():
+                await asyncio.sleep(args.fetch_ms / 1000)
+            await parse_stage.put(item)
+
+    async def sample() -> None:
+        # Última muestra con el pipeline en régimen estable
+        while True:
+            await asyncio.sleep(1.0)
+            metrics[:] = [
+                fetch_meter.snapshot(queue.qsize(), 0),
+                parse_stage.metrics(),
+                write_stage.metrics(),
+            ]
+
+    parse_stage.start()
+    write_stage.start()
+    sampler = asyncio.create_task(sample())
+    start = time.perf_counter()
+    await asyncio.gather(*(fetch_worker() for _ in range(args.workers)))
+    await parse_stage.close()
+    await write_stage.close()
+    elapsed = time.perf_counter() - start
+    executor.shutdown()
+    sampler.cancel()
+    return args.pages / elapsed, metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Staged vs sequential pipeline")
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=5, help="Pool de fetch")
+    parser.add_argument("--parse-workers", type=int, default=2)
+    parser.add_argument("--write-workers", type=int, default=4)
+    parser.add_argument("--queue-size", type=int, default=16)
+    parser.add_argument("--fetch-ms", type=float, default=120.0)
+    parser.add_argument("--parse-ms", type=float, default=8.0)
+    parser.add_argument("--write-ms", type=float, default=40.0)
+    args = parser.parse_args()
+
+    sequential = asyncio.run(run_sequential(args))
+    staged, metrics = asyncio.run(run_staged(args))
+
+    table = Table(
+        title=(
+            f"{args.pages} páginas: fetch {args.fetch_ms:.0f} ms, "
+            f"parse {args.parse_ms:.0f} ms CPU, write {args.write_ms:.0f} ms"
+        )
+    )
+    table.add_column("Variante", style="cyan")
+    table.add_column("Páginas/s", style="green")
+    table.add_row("sequential", f"{sequential:.1f}")
+    table.add_row("staged", f"{staged:.1f} ({staged / sequential:.2f}x)")
+    Console().print(table)
+
+    stages = Table(title="Stages (variante staged, última ventana)")
+    for column in ("Stage", "Workers", "Cola", "Utilización"):
+        stages.add_column(column)
+    for m in metrics:
+        stages.add_row(
+            m.name, str(m.workers), str(m.queue_depth), f"{m.utilization:.0%}"
+        )
+    Console().print(stages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Benchmark de serialización por registro: msgspec/emisor mínimo vs json/yaml.
+
+Mide el coste por registro de:
+- Frontmatter: ``yaml.dump`` frente a ``dump_frontmatter``
+- JSONL: ``json.dumps(default=str)`` línea a línea frente a ``encode_jsonl``
+
+Usage:
+    uv run python scripts/bench_serialization.py
+    uv run python scripts/bench_serialization.py --records 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import yaml
+from rich.console import Console
+from rich.table import Table
+
+from uif_scraper.utils.serialization import dump_frontmatter, encode_jsonl
+
+
+def build_frontmatter(i: int) -> dict[str, Any]:
+    """Metadata típica tras ``filter_metadata_for_frontmatter``."""
+    return {
+        "url": f"https://docs.example.com/guide/section-{i}",
+        "title": f"Guía de configuración {i}: parámetros avanzados",
+        "author": "Equipo de Documentación",
+        "date": "2024-05-01",
+        "sitename": "Example Docs",
+        "description": "Cómo configurar el servidor, los workers y la caché.",
+        "keywords": ["configuración", "servidor", "caché", "workers"],
+        "og_type": "article",
+        "ingestion_engine": "UIF v4.0",
+    }
+
+
+def build_record(i: int) -> dict[str, Any]:
+    """Item tal como lo valida ``ScrapedItem`` y bufferiza ``DataWriter``."""
+    return {
+        "url": f"https://docs.example.com/guide/section-{i}",
+        "title": f"Guía {i}",
+        "content": "Contenido markdown de la página. " * 40,
+        "content_type": "text",
+        "domain": "docs.example.com",
+        "extracted_at": datetime.now(),
+        "metadata": build_frontmatter(i),
+    }
+
+
+def timed(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(records: int) -> None:
+    console = Console()
+    frontmatters = [build_frontmatter(i) for i in range(records)]
+    items = [build_record(i) for i in range(records)]
+
+    yaml_s = timed(
+        lambda: [yaml.dump(m, allow_unicode=True, sort_keys=True) for m in frontmatters]
+    )
+    fm_s = timed(lambda: [dump_frontmatter(m, sort_keys=True) for m in frontmatters])
+
+    json_s = timed(
+        lambda: "".join(
+            json.dumps(item, ensure_ascii=False, default=str) + "\n" for item in items
+        ).encode("utf-8")
+    )
+    msgspec_s = timed(lambda: encode_jsonl(items))
+
+    table = Table(title=f"Serialización por registro ({records:,} registros)")
+    table.add_column("Sink", style="cyan")
+    table.add_column("Actual (µs/rec)", style="red")
+    table.add_column("Nuevo (µs/rec)", style="green")
+    table.add_column("Speedup", style="bold")
+    for name, old, new in (
+        ("frontmatter YAML", yaml_s, fm_s),
+        ("JSONL", json_s, msgspec_s),
+    ):
+        table.add_row(
+            name,
+            f"{old / records * 1e6:.2f}",
+            f"{new / records * 1e6:.2f}",
+            f"{old / max(new, 1e-9):.1f}x",
+        )
+    console.print(table)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serialization microbenchmark")
+    parser.add_argument("--records", type=int, default=5000, help="Registros")
+    args = parser.parse_args()
+    run(args.records)
+
+
+if __name__ == "__main__":
+    main()
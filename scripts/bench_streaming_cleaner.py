@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Benchmark de páginas gigantes: limpieza en memoria vs streaming.
+
+Genera una referencia de API sintética mayor que ``MAX_HTML_SIZE_BYTES`` y
+compara:
+
+- in-memory: ``pre_clean_html`` sin truncar + ``TextExtractor.extract`` y
+  ``MetadataExtractor`` sobre el HTML completo (lo que costaría no truncar).
+- streaming: ``StreamingHTMLCleaner`` + ``TextExtractor.extract_stream`` y
+  metadata sobre el esqueleto.
+
+Cada variante corre en un subproceso; se reporta tiempo, pico de RSS
+adicional y cuántas secciones llegan al markdown.
+
+Usage:
+    uv run python scripts/bench_streaming_cleaner.py
+    uv run python scripts/bench_streaming_cleaner.py --mb 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+URL = "https://docs.example.com/api/"
+
+
+def build_page(mb: float) -> str:
+    """Referencia de API sintética de ~``mb`` MB con nav, footer y scripts."""
+    nav = "".join(f'<li><a href="/nav/{i}">Nav {i}</a></li>' for i in range(50))
+    blocks: list[str] = []
+    size = 0
+    i = 0
+    while size < mb * 1024 * 1024:
+        block = (
+            f"<section><h2 id='f{i}'>func_{i}()</h2>"
+            f"<p>Returns value {i} &amp; documents the behaviour of the call.</p>"
+            f"<pre><code>x = func_{i}(a, b)</code></pre>"
+            f"<ul><li>a: first argument</li><li>b: second argument</li></ul>"
+            f"</section>"
+        )
+        blocks.append(block)
+        size += len(block)
+        i += 1
+    return (
+        f"<html><head><title>API Reference</title></head>"
+        f"<body><nav><ul>{nav}</ul></nav><main>{''.join(blocks)}</main>"
+        f"<footer>Footer</footer></body></html>"
+    )
+
+
+async def run_variant(variant: str, mb: float) -> dict[str, float]:
+    from loguru import logger
+
+    from uif_scraper.extractors.metadata_extractor import MetadataExtractor
+    from uif_scraper.extractors.text_extractor import TextExtractor
+    from uif_scraper.utils.html_cleaner import pre_clean_html
+    from uif_scraper.utils.streaming_cleaner import StreamingHTMLCleaner
+
+    logger.remove()
+    text_extractor = TextExtractor()
+    metadata_extractor = MetadataExtractor()
+    page = build_page(mb)
+
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if variant == "in-memory":
+        clean_html = pre_clean_html(page, max_size=len(page) + 1)
+        text = await text_extractor.extract(clean_html, URL)
+        await metadata_extractor.extract(page, URL)
+    else:
+        cleaner = StreamingHTMLCleaner()
+        text = await text_extractor.extract_stream(cleaner.iter_clean(page), URL)
+        await metadata_extractor.extract(cleaner.metadata_html(), URL)
+    elapsed = time.perf_counter() - start
+    rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "seconds": elapsed,
+        "rss_mb": (rss_peak - baseline_rss) / 1024,
+        "sections": text["markdown"].count("## func_"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Oversized page cleaning benchmark")
+    parser.add_argument("--mb", type=float, default=10, help="Tamaño de la página (MB)")
+    parser.add_argument("--variant", choices=["in-memory", "streaming"], default=None)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(asyncio.run(run_variant(args.variant, args.mb))))
+        return
+
+    results: dict[str, dict[str, float]] = {}
+    for variant in ("in-memory", "streaming"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--variant", variant, "--mb", str(args.mb)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        results[variant] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    table = Table(title=f"Página de {args.mb:g} MB")
+    table.add_column("Métrica", style="cyan")
+    table.add_column("in-memory", style="red")
+    table.add_column("streaming", style="green")
+    for key, label, fmt in (
+        ("seconds", "Tiempo (s)", "{:.2f}"),
+        ("rss_mb", "RSS pico adicional (MB)", "{:,.0f}"),
+        ("sections", "Secciones en el markdown", "{:,.0f}"),
+    ):
+        table.add_row(
+            label,
+            fmt.format(results["in-memory"][key]),
+            fmt.format(results["streaming"][key]),
+        )
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from uif_scraper.infrastructure.persistence import DataWriter, ScrapedRecord
+
+
+@pytest.mark.asyncio
+async def test_scraped_record_written_without_revalidation(tmp_path):
+    async with DataWriter(output_dir=tmp_path, buffer_size=10) as writer:
+        record = ScrapedRecord(
+            url="https://example.com/a",
+            title="A",
+            content="# A",
+            domain="example.com",
+            metadata={"headers": [{"level": 1, "text": "A", "id": None}]},
+        )
+        assert await writer.write(record) is True
+        main_file = writer._main_file
+
+    assert main_file is not None
+    line = json.loads(main_file.read_text(encoding="utf-8"))
+    assert list(line) == [
+        "url",
+        "title",
+        "content",
+        "content_type",
+        "domain",
+        "extracted_at",
+        "metadata",
+    ]
+    assert line["content_type"] == "text"
+    assert line["metadata"]["headers"][0]["text"] == "A"
+
+
+@pytest.mark.asyncio
+async def test_invalid_dict_goes_to_failed_file(tmp_path):
+    async with DataWriter(output_dir=tmp_path) as writer:
+        assert await writer.write({"url": "https://example.com"}) is False
+        failed_file = writer._failed_file
+
+    assert failed_file is not None
+    failed = json.loads(failed_file.read_text(encoding="utf-8"))
+    assert failed["original_data"] == {"url": "https://example.com"}
@@ -0,0 +1,99 @@
+from uif_scraper.utils.browser_escalation import EscalationPolicy, section_key
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_policy(clock: FakeClock, **kwargs) -> EscalationPolicy:
+    return EscalationPolicy(
+        block_threshold=2,
+        probe_interval=10.0,
+        max_probe_interval=40.0,
+        clock=clock,
+        **kwargs,
+    )
+
+
+def test_section_key_uses_host_and_path_prefix():
+    assert section_key("https://Example.com/shop/item/1?x=1") == "example.com/shop"
+    assert section_key("https://example.com/") == "example.com/"
+    assert section_key("https://example.com/a/b/c", path_depth=2) == "example.com/a/b"
+    assert section_key("https://example.com/a/b", path_depth=0) == "example.com/"
+
+
+def test_single_block_does_not_escalate():
+    policy = make_policy(FakeClock())
+    assert not policy.record_block("https://example.com/shop/1")
+    assert not policy.needs_browser("https://example.com/shop/2")
+
+    # Un éxito entre medias reinicia la cuenta
+    policy.record_success("https://example.com/shop/3")
+    assert not policy.record_block("https://example.com/shop/4")
+    assert not policy.active
+
+
+def test_escalation_is_scoped_to_the_section():
+    policy = make_policy(FakeClock())
+    policy.record_block("https://example.com/shop/1")
+    assert policy.record_block("https://example.com/shop/2")
+
+    assert policy.needs_browser("https://example.com/shop/3")
+    assert not policy.needs_browser("https://example.com/blog/1")
+    assert not policy.needs_browser("https://other.com/shop/1")
+    assert policy.escalated_sections() == ["example.com/shop"]
+
+
+def test_reprobe_deescalates_when_fast_path_works():
+    clock = FakeClock()
+    policy = make_policy(clock)
+    policy.record_block("https://example.com/shop/1")
+    policy.record_block("https://example.com/shop/2")
+
+    clock.now = 10.0
+    # Un solo re-probe por intervalo
+    assert not policy.needs_browser("https://example.com/shop/3")
+    assert policy.needs_browser("https://example.com/shop/4")
+
+    assert policy.record_success("https://example.com/shop/3")
+    assert not policy.active
+    assert not policy.needs_browser("https://example.com/shop/5")
+    assert policy.get_stats() == {
+        "escalated": 0,
+        "escalations": 1,
+        "deescalations": 1,
+        "probes": 1,
+    }
+
+
+def test_failed_reprobes_back_off_up_to_the_ceiling():
+    clock = FakeClock()
+    policy = make_policy(clock)
+    url = "https://example.com/shop/1"
+    policy.record_block(url)
+    policy.record_block(url)
+
+    for expected_interval in (20.0, 40.0, 40.0):
+        clock.now += 100.0
+        assert not policy.needs_browser(url)  # re-probe
+        assert not policy.record_block(url)
+        clock.now += expected_interval - 1
+        assert policy.needs_browser(url)
+        clock.now += 1
+        assert not policy.needs_browser(url)
+        assert not policy.record_block(url)
+    assert policy.active
+
+
+def test_reset_forgets_escalations():
+    policy = make_policy(FakeClock(), path_depth=0)
+    policy.record_block("https://example.com/a")
+    policy.record_block("https://example.com/b")
+    assert policy.needs_browser("https://example.com/c")
+
+    policy.reset()
+    assert not policy.active
@@ -0,0 +1,241 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, ClassVar, Self
+
+import pytest
+from playwright.async_api import Error as PlaywrightError
+
+from uif_scraper.core.browser_session import LazyBrowserSession
+from uif_scraper.utils.memory_governor import MB
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.handlers: list[Any] = []
+
+    async def route(self, pattern: str, handler: Any) -> None:
+        self.handlers.append(handler)
+
+
+class FakeRoute:
+    def __init__(self, resource_type: str, url: str) -> None:
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.outcome = ""
+
+    async def abort(self) -> None:
+        self.outcome = "aborted"
+
+    async def continue_(self) -> None:
+        self.outcome = "continued"
+
+
+class FakeSession:
+    instances: ClassVar[list["FakeSession"]] = []
+
+    def __init__(self) -> None:
+        self.started = False
+        self.closed = False
+        self.release = asyncio.Event()
+        self.release.set()
+        self.context = FakeContext()
+        FakeSession.instances.append(self)
+
+    async def __aenter__(self) -> Self:
+        await asyncio.sleep(0.01)  # Arranque del navegador
+        self.started = True
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        self.closed = True
+
+    async def fetch(self, url: str, **kwargs: Any) -> str:
+        await self.release.wait()
+        return f"rendered {url}"
+
+
+@pytest.fixture(autouse=True)
+def reset_instances():
+    FakeSession.instances = []
+
+
+@pytest.mark.asyncio
+async def test_launches_once_on_first_fetch():
+    browser = LazyBrowserSession(FakeSession, idle_timeout=60)
+    assert not browser.running
+    assert FakeSession.instances == []
+
+    results = await asyncio.gather(
+        *(browser.fetch(f"https://example.com/{i}") for i in range(5))
+    )
+
+    assert results[0] == "rendered https://example.com/0"
+    assert len(FakeSession.instances) == 1
+    assert browser.launches == 1
+    await browser.close()
+    assert FakeSession.instances[0].closed
+    assert not browser.running
+
+
+@pytest.mark.asyncio
+async def test_close_survives_a_crashed_browser():
+    class CrashedSession(FakeSession):
+        async def __aexit__(self, *exc: object) -> None:
+            raise PlaywrightError("Browser has been closed")
+
+    browser = LazyBrowserSession(CrashedSession, idle_timeout=60)
+    await browser.fetch("https://example.com/")
+
+    await browser.close()
+
+    assert not browser.running
+
+
+@pytest.mark.asyncio
+async def test_idle_session_closes_and_relaunches_transparently():
+    browser = LazyBrowserSession(FakeSession, idle_timeout=0.05)
+    await browser.fetch("https://example.com/a")
+    assert not await browser.close_if_idle()
+
+    await asyncio.sleep(0.06)
+    assert await browser.close_if_idle()
+    assert FakeSession.instances[0].closed
+
+    assert await browser.fetch("https://example.com/b") == (
+        "rendered https://example.com/b"
+    )
+    assert browser.launches == 2
+    assert len(FakeSession.instances) == 2
+    await browser.close()
+
+
+@pytest.mark.asyncio
+async def test_never_closes_with_fetches_in_flight():
+    browser = LazyBrowserSession(FakeSession, idle_timeout=0.01)
+    await browser.fetch("https://example.com/warmup")
+    session = FakeSession.instances[0]
+    session.release.clear()
+
+    slow = asyncio.create_task(browser.fetch("https://example.com/slow"))
+    await asyncio.sleep(0.05)
+    assert not await browser.close_if_idle()
+    assert not session.closed
+
+    session.release.set()
+    await slow
+    await browser.close()
+
+
+@pytest.mark.asyncio
+async def test_zero_idle_timeout_keeps_browser_open():
+    browser = LazyBrowserSession(FakeSession, idle_timeout=0)
+    await browser.fetch("https://example.com/a")
+    await asyncio.sleep(0.01)
+    assert not await browser.close_if_idle()
+    assert browser.running
+    await browser.close()
+
+
+@pytest.mark.asyncio
+async def test_blocks_resources_and_tracker_domains_at_context_level():
+    browser = LazyBrowserSession(
+        FakeSession,
+        blocked_resources=["image", "font"],
+        blocked_domains=["doubleclick.net"],
+    )
+    await browser.fetch("https://example.com/a")
+    [handler] = FakeSession.instances[0].context.handlers
+
+    cases = {
+        ("image", "https://example.com/logo.png"): "aborted",
+        ("script", "https://ad.doubleclick.net/tag.js"): "aborted",
+        ("script", "https://example.com/app.js"): "continued",
+        ("document", "https://doubleclick.net/"): "continued",
+    }
+    for (resource_type, url), expected in cases.items():
+        route = FakeRoute(resource_type, url)
+        await handler(route)
+        assert route.outcome == expected, (resource_type, url)
+    assert browser.blocked_requests == 2
+    await browser.close()
+
+
+@pytest.mark.asyncio
+async def test_route_on_a_closed_page_is_dropped():
+    class ClosedPageRoute(FakeRoute):
+        async def continue_(self) -> None:
+            raise PlaywrightError("Target page has been closed")
+
+    browser = LazyBrowserSession(FakeSession, blocked_resources=["image"])
+    await browser.fetch("https://example.com/a")
+    [handler] = FakeSession.instances[0].context.handlers
+
+    route = ClosedPageRoute("script", "https://example.com/app.js")
+    await handler(route)
+
+    assert route.outcome == ""
+    await browser.close()
+
+
+@pytest.mark.asyncio
+async def test_max_pages_bounds_concurrent_renders():
+    browser = LazyBrowserSession(FakeSession, max_pages=2)
+    await browser.fetch("https://example.com/warmup")
+    session = FakeSession.instances[0]
+    session.release.clear()
+
+    tasks = [
+        asyncio.create_task(browser.fetch(f"https://example.com/{i}")) for i in range(5)
+    ]
+    await asyncio.sleep(0.02)
+    assert browser.get_stats()["active_pages"] == 2
+
+    session.release.set()
+    await asyncio.gather(*tasks)
+    stats = browser.get_stats()
+    assert stats["renders"] == 6
+    assert stats["render_p95_ms"] >= stats["render_p50_ms"] > 0
+    await browser.close()
+
+
+@pytest.mark.asyncio
+async def test_recycles_after_page_count_draining_in_flight_pages():
+    browser = LazyBrowserSession(FakeSession, recycle_after_pages=2)
+    await browser.fetch("https://example.com/1")
+    first = FakeSession.instances[0]
+    first.release.clear()
+    slow = asyncio.create_task(browser.fetch("https://example.com/2"))
+    await asyncio.sleep(0.01)
+
+    # El tercero espera a que termine el render en vuelo antes de reciclar
+    third = asyncio.create_task(browser.fetch("https://example.com/3"))
+    await asyncio.sleep(0.02)
+    assert not first.closed
+    assert not third.done()
+
+    first.release.set()
+    await asyncio.gather(slow, third)
+    assert first.closed
+    assert browser.recycles == 1
+    assert browser.launches == 2
+    await browser.close()
+
+
+@pytest.mark.asyncio
+async def test_recycles_when_browser_memory_exceeds_limit():
+    rss = {"value": 100 * MB}
+    browser = LazyBrowserSession(
+        FakeSession,
+        recycle_after_bytes=512 * MB,
+        memory_check_interval=0,
+        rss_reader=lambda: rss["value"],
+    )
+    await browser.fetch("https://example.com/a")
+    await browser.fetch("https://example.com/b")
+    assert browser.recycles == 0
+
+    rss["value"] = 600 * MB
+    await browser.fetch("https://example.com/c")
+    assert browser.recycles == 1
+    assert FakeSession.instances[0].closed
+    assert not FakeSession.instances[1].closed
+    await browser.close()
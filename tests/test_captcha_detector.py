@@ -0,0 +1,56 @@
+from uif_scraper.utils.captcha_detector import CaptchaDetector
+
+NORMAL_PAGE = (
+    "<html><head><title>Docs</title></head><body>"
+    + "<p>Contenido normal de documentación.</p>" * 2000
+    + "</body></html>"
+)
+
+
+def test_detects_cloudflare_challenge_on_403():
+    html = '<html><head></head><body><div id="cf-content">Checking your browser before accessing</div></body></html>'
+    detector = CaptchaDetector()
+    assert detector.detect(html, status_code=403, headers={}) == (
+        True,
+        "cloudflare_iuam",
+    )
+
+
+def test_priority_prefers_specific_signature_over_generic():
+    html = "<html><body>captcha <div class='g-recaptcha'></div></body></html>"
+    detector = CaptchaDetector()
+    assert detector.detect(html) == (True, "recaptcha")
+
+
+def test_large_200_page_is_not_scanned():
+    html = NORMAL_PAGE.replace("<body>", "<body><div class='g-recaptcha'></div>")
+    detector = CaptchaDetector()
+    assert detector.detect(html, status_code=200, headers={}) == (False, None)
+
+
+def test_tiny_200_page_is_scanned():
+    html = "<html><body>Please verify you are human</body></html>"
+    detector = CaptchaDetector()
+    assert detector.detect(html, status_code=200, headers={}) == (
+        True,
+        "generic_captcha",
+    )
+
+
+def test_challenge_header_triggers_scan():
+    html = NORMAL_PAGE.replace("<body>", "<body><div class='cf-turnstile-wrapper'>")
+    detector = CaptchaDetector()
+    result = detector.detect(
+        html, status_code=200, headers={"CF-Mitigated": "challenge"}
+    )
+    assert result == (True, "cloudflare_turnstile")
+
+
+def test_marker_beyond_scan_window_is_ignored():
+    html = "<html><head></head><body>" + "x" * 5000 + "captcha</body></html>"
+    detector = CaptchaDetector(scan_bytes=1024)
+    assert detector.detect(html, status_code=403) == (False, None)
+
+
+def test_empty_html():
+    assert CaptchaDetector().detect("") == (False, None)
@@ -1,5 +1,15 @@
 import time
 
+import httpx
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from uif_scraper.infrastructure.network.resilient_transport import (
+    CircuitOpenError,
+    create_resilient_transport,
+)
 from uif_scraper.utils.circuit_breaker import CircuitBreaker
 
 # Valid test domain from webscraper.io
@@ -33,3 +43,149 @@ def test_circuit_breaker_success_reset():
     cb.record_failure(TEST_DOMAIN)
     cb.record_success(TEST_DOMAIN)
     assert cb.failures[TEST_DOMAIN] == 0
+
+
+def test_half_open_lets_a_single_probe_through():
+    cb = CircuitBreaker(threshold=1, timeout=0.05)
+    cb.record_failure(TEST_DOMAIN)
+    assert cb.get_state(TEST_DOMAIN) == "open"
+
+    time.sleep(0.06)
+    assert cb.get_state(TEST_DOMAIN) == "half-open"
+    assert cb.should_allow(TEST_DOMAIN) is True  # La sonda
+    assert cb.should_allow(TEST_DOMAIN) is False
+    assert cb.is_blocked(TEST_DOMAIN) is True
+
+    cb.record_success(TEST_DOMAIN)
+    assert cb.get_state(TEST_DOMAIN) == "closed"
+    assert cb.should_allow(TEST_DOMAIN) is True
+
+
+def test_failed_probe_reopens_immediately():
+    cb = CircuitBreaker(threshold=3, timeout=0.05)
+    for _ in range(3):
+        cb.record_failure(TEST_DOMAIN)
+    time.sleep(0.06)
+    assert cb.should_allow(TEST_DOMAIN) is True
+
+    cb.record_failure(TEST_DOMAIN)
+
+    assert cb.get_state(TEST_DOMAIN) == "open"
+    assert cb.should_allow(TEST_DOMAIN) is False
+    assert cb.trips == 2
+
+
+def test_lost_probe_is_replaced_after_timeout():
+    cb = CircuitBreaker(threshold=1, timeout=0.05)
+    cb.record_failure(TEST_DOMAIN)
+    time.sleep(0.06)
+    assert cb.should_allow(TEST_DOMAIN) is True
+
+    # La sonda nunca informa: otro caller toma el relevo
+    time.sleep(0.06)
+    assert cb.should_allow(TEST_DOMAIN) is True
+    assert cb.probes == 2
+
+
+def test_is_blocked_does_not_take_the_probe():
+    cb = CircuitBreaker(threshold=1, timeout=0.05)
+    cb.record_failure(TEST_DOMAIN)
+    assert cb.is_blocked(TEST_DOMAIN) is True
+
+    time.sleep(0.06)
+    assert cb.is_blocked(TEST_DOMAIN) is False
+    assert cb.should_allow(TEST_DOMAIN) is True
+
+
+def test_registry_is_bounded():
+    cb = CircuitBreaker(threshold=1, max_domains=100)
+    for i in range(1000):
+        cb.record_failure(f"host{i}.test")
+
+    assert len(cb.failures) == 100
+    # Los más recientes siguen abiertos
+    assert cb.get_state("host999.test") == "open"
+    assert cb.get_state("host0.test") == "closed"
+
+
+def test_healthy_domains_are_not_tracked():
+    cb = CircuitBreaker()
+    for _ in range(10):
+        assert cb.should_allow(TEST_DOMAIN)
+        cb.record_success(TEST_DOMAIN)
+
+    assert cb.failures == {}
+
+
+@pytest_asyncio.fixture
+async def server():
+    hits: list[str] = []
+
+    async def down(request: web.Request) -> web.Response:
+        return web.Response(status=503)
+
+    async def misdirected(request: web.Request) -> web.Response:
+        return web.Response(status=421)
+
+    async def broken(request: web.Request) -> web.Response:
+        hits.append(request.path)
+        return web.Response(status=500)
+
+    app = web.Application()
+    app.router.add_get("/down", down)
+    app.router.add_get("/misdirected", misdirected)
+    app.router.add_get("/broken", broken)
+    srv = TestServer(app)
+    await srv.start_server()
+    srv.hits = hits  # type: ignore[attr-defined]
+    yield srv
+    await srv.close()
+
+
+@pytest.mark.asyncio
+async def test_transports_share_the_registry(server):
+    cb = CircuitBreaker(threshold=2, timeout=60)
+    first = create_resilient_transport(max_retries=1, circuit_breaker=cb)
+    second = create_resilient_transport(max_retries=1, circuit_breaker=cb)
+    url = str(server.make_url("/down"))
+
+    async with httpx.AsyncClient(transport=first) as client:
+        for _ in range(2):
+            assert (await client.get(url)).status_code == 504
+
+    # El circuito que abrió un transport lo respeta el otro (y el engine)
+    async with httpx.AsyncClient(transport=second) as client:
+        with pytest.raises(CircuitOpenError) as exc_info:
+            await client.get(url)
+    assert exc_info.value.domain == "127.0.0.1"
+    assert 59 < exc_info.value.retry_after <= 60
+    assert second.get_circuit_state("127.0.0.1") == "open"
+
+
+@pytest.mark.asyncio
+async def test_origin_421_is_a_plain_response(server):
+    cb = CircuitBreaker(threshold=1)
+    transport = create_resilient_transport(max_retries=1, circuit_breaker=cb)
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.get(str(server.make_url("/misdirected")))
+
+    # Un 421 real del origen no se confunde con el circuito abierto
+    assert response.status_code == 421
+    assert cb.get_state("127.0.0.1") == "closed"
+
+
+@pytest.mark.asyncio
+async def test_origin_500_is_not_retried_nor_trips(server):
+    cb = CircuitBreaker(threshold=1)
+    transport = create_resilient_transport(
+        max_retries=3, base_delay=0.01, circuit_breaker=cb
+    )
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.get(str(server.make_url("/broken")))
+
+    # El 500 de una página llega tal cual al engine, que la salta
+    assert response.status_code == 500
+    assert len(server.hits) == 1
+    assert cb.get_state("127.0.0.1") == "closed"
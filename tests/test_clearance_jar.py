@@ -0,0 +1,98 @@
+from uif_scraper.utils.clearance_jar import ClearanceJar
+
+UA = "Mozilla/5.0 (X11; Linux x86_64) Chrome/131.0"
+
+
+def browser_cookies():
+    return [
+        {
+            "name": "cf_clearance",
+            "value": "token",
+            "domain": ".example.com",
+            "path": "/",
+            "expires": 2000.0,
+        },
+        {"name": "session", "value": "s1", "domain": "www.example.com", "path": "/"},
+        {"name": "scoped", "value": "x", "domain": "example.com", "path": "/shop"},
+        {"name": "tracker", "value": "t", "domain": ".ads.net", "path": "/"},
+    ]
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_jar(clock: FakeClock | None = None) -> ClearanceJar:
+    return ClearanceJar(clock=clock or FakeClock())
+
+
+def test_imports_cookies_for_the_rendered_host_only():
+    jar = make_jar()
+    changed = jar.update_from_browser(
+        "https://www.example.com/page",
+        browser_cookies(),
+        {"User-Agent": UA, "Accept": "*/*"},
+    )
+    assert sorted(changed) == ["example.com", "www.example.com"]
+    assert jar.cookies_for("https://www.example.com/blog") == {
+        "session": "s1",
+        "cf_clearance": "token",
+    }
+    assert jar.cookies_for("https://www.example.com/shop/1")["scoped"] == "x"
+    assert jar.cookies_for("https://ads.net/") == {}
+    assert jar.user_agent_for("https://www.example.com/") == UA
+
+    # Sin cambios no hay nada que persistir
+    assert (
+        jar.update_from_browser(
+            "https://www.example.com/page", browser_cookies(), {"user-agent": UA}
+        )
+        == []
+    )
+
+
+def test_expired_cookies_are_not_sent():
+    clock = FakeClock()
+    jar = make_jar(clock)
+    jar.update_from_browser("https://example.com/", browser_cookies(), None)
+    assert "cf_clearance" in jar.cookies_for("https://example.com/")
+    clock.now = 2001.0
+    assert "cf_clearance" not in jar.cookies_for("https://example.com/")
+
+
+def test_headers_for_clients_without_a_jar():
+    jar = make_jar()
+    assert jar.headers_for("https://example.com/a.pdf") == {}
+    jar.update_from_browser(
+        "https://example.com/", browser_cookies()[:1], {"user-agent": UA}
+    )
+    assert jar.headers_for("https://example.com/a.pdf") == {
+        "Cookie": "cf_clearance=token",
+        "User-Agent": UA,
+    }
+
+
+def test_discard_and_persistence_roundtrip():
+    jar = make_jar()
+    jar.update_from_browser(
+        "https://example.com/", browser_cookies(), {"user-agent": UA}
+    )
+    entry = jar.get("example.com")
+    assert entry is not None
+    rows = [("example.com", entry.encode_cookies(), entry.user_agent)]
+
+    restored = make_jar()
+    restored.load(rows + [("broken.com", "not json", None)])
+    assert restored.cookies_for("https://example.com/shop/") == {
+        "cf_clearance": "token",
+        "scoped": "x",
+    }
+    assert restored.user_agent_for("https://example.com/") == UA
+    assert len(restored) == 1
+
+    assert restored.discard("https://example.com/") == ["example.com"]
+    assert restored.cookies_for("https://example.com/") == {}
@@ -44,3 +44,23 @@ async def test_state_manager_add_update(tmp_path):
     assert new_retry == 1
 
     await pool.close_all()
+
+
+@pytest.mark.asyncio
+async def test_domain_cookies_roundtrip(tmp_path):
+    pool = SQLitePool(tmp_path / "state.db")
+    state = StateManager(pool)
+    await state.initialize()
+
+    await state.save_domain_cookies("example.com", '[{"name":"a"}]', "UA/1")
+    await state.save_domain_cookies("example.com", '[{"name":"b"}]', "UA/2")
+    await state.save_domain_cookies("other.com", "[]", None)
+    rows = sorted(await state.load_domain_cookies())
+    assert rows == [
+        ("example.com", '[{"name":"b"}]', "UA/2"),
+        ("other.com", "[]", None),
+    ]
+
+    await state.delete_domain_cookies("other.com")
+    assert [r[0] for r in await state.load_domain_cookies()] == ["example.com"]
+    await pool.close_all()
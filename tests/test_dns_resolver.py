@@ -0,0 +1,162 @@
+import asyncio
+import socket
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from uif_scraper.infrastructure.network.page_client import PageClient
+from uif_scraper.infrastructure.network.resilient_transport import (
+    create_resilient_transport,
+)
+from uif_scraper.utils.dns_resolver import CachingResolver
+from uif_scraper.utils.http_session import HTTPSessionCache
+
+
+class FakeLookup:
+    """Resolución falsa que cuenta las consultas reales."""
+
+    def __init__(self, table: dict[str, str], delay: float = 0.0):
+        self.table = table
+        self.delay = delay
+        self.calls: list[str] = []
+
+    async def __call__(self, host: str, family: int):
+        self.calls.append(host)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if host not in self.table:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return ((socket.AF_INET, self.table[host]),)
+
+
+@pytest.mark.asyncio
+async def test_caches_positive_lookups():
+    lookup = FakeLookup({"example.com": "93.184.216.34"})
+    resolver = CachingResolver(lookup=lookup)
+
+    assert await resolver.addresses("example.com") == ["93.184.216.34"]
+    assert await resolver.addresses("EXAMPLE.com.") == ["93.184.216.34"]
+
+    assert lookup.calls == ["example.com"]
+    assert resolver.get_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_remembers_failures_in_negative_cache():
+    lookup = FakeLookup({})
+    resolver = CachingResolver(lookup=lookup)
+
+    for _ in range(3):
+        with pytest.raises(socket.gaierror):
+            await resolver.lookup("down.invalid")
+
+    assert lookup.calls == ["down.invalid"]
+    assert resolver.get_stats()["negative_hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_resolution():
+    lookup = FakeLookup({"example.com": "93.184.216.34"}, delay=0.01)
+    resolver = CachingResolver(lookup=lookup)
+
+    results = await asyncio.gather(
+        *(resolver.addresses("example.com") for _ in range(10))
+    )
+
+    assert all(r == ["93.184.216.34"] for r in results)
+    assert lookup.calls == ["example.com"]
+
+
+@pytest.mark.asyncio
+async def test_overrides_skip_resolution():
+    lookup = FakeLookup({})
+    resolver = CachingResolver({"Fixture.test": "::1"}, lookup=lookup)
+
+    results = await resolver.resolve("fixture.test", 443)
+
+    assert lookup.calls == []
+    assert results[0]["host"] == "::1"
+    assert results[0]["port"] == 443
+    assert results[0]["family"] == socket.AF_INET6
+    assert results[0]["hostname"] == "fixture.test"
+
+
+def test_rejects_invalid_override():
+    with pytest.raises(ValueError):
+        CachingResolver({"fixture.test": "not-an-ip"})
+
+
+@pytest.mark.asyncio
+async def test_prefetch_resolves_unknown_hosts_in_background():
+    lookup = FakeLookup({"a.com": "10.0.0.1", "b.com": "10.0.0.2"})
+    resolver = CachingResolver({"local.test": "127.0.0.1"}, lookup=lookup)
+    await resolver.addresses("a.com")
+
+    scheduled = resolver.prefetch(["a.com", "b.com", "b.com", "local.test", None])
+    assert scheduled == 1
+    await asyncio.gather(*resolver._prefetch_tasks)
+
+    assert sorted(lookup.calls) == ["a.com", "b.com"]
+    assert resolver.is_known("b.com")
+    assert resolver.get_stats()["prefetched"] == 1
+    await resolver.close()
+
+
+@pytest_asyncio.fixture
+async def server():
+    async def page(request: web.Request) -> web.Response:
+        return web.Response(
+            text=f"<html><title>{request.host}</title></html>",
+            content_type="text/html",
+        )
+
+    app = web.Application()
+    app.router.add_get("/page", page)
+    srv = TestServer(app, host="127.0.0.1")
+    await srv.start_server()
+    yield srv
+    await srv.close()
+
+
+@pytest.mark.asyncio
+async def test_overrides_route_page_fetches_through_curl(server):
+    resolver = CachingResolver({"fixture.test": "127.0.0.1"})
+    client = PageClient(create_resilient_transport(max_retries=1, resolver=resolver))
+
+    page = await client.get(f"http://fixture.test:{server.port}/page")
+
+    assert page.status == 200
+    assert page.css("title::text").get() == f"fixture.test:{server.port}"
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_unresolvable_host_fails_like_a_connect_error():
+    lookup = FakeLookup({})
+    resolver = CachingResolver(lookup=lookup)
+    client = PageClient(
+        create_resilient_transport(max_retries=2, base_delay=0.01, resolver=resolver)
+    )
+
+    page = await client.get("http://down.invalid/page")
+
+    # Reintentada como un fallo de conexión; el reintento sale de la caché negativa
+    assert page.status == 504
+    assert lookup.calls == ["down.invalid"]
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_overrides_route_asset_session(server):
+    resolver = CachingResolver({"fixture.test": "127.0.0.1"})
+    cache = HTTPSessionCache(resolver=resolver)
+    session = await cache.get_session()
+
+    async with session.get(f"http://fixture.test:{server.port}/page") as response:
+        assert response.status == 200
+        assert "fixture.test" in await response.text()
+
+    assert resolver.get_stats()["hits"] >= 1
+    await cache.close()
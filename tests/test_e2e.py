@@ -95,6 +95,7 @@ async def test_e2e_http_fetch_single_page(tmp_path):
         session.fetch_result = response
 
         await core._process_page(session, url)
+        await core._stop_stages(timeout=60)
         core.url_queue.task_done()
 
     # Esperar que el batch processor flushee las actualizaciones de estado
@@ -277,6 +278,7 @@ async def test_e2e_full_flow_mocked_browser(tmp_path):
 
     async with PartialMockSession() as session:
         await core._process_page(session, url)
+        await core._stop_stages(timeout=60)
         core.url_queue.task_done()
 
     # Verificar DB
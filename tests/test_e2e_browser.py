@@ -97,6 +97,7 @@ async def test_browser_scrape_single_page(tmp_path):
         # Procesar la página
         url = await core.url_queue.get()
         await core._process_page(session, url)
+        await core._stop_stages(timeout=60)
         core.url_queue.task_done()
 
     # Esperar que el batch processor flushee las actualizaciones de estado
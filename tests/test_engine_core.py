@@ -9,21 +9,30 @@ Tests unitarios y de integración para verificar:
 """
 
 import asyncio
+import threading
+import time
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from uif_scraper.config import ScraperConfig
 from uif_scraper.core.engine_core import EngineCore, UICallback
-from uif_scraper.core.types import ActivityEntry, EngineStats
+from uif_scraper.core.types import ActivityEntry, EngineStats, FetchedPage
 from uif_scraper.db_manager import StateManager
 from uif_scraper.extractors.asset_extractor import AssetExtractor
 from uif_scraper.extractors.metadata_extractor import MetadataExtractor
 from uif_scraper.extractors.text_extractor import TextExtractor
+from uif_scraper.infrastructure.network.page_client import (
+    NonHTMLContentError,
+    PageTooLargeError,
+)
+from uif_scraper.infrastructure.network.resilient_transport import CircuitOpenError
 from uif_scraper.models import MigrationStatus, ScrapingScope
 from uif_scraper.navigation import NavigationService
 from uif_scraper.reporter import ReporterService
+from uif_scraper.utils.page_guard import PageBudget, PageDeadlineExceeded
 
 
 class MockUICallback(UICallback):
@@ -400,3 +409,508 @@ class TestEngineCoreSpeedTracking:
         """Velocidad inicial es cero."""
         assert engine_core._current_speed == 0.0
         assert engine_core._pages_since_last_check == 0
+
+
+class TestPageGuard:
+    """Tests para deadline por página y documentos patológicos."""
+
+    @pytest.mark.asyncio
+    async def test_pathological_page_uses_degraded_extraction(
+        self, engine_core, mock_state
+    ):
+        html = "<html><body><h1>Raro</h1>" + "<div>" * 2000 + "fondo"
+        page = SimpleNamespace(
+            status=200, headers={}, body=html.encode(), encoding="utf-8"
+        )
+        engine_core.navigation.extract_links = MagicMock(return_value=([], []))
+        engine_core.robots_checker.can_fetch = AsyncMock(return_value=True)
+        engine_core._fetch_page = AsyncMock(return_value=page)
+        engine_core._save_markdown = AsyncMock()
+
+        await engine_core._process_page(MagicMock(), "https://example.com/raro")
+        await engine_core._stop_stages(timeout=5)
+
+        _, kwargs = engine_core.navigation.extract_links.call_args
+        assert kwargs["max_links"] == engine_core.page_budget.max_links
+        markdown = engine_core._save_markdown.call_args.args[2]
+        assert markdown == "# Raro\n\nfondo"
+        mock_state.update_status.assert_called_with(
+            "https://example.com/raro", MigrationStatus.COMPLETED
+        )
+
+    @pytest.mark.asyncio
+    async def test_node_limit_gates_before_the_parse_pool(
+        self, engine_core, mock_state
+    ):
+        """Pasado max_nodes solo la extracción degradada usa el pool de parse."""
+        html = "<html><body><h1>Enorme</h1>" + "<span>x</span>" * 2000
+        page = SimpleNamespace(
+            status=200, headers={}, body=html.encode(), encoding="utf-8"
+        )
+        engine_core.page_budget = PageBudget(max_nodes=500)
+        engine_core.navigation.extract_links = MagicMock(return_value=([], []))
+        engine_core.robots_checker.can_fetch = AsyncMock(return_value=True)
+        engine_core._fetch_page = AsyncMock(return_value=page)
+        engine_core._save_markdown = AsyncMock()
+
+        with patch.object(
+            engine_core, "_run_cpu", wraps=engine_core._run_cpu
+        ) as run_cpu:
+            await engine_core._process_page(MagicMock(), "https://example.com/enorme")
+            await engine_core._stop_stages(timeout=5)
+
+        assert [call.args[0] for call in run_cpu.call_args_list] == [
+            engine_core._extract_degraded
+        ]
+        mock_state.update_status.assert_called_with(
+            "https://example.com/enorme", MigrationStatus.COMPLETED
+        )
+
+    @pytest.mark.asyncio
+    async def test_oversized_page_with_many_links_stays_streamed(
+        self, engine_core, mock_state
+    ):
+        html = (
+            "<html><body><h1>Índice</h1>"
+            + "".join(f"<p><a href='/l{i}'>link {i}</a></p>" for i in range(50))
+            + "</body></html>"
+        )
+        page = SimpleNamespace(
+            status=200, headers={}, body=html.encode(), encoding="utf-8"
+        )
+        engine_core.page_budget = PageBudget(max_links=10)
+        engine_core.navigation.extract_links = MagicMock(return_value=([], []))
+        engine_core.robots_checker.can_fetch = AsyncMock(return_value=True)
+        engine_core._fetch_page = AsyncMock(return_value=page)
+        engine_core._save_markdown = AsyncMock()
+
+        with (
+            patch("uif_scraper.core.engine_core.MAX_HTML_SIZE_BYTES", 500),
+            patch.object(
+                engine_core, "_extract_degraded", wraps=engine_core._extract_degraded
+            ) as degraded,
+        ):
+            await engine_core._process_page(MagicMock(), "https://example.com/indice")
+            await engine_core._stop_stages(timeout=5)
+
+        # Los links se recortan, pero la página sigue por el camino streaming
+        _, kwargs = engine_core.navigation.extract_links.call_args
+        assert kwargs["max_links"] == 10
+        degraded.assert_not_called()
+        markdown = engine_core._save_markdown.call_args.args[2]
+        assert "link 49" in markdown
+
+    @pytest.mark.asyncio
+    async def test_parse_deadline_holds_the_worker_until_the_thread_stops(
+        self, engine_core, mock_state
+    ):
+        """Un hilo no se cancela: el worker espera a que llegue a un checkpoint."""
+        finished = threading.Event()
+
+        def slow_clean(raw_html, sanitize=True, checkpoint=None):
+            time.sleep(0.3)  # Fase sin checkpoints (un parseo nativo)
+            finished.set()
+            checkpoint()
+            raise AssertionError("checkpoint should abandon the page")
+
+        engine_core.template_learner.clean = slow_clean
+        await engine_core._parse_page(
+            FetchedPage(
+                url="https://example.com/lenta",
+                raw_html="<p>lenta</p>",
+                over_budget=None,
+                time_left=0.05,
+                start_time=0.0,
+            )
+        )
+
+        assert finished.is_set()
+        status, message = mock_state.update_status.call_args.args[1:]
+        assert status == MigrationStatus.FAILED
+        assert "stage 'clean'" in message
+        assert engine_core.write_stage.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_unexpected_parse_error_counts_as_a_page_failure(
+        self, engine_core, mock_state
+    ):
+        mock_state.increment_retry = AsyncMock(
+            return_value=engine_core.config.max_retries
+        )
+        engine_core.template_learner.clean = MagicMock(side_effect=KeyError("bug"))
+
+        await engine_core._parse_page(
+            FetchedPage(
+                url="https://example.com/rota",
+                raw_html="<p>rota</p>",
+                over_budget=None,
+                time_left=30.0,
+                start_time=0.0,
+            )
+        )
+
+        mock_state.increment_retry.assert_awaited_once_with("https://example.com/rota")
+        assert mock_state.update_status.call_args.args[1] == MigrationStatus.FAILED
+        assert engine_core.write_stage.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_document_deadline_fails_without_retry(self, engine_core, mock_state):
+        mock_state.increment_retry = AsyncMock(return_value=1)
+
+        await engine_core._handle_page_error(
+            "https://example.com/lenta",
+            PageDeadlineExceeded("https://example.com/lenta", "extract", 90.0),
+        )
+
+        assert engine_core.circuit_breaker.failures == {}
+        mock_state.increment_retry.assert_not_called()
+        assert engine_core.url_queue.empty()
+        assert mock_state.update_status.call_args.args[1] == MigrationStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_oversized_page_fails_without_retry(self, engine_core, mock_state):
+        mock_state.increment_retry = AsyncMock(return_value=1)
+
+        await engine_core._handle_page_error(
+            "https://example.com/dump",
+            PageTooLargeError("https://example.com/dump", 60 * 2**20, 50 * 2**20),
+        )
+
+        mock_state.increment_retry.assert_not_called()
+        assert engine_core.url_queue.empty()
+        assert mock_state.update_status.call_args.args[1] == MigrationStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retry_budget_fails_without_requeue(
+        self, engine_core, mock_state
+    ):
+        mock_state.increment_retry = AsyncMock(return_value=1)
+        for _ in range(6):
+            engine_core.retry_budget.record_failure()
+
+        await engine_core._handle_page_error(
+            "https://example.com/caida", Exception("HTTP 504")
+        )
+
+        assert engine_core.url_queue.empty()
+        assert engine_core.retry_budget.denied == 1
+        status, message = mock_state.update_status.call_args.args[1:]
+        assert status == MigrationStatus.FAILED
+        assert message.startswith("Retry budget exhausted")
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_requeues_without_spending_a_retry(
+        self, engine_core, mock_state
+    ):
+        mock_state.increment_retry = AsyncMock(return_value=1)
+
+        await engine_core._handle_page_error(
+            "https://example.com/a", CircuitOpenError("example.com", 30.0)
+        )
+
+        mock_state.increment_retry.assert_not_called()
+        assert list(engine_core._requeues.values()) == ["https://example.com/a"]
+        await engine_core._cancel_requeues()
+
+    @pytest.mark.asyncio
+    async def test_retry_backoff_does_not_hold_the_worker(
+        self, engine_core, mock_state
+    ):
+        """El backoff se programa en el loop: el worker sigue con otra página."""
+        mock_state.increment_retry = AsyncMock(return_value=1)
+
+        async with asyncio.timeout(0.5):
+            await engine_core._handle_page_error(
+                "https://example.com/a", Exception("HTTP 503")
+            )
+
+        assert engine_core.url_queue.empty()
+        assert list(engine_core._requeues.values()) == ["https://example.com/a"]
+        await engine_core._cancel_requeues()
+
+    @pytest.mark.asyncio
+    async def test_scheduled_requeue_reaches_the_queue(self, engine_core):
+        engine_core._schedule_requeue("https://example.com/a", 0.01)
+
+        url = await asyncio.wait_for(engine_core.url_queue.get(), timeout=1.0)
+
+        assert url == "https://example.com/a"
+        assert engine_core._requeues == {}
+
+    @pytest.mark.asyncio
+    async def test_shutdown_cancels_pending_requeues(self, engine_core, mock_state):
+        engine_core._schedule_requeue("https://example.com/a", 0.05)
+
+        await engine_core._cancel_requeues()
+        await asyncio.sleep(0.1)
+
+        assert engine_core.url_queue.empty()
+        assert engine_core._requeues == {}
+        mock_state.update_status.assert_awaited_once_with(
+            "https://example.com/a", MigrationStatus.PENDING, immediate=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_origin_421_spends_retries_like_any_error(
+        self, engine_core, mock_state
+    ):
+        """Un 421 real del origen no se toma por circuito abierto."""
+        mock_state.increment_retry = AsyncMock(return_value=3)
+        session = MagicMock()
+
+        with patch.object(
+            engine_core.page_client,
+            "get",
+            new=AsyncMock(return_value=SimpleNamespace(status=421)),
+        ):
+            with pytest.raises(Exception, match="HTTP 421") as exc_info:
+                await engine_core._fetch_page(session, "https://example.com/a")
+        assert not isinstance(exc_info.value, CircuitOpenError)
+
+        await engine_core._handle_page_error("https://example.com/a", exc_info.value)
+
+        mock_state.increment_retry.assert_awaited_once()
+        assert engine_core.url_queue.empty()
+        assert mock_state.update_status.call_args.args[1] == MigrationStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_origin_500_skips_the_page_without_tripping(self, engine_core):
+        """Un 500 del origen se salta la página sin contar contra el host."""
+        session = MagicMock()
+
+        with patch.object(
+            engine_core.page_client,
+            "get",
+            new=AsyncMock(return_value=SimpleNamespace(status=500)),
+        ):
+            page = await engine_core._fetch_page(session, "https://example.com/a")
+
+        assert page is None
+        session.fetch.assert_not_called()
+        assert engine_core.circuit_breaker.get_state("example.com") == "closed"
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_asset_download(self, engine_core, mock_state):
+        for _ in range(engine_core.config.circuit_threshold):
+            engine_core.circuit_breaker.record_failure("cdn.example.com")
+        engine_core.http_cache.get_session = AsyncMock()
+
+        await engine_core._download_asset("https://cdn.example.com/logo.png")
+
+        engine_core.http_cache.get_session.assert_not_called()
+        assert mock_state.update_status.call_args.args[1] == MigrationStatus.FAILED
+        assert engine_core.stats.assets_failed == 1
+        assert engine_core.get_dashboard_state().circuit_state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_non_html_page_is_routed_to_assets(self, engine_core, mock_state):
+        url = "https://example.com/descargar?id=7"
+        engine_core.extract_assets = True
+        engine_core.stats.pages_total_count = 1
+        engine_core.robots_checker.can_fetch = AsyncMock(return_value=True)
+        engine_core._fetch_page = AsyncMock(
+            side_effect=NonHTMLContentError(url, "application/pdf")
+        )
+
+        await engine_core._process_page(MagicMock(), url)
+
+        mock_state.reclassify_url.assert_awaited_once_with(url, "asset")
+        assert engine_core.asset_queue.get_nowait() == url
+        assert engine_core.stats.pages_total_count == 0
+        assert engine_core.stats.assets_total_count == 1
+        assert engine_core.parse_stage.pending == 0
+        mock_state.update_status.assert_not_called()
+
+
+class TestLinkFirstPipeline:
+    """Tests para admisión de links antes de la extracción."""
+
+    @pytest.mark.asyncio
+    async def test_links_queued_before_extraction_finishes(
+        self, engine_core, mock_state
+    ):
+        html = "<html><body><h1>Guía</h1><p>Texto.</p></body></html>"
+        page = SimpleNamespace(
+            status=200, headers={}, body=html.encode(), encoding="utf-8"
+        )
+        release = threading.Event()
+        threads: list[str] = []
+
+        def slow_extract(*args, **kwargs):
+            # Bloquea un hilo del pool de parse, no el event loop
+            threads.append(threading.current_thread().name)
+            release.wait(timeout=5)
+            return {"markdown": "# Guía", "engine": "html-to-markdown"}
+
+        engine_core.navigation.extract_links = MagicMock(
+            return_value=(["https://example.com/siguiente"], [])
+        )
+        engine_core.robots_checker.can_fetch = AsyncMock(return_value=True)
+        engine_core._fetch_page = AsyncMock(return_value=page)
+        engine_core._save_markdown = AsyncMock()
+        engine_core.text_extractor.extract_sync = slow_extract
+
+        engine_core.parse_stage.start()
+        engine_core.write_stage.start()
+        await engine_core._process_page(MagicMock(), "https://example.com/guia")
+        await asyncio.sleep(0.01)
+
+        # El worker ya volvió: el link está en la frontera, la página sigue en parse
+        assert engine_core.url_queue.get_nowait() == "https://example.com/siguiente"
+        assert engine_core.parse_stage.pending == 1
+        assert engine_core.parse_stage.meter.busy == 1
+        engine_core._save_markdown.assert_not_called()
+
+        release.set()
+        await engine_core._stop_stages(timeout=5)
+        assert threads[0].startswith("uif-parse")
+        engine_core._save_markdown.assert_called_once()
+        assert engine_core._pipeline_pending() == 0
+        mock_state.update_status.assert_called_with(
+            "https://example.com/guia", MigrationStatus.COMPLETED
+        )
+
+    @pytest.mark.asyncio
+    async def test_stage_metrics_in_dashboard_state(self, engine_core, config):
+        metrics = engine_core.get_stage_metrics()
+        assert [m.name for m in metrics] == ["fetch", "parse", "write"]
+        assert metrics[0].workers == config.default_workers
+        assert metrics[1].workers == config.parse_workers
+        assert metrics[2].capacity == config.stage_queue_size
+        assert engine_core.get_dashboard_state().stages == metrics
+
+
+class TestMemoryGovernor:
+    """Tests para la integración del gobernador de memoria."""
+
+    @pytest.mark.asyncio
+    async def test_queues_are_accounted(self, engine_core):
+        """Colas de URLs y de persistencia cuentan para el presupuesto."""
+        await engine_core.url_queue.put("https://example.com/a")
+        await engine_core.queue_item_for_persistence(
+            {"url": "https://example.com/a", "content": "x" * 1000}
+        )
+
+        accounted = engine_core.memory.accounted()
+        assert accounted["url_queue"] > 0
+        assert accounted["data_queue"] == 1000
+        assert accounted["parse_queue"] == 0
+
+    @pytest.mark.asyncio
+    async def test_relief_shrinks_caches_and_flushes_writer(self, engine_core):
+        """El alivio encoge las cachés de dedup y vacía el writer JSONL."""
+        for i in range(10):
+            engine_core.seen_urls[f"https://example.com/{i}"] = True
+        engine_core._data_writer = MagicMock()
+        engine_core._data_writer.flush = AsyncMock()
+
+        await engine_core.memory._run_relief()
+
+        assert len(engine_core.seen_urls) == 5
+        engine_core._data_writer.flush.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_page_admission_waits_under_pressure(self, engine_core):
+        """Con la admisión pausada los page workers no inician fetches."""
+        engine_core.memory._admission.clear()
+        engine_core._process_page = AsyncMock()
+        await engine_core.url_queue.put("https://example.com/a")
+        await engine_core.url_queue.get()
+
+        task = asyncio.create_task(
+            engine_core._safe_process_page(MagicMock(), "https://example.com/a")
+        )
+        await asyncio.sleep(0.05)
+        engine_core._process_page.assert_not_awaited()
+
+        engine_core.memory._admission.set()
+        await asyncio.wait_for(task, timeout=2)
+        engine_core._process_page.assert_awaited_once()
+
+
+class TestBrowserEscalation:
+    """Tests para la escalada al navegador por sección."""
+
+    @pytest.mark.asyncio
+    async def test_block_escalates_only_its_section(self, engine_core):
+        """Los bloqueos en /shop no mandan /blog al navegador."""
+        session = MagicMock()
+        session.fetch = AsyncMock(return_value=SimpleNamespace(status=200))
+        blocked = SimpleNamespace(status=403)
+        ok = SimpleNamespace(status=200)
+
+        with patch.object(
+            engine_core.page_client,
+            "get",
+            new=AsyncMock(side_effect=[blocked, blocked, ok]),
+        ) as fast_get:
+            await engine_core._fetch_page(session, "https://example.com/shop/1")
+            await engine_core._fetch_page(session, "https://example.com/shop/2")
+            await engine_core._fetch_page(session, "https://example.com/shop/3")
+            await engine_core._fetch_page(session, "https://example.com/blog/1")
+
+        # shop/1 y shop/2 se rinden en el navegador; shop/3 va directo
+        assert session.fetch.await_count == 3
+        assert fast_get.await_count == 3
+        assert engine_core.use_browser_mode is False
+        assert engine_core.browser_mode_active
+        assert engine_core.escalation.escalated_sections() == ["example.com/shop"]
+
+
+class TestClearanceReuse:
+    """Tests para la reutilización de la clearance del navegador."""
+
+    @pytest.mark.asyncio
+    async def test_browser_clearance_unlocks_fast_path(self, engine_core, mock_state):
+        """Las cookies del navegador y su UA viajan en el siguiente fetch rápido."""
+        ua = "Mozilla/5.0 Chrome/131.0"
+        rendered = SimpleNamespace(
+            status=200,
+            cookies=(
+                {
+                    "name": "cf_clearance",
+                    "value": "token",
+                    "domain": ".example.com",
+                    "path": "/",
+                    "expires": -1,
+                },
+            ),
+            request_headers={"user-agent": ua},
+        )
+        session = MagicMock()
+        session.fetch = AsyncMock(return_value=rendered)
+        engine_core.use_browser_mode = True
+        await engine_core._fetch_page(session, "https://example.com/a")
+        mock_state.save_domain_cookies.assert_awaited_once()
+
+        engine_core.use_browser_mode = False
+        with patch.object(
+            engine_core.page_client,
+            "get",
+            new=AsyncMock(return_value=SimpleNamespace(status=200)),
+        ) as fast_get:
+            await engine_core._fetch_page(session, "https://example.com/b")
+
+        headers = fast_get.await_args.kwargs["headers"]
+        assert headers["Cookie"] == "cf_clearance=token"
+        assert headers["User-Agent"] == ua
+
+    @pytest.mark.asyncio
+    async def test_rejected_clearance_is_discarded(self, engine_core, mock_state):
+        """Un 403 con cookies descarta la clearance y la borra de la DB."""
+        engine_core.cookie_jar.update_from_browser(
+            "https://example.com/",
+            [{"name": "cf_clearance", "value": "old", "domain": "example.com"}],
+        )
+        session = MagicMock()
+        session.fetch = AsyncMock(return_value=SimpleNamespace(status=200))
+        with patch.object(
+            engine_core.page_client,
+            "get",
+            new=AsyncMock(return_value=SimpleNamespace(status=403)),
+        ):
+            await engine_core._fetch_page(session, "https://example.com/b")
+
+        mock_state.delete_domain_cookies.assert_awaited_once_with("example.com")
+        assert engine_core.cookie_jar.cookies_for("https://example.com/") == {}
+        session.fetch.assert_awaited_once()
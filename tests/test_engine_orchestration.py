@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -39,7 +40,10 @@ async def test_engine_retry_logic(tmp_path):
         session = AsyncMock()
         await core._process_page(session, TEST_URL)
         assert state.increment_retry.call_count == 1
-        assert core.url_queue.qsize() == 1
+        # El backoff no retiene al worker: la URL vuelve a la cola después
+        assert core.url_queue.qsize() == 0
+        requeued = await asyncio.wait_for(core.url_queue.get(), timeout=5)
+        assert requeued == TEST_URL
 
 
 @pytest.mark.asyncio
@@ -74,4 +78,6 @@ async def test_engine_run_orchestration(tmp_path):
         core.setup.assert_called_once()
         # Verificar que se crearon los workers
         assert core._page_worker.call_count == 2  # default_workers=2
+        # El navegador solo se lanza al escalar: nadie hizo fetch con él
+        mock_session.assert_not_called()
     await pool.close_all()
@@ -58,12 +58,11 @@ async def test_engine_process_page_full(tmp_path):
         )
     )
 
-    with patch(
-        "scrapling.fetchers.AsyncFetcher.get", new_callable=AsyncMock
-    ) as mock_get:
+    with patch.object(core.page_client, "get", new_callable=AsyncMock) as mock_get:
         mock_get.return_value = mock_resp
         session = AsyncMock()
         await core._process_page(session, TEST_URL)
+        await core._stop_stages(timeout=30)
         assert "https://webscraper.io/other" in core.seen_urls
         assert "https://webscraper.io/img.png" in core.seen_assets
 
@@ -0,0 +1,110 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import ValidationError
+
+from uif_scraper.config import EXTRACTION_PROFILES, ScraperConfig
+from uif_scraper.core.engine_core import EngineCore
+from uif_scraper.db_manager import StateManager
+from uif_scraper.db_pool import SQLitePool
+from uif_scraper.extractors.asset_extractor import AssetExtractor
+from uif_scraper.extractors.metadata_extractor import MetadataExtractor
+from uif_scraper.extractors.text_extractor import TextExtractor
+from uif_scraper.models import ScrapingScope
+from uif_scraper.navigation import NavigationService
+from uif_scraper.reporter import ReporterService
+from uif_scraper.utils.markdown_utils import render_markdown_document
+
+BASE_URL = "https://docs.example.com/guide/"
+PAGE = (
+    "<html><head><title>Install | Docs</title>"
+    "<meta name='description' content='How to install'>"
+    "<meta property='og:site_name' content='Example Docs'></head>"
+    "<body><nav><a href='/'>Home</a></nav><main><h1>Install</h1>"
+    "<p>Run the installer and follow the steps shown on screen to finish.</p>"
+    "<p>See <a href='setup'>the setup guide</a> for details.</p></main></body></html>"
+)
+
+
+def test_default_profile_is_full():
+    config = ScraperConfig()
+    assert config.extraction_profile == "full"
+    assert config.profile is EXTRACTION_PROFILES["full"]
+
+
+def test_unknown_profile_rejected():
+    with pytest.raises(ValidationError):
+        ScraperConfig(extraction_profile="turbo")
+
+
+def test_render_without_link_absolutization():
+    markdown = "# T\n\nSee [setup](setup)."
+    assert "](setup)" in render_markdown_document(
+        markdown, {}, BASE_URL, absolutize_links=False
+    )
+    assert "](https://docs.example.com/" in render_markdown_document(
+        markdown, {}, BASE_URL
+    )
+
+
+@pytest.mark.asyncio
+async def test_extract_basic_reads_head_only():
+    metadata = await MetadataExtractor().extract_basic(PAGE, BASE_URL)
+    assert metadata["title"] == "Install"
+    assert metadata["description"] == "How to install"
+    assert metadata["sitename"] == "Example Docs"
+    assert metadata["headers"] == []
+    assert list(metadata) == list(await MetadataExtractor().extract(PAGE, BASE_URL))
+
+
+@pytest.mark.asyncio
+async def test_short_output_kept_without_fallbacks():
+    html = "<p>Short text</p>"
+    extractor = TextExtractor()
+    assert (await extractor.extract(html, BASE_URL, fallbacks=False))["engine"] == (
+        "html-to-markdown"
+    )
+    assert (await extractor.extract(html, BASE_URL))["engine"] != "html-to-markdown"
+
+
+async def _process(tmp_path, profile: str) -> EngineCore:
+    config = ScraperConfig(data_dir=tmp_path, extraction_profile=profile)
+    state = StateManager(SQLitePool(tmp_path / f"{profile}.db"))
+    await state.initialize()
+    core = EngineCore(
+        config=config,
+        state=state,
+        text_extractor=TextExtractor(),
+        metadata_extractor=MetadataExtractor(),
+        asset_extractor=AssetExtractor(tmp_path / profile),
+        navigation_service=NavigationService(BASE_URL, scope=ScrapingScope.BROAD),
+        reporter_service=ReporterService(MagicMock(), state),
+    )
+    core.robots_checker.can_fetch = AsyncMock(return_value=True)
+
+    resp = MagicMock(status=200, body=PAGE, raw_content=None)
+    resp.css = MagicMock(return_value=[])
+    with patch.object(core.page_client, "get", new_callable=AsyncMock) as get:
+        get.return_value = resp
+        await core._process_page(AsyncMock(), BASE_URL + "install")
+    await core._stop_stages(timeout=30)
+    await state.stop_batch_processor()
+    return core
+
+
+@pytest.mark.asyncio
+async def test_fast_profile_skips_sinks_and_compression(tmp_path):
+    core = await _process(tmp_path, "fast")
+    content_dir = tmp_path / "fast" / "content"
+    written = list(content_dir.iterdir())
+    assert [p.suffix for p in written] == [".md"]
+    assert "](setup)" in written[0].read_text(encoding="utf-8")
+    assert core.data_queue.qsize() == 0
+
+
+@pytest.mark.asyncio
+async def test_full_profile_keeps_every_stage(tmp_path):
+    core = await _process(tmp_path, "full")
+    written = list((tmp_path / "full" / "content").iterdir())
+    assert [p.name.endswith(".md.zst") for p in written] == [True]
+    assert core.data_queue.qsize() == 1
@@ -0,0 +1,109 @@
+import pytest
+
+from uif_scraper.utils.host_latency import (
+    AdaptiveTimeouts,
+    HedgeBudget,
+    HostLatencyTracker,
+    LatencySketch,
+)
+
+
+def test_sketch_quantiles_within_relative_error():
+    sketch = LatencySketch(half_life=10_000)
+    for i in range(1, 1001):
+        sketch.add(i / 1000)
+
+    assert sketch.quantile(0.5) == pytest.approx(0.5, rel=0.03)
+    assert sketch.quantile(0.99) == pytest.approx(0.99, rel=0.03)
+    assert sketch.quantile(0.0) == pytest.approx(0.001, rel=0.03)
+    assert LatencySketch().quantile(0.5) is None
+
+
+def test_sketch_follows_recent_latency():
+    sketch = LatencySketch(half_life=50)
+    for _ in range(500):
+        sketch.add(0.1)
+    for _ in range(500):
+        sketch.add(2.0)
+
+    # Las muestras viejas pesan casi nada tras varias vidas medias
+    assert sketch.quantile(0.05) == pytest.approx(2.0, rel=0.03)
+    assert len(sketch._buckets) <= 2
+
+
+def test_quantiles_per_host_with_min_samples():
+    tracker = HostLatencyTracker()
+    for i in range(1, 101):
+        tracker.record("a.com", i / 100)
+    tracker.record("b.com", 5.0)
+
+    assert tracker.quantile("a.com", 0.95) == pytest.approx(0.95, rel=0.03)
+    assert tracker.quantile("b.com", 0.95) == pytest.approx(5.0, rel=0.03)
+    assert tracker.quantile("b.com", 0.95, min_samples=10) is None
+    assert tracker.quantile("c.com", 0.95) is None
+
+
+def test_hosts_are_bounded():
+    tracker = HostLatencyTracker(max_hosts=2)
+    for host in ("a.com", "b.com", "c.com"):
+        tracker.record(host, 1.0)
+
+    assert tracker.count("a.com") == 0  # Expulsado por LRU
+    assert tracker.count("c.com") == 1
+
+
+def learned(host_latency: float, **kwargs) -> AdaptiveTimeouts:
+    timeouts = AdaptiveTimeouts(30.0, multiplier=3.0, floor=2.0, ceiling=60.0, **kwargs)
+    for _ in range(50):
+        timeouts.record("a.com", host_latency, host_latency * 2)
+    return timeouts
+
+
+def test_default_until_host_has_history():
+    timeouts = AdaptiveTimeouts(30.0, min_samples=20)
+    for _ in range(19):
+        timeouts.record("a.com", 0.1, 0.2)
+
+    assert timeouts.for_host("a.com").total == 30.0
+    assert timeouts.for_host("a.com", cap=12.0).read == 12.0
+
+
+def test_fast_host_gets_tight_timeouts_above_floor():
+    limits = learned(0.9).for_host("a.com")
+
+    assert limits.read == pytest.approx(2.7, rel=0.03)
+    assert limits.connect == limits.read
+    assert limits.total == pytest.approx(5.4, rel=0.03)
+    assert learned(0.05).for_host("a.com").read == 2.0  # Suelo
+
+
+def test_slow_host_gets_more_than_the_default_up_to_ceiling():
+    assert learned(15.0).for_host("a.com").read == pytest.approx(45.0, rel=0.03)
+    assert learned(40.0).for_host("a.com").total == 60.0  # Techo
+    assert learned(40.0).for_host("a.com", cap=10.0).total == 10.0
+
+
+def test_timeouts_widen_when_host_slows_down():
+    timeouts = learned(0.5)
+    before = timeouts.for_host("a.com").read
+    for _ in range(5):
+        timeouts.record_timeout("a.com", before)
+
+    assert timeouts.for_host("a.com").read > before
+    assert timeouts.timeouts == 5
+
+
+def test_disabled_always_uses_default():
+    assert learned(0.5, enabled=False).for_host("a.com").read == 30.0
+
+
+def test_hedge_budget_caps_extra_load():
+    budget = HedgeBudget(ratio=0.25, burst=1.0)
+    assert budget.try_spend()
+    assert not budget.try_spend()
+
+    hedges = 0
+    for _ in range(100):
+        budget.earn()
+        hedges += budget.try_spend()
+    assert hedges == 25
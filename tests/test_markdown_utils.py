@@ -0,0 +1,66 @@
+from uif_scraper.extractors.metadata_extractor import DocumentHeader
+from uif_scraper.utils.markdown_utils import (
+    enhance_markdown_for_rag,
+    generate_toc,
+    render_markdown_document,
+    resolve_relative_links,
+)
+
+BASE_URL = "https://example.com/docs/page"
+
+
+def test_resolve_links_and_images_in_one_pass():
+    md = "See [guide](guide.md) and ![logo](/img/logo.png) or [ext](https://x.org)"
+    assert resolve_relative_links(md, BASE_URL) == (
+        "See [guide](https://example.com/docs/guide.md) and "
+        "![logo](https://example.com/img/logo.png) or [ext](https://x.org)"
+    )
+
+
+def test_special_urls_and_empty_links_untouched():
+    md = "[a](#frag) [b](mailto:a@b.c) [](rel) ![](rel.png)"
+    assert resolve_relative_links(md, BASE_URL) == (
+        "[a](#frag) [b](mailto:a@b.c) [](rel) ![](https://example.com/docs/rel.png)"
+    )
+
+
+def test_generate_toc_accepts_dicts_and_models():
+    dicts = [{"level": 1, "text": "Intro", "id": None}, {"level": 2, "text": "Uso"}]
+    models = [
+        DocumentHeader(level=1, text="Intro"),
+        DocumentHeader(level=2, text="Uso"),
+    ]
+    expected = "## Tabla de Contenidos\n\n- [Intro](#intro)\n  - [Uso](#uso)\n"
+    assert generate_toc(dicts) == expected
+    assert generate_toc(models) == expected
+    assert generate_toc([{"level": 5, "text": "Deep"}]) == ""
+
+
+def test_toc_inserted_before_first_text_line():
+    md = "# Title\n\nBody [x](x.md)\n"
+    metadata = {"headers": [{"level": 1, "text": "Title"}]}
+    result = enhance_markdown_for_rag(md, metadata, BASE_URL)
+    assert result == (
+        "# Title\n\n\n## Tabla de Contenidos\n\n- [Title](#title)\n\n\n"
+        "Body [x](https://example.com/docs/x.md)\n"
+    )
+
+
+def test_render_document_writes_frontmatter_toc_and_body():
+    md = "Intro [x](x.md)"
+    metadata = {"headers": [{"level": 1, "text": "A"}]}
+    result = render_markdown_document(md, metadata, BASE_URL, frontmatter="title: A\n")
+    assert result == (
+        "---\ntitle: A\n---\n\n"
+        "\n## Tabla de Contenidos\n\n- [A](#a)\n\n\n"
+        "Intro [x](https://example.com/docs/x.md)"
+    )
+
+
+def test_render_document_without_toc_or_body():
+    assert render_markdown_document("", {}, BASE_URL, frontmatter="a: 1\n") == (
+        "---\na: 1\n---\n\n"
+    )
+    assert render_markdown_document("texto", {}, BASE_URL, include_toc=False) == (
+        "texto"
+    )
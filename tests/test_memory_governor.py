@@ -0,0 +1,151 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+from cachetools import LRUCache
+
+from uif_scraper.utils.memory_governor import (
+    MB,
+    MemoryGovernor,
+    process_tree_rss,
+    resolve_memory_budget,
+    shrink_cache,
+)
+
+
+class FakeRSS:
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+    def __call__(self) -> int:
+        return self.value
+
+
+def make_governor(rss: FakeRSS, budget_mb: int = 100) -> MemoryGovernor:
+    return MemoryGovernor(
+        budget_mb * MB,
+        high_watermark=0.8,
+        low_watermark=0.6,
+        relief_interval=0.0,
+        rss_reader=rss,
+    )
+
+
+@pytest.mark.asyncio
+async def test_pauses_admission_over_high_watermark_and_resumes_below_low():
+    rss = FakeRSS(10 * MB)
+    governor = make_governor(rss)
+
+    rss.value = 85 * MB
+    await governor.check(in_flight=3)
+    assert governor.paused
+    waiter = asyncio.create_task(governor.wait_for_admission())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    # Histéresis: entre los dos umbrales sigue pausado
+    rss.value = 70 * MB
+    await governor.check(in_flight=3)
+    assert governor.paused
+
+    rss.value = 50 * MB
+    await governor.check(in_flight=3)
+    assert not governor.paused
+    await asyncio.wait_for(waiter, timeout=1)
+    assert governor.pauses == 1
+
+
+@pytest.mark.asyncio
+async def test_accounted_bytes_trigger_pressure_before_rss_grows():
+    rss = FakeRSS(10 * MB)
+    governor = make_governor(rss)
+    queued = {"bytes": 0}
+    governor.register_gauge("queue", lambda: queued["bytes"])
+
+    governor.reserve("buffers", 40 * MB)
+    queued["bytes"] = 35 * MB
+    await governor.check(in_flight=1)
+    assert governor.paused
+    assert governor.accounted() == {"buffers": 40 * MB, "queue": 35 * MB}
+
+    governor.release("buffers", 40 * MB)
+    queued["bytes"] = 0
+    await governor.check(in_flight=1)
+    assert not governor.paused
+    assert governor.usage() == 10 * MB
+
+
+@pytest.mark.asyncio
+async def test_relief_actions_run_under_pressure():
+    rss = FakeRSS(90 * MB)
+    governor = make_governor(rss)
+    calls: list[str] = []
+
+    async def flush() -> None:
+        calls.append("flush")
+
+    def failing() -> None:
+        raise RuntimeError("boom")
+
+    governor.register_relief("caches", lambda: calls.append("shrink"))
+    governor.register_relief("broken", failing)
+    governor.register_relief("writers", flush)
+
+    await governor.check(in_flight=1)
+    assert calls == ["shrink", "flush"]
+    assert governor.reliefs == 1
+
+
+@pytest.mark.asyncio
+async def test_never_pauses_without_work_in_flight():
+    rss = FakeRSS(90 * MB)
+    governor = make_governor(rss)
+
+    await governor.check(in_flight=0)
+    assert not governor.paused
+
+    await governor.check(in_flight=2)
+    assert governor.paused
+    # El trabajo en vuelo terminó y el RSS no bajó: pausar ya no libera nada
+    await governor.check(in_flight=0)
+    assert not governor.paused
+
+
+@pytest.mark.asyncio
+async def test_disabled_budget_is_a_no_op():
+    rss = FakeRSS(10 * 1024 * MB)
+    governor = MemoryGovernor(resolve_memory_budget(0), rss_reader=rss)
+    await governor.check(in_flight=5)
+    assert not governor.enabled
+    assert not governor.paused
+
+
+def test_shrink_cache_drops_least_recent_entries():
+    cache: LRUCache[int, int] = LRUCache(maxsize=10)
+    for i in range(8):
+        cache[i] = i
+    cache[0]  # Recién usada: sobrevive
+
+    assert shrink_cache(cache, fraction=0.5) == 4
+    assert set(cache) == {0, 5, 6, 7}
+
+
+def test_resolve_memory_budget():
+    assert resolve_memory_budget(512) == 512 * MB
+    assert resolve_memory_budget(0) == 0
+    assert resolve_memory_budget(None) > 0
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="requires /proc")
+def test_process_tree_rss_counts_child_processes():
+    child = subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(30)"],
+    )
+    try:
+        assert process_tree_rss() > 0
+        assert process_tree_rss(child.pid) == 0  # Sin descendientes
+    finally:
+        child.kill()
+        child.wait()
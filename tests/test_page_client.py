@@ -0,0 +1,288 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from uif_scraper.infrastructure.network.page_client import (
+    NonHTMLContentError,
+    PageClient,
+    PageTooLargeError,
+    is_html_content_type,
+)
+from uif_scraper.infrastructure.network.resilient_transport import (
+    create_resilient_transport,
+)
+from uif_scraper.utils.circuit_breaker import CircuitBreaker
+from uif_scraper.utils.host_latency import AdaptiveTimeouts, HedgeBudget
+
+PAGE = (
+    "<html><head><meta charset='utf-8'><title>Inicio</title></head>"
+    "<body><a href='/a'>A</a><a href='/b'>B</a></body></html>"
+)
+
+
+@pytest_asyncio.fixture
+async def server():
+    peers: set[tuple[str, int]] = set()
+    stalls: list[str] = []
+
+    async def page(request: web.Request) -> web.Response:
+        peers.add(request.transport.get_extra_info("peername"))
+        return web.Response(text=PAGE, content_type="text/html")
+
+    async def moved(request: web.Request) -> web.Response:
+        raise web.HTTPFound("/page")
+
+    async def pdf(request: web.Request) -> web.Response:
+        return web.Response(body=b"%PDF" * 4096, content_type="application/pdf")
+
+    async def slow(request: web.Request) -> web.Response:
+        # Solo el primer request se atasca
+        stalls.append(request.path)
+        if len(stalls) == 1:
+            await asyncio.sleep(0.5)
+        return web.Response(text=PAGE, content_type="text/html")
+
+    async def dead(request: web.Request) -> web.Response:
+        await asyncio.sleep(10)
+        return web.Response(text=PAGE, content_type="text/html")
+
+    async def flaky(request: web.Request) -> web.Response:
+        # Falla una vez de cada dos
+        stalls.append(request.path)
+        if len(stalls) % 2:
+            return web.Response(status=503)
+        return web.Response(text=PAGE, content_type="text/html")
+
+    async def down(request: web.Request) -> web.Response:
+        return web.Response(status=503)
+
+    async def big(request: web.Request) -> web.Response:
+        return web.Response(text="<p>x</p>" * 4096, content_type="text/html")
+
+    async def huge(request: web.Request) -> web.StreamResponse:
+        # Chunked (sin Content-Length): el límite se aplica mientras se lee
+        response = web.StreamResponse(headers={"Content-Type": "text/html"})
+        await response.prepare(request)
+        for _ in range(64):
+            await response.write(b"<p>" + b"x" * 4096 + b"</p>")
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/page", page)
+    app.router.add_get("/old", moved)
+    app.router.add_get("/file", pdf)
+    app.router.add_get("/big", big)
+    app.router.add_get("/slow", slow)
+    app.router.add_get("/dead", dead)
+    app.router.add_get("/huge", huge)
+    app.router.add_get("/flaky", flaky)
+    app.router.add_get("/down", down)
+    srv = TestServer(app)
+    await srv.start_server()
+    srv.peers = peers  # type: ignore[attr-defined]
+    yield srv
+    await srv.close()
+
+
+@pytest.mark.asyncio
+async def test_returns_scrapling_response_with_selectors(server):
+    client = PageClient(create_resilient_transport(max_retries=1))
+    page = await client.get(str(server.make_url("/old")), headers={"Referer": "x"})
+
+    assert page.status == 200
+    assert page.url.endswith("/page")
+    assert page.css("title::text").get() == "Inicio"
+    assert [str(h) for h in page.css("a::attr(href)")] == ["/a", "/b"]
+    assert page.headers["content-type"].startswith("text/html")
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_reuses_connections_across_requests(server):
+    client = PageClient(create_resilient_transport(max_retries=1, max_connections=2))
+    url = str(server.make_url("/page"))
+    for _ in range(3):
+        await asyncio.gather(*(client.get(url) for _ in range(2)))
+
+    assert client.requests == 6
+    # Keep-alive: no más conexiones que el tamaño del pool
+    assert len(server.peers) <= 2
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_reopens_after_close(server):
+    client = PageClient(create_resilient_transport(max_retries=1))
+    url = str(server.make_url("/page"))
+    await client.get(url)
+    await client.aclose()
+    assert not client.is_active
+
+    page = await client.get(url)
+    assert page.status == 200
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_non_html_response_is_rejected_before_the_body(server):
+    client = PageClient(create_resilient_transport(max_retries=1))
+
+    with pytest.raises(NonHTMLContentError) as exc_info:
+        await client.get(str(server.make_url("/file")))
+
+    assert exc_info.value.content_type.startswith("application/pdf")
+    assert client.non_html == 1
+    # La conexión sigue utilizable tras cortar la respuesta
+    assert (await client.get(str(server.make_url("/page")))).status == 200
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_oversized_bodies_are_aborted(server):
+    client = PageClient(create_resilient_transport(max_retries=1), max_bytes=8192)
+
+    for path in ("/big", "/huge"):  # Con y sin Content-Length
+        with pytest.raises(PageTooLargeError) as exc_info:
+            await client.get(str(server.make_url(path)))
+        assert exc_info.value.limit == 8192
+
+    assert client.oversized == 2
+    assert (await client.get(str(server.make_url("/page")))).status == 200
+    await client.aclose()
+
+
+def test_html_content_types():
+    assert is_html_content_type("text/html; charset=utf-8")
+    assert is_html_content_type("Application/XHTML+XML")
+    assert is_html_content_type(None)
+    assert not is_html_content_type("application/pdf")
+    assert not is_html_content_type("video/mp4")
+
+
+def hedged_client(budget: HedgeBudget) -> PageClient:
+    client = PageClient(
+        create_resilient_transport(max_retries=1),
+        hedge_budget=budget,
+        hedge_transport=create_resilient_transport(max_retries=1),
+    )
+    # Host rápido: p95 de 10 ms
+    for _ in range(20):
+        client.latency.record("127.0.0.1", 0.01)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_over_stalled_request(server):
+    client = hedged_client(HedgeBudget())
+
+    started = time.monotonic()
+    page = await client.get(str(server.make_url("/slow")))
+
+    assert page.status == 200
+    assert time.monotonic() - started < 0.4
+    assert client.hedges == 1
+    assert client.hedge_wins == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_budget(server):
+    client = hedged_client(HedgeBudget(ratio=0.0, burst=0.0))
+
+    started = time.monotonic()
+    page = await client.get(str(server.make_url("/slow")))
+
+    assert page.status == 200
+    assert time.monotonic() - started >= 0.5
+    assert client.hedges == 0
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_hedge_does_not_beat_healthy_primary(server):
+    # El hedge falla al instante como el transport con los reintentos agotados
+    client = PageClient(
+        create_resilient_transport(max_retries=1),
+        hedge_budget=HedgeBudget(),
+        hedge_transport=httpx.MockTransport(
+            lambda request: httpx.Response(504, request=request)
+        ),
+    )
+    for _ in range(20):
+        client.latency.record("127.0.0.1", 0.01)
+
+    page = await client.get(str(server.make_url("/slow")))
+
+    assert page.status == 200
+    assert client.hedges == 1
+    assert client.hedge_wins == 0
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_while_circuit_is_recovering(server):
+    breaker = CircuitBreaker(threshold=1, timeout=0.05)
+    transport = create_resilient_transport(max_retries=1, circuit_breaker=breaker)
+    client = PageClient(
+        transport,
+        hedge_budget=HedgeBudget(),
+        hedge_transport=create_resilient_transport(
+            max_retries=1, circuit_breaker=breaker
+        ),
+    )
+    for _ in range(20):
+        client.latency.record("127.0.0.1", 0.01)
+    breaker.record_failure("127.0.0.1")
+    await asyncio.sleep(0.06)
+
+    # Half-open: el primario es la sonda y nadie lo cancela
+    page = await client.get(str(server.make_url("/slow")))
+
+    assert page.status == 200
+    assert client.hedges == 0
+    assert breaker.get_state("127.0.0.1") == "closed"
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_only_first_attempt_origin_responses_feed_latency(server):
+    timeouts = AdaptiveTimeouts(30.0)
+    client = PageClient(
+        create_resilient_transport(max_retries=2, base_delay=0.01, jitter=0.0),
+        timeouts=timeouts,
+    )
+
+    # 504 sintético (reintentos agotados) y 200 tras un reintento: con backoff
+    assert (await client.get(str(server.make_url("/down")))).status == 504
+    assert (await client.get(str(server.make_url("/flaky")))).status == 200
+    assert timeouts.total.count("127.0.0.1") == 0
+
+    assert (await client.get(str(server.make_url("/page")))).status == 200
+    assert timeouts.total.count("127.0.0.1") == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_adaptive_timeout_cuts_stalled_request_on_fast_host(server):
+    timeouts = AdaptiveTimeouts(30.0, floor=0.2)
+    client = PageClient(create_resilient_transport(max_retries=1), timeouts=timeouts)
+    for _ in range(5):
+        await asyncio.gather(
+            *(client.get(str(server.make_url("/page"))) for _ in range(4))
+        )
+    assert timeouts.for_host("127.0.0.1").read < 1.0
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        await client.get(str(server.make_url("/dead")))
+
+    # Sin historial habría esperado timeout_seconds (30 s)
+    assert time.monotonic() - started < 2.0
+    assert timeouts.timeouts == 1
+    await client.aclose()
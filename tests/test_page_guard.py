@@ -0,0 +1,142 @@
+import asyncio
+import time
+
+import pytest
+
+from uif_scraper.extractors.text_extractor import TextExtractor
+from uif_scraper.utils.page_guard import (
+    Deadline,
+    PageBudget,
+    PageDeadlineExceeded,
+    assess_complexity,
+    count_nodes,
+    degraded_text,
+)
+
+NORMAL = (
+    "<html><head><title>Guía</title><script>if (a < b) { x = '<div>' }</script>"
+    "</head><body><nav><ul>"
+    + "<li><a href='/nav'>Nav</a>" * 30
+    + "</ul></nav><main><h1>Guía</h1>"
+    + "<p>Texto con <b>negrita</b> &amp; entidades." * 200
+    + "</main></body></html>"
+)
+DEEP_TABLES = (
+    "<html><body>"
+    + "<table><tr><td><div>" * 5000
+    + "celda profunda"
+    + "</div></td></tr></table>" * 5000
+    + "</body></html>"
+)
+MANY_LINKS = (
+    "<html><body>"
+    + "".join(f"<a href='/l{i}'>link {i}</a>" for i in range(30_000))
+    + "</body></html>"
+)
+GIANT_SVG = (
+    "<html><body><h1>Mapa</h1><svg>"
+    + '<path d="M0 0L10 10"/>' * 150_000
+    + "</svg><p>Leyenda del mapa</p></body></html>"
+)
+
+
+def test_normal_page_within_budget():
+    complexity = assess_complexity(NORMAL)
+    assert complexity.links == 30
+    assert complexity.max_depth <= 6  # <li> y <p> sin cerrar no suman
+    assert PageBudget().exceeded(complexity) is None
+
+
+@pytest.mark.parametrize(
+    ("html", "reason"),
+    [(DEEP_TABLES, "depth"), (MANY_LINKS, "links"), (GIANT_SVG, "nodes")],
+)
+def test_pathological_documents_exceed_budget(html, reason):
+    exceeded = PageBudget().exceeded(assess_complexity(html))
+    assert exceeded is not None
+    assert exceeded.startswith(reason)
+
+
+def test_node_count_decides_without_the_scan():
+    budget = PageBudget()
+    assert count_nodes(GIANT_SVG) == assess_complexity(GIANT_SVG).nodes
+    exceeded = budget.exceeded_nodes(count_nodes(GIANT_SVG))
+    assert exceeded is not None
+    assert exceeded.startswith("nodes")
+    assert budget.exceeded_nodes(count_nodes(NORMAL)) is None
+
+
+def test_streamed_pages_only_check_depth():
+    budget = PageBudget()
+    assert budget.exceeded(assess_complexity(GIANT_SVG), streamed=True) is None
+    assert budget.exceeded(assess_complexity(MANY_LINKS), streamed=True) is None
+    exceeded = budget.exceeded(assess_complexity(DEEP_TABLES), streamed=True)
+    assert exceeded is not None
+    assert exceeded.startswith("depth")
+
+
+def test_scan_stops_once_the_budget_is_exceeded():
+    budget = PageBudget(max_depth=50, max_links=100)
+    deep = "<html><body>" + "<div>" * 200_000 + "</div>" * 200_000
+    start = time.perf_counter()
+    complexity = assess_complexity(deep, budget)
+    assert time.perf_counter() - start < 0.1
+    assert complexity.max_depth == 51
+    assert assess_complexity(MANY_LINKS, budget).links == 101
+    # Sin presupuesto, medidas completas
+    assert assess_complexity(MANY_LINKS).links == 30_000
+
+
+def test_depth_ignores_flat_self_closing_and_script_tags():
+    html = (
+        "<html><SCRIPT>var a = '<div><div>'</SCRIPT><!-- <div><div> -->"
+        "<DIV><P><BR><div/><img src='x'><div><span>texto</span></div></DIV>"
+    )
+    assert assess_complexity(html).max_depth == 4  # html > DIV > div > span
+
+
+def test_degraded_text_keeps_headings_and_drops_svg():
+    text = degraded_text(GIANT_SVG)
+    assert text == "# Mapa\n\nLeyenda del mapa"
+    assert "a < b" not in degraded_text(NORMAL)
+    assert "negrita & entidades" in degraded_text(NORMAL)
+
+
+@pytest.mark.asyncio
+async def test_degraded_extractor_is_linear_on_deep_nesting():
+    html = "<html><body>" + "<div>" * 50_000 + "texto" + "</div>" * 50_000
+    start = time.perf_counter()
+    result = await TextExtractor().extract_degraded(html, "https://example.com")
+    assert time.perf_counter() - start < 1.0
+    assert result == {"markdown": "texto", "engine": "degraded-text"}
+
+
+@pytest.mark.asyncio
+async def test_deadline_check_and_timeout_at():
+    deadline = Deadline.after(0.05)
+    deadline.check("fetch")
+    assert 0 < deadline.remaining() <= 0.05
+
+    with pytest.raises(TimeoutError):
+        async with asyncio.timeout_at(deadline.expires_at):
+            await asyncio.sleep(1)
+
+    assert deadline.expired()
+    with pytest.raises(PageDeadlineExceeded) as exc_info:
+        deadline.check("extract", "https://example.com/a")
+    assert exc_info.value.stage == "extract"
+    assert exc_info.value.retryable is False
+    assert PageDeadlineExceeded("u", "fetch", 1.0).retryable is True
+
+
+@pytest.mark.asyncio
+async def test_deadline_checkpoint_from_parse_threads():
+    deadline = Deadline.after(0.05)
+    check = deadline.checkpoint("clean", "https://example.com/a")
+    await asyncio.to_thread(check)
+
+    await asyncio.sleep(0.06)
+    with pytest.raises(PageDeadlineExceeded) as exc_info:
+        await asyncio.to_thread(check)
+    assert exc_info.value.stage == "clean"
+    assert exc_info.value.url == "https://example.com/a"
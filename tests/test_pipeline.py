@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from uif_scraper.core.pipeline import PipelineStage, StageMeter
+
+
+@pytest.mark.asyncio
+async def test_put_blocks_when_queue_is_full():
+    processed: list[int] = []
+
+    async def handler(item: int) -> None:
+        processed.append(item)
+
+    stage: PipelineStage[int] = PipelineStage("parse", 1, 1, handler)
+    await stage.put(1)
+    blocked = asyncio.create_task(stage.put(2))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+    assert stage.pending == 1
+
+    stage.start()
+    await blocked
+    await stage.close(timeout=1)
+    assert processed == [1, 2]
+    assert stage.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_close_drains_then_stops_and_survives_handler_errors():
+    processed: list[int] = []
+
+    async def handler(item: int) -> None:
+        if item == 2:
+            raise ValueError("boom")
+        processed.append(item)
+
+    stage: PipelineStage[int] = PipelineStage("write", 2, 8, handler)
+    for i in range(5):
+        await stage.put(i)
+    await stage.close(timeout=1)
+    assert sorted(processed) == [0, 1, 3, 4]
+    metrics = stage.metrics()
+    assert metrics.processed == 5
+    assert metrics.busy == 0
+    assert metrics.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_close_timeout_cancels_stuck_workers():
+    async def handler(item: int) -> None:
+        await asyncio.sleep(10)
+
+    stage: PipelineStage[int] = PipelineStage("parse", 1, 4, handler)
+    stage.start()
+    await stage.put(1)
+    await asyncio.sleep(0)
+    await asyncio.wait_for(stage.close(timeout=0.05), timeout=1)
+    assert stage.meter.busy == 0
+
+
+def test_meter_utilization_counts_work_in_progress(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("uif_scraper.core.pipeline.time.monotonic", lambda: now[0])
+    meter = StageMeter("fetch", workers=2)
+
+    with meter.track():
+        now[0] += 2.0
+    with meter.track():
+        now[0] += 1.0
+        # 3s ocupados de 2 workers x 3s: 50% (incluye el item en curso)
+        assert meter.utilization() == pytest.approx(0.5)
+        assert meter.snapshot(queue_depth=7, capacity=0).busy == 1
+
+    now[0] += 2.0
+    assert meter.utilization() == 0.0
+    assert meter.processed == 2
+
+
+@pytest.mark.asyncio
+async def test_queued_bytes_tracks_payloads_waiting_in_queue():
+    async def handler(item: str) -> None:
+        pass
+
+    stage: PipelineStage[str] = PipelineStage("parse", 1, 4, handler, sizeof=len)
+    await stage.put("abc")
+    await stage.put("defgh")
+    assert stage.queued_bytes == 8
+
+    stage.start()
+    await stage.close(timeout=1)
+    assert stage.queued_bytes == 0
@@ -0,0 +1,86 @@
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from uif_scraper.infrastructure.network.page_client import PageClient
+from uif_scraper.infrastructure.network.resilient_transport import (
+    create_resilient_transport,
+)
+from uif_scraper.utils.retry_budget import RetryBudget
+
+
+def test_isolated_failures_keep_retrying():
+    budget = RetryBudget(ratio=0.1, max_tokens=10)
+
+    # 1 fallo cada 20 requests: el saldo se mantiene
+    for _ in range(10):
+        for _ in range(19):
+            budget.record_success()
+        budget.record_failure()
+        assert budget.try_retry()
+
+    assert budget.denied == 0
+
+
+def test_mass_failure_stops_retries_until_successes_refill():
+    budget = RetryBudget(ratio=0.1, max_tokens=10)
+
+    for _ in range(5):
+        budget.record_failure()
+    assert not budget.try_retry()
+    assert budget.denied == 1
+
+    # Hacen falta 10 éxitos por token para volver a superar la mitad
+    for _ in range(11):
+        budget.record_success()
+    assert budget.try_retry()
+
+
+def test_disabled_budget_always_allows():
+    budget = RetryBudget(enabled=False)
+    for _ in range(50):
+        budget.record_failure()
+
+    assert budget.try_retry()
+    assert budget.tokens == 0.0
+
+
+@pytest_asyncio.fixture
+async def server():
+    hits: list[str] = []
+
+    async def down(request: web.Request) -> web.Response:
+        hits.append(request.path)
+        return web.Response(status=503)
+
+    app = web.Application()
+    app.router.add_get("/down", down)
+    srv = TestServer(app)
+    await srv.start_server()
+    srv.hits = hits  # type: ignore[attr-defined]
+    yield srv
+    await srv.close()
+
+
+@pytest.mark.asyncio
+async def test_transport_stops_retrying_when_budget_is_exhausted(server):
+    budget = RetryBudget(ratio=0.1, max_tokens=4)
+    client = PageClient(
+        create_resilient_transport(
+            max_retries=3, base_delay=0.01, jitter=0.0, retry_budget=budget
+        )
+    )
+    url = str(server.make_url("/down"))
+
+    first = await client.get(url)
+    # 1.º intento y un reintento: tras 2 fallos el saldo (2) ya no supera la mitad
+    assert first.status == 504
+    assert len(server.hits) == 2
+
+    second = await client.get(url)
+    assert second.status == 504
+    assert len(server.hits) == 3  # Sin reintentos
+    assert budget.retries == 1
+    assert budget.denied == 2
+    await client.aclose()
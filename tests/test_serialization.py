@@ -0,0 +1,48 @@
+import json
+from datetime import datetime
+
+import pytest
+import yaml
+
+from uif_scraper.utils.serialization import dump_frontmatter, encode_jsonl
+
+FRONTMATTER_SAMPLES = [
+    {"url": "https://example.com/a?b=c&d=e", "title": "Hola mundo"},
+    {"title": "Guía: configuración", "description": "a #comment", "date": "2024-01-01"},
+    {"keywords": ["yes", "No", "null", "1.5", "-"], "sitename": "~"},
+    {"title": 'línea\nnueva\t"comillas" \\ \x85  ', "og_type": "art:"},
+    {"size": 10, "ratio": 1e-07, "big": -1e300, "flag": True, "empty": []},
+]
+
+
+@pytest.mark.parametrize("data", FRONTMATTER_SAMPLES)
+def test_dump_frontmatter_round_trips(data):
+    assert yaml.safe_load(dump_frontmatter(data)) == data
+
+
+def test_dump_frontmatter_block_style_and_order():
+    data = {"url": "https://x.com", "keywords": ["a", "b"], "author": "Ana"}
+    assert (
+        dump_frontmatter(data)
+        == "url: https://x.com\nkeywords:\n- a\n- b\nauthor: Ana\n"
+    )
+    assert dump_frontmatter(data, sort_keys=True).startswith("author: Ana\n")
+
+
+def test_dump_frontmatter_falls_back_for_nested_values():
+    data = {"title": "T", "extra": {"nested": 1}}
+    assert dump_frontmatter(data) == yaml.dump(
+        data, allow_unicode=True, sort_keys=False
+    )
+
+
+def test_encode_jsonl_matches_json_lines():
+    items = [{"url": "https://x.com", "title": "Niño"}, {"n": 1, "tags": ["a"]}]
+    lines = encode_jsonl(items).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == items
+    assert "Niño" in lines[0]
+
+
+def test_encode_jsonl_serializes_datetime():
+    line = encode_jsonl([{"at": datetime(2024, 1, 2, 3, 4, 5)}])
+    assert json.loads(line) == {"at": "2024-01-02T03:04:05"}
@@ -0,0 +1,106 @@
+from unittest.mock import patch
+
+import pytest
+
+from uif_scraper.extractors.metadata_extractor import MetadataExtractor
+from uif_scraper.extractors.text_extractor import TextExtractor
+from uif_scraper.utils.html_cleaner import pre_clean_html
+from uif_scraper.utils.streaming_cleaner import StreamingHTMLCleaner
+
+NAV = (
+    "<nav><ul>"
+    + "".join(f"<li><a href='/n{i}'>Nav {i}</a></li>" for i in range(20))
+    + "</ul></nav>"
+)
+
+
+def make_doc(sections: int) -> str:
+    body = "".join(
+        f"<section><h2 id='f{i}'>func_{i}()</h2>"
+        f"<p>Returns value {i} &amp; more text about the behaviour.</p>"
+        f"<pre><code>x = func_{i}(a, b)</code></pre>"
+        f"<ul><li>arg a<li>arg b</ul>"
+        f"<script>document.write('</div><p>leak</p>')</script></section>"
+        for i in range(sections)
+    )
+    return (
+        "<!doctype html><html lang='en'><head><title>API Reference</title>"
+        "<meta property='og:title' content='API'>"
+        '<script type=\'application/ld+json\'>{"@type": "TechArticle"}</script>'
+        f"</head><body>{NAV}<main><h1>Reference</h1>{body}</main>"
+        "<footer>Footer text</footer></body></html>"
+    )
+
+
+def test_chunks_cover_whole_document_without_boilerplate():
+    doc = make_doc(300)
+    cleaner = StreamingHTMLCleaner(chunk_size=4096)
+    chunks = list(cleaner.iter_clean(doc, feed_size=1000))
+
+    assert cleaner.chunks_emitted == len(chunks) > 1
+    joined = "".join(chunks)
+    assert all(f"func_{i}()" in joined for i in range(300))
+    assert "Nav 3" not in joined
+    assert "Footer text" not in joined
+    assert "leak" not in joined
+
+
+def test_feed_size_does_not_change_output():
+    doc = make_doc(50)
+    outputs = {
+        tuple(StreamingHTMLCleaner(chunk_size=2048).iter_clean(doc, feed_size=size))
+        for size in (7, 333, 4096, len(doc))
+    }
+    assert len(outputs) == 1
+
+
+def test_single_chunk_matches_pre_clean_html():
+    doc = make_doc(5)
+    assert "".join(StreamingHTMLCleaner().iter_clean(doc)) == pre_clean_html(doc)
+
+
+@pytest.mark.asyncio
+async def test_streamed_markdown_matches_in_memory_extraction():
+    doc = make_doc(200)
+    extractor = TextExtractor()
+    streamed = await extractor.extract_stream(
+        StreamingHTMLCleaner(chunk_size=8192).iter_clean(doc), "https://x.dev/api"
+    )
+    in_memory = await extractor.extract(pre_clean_html(doc), "https://x.dev/api")
+
+    assert streamed["engine"] == "html-to-markdown-streaming"
+    assert streamed["markdown"].count("## func_") == 200
+    assert streamed["markdown"].count("x = func_") == 200
+    assert len(streamed["markdown"]) == pytest.approx(
+        len(in_memory["markdown"]), rel=0.01
+    )
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_falls_back_to_plain_text():
+    chunks = ["<h2>Roto</h2><p>texto del chunk</p>", "<h2>Sano</h2>"]
+    with patch(
+        "uif_scraper.extractors.text_extractor.convert",
+        side_effect=[RuntimeError("panic"), "## Sano"],
+    ):
+        result = await TextExtractor().extract_stream(
+            chunks, "https://x.dev/api", fix_text=False
+        )
+
+    assert result["markdown"] == "Roto\ntexto del chunk\n\n## Sano"
+
+
+@pytest.mark.asyncio
+async def test_metadata_skeleton_keeps_document_metadata():
+    doc = make_doc(30)
+    cleaner = StreamingHTMLCleaner()
+    for _ in cleaner.iter_clean(doc):
+        pass
+    skeleton = cleaner.metadata_html()
+    assert len(skeleton) < len(doc) / 5
+
+    extractor = MetadataExtractor()
+    from_skeleton = await extractor.extract(skeleton, "https://x.dev/api")
+    from_full = await extractor.extract(doc, "https://x.dev/api")
+    for key in ("title", "og_title", "json_ld", "headers"):
+        assert from_skeleton[key] == from_full[key]
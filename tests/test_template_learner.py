@@ -0,0 +1,147 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from uif_scraper.utils.html_cleaner import pre_clean_html
+from uif_scraper.utils.template_learner import TemplateLearner
+
+RELATED = "".join(
+    f'<li><a href="/r{j}">Related link number {j}</a></li>' for j in range(8)
+)
+
+
+def make_page(i: int, layout: str = "container") -> str:
+    return (
+        f'<html><body><div id="wrap" class="{layout}">'
+        f'<aside class="related"><ul>{RELATED}</ul></aside>'
+        f"<main><article><h1>Title {i}</h1>"
+        + "<p>Paragraph of real content with enough words to be kept.</p>" * (3 + i)
+        + "</article></main></div></body></html>"
+    )
+
+
+def test_same_layout_shares_fingerprint():
+    learner = TemplateLearner()
+    _, first = learner.clean(make_page(1))
+    _, second = learner.clean(make_page(7))
+    _, other = learner.clean(make_page(1, layout="blog"))
+    assert first == second
+    assert first != other
+
+
+def test_learned_plan_matches_full_cleaning():
+    learner = TemplateLearner(learn_pages=2)
+    for i in range(5):
+        clean, _ = learner.clean(make_page(i))
+        assert clean == pre_clean_html(make_page(i))
+        assert "Related link" not in clean
+
+    stats = learner.get_stats()
+    assert stats["learned"] == 1
+    assert stats["learning_pages"] == 2
+    assert stats["plan_hits"] == 3
+
+
+def test_plan_contains_only_consistently_pruned_subtrees():
+    learner = TemplateLearner(learn_pages=2)
+    _, template_id = learner.clean(make_page(0))
+    learner.clean(make_page(1))
+    plan = learner._templates[template_id].plan
+    assert plan is not None
+    related = (
+        "body > div#wrap.container:nth-child(1) > aside.related:nth-child(1)"
+        " > ul:nth-child(1)"
+    )
+    assert plan.boilerplate_paths == (related,)
+    assert plan.needs_density_pass is False
+
+
+def test_preferred_engine_only_when_fallback_always_wins():
+    learner = TemplateLearner(learn_pages=2)
+    _, template_id = learner.clean(make_page(0))
+    learner.record_engine(template_id, "markitdown")
+    assert learner.preferred_engine(template_id) is None
+    learner.record_engine(template_id, "markitdown")
+    assert learner.preferred_engine(template_id) == "markitdown"
+
+    _, other = learner.clean(make_page(0, layout="blog"))
+    learner.record_engine(other, "html-to-markdown")
+    learner.record_engine(other, "html-to-markdown")
+    assert learner.preferred_engine(other) is None
+
+
+def test_empty_html():
+    assert TemplateLearner().clean("") == ("", "empty")
+
+
+def test_clean_from_parse_threads():
+    learner = TemplateLearner(learn_pages=3)
+    pages = [make_page(i % 6) for i in range(60)]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda page: learner.clean(page)[0], pages))
+
+    assert results == [pre_clean_html(page) for page in pages]
+    stats = learner.get_stats()
+    assert stats["learned"] == 1
+    assert stats["learning_pages"] + stats["plan_hits"] == len(pages)
+
+
+STEPS = (
+    "<ul>"
+    + "".join(
+        f"<li>Step {j}: mix the ingredients slowly and wait a minute.</li>"
+        for j in range(4)
+    )
+    + "</ul>"
+)
+
+
+def make_article(i: int, steps: bool = False) -> str:
+    # Links relacionados al final del artículo, fuera del fingerprint
+    return (
+        '<html><body><div id="wrap" class="container">'
+        f'<aside class="related"><ul>{RELATED}</ul></aside>'
+        f"<main><article><h1>Title {i}</h1>"
+        + "<p>Paragraph of real content with enough words to be kept.</p>" * 3
+        + (STEPS if steps else "")
+        + f"<ul>{RELATED}</ul></article></main></div></body></html>"
+    )
+
+
+def test_plan_keeps_content_at_a_learned_path_on_later_pages():
+    learner = TemplateLearner(learn_pages=2)
+    _, template_id = learner.clean(make_article(0))
+    learner.clean(make_article(1))
+    assert learner._templates[template_id].plan.needs_density_pass is False
+
+    # Segunda página de la plantilla: una lista real donde antes estaban
+    # los links relacionados del artículo
+    page = make_article(2, steps=True)
+    clean, same_template = learner.clean(page)
+
+    assert same_template == template_id
+    assert clean == pre_clean_html(page)
+    assert "Step 3" in clean
+    assert "Related link" not in clean
+    assert learner.get_stats()["plan_fallbacks"] == 1
+
+    # Una página conforme no paga la poda por densidad
+    page = make_article(3)
+    assert learner.clean(page)[0] == pre_clean_html(page)
+    assert learner.get_stats()["plan_fallbacks"] == 1
+
+
+def test_learning_is_linear_on_wide_pages():
+    items = "".join(
+        f"<div class='item'><p>Item {i} with a bit of text to keep it.</p></div>"
+        for i in range(5000)
+    )
+    page = f"<html><body><main>{items}</main></body></html>"
+    learner = TemplateLearner(learn_pages=2)
+
+    start = time.perf_counter()
+    for _ in range(3):
+        clean, _ = learner.clean(page)
+    # Cuadrático eran ~50 s por página; lineal, décimas
+    assert time.perf_counter() - start < 3.0
+    assert clean == pre_clean_html(page)
@@ -181,3 +181,36 @@ class TestExtractionNeverFails:
         # Not a string (int)
         result = await extractor.extract(123, "https://test.com")  # type: ignore
         assert result["engine"] == "none"
+
+
+class TestPreferredEngine:
+    """Motor aprendido por plantilla: se saltan intentos que no alcanzan."""
+
+    @pytest.mark.asyncio
+    async def test_preferred_parachute_skips_earlier_levels(
+        self, extractor: TextExtractor
+    ) -> None:
+        html = (
+            "<html><body><article><p>"
+            + "Contenido real. " * 20
+            + "</p></article></body></html>"
+        )
+        result = await extractor.extract(
+            html, "https://test.com", preferred_engine="beautifulsoup-parachute"
+        )
+        assert result["engine"] == "beautifulsoup-parachute"
+        assert "Contenido real." in result["markdown"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_preferred_engine_uses_normal_flow(
+        self, extractor: TextExtractor
+    ) -> None:
+        html = (
+            "<html><body><article><p>"
+            + "Contenido real. " * 20
+            + "</p></article></body></html>"
+        )
+        result = await extractor.extract(
+            html, "https://test.com", preferred_engine="html-to-markdown"
+        )
+        assert result["engine"] == "html-to-markdown"
@@ -0,0 +1,56 @@
+import ftfy
+import pytest
+
+from uif_scraper.utils.text_utils import clean_text, decode_html, fix_text, needs_ftfy
+
+CLEAN_SAMPLES = [
+    "Plain ASCII documentation page.",
+    "El niño comió paella en València.",
+    "It’s a “quoted” example",
+    "## Título\n\n- Opción A\n- Opción B",
+]
+
+DIRTY_SAMPLES = [
+    "schÃ¶n und grÃ¼n",
+    "Ð¿Ñ€Ð¸Ð²ÐµÑ‚",
+    "line one\r\nline two",
+    "Tom &amp; Jerry",
+    "ﬁle",
+    "control\x85char",
+]
+
+
+@pytest.mark.parametrize("text", CLEAN_SAMPLES)
+def test_clean_text_skips_ftfy(text):
+    assert needs_ftfy(text) is False
+    assert fix_text(text) == ftfy.fix_text(text)
+
+
+@pytest.mark.parametrize("text", DIRTY_SAMPLES)
+def test_suspicious_text_goes_through_ftfy(text):
+    assert needs_ftfy(text) is True
+    assert fix_text(text) == ftfy.fix_text(text)
+
+
+def test_clean_text_fixes_mojibake_per_chunk():
+    text = "Texto limpio. " * 50 + "schÃ¶n"
+    assert clean_text(text, max_chunk_size=100).endswith("schön")
+
+
+def test_clean_text_collapses_newlines():
+    assert clean_text("a\n\n\n\nb") == "a\n\nb"
+
+
+def test_decode_html_uses_header_charset():
+    body = "Año café".encode("iso-8859-1")
+    assert decode_html(body, "text/html; charset=ISO-8859-1", "utf-8") == "Año café"
+
+
+def test_decode_html_sniffs_meta_charset_when_header_has_none():
+    body = b'<meta charset="windows-1252"><p>\x93hola\x94</p>'
+    assert decode_html(body, "text/html", "utf-8").endswith("“hola”</p>")
+
+
+def test_decode_html_bom_and_unknown_charset():
+    assert decode_html(b"\xef\xbb\xbfhola", "text/html; charset=latin-1") == "hola"
+    assert decode_html("niño".encode(), "text/html; charset=bogus") == "niño"
@@ -0,0 +1,115 @@
+import asyncio
+from typing import cast
+
+import pytest
+
+from uif_scraper.config import ScraperConfig
+from uif_scraper.utils.traffic_budget import (
+    TrafficBudget,
+    TrafficClassName,
+    TrafficScheduler,
+    asset_traffic_class,
+)
+
+
+def make_scheduler(total: int, **budgets: TrafficBudget) -> TrafficScheduler:
+    return TrafficScheduler(total, cast(dict[TrafficClassName, TrafficBudget], budgets))
+
+
+@pytest.mark.asyncio
+async def test_assets_never_take_the_page_floor():
+    scheduler = make_scheduler(
+        4,
+        page=TrafficBudget(min_slots=2),
+        document=TrafficBudget(),
+    )
+    docs = [asyncio.create_task(scheduler.acquire("document")) for _ in range(4)]
+    await asyncio.sleep(0)
+    assert sum(t.done() for t in docs) == 2
+
+    # Los dos slots reservados siguen libres para páginas
+    await asyncio.wait_for(scheduler.acquire("page"), timeout=0.1)
+    await asyncio.wait_for(scheduler.acquire("page"), timeout=0.1)
+    assert scheduler.get_stats()["page"]["in_flight"] == 2
+    for task in docs:
+        task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_is_shared_by_weight():
+    scheduler = make_scheduler(
+        4,
+        page=TrafficBudget(weight=3.0),
+        image=TrafficBudget(weight=1.0),
+        document=TrafficBudget(),
+    )
+    for _ in range(4):
+        await scheduler.acquire("document")
+    # Las imágenes esperan primero, pero el reparto sigue los pesos
+    waiters = [asyncio.create_task(scheduler.acquire("image")) for _ in range(6)]
+    waiters += [asyncio.create_task(scheduler.acquire("page")) for _ in range(6)]
+    await asyncio.sleep(0)
+    for _ in range(4):
+        scheduler.release("document")
+    await asyncio.sleep(0)
+
+    stats = scheduler.get_stats()
+    assert stats["page"]["in_flight"] == 3
+    assert stats["image"]["in_flight"] == 1
+
+    # Un slot de imagen liberado vuelve a imágenes (cuota 0/1 < 3/3)
+    scheduler.release("image")
+    await asyncio.sleep(0)
+    assert scheduler.get_stats()["image"]["in_flight"] == 1
+    for task in waiters:
+        task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_max_slots_and_cancelled_waiters():
+    scheduler = make_scheduler(8, document=TrafficBudget(max_slots=1))
+    await scheduler.acquire("document")
+    waiting = asyncio.create_task(scheduler.acquire("document"))
+    await asyncio.sleep(0)
+    assert not waiting.done()
+
+    waiting.cancel()
+    await asyncio.sleep(0)
+    scheduler.release("document")
+    stats = scheduler.get_stats()["document"]
+    assert stats == {"in_flight": 0, "waiting": 0, "max_slots": 1, "bytes": 0}
+
+
+@pytest.mark.asyncio
+async def test_floor_cannot_reserve_whole_pool():
+    scheduler = make_scheduler(
+        1, page=TrafficBudget(min_slots=2), image=TrafficBudget()
+    )
+    await asyncio.wait_for(scheduler.acquire("image"), timeout=0.1)
+
+
+@pytest.mark.asyncio
+async def test_bandwidth_budget_delays_consumer(monkeypatch):
+    slept: list[float] = []
+
+    async def fake_sleep(seconds: float) -> None:
+        slept.append(seconds)
+
+    monkeypatch.setattr("uif_scraper.utils.traffic_budget.asyncio.sleep", fake_sleep)
+    scheduler = make_scheduler(2, document=TrafficBudget(bandwidth_kbps=100))
+
+    await scheduler.throttle("document", 100 * 1024)  # ráfaga inicial de 1s
+    assert slept == []
+    await scheduler.throttle("document", 50 * 1024)
+    assert slept[0] == pytest.approx(0.5, abs=0.05)
+    assert scheduler.get_stats()["document"]["bytes"] == 150 * 1024
+
+
+def test_asset_traffic_class_and_config_defaults():
+    assert asset_traffic_class("https://x.com/a/photo.JPG?v=2") == "image"
+    assert asset_traffic_class("https://x.com/manual.pdf") == "document"
+
+    config = ScraperConfig(traffic_budgets={"image": {"bandwidth_kbps": 512}})
+    assert config.traffic_budgets["image"].bandwidth_kbps == 512
+    assert config.traffic_budgets["page"].min_slots == 2
+    assert set(config.traffic_budgets) == {"page", "document", "image"}
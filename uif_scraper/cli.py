@@ -10,7 +10,11 @@ import typer
 from questionary import Choice
 from rich.console import Console
 
-from uif_scraper.config import load_config_with_overrides, run_wizard
+from uif_scraper.config import (
+    EXTRACTION_PROFILES,
+    load_config_with_overrides,
+    run_wizard,
+)
 from uif_scraper.core.engine_core import EngineCore
 from uif_scraper.db_manager import StateManager
 from uif_scraper.db_pool import SQLitePool
@@ -22,6 +26,9 @@ from uif_scraper.models import ScrapingScope
 from uif_scraper.navigation import NavigationService
 from uif_scraper.reporter import ReporterService
 from uif_scraper.tui.textual_callback import TextualUICallback
+from uif_scraper.utils.circuit_breaker import CircuitBreaker
+from uif_scraper.utils.dns_resolver import CachingResolver
+from uif_scraper.utils.retry_budget import RetryBudget
 from uif_scraper.utils.url_utils import slugify
 
 # Import para resilient transport
@@ -112,6 +119,12 @@ def scrape(
         "--setup",
         help="Ejecutar wizard de configuración",
     ),
+    profile: str = typer.Option(
+        None,
+        "--profile",
+        "-p",
+        help="Perfil de extracción: fast, balanced, full",
+    ),
 ) -> None:
     """🛸 Ejecutar misión de scraping con TUI moderna."""
     asyncio.run(
@@ -123,6 +136,7 @@ def scrape(
             only_text=only_text,
             output_dir=output_dir,
             setup=setup,
+            profile=profile,
         )
     )
 
@@ -135,6 +149,7 @@ async def _run_async(
     only_text: bool,
     output_dir: Path | None,
     setup: bool,
+    profile: str | None = None,
 ) -> None:
     """Async implementation of the scrape command."""
     from uif_scraper.tui.app import UIFDashboardApp
@@ -163,6 +178,15 @@ async def _run_async(
     if output_dir:
         config.data_dir = output_dir
 
+    if profile:
+        if profile not in EXTRACTION_PROFILES:
+            console.print(
+                f"[red]Perfil desconocido: {profile} "
+                f"(usa {', '.join(EXTRACTION_PROFILES)})[/]"
+            )
+            return
+        config.extraction_profile = profile  # type: ignore[assignment]
+
     if not config.data_dir.is_absolute():
         config.data_dir = Path.cwd() / "data"
 
@@ -213,6 +237,20 @@ async def _run_async(
         """Callback para cambios de circuit breaker."""
         ui_callback.on_circuit_state_change(domain, old_state, new_state, failure_count)
 
+    # Resolver DNS compartido por el fast path de páginas y los assets
+    resolver = CachingResolver(
+        config.dns_overrides,
+        ttl=config.dns_cache_ttl_seconds,
+        negative_ttl=config.dns_negative_ttl_seconds,
+    )
+
+    # Presupuesto de reintentos único para el transport y el engine
+    retry_budget = RetryBudget(config.retry_budget_ratio, enabled=config.retry_budget)
+    # Circuit breaker por host único para páginas, navegador y assets
+    circuit_breaker = CircuitBreaker(
+        config.circuit_threshold, config.circuit_timeout_seconds
+    )
+
     # Create ResilientTransport for network resilience
     # Note: This transport handles retries, circuit breaker, and TUI callbacks
     # ✅ HYBRID MODE: curl_cffi primary, httpx fallback
@@ -221,12 +259,14 @@ async def _run_async(
         base_delay=1.0,
         max_delay=30.0,
         jitter=2.0,
-        circuit_threshold=5,
-        circuit_timeout=60.0,
         on_retry=on_network_retry,
         on_circuit_change=on_circuit_change,
         use_curl_cffi=True,  # ✅ ACTIVAR CURL_CFFI (TLS impersonation)
-        impersonate="chrome120",  # Chrome 120 fingerprint
+        impersonate="chrome",  # Último fingerprint de Chrome (el del fast path)
+        max_connections=config.default_workers,  # Pool compartido por las páginas
+        resolver=resolver,
+        retry_budget=retry_budget,
+        circuit_breaker=circuit_breaker,
     )
 
     # Create EngineCore directly with all dependencies
@@ -242,6 +282,9 @@ async def _run_async(
         on_network_retry=on_network_retry,
         on_circuit_change=on_circuit_change,
         resilient_transport=_resilient_transport,  # ✅ INYECTADO: Motor de resiliencia
+        resolver=resolver,
+        retry_budget=retry_budget,
+        circuit_breaker=circuit_breaker,
     )
 
     # Set up UI callback for event-driven updates
@@ -1,14 +1,117 @@
 import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import questionary
 import yaml
 from pydantic import BaseModel, Field, field_validator
 from rich.console import Console
 
+from uif_scraper.utils.traffic_budget import TrafficBudget, TrafficClassName
+
 console = Console()
 
+ExtractionProfileName = Literal["fast", "balanced", "full"]
+
+
+@dataclass(frozen=True, slots=True)
+class ExtractionProfile:
+    """Etapas del pipeline por página habilitadas para una misión."""
+
+    name: str
+    sanitize_html: bool  # nh3 sobre el HTML limpio antes de convertir
+    full_metadata: bool  # MetadataExtractor completo; False = solo el <head>
+    structured_data: bool  # JSON-LD / Microdata / RDFa
+    toc: bool
+    absolutize_links: bool
+    fix_text: bool  # ftfy sobre el markdown extraído
+    extraction_fallbacks: bool  # MarkItDown si html-to-markdown se queda corto
+    compression: str  # "zstd", "gzip" o "none"
+    jsonl_sink: bool
+
+
+# Subrecursos que el navegador no descarga: solo se guarda el HTML y los
+# assets van por el downloader propio
+DEFAULT_BROWSER_BLOCKED_RESOURCES = (
+    "image",
+    "imageset",
+    "media",
+    "font",
+    "beacon",
+    "object",
+    "texttrack",
+    "csp_report",
+)
+
+# Analítica y publicidad de terceros (se bloquean también sus subdominios)
+DEFAULT_BROWSER_BLOCKED_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "adservice.google.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "mixpanel.com",
+    "clarity.ms",
+    "newrelic.com",
+    "nr-data.net",
+    "scorecardresearch.com",
+    "quantserve.com",
+)
+
+EXTRACTION_PROFILES: dict[str, ExtractionProfile] = {
+    # Texto plano para índices de búsqueda: lo mínimo por página
+    "fast": ExtractionProfile(
+        name="fast",
+        sanitize_html=False,
+        full_metadata=False,
+        structured_data=False,
+        toc=False,
+        absolutize_links=False,
+        fix_text=False,
+        extraction_fallbacks=False,
+        compression="none",
+        jsonl_sink=False,
+    ),
+    # Metadata del <head>, sin TOC ni JSON-LD; texto y links como "full"
+    "balanced": ExtractionProfile(
+        name="balanced",
+        sanitize_html=True,
+        full_metadata=False,
+        structured_data=False,
+        toc=False,
+        absolutize_links=True,
+        fix_text=True,
+        extraction_fallbacks=True,
+        compression="zstd",
+        jsonl_sink=True,
+    ),
+    # Comportamiento histórico: todas las etapas
+    "full": ExtractionProfile(
+        name="full",
+        sanitize_html=True,
+        full_metadata=True,
+        structured_data=True,
+        toc=True,
+        absolutize_links=True,
+        fix_text=True,
+        extraction_fallbacks=True,
+        compression="zstd",
+        jsonl_sink=True,
+    ),
+}
+
+
+DEFAULT_TRAFFIC_BUDGETS: dict[TrafficClassName, TrafficBudget] = {
+    "page": TrafficBudget(weight=4.0, min_slots=2),
+    "document": TrafficBudget(weight=1.0, max_slots=2),
+    "image": TrafficBudget(weight=1.0, max_slots=2),
+}
+
 
 class ScraperConfig(BaseModel):
     """Scraper configuration.
@@ -25,11 +128,81 @@ class ScraperConfig(BaseModel):
     default_workers: int = 5
     asset_workers: int = 8
     dns_overrides: dict[str, str] = Field(default_factory=dict)
+    # Caché DNS compartida: TTL de resoluciones correctas y de hosts caídos
+    dns_cache_ttl_seconds: float = 300.0
+    dns_negative_ttl_seconds: float = 30.0
     log_rotation_mb: int = 50
     log_level: str = "INFO"
     db_pool_size: int = 5
     db_timeout_seconds: float = 5.0
     stats_cache_ttl_seconds: float = 5.0
+    extraction_profile: ExtractionProfileName = "full"
+    # Guardas por página: deadline total y presupuesto de complejidad del HTML
+    page_deadline_seconds: float = 90.0
+    max_document_nodes: int = 100_000
+    max_document_depth: int = 256
+    max_document_links: int = 20_000
+    # Tope del body de una página en el fast path (0 = sin límite): por encima
+    # de MAX_HTML_SIZE_BYTES se limpia en streaming, por encima de esto se aborta
+    max_page_size_mb: int = 50
+    # Hedging del fast path: si un request no tiene headers al llegar al p95
+    # del host, sale un segundo por otro pool; como mucho hedge_budget_ratio
+    # requests extra por request
+    hedge_requests: bool = False
+    hedge_budget_ratio: float = 0.05
+    # Timeouts adaptativos por host: timeout_multiplier × p99 reciente, entre
+    # suelo y techo (timeout_seconds hasta tener historial del host)
+    adaptive_timeouts: bool = True
+    timeout_multiplier: float = 3.0
+    timeout_floor_seconds: float = 2.0
+    timeout_ceiling_seconds: float = 60.0
+    # Presupuesto de reintentos compartido por transport y engine: cada éxito
+    # suma retry_budget_ratio tokens y cada fallo resta uno; con el bucket
+    # por debajo de la mitad no se reintenta en ninguna capa
+    retry_budget: bool = True
+    retry_budget_ratio: float = 0.1
+    # Circuit breaker por host compartido por páginas, navegador y assets:
+    # circuit_threshold fallos seguidos lo abren durante circuit_timeout_seconds,
+    # después un único request de prueba decide si se cierra
+    circuit_threshold: int = 5
+    circuit_timeout_seconds: float = 60.0
+    # Pipeline por stages: fetch (default_workers), parse y write con colas
+    # acotadas entre ellos; cada pool se dimensiona por separado. parse_workers
+    # es también el tamaño del pool de hilos donde corre la limpieza y la
+    # conversión (la parte nativa en paralelo, la parte Python bajo el GIL)
+    parse_workers: int = 2
+    write_workers: int = 4
+    stage_queue_size: int = 16
+    # Páginas, documentos e imágenes comparten default_workers slots con
+    # reparto ponderado; min_slots de "page" es el suelo del descubrimiento
+    traffic_budgets: dict[TrafficClassName, TrafficBudget] = Field(
+        default_factory=lambda: dict(DEFAULT_TRAFFIC_BUDGETS)
+    )
+    # Gobernador de memoria: None = 80% de la RAM del sistema/cgroup, 0 = sin
+    # límite. Sobre high_watermark se pausa el fetch y se liberan cachés
+    memory_budget_mb: int | None = None
+    memory_high_watermark: float = 0.85
+    memory_low_watermark: float = 0.70
+    # El navegador se lanza en la primera escalada y se cierra tras este
+    # tiempo sin fetches (0 = abierto hasta el final de la misión)
+    browser_idle_timeout_seconds: float = 120.0
+    # Pool de páginas del navegador: subrecursos y dominios que no se
+    # descargan al renderizar, y reciclado tras N páginas o X MB de RSS de
+    # sus procesos (0 = nunca)
+    browser_blocked_resources: list[str] = Field(
+        default_factory=lambda: list(DEFAULT_BROWSER_BLOCKED_RESOURCES)
+    )
+    browser_blocked_domains: list[str] = Field(
+        default_factory=lambda: list(DEFAULT_BROWSER_BLOCKED_DOMAINS)
+    )
+    browser_recycle_pages: int = 500
+    browser_recycle_mb: int = 1536
+    # Escalada al navegador por host + primeros segmentos de ruta: escala
+    # tras N bloqueos y re-prueba el fast path con intervalo creciente
+    escalation_path_depth: int = 1
+    escalation_block_threshold: int = 2
+    escalation_probe_seconds: float = 60.0
+    escalation_max_probe_seconds: float = 900.0
 
     @field_validator("data_dir", "cache_dir", mode="before")
     @classmethod
@@ -38,6 +211,19 @@ class ScraperConfig(BaseModel):
             return Path(os.path.expandvars(os.path.expanduser(str(v))))
         return Path(v)
 
+    @field_validator("traffic_budgets", mode="after")
+    @classmethod
+    def complete_traffic_budgets(
+        cls, v: dict[TrafficClassName, TrafficBudget]
+    ) -> dict[TrafficClassName, TrafficBudget]:
+        # Las clases no configuradas conservan su presupuesto por defecto
+        return {**DEFAULT_TRAFFIC_BUDGETS, **v}
+
+    @property
+    def profile(self) -> ExtractionProfile:
+        """Perfil de extracción activo."""
+        return EXTRACTION_PROFILES[self.extraction_profile]
+
     def save(self, path: Path) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
         with open(path, "w", encoding="utf-8") as f:
@@ -92,10 +278,17 @@ async def run_wizard() -> ScraperConfig:
         default="INFO",
     ).ask_async()
 
+    extraction_profile = await questionary.select(
+        "Perfil de extracción:",
+        choices=list(EXTRACTION_PROFILES),
+        default="full",
+    ).ask_async()
+
     config = ScraperConfig(
         data_dir=Path(data_dir or "data"),
         default_workers=int(workers or 5),
         log_level=log_level or "INFO",
+        extraction_profile=extraction_profile or "full",
     )
 
     save_path = get_config_path()
@@ -0,0 +1,257 @@
+"""Lazy browser session for UIF Engine.
+
+Most missions never leave the HTTP fast path, yet launching
+Chromium costs seconds of startup and hundreds of MB. ``LazyBrowserSession``
+starts the stealth session on the first browser fetch, shuts it down after
+an idle period and relaunches it transparently when it is needed again.
+
+While it runs, the session is managed as a page pool:
+
+- Requests for resource types and third-party domains we never keep
+  (images, fonts, media, trackers) are aborted at the context level, so
+  every tab renders only what the HTML extraction needs.
+- At most ``max_pages`` tabs render at once; extra fetches wait on a
+  semaphore instead of scrapling's polling loop.
+- The browser is recycled after ``recycle_after_pages`` renders or once its
+  processes exceed ``recycle_after_bytes`` of RSS, draining in-flight pages
+  first, because long-lived Chromium contexts only grow.
+- Render times are kept in a rolling window for p50/p95 reporting.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from typing import Any, Protocol
+from urllib.parse import urlsplit
+
+from loguru import logger
+from patchright.async_api import Error as PatchrightError
+from playwright.async_api import Error as PlaywrightError
+
+from uif_scraper.utils.memory_governor import MB, process_tree_rss
+
+# Renders recientes usados para las métricas de latencia
+RENDER_WINDOW = 256
+
+# Errores del driver (patchright en la sesión stealth, playwright en la
+# dinámica) con el navegador caído o ya cerrado; OSError si el proceso murió
+_BROWSER_ERRORS = (PatchrightError, PlaywrightError, OSError)
+
+
+class BrowserFetcher(Protocol):
+    """Lo que el engine usa de una sesión de navegador: ``fetch``."""
+
+    async def fetch(self, url: str, **kwargs: Any) -> Any: ...
+
+
+class LazyBrowserSession:
+    """Sesión de navegador que se lanza bajo demanda y se cierra si está ociosa.
+
+    Args:
+        factory: Crea una sesión nueva sin iniciar (p.ej. ``AsyncStealthySession``,
+            un async context manager con ``fetch``)
+        idle_timeout: Segundos sin fetches tras los que se cierra el navegador
+            (0 = mantenerlo abierto hasta ``close``)
+        max_pages: Tabs renderizando a la vez (0 = sin límite propio)
+        blocked_resources: Tipos de recurso de Playwright que se abortan
+            (``image``, ``font``, ``media``...)
+        blocked_domains: Dominios (y subdominios) cuyos subrecursos se abortan
+        recycle_after_pages: Renders tras los que se recicla el navegador (0 = nunca)
+        recycle_after_bytes: RSS de los procesos del navegador que fuerza el
+            reciclado (0 = nunca)
+        memory_check_interval: Segundos mínimos entre lecturas del RSS
+        rss_reader: Lector del RSS del navegador (inyectable en tests)
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        idle_timeout: float = 120.0,
+        max_pages: int = 0,
+        blocked_resources: Iterable[str] = (),
+        blocked_domains: Iterable[str] = (),
+        recycle_after_pages: int = 0,
+        recycle_after_bytes: int = 0,
+        memory_check_interval: float = 5.0,
+        rss_reader: Callable[[], int] | None = None,
+    ) -> None:
+        self._factory = factory
+        self.idle_timeout = idle_timeout
+        self.blocked_resources = frozenset(blocked_resources)
+        self.blocked_domains = frozenset(d.lower().lstrip(".") for d in blocked_domains)
+        self.recycle_after_pages = recycle_after_pages
+        self.recycle_after_bytes = recycle_after_bytes
+        self.memory_check_interval = memory_check_interval
+        self._read_rss = rss_reader or process_tree_rss
+        # Sesión scrapling en marcha (async context manager con ``fetch``)
+        self._session: Any = None
+        self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(max_pages) if max_pages > 0 else None
+        self._active = 0
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._last_used = 0.0
+        self._pages_since_launch = 0
+        self._last_memory_check = 0.0
+        self._browser_rss = 0
+        self._render_times: deque[float] = deque(maxlen=RENDER_WINDOW)
+        self.launches = 0
+        self.recycles = 0
+        self.renders = 0
+        self.blocked_requests = 0
+
+    @property
+    def running(self) -> bool:
+        return self._session is not None
+
+    async def fetch(self, url: str, **kwargs: Any) -> Any:
+        """Fetch con el navegador, lanzándolo si no está en marcha."""
+        async with self._slots or contextlib.nullcontext():
+            async with self._lock:
+                reason = self._recycle_reason()
+                if reason:
+                    await self._recycle(reason)
+                session = self._session or await self._launch()
+                # Contado dentro del lock: close_if_idle y el reciclado no
+                # cierran con fetches en vuelo
+                self._active += 1
+                self._pages_since_launch += 1
+                self._drained.clear()
+            started = time.monotonic()
+            try:
+                page = await session.fetch(url, **kwargs)
+            finally:
+                self._active -= 1
+                if not self._active:
+                    self._drained.set()
+                self._last_used = time.monotonic()
+        render = self._last_used - started
+        self.renders += 1
+        self._render_times.append(render)
+        logger.debug(f"Rendered {url} in {render * 1000:.0f} ms")
+        return page
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """True si un subrecurso no debe descargarse al renderizar."""
+        if resource_type in self.blocked_resources:
+            return True
+        # La navegación principal nunca se bloquea, aunque sea un dominio listado
+        if resource_type == "document" or not self.blocked_domains:
+            return False
+        labels = (urlsplit(url).hostname or "").split(".")
+        return any(
+            ".".join(labels[i:]) in self.blocked_domains for i in range(len(labels))
+        )
+
+    async def _route(self, route: Any) -> None:
+        request = route.request
+        try:
+            if self.should_block(request.resource_type, request.url):
+                self.blocked_requests += 1
+                await route.abort()
+            else:
+                await route.continue_()
+        except _BROWSER_ERRORS as e:
+            # La página pudo cerrarse con el request pendiente
+            logger.debug(f"Browser route for {request.url} dropped: {e}")
+
+    def _recycle_reason(self) -> str | None:
+        if self._session is None:
+            return None
+        if self.recycle_after_pages and (
+            self._pages_since_launch >= self.recycle_after_pages
+        ):
+            return f"{self._pages_since_launch} pages"
+        if not self.recycle_after_bytes:
+            return None
+        now = time.monotonic()
+        if now - self._last_memory_check < self.memory_check_interval:
+            return None
+        self._last_memory_check = now
+        self._browser_rss = self._read_rss()
+        if self._browser_rss >= self.recycle_after_bytes:
+            return f"{self._browser_rss / MB:.0f} MB RSS"
+        return None
+
+    async def _recycle(self, reason: str) -> None:
+        # Con el lock tomado no entran fetches nuevos: se drenan los que vuelan
+        await self._drained.wait()
+        await self._shutdown()
+        self.recycles += 1
+        logger.info(f"Browser recycled after {reason}")
+
+    async def _launch(self) -> Any:
+        started = time.monotonic()
+        session = self._factory()
+        await session.__aenter__()
+        context = getattr(session, "context", None)
+        if context is not None and (self.blocked_resources or self.blocked_domains):
+            await context.route("**/*", self._route)
+        self._session = session
+        self._pages_since_launch = 0
+        self._last_memory_check = time.monotonic()
+        self.launches += 1
+        self._last_used = time.monotonic()
+        logger.info(
+            f"Browser session launched on demand in {self._last_used - started:.1f}s"
+            f" (launch #{self.launches})"
+        )
+        return session
+
+    async def close_if_idle(self) -> bool:
+        """Cierra el navegador si lleva ``idle_timeout`` segundos sin uso.
+
+        Returns:
+            True si se cerró.
+        """
+        if self._session is None or self.idle_timeout <= 0:
+            return False
+        if self._active or time.monotonic() - self._last_used < self.idle_timeout:
+            return False
+        async with self._lock:
+            # Un fetch pudo arrancar mientras se esperaba el lock
+            if self._active or self._session is None:
+                return False
+            await self._shutdown()
+        logger.info(f"Browser session closed after {self.idle_timeout:.0f}s idle")
+        return True
+
+    async def close(self) -> None:
+        """Cierra el navegador si está en marcha."""
+        async with self._lock:
+            await self._shutdown()
+
+    async def _shutdown(self) -> None:
+        session, self._session = self._session, None
+        self._browser_rss = 0
+        if session is None:
+            return
+        try:
+            await session.__aexit__(None, None, None)
+        except _BROWSER_ERRORS as e:
+            logger.warning(f"Browser session close failed: {e}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Estado del pool y latencias de render para monitoring."""
+        renders = sorted(self._render_times)
+
+        def percentile_ms(q: float) -> float:
+            if not renders:
+                return 0.0
+            return renders[min(len(renders) - 1, int(q * len(renders)))] * 1000
+
+        return {
+            "running": self.running,
+            "active_pages": self._active,
+            "launches": self.launches,
+            "recycles": self.recycles,
+            "renders": self.renders,
+            "blocked_requests": self.blocked_requests,
+            "render_p50_ms": percentile_ms(0.50),
+            "render_p95_ms": percentile_ms(0.95),
+            "browser_rss_mb": self._browser_rss / MB,
+        }
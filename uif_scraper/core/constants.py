@@ -8,7 +8,7 @@ Reference: AGENTS.md best practices - Separar configuración de lógica.
 # TIMEOUTS
 # ============================================================================
 
-# Browser mode fetch timeout (ms) - usado cuando AsyncFetcher falla con 403/429
+# Browser mode fetch timeout (ms) - usado cuando el fast path HTTP falla con 403/429
 DEFAULT_BROWSER_TIMEOUT_MS: int = 45000  # 45 segundos
 
 # Queue get timeout (seconds) - tiempo máximo esperando por un item en la cola
@@ -24,7 +24,8 @@ MIN_SHUTDOWN_TIMEOUT_SECONDS: float = 30.0
 # SIZE LIMITS
 # ============================================================================
 
-# Maximum HTML size to process (bytes) - prevenir OOM con páginas gigantes
+# Maximum HTML size for in-memory cleaning (bytes) - por encima, la página se
+# limpia y convierte en streaming por chunks para acotar la memoria
 MAX_HTML_SIZE_BYTES: int = 5 * 1024 * 1024  # 5 MB
 
 # Maximum URL length - límite razonable para evitar issues de storage
@@ -8,15 +8,19 @@ from __future__ import annotations
 import asyncio
 import enum
 import os
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit
 
 import aiohttp
-import yaml
 from cachetools import TTLCache
 from loguru import logger
-from scrapling.fetchers import AsyncFetcher, AsyncStealthySession
+from scrapling.fetchers import AsyncStealthySession
 
 from uif_scraper.config import ScraperConfig
 from uif_scraper.core.constants import (
@@ -25,13 +29,23 @@ from uif_scraper.core.constants import (
     DEFAULT_JITTER_MAX,
     DEFAULT_QUEUE_TIMEOUT_SECONDS,
     HTTP_MAX_CONNECTIONS_PER_HOST,
+    MAX_HTML_SIZE_BYTES,
     MIN_SHUTDOWN_TIMEOUT_SECONDS,
     SEEN_ASSETS_CACHE_MAXSIZE,
     SEEN_CACHE_TTL_SECONDS,
     SEEN_URLS_CACHE_MAXSIZE,
 )
+from uif_scraper.core.browser_session import BrowserFetcher, LazyBrowserSession
 from uif_scraper.core.stats_tracker import StatsTracker
-from uif_scraper.core.types import ActivityEntry, DashboardState, EngineStats
+from uif_scraper.core.pipeline import PipelineStage, StageMeter
+from uif_scraper.core.types import (
+    ActivityEntry,
+    DashboardState,
+    EngineStats,
+    ExtractedPage,
+    FetchedPage,
+    StageMetrics,
+)
 from uif_scraper.db_manager import StateManager
 from uif_scraper.extractors.asset_extractor import AssetExtractor
 from uif_scraper.extractors.metadata_extractor import MetadataExtractor
@@ -39,17 +53,50 @@ from uif_scraper.extractors.text_extractor import TextExtractor
 from uif_scraper.models import MigrationStatus
 from uif_scraper.navigation import NavigationService
 from uif_scraper.reporter import ReporterService
+from uif_scraper.utils.browser_escalation import EscalationPolicy
 from uif_scraper.utils.captcha_detector import CaptchaDetector
+from uif_scraper.utils.clearance_jar import ClearanceJar
 from uif_scraper.utils.compression import write_compressed_markdown
-from uif_scraper.utils.html_cleaner import pre_clean_html
+from uif_scraper.utils.dns_resolver import CachingResolver
+from uif_scraper.utils.host_latency import AdaptiveTimeouts, HedgeBudget
+from uif_scraper.utils.retry_budget import RetryBudget
 from uif_scraper.utils.http_session import HTTPSessionCache
-from uif_scraper.utils.markdown_utils import enhance_markdown_for_rag
+from uif_scraper.utils.markdown_utils import render_markdown_document
+from uif_scraper.utils.memory_governor import (
+    MB,
+    MemoryGovernor,
+    resolve_memory_budget,
+    shrink_cache,
+)
+from uif_scraper.utils.page_guard import (
+    Deadline,
+    PageBudget,
+    PageDeadlineExceeded,
+    assess_complexity,
+    count_nodes,
+    no_checkpoint,
+)
 from uif_scraper.utils.robots_checker import RobotsChecker
+from uif_scraper.utils.serialization import dump_frontmatter
+from uif_scraper.utils.streaming_cleaner import StreamingHTMLCleaner
+from uif_scraper.utils.template_learner import TemplateLearner
+from uif_scraper.utils.traffic_budget import TrafficScheduler, asset_traffic_class
+from uif_scraper.utils.text_utils import decode_html
 from uif_scraper.utils.url_utils import slugify, smart_url_normalize
 
 # Import para resilient transport (opcional)
 from uif_scraper.utils.circuit_breaker import CircuitBreaker
-from uif_scraper.infrastructure.persistence import DataWriter
+from uif_scraper.infrastructure.network.page_client import (
+    NonHTMLContentError,
+    PageClient,
+    PageTooLargeError,
+)
+from uif_scraper.infrastructure.network.resilient_transport import (
+    CircuitOpenError,
+    RETRYABLE_STATUSES,
+    create_resilient_transport,
+)
+from uif_scraper.infrastructure.persistence import DataWriter, ScrapedRecord
 
 
 # ============================================================================
@@ -84,9 +131,30 @@ class _Sentinel(enum.Enum):
 
 
 _STOP_SENTINEL = _Sentinel.STOP
+
+# Tamaño de chunk al leer assets (unidad de descuento del ancho de banda)
+ASSET_READ_CHUNK_BYTES = 64 * 1024
+
+# Ciclos del monitor (0.5s) entre logs de métricas de stages
+STAGE_METRICS_LOG_TICKS = 20
+
+# Coste estimado de una URL encolada (str + slot de la cola + entrada en
+# seen_urls) para el gobernador de memoria
+QUEUED_URL_ESTIMATE_BYTES = 256
 QueueItem = str | _Sentinel
 
 
+def _host_of(url: str) -> str:
+    """Clave del circuit breaker: el host sin puerto, como en el transport."""
+    return urlsplit(url).hostname or "unknown"
+
+
+def _record_size(item: dict[str, Any] | ScrapedRecord) -> int:
+    """Bytes del contenido de un registro de persistencia."""
+    content = item.content if isinstance(item, ScrapedRecord) else item.get("content")
+    return len(content) if isinstance(content, str) else 0
+
+
 class UICallback(ABC):
     """Interfaz para callbacks de UI del EngineCore.
 
@@ -149,6 +217,9 @@ class EngineCore:
         on_network_retry: Any = None,
         on_circuit_change: Any = None,
         resilient_transport: Any = None,  # httpx.AsyncBaseTransport para resiliencia
+        resolver: CachingResolver | None = None,
+        retry_budget: RetryBudget | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
     ) -> None:
         self.config = config
         self.extract_assets = extract_assets
@@ -160,31 +231,95 @@ class EngineCore:
         self.navigation = navigation_service
         self.reporter = reporter_service
 
-        # Resilient Transport (httpx con retries + circuit breaker)
-        self.resilient_transport = resilient_transport
-
         # Callbacks de red para resiliencia
         self._on_network_retry = on_network_retry
         self._on_circuit_change = on_circuit_change
 
+        # DNS compartido por páginas (curl) y assets (aiohttp), con
+        # dns_overrides, caché negativa y prefetch de hosts descubiertos
+        self.resolver = resolver or CachingResolver(
+            config.dns_overrides,
+            ttl=config.dns_cache_ttl_seconds,
+            negative_ttl=config.dns_negative_ttl_seconds,
+        )
+
+        # Presupuesto de reintentos único: el transport (por request) y el
+        # engine (por página) reintentan solo mientras la tasa de éxito lo
+        # sostiene, en vez de multiplicar sus max_retries
+        self.retry_budget = retry_budget or RetryBudget(
+            config.retry_budget_ratio, enabled=config.retry_budget
+        )
+
+        # Un único circuit breaker por host para fast path, navegador y
+        # assets: todas las capas ven (y la TUI muestra) el mismo estado
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            config.circuit_threshold, config.circuit_timeout_seconds
+        )
+
+        # Resilient Transport (httpx con retries + circuit breaker): fast path
+        # de páginas con un pool de conexiones que vive toda la misión
+        self.resilient_transport = resilient_transport or create_resilient_transport(
+            on_retry=on_network_retry,
+            on_circuit_change=on_circuit_change,
+            impersonate="chrome",
+            max_connections=config.default_workers,
+            resolver=self.resolver,
+            retry_budget=self.retry_budget,
+            circuit_breaker=self.circuit_breaker,
+        )
+        # Timeouts por host aprendidos de la latencia observada (fast path y
+        # navegador por separado)
+        self.page_timeouts = self._adaptive_timeouts(config.timeout_seconds)
+        self.browser_timeouts = self._adaptive_timeouts(
+            DEFAULT_BROWSER_TIMEOUT_MS / 1000
+        )
+
+        hedge_budget, hedge_transport = None, None
+        if config.hedge_requests:
+            # Pool propio: el hedge no espera detrás de la conexión atascada
+            hedge_budget = HedgeBudget(config.hedge_budget_ratio)
+            hedge_transport = create_resilient_transport(
+                max_retries=1,
+                impersonate="chrome",
+                max_connections=config.default_workers,
+                resolver=self.resolver,
+                circuit_breaker=self.circuit_breaker,
+            )
+        self.page_client = PageClient(
+            self.resilient_transport,
+            timeout=config.timeout_seconds,
+            max_bytes=config.max_page_size_mb * MB,
+            timeouts=self.page_timeouts,
+            hedge_budget=hedge_budget,
+            hedge_transport=hedge_transport,
+        )
+
         # Infrastructure
         self.stats = StatsTracker()
-        self.circuit_breaker = CircuitBreaker()
         self.http_cache = HTTPSessionCache(
             max_pool_size=config.asset_workers * 2,
             max_connections_per_host=HTTP_MAX_CONNECTIONS_PER_HOST,
             timeout_total=config.timeout_seconds,
             verify_ssl=True,
+            resolver=self.resolver,
         )
         self.robots_checker = RobotsChecker(self.http_cache)
         self.captcha_detector = CaptchaDetector()
+        self.template_learner = TemplateLearner()
+        self.page_budget = PageBudget(
+            max_nodes=config.max_document_nodes,
+            max_depth=config.max_document_depth,
+            max_links=config.max_document_links,
+        )
 
         # Queues
         self.url_queue: asyncio.Queue[QueueItem] = asyncio.Queue()
         self.asset_queue: asyncio.Queue[QueueItem] = asyncio.Queue()
+        # Reintentos con backoff programados en el loop (handle -> url)
+        self._requeues: dict[asyncio.TimerHandle, str] = {}
 
         # Persistence queue (Productor-Consumidor pattern)
-        self.data_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self.data_queue: asyncio.Queue[dict[str, Any] | ScrapedRecord] = asyncio.Queue()
         self._persistence_worker_task: asyncio.Task[None] | None = None
         self._data_writer: DataWriter | None = None
         self._total_items_written: int = 0
@@ -198,8 +333,78 @@ class EngineCore:
         )
 
         # Concurrency
-        self.semaphore = asyncio.Semaphore(config.default_workers)
+        # Slots de red compartidos por páginas, documentos e imágenes con
+        # reparto ponderado y suelo para el fetch de páginas
+        self.traffic = TrafficScheduler(config.default_workers, config.traffic_budgets)
         self.report_lock = asyncio.Lock()
+        # Pipeline por stages: el pool de fetch son los page workers; parse
+        # (CPU) y write (disco/DB) tienen pool y cola acotada propios. El
+        # trabajo de CPU de parse corre en hilos para no bloquear el event
+        # loop; lxml, selectolax y html-to-markdown sueltan el GIL en su parte
+        # nativa, el resto del parse sigue serializado por el GIL
+        self._fetch_meter = StageMeter("fetch", config.default_workers)
+        self.parse_executor = ThreadPoolExecutor(
+            max_workers=config.parse_workers, thread_name_prefix="uif-parse"
+        )
+        self.parse_stage: PipelineStage[FetchedPage] = PipelineStage(
+            "parse",
+            config.parse_workers,
+            config.stage_queue_size,
+            self._parse_page,
+            sizeof=lambda item: len(item.raw_html),
+        )
+        self.write_stage: PipelineStage[ExtractedPage] = PipelineStage(
+            "write",
+            config.write_workers,
+            config.stage_queue_size,
+            self._write_page,
+            sizeof=lambda item: len(item.text_data.get("markdown", "")),
+        )
+
+        # Gobernador de memoria: RSS + bytes en colas y buffers. Bajo presión
+        # pausa la admisión de fetches, encoge cachés y vacía el writer JSONL
+        self.memory = MemoryGovernor(
+            resolve_memory_budget(config.memory_budget_mb),
+            high_watermark=config.memory_high_watermark,
+            low_watermark=config.memory_low_watermark,
+        )
+        self.memory.register_gauge(
+            "url_queue", lambda: self.url_queue.qsize() * QUEUED_URL_ESTIMATE_BYTES
+        )
+        self.memory.register_gauge(
+            "asset_queue", lambda: self.asset_queue.qsize() * QUEUED_URL_ESTIMATE_BYTES
+        )
+        self.memory.register_gauge("parse_queue", lambda: self.parse_stage.queued_bytes)
+        self.memory.register_gauge("write_queue", lambda: self.write_stage.queued_bytes)
+        self.memory.register_relief("caches", self._shrink_caches)
+        self.memory.register_relief("writers", self._flush_writers)
+
+        # Navegador bajo demanda: solo se lanza al escalar desde el fast path
+        self.browser = LazyBrowserSession(
+            lambda: AsyncStealthySession(
+                headless=True,
+                max_pages=config.default_workers,
+                solve_cloudflare=True,
+            ),
+            idle_timeout=config.browser_idle_timeout_seconds,
+            max_pages=config.default_workers,
+            blocked_resources=config.browser_blocked_resources,
+            blocked_domains=config.browser_blocked_domains,
+            recycle_after_pages=config.browser_recycle_pages,
+            recycle_after_bytes=config.browser_recycle_mb * MB,
+        )
+
+        # Escalada al navegador por sección (host + prefijo de ruta) con
+        # re-probes del fast path; use_browser_mode fuerza el navegador global
+        self.escalation = EscalationPolicy(
+            path_depth=config.escalation_path_depth,
+            block_threshold=config.escalation_block_threshold,
+            probe_interval=config.escalation_probe_seconds,
+            max_probe_interval=config.escalation_max_probe_seconds,
+        )
+
+        # Cookies de clearance del navegador reutilizadas en el fast path
+        self.cookie_jar = ClearanceJar()
 
         # State
         self.use_browser_mode = False
@@ -218,6 +423,15 @@ class EngineCore:
         self._pages_since_last_check: int = 0
         self._current_speed: float = 0.0
 
+    @property
+    def _mission_host(self) -> str:
+        return _host_of(f"//{self.navigation.domain}")
+
+    @property
+    def browser_mode_active(self) -> bool:
+        """True si el navegador está forzado o alguna sección está escalada."""
+        return self.use_browser_mode or self.escalation.active
+
     def get_stats(self) -> EngineStats:
         self.stats.seen_urls_count = len(self.seen_urls)
         self.stats.seen_assets_count = len(self.seen_assets)
@@ -230,14 +444,15 @@ class EngineCore:
             base_url=self.navigation.base_url,
             scope=self.navigation.scope.value,
             workers=self.config.default_workers,
-            mode="browser" if self.use_browser_mode else "stealth",
+            mode="browser" if self.browser_mode_active else "stealth",
             stats=self.get_stats(),
-            circuit_state=self.circuit_breaker.get_state(self.navigation.domain),
+            circuit_state=self.circuit_breaker.get_state(self._mission_host),
             recent_activity=[
                 ActivityEntry(title=e["title"], engine=e["engine"], timestamp=e["time"])
                 for e in self.activity_log[-10:]
             ],
             elapsed_seconds=elapsed_seconds,
+            stages=self.get_stage_metrics(),
         )
 
     async def setup(self) -> None:
@@ -262,6 +477,9 @@ class EngineCore:
 
         await self.state.start_batch_processor()
 
+        # Clearance persistida: una resolución previa desbloquea el fast path
+        self.cookie_jar.load(await self.state.load_domain_cookies())
+
         db_stats = await self.state.get_stats(force_refresh=True)
         self.stats.pages_completed = db_stats.get(MigrationStatus.COMPLETED.value, 0)
         self.stats.pages_failed = db_stats.get(MigrationStatus.FAILED.value, 0)
@@ -306,51 +524,55 @@ class EngineCore:
         self._notify_state_change("running", reason="mission_started")
         self._notify_ui()
 
-        async with AsyncStealthySession(
-            headless=True,
-            max_pages=self.config.default_workers,
-            solve_cloudflare=True,
-        ) as session:
-            try:
-                # ✅ USAR TASKGROUP PARA STRUCTURED CONCURRENCY
-                # Esto garantiza que todos los workers terminen juntos
-                async with asyncio.TaskGroup() as tg:
-                    # Page workers
-                    for _ in range(self.config.default_workers):
-                        tg.create_task(self._page_worker(session))
-
-                    # Asset workers
-                    if self.extract_assets:
-                        for _ in range(self.config.asset_workers):
-                            tg.create_task(self._asset_worker())
-
-                    # Monitor loop - corre en el TaskGroup también
-                    # Este task monitorea el estado y puede iniciar shutdown
-                    tg.create_task(self._monitor_loop())
-
-                    # El TaskGroup espera aquí hasta que TODOS los tasks terminen
-                    # Si cualquier task lanza excepción no manejada, se cancelan todos
-
-            except* asyncio.CancelledError:
-                # Shutdown controlado vía _shutdown_event
-                logger.info("TaskGroup cancelled (shutdown)")
-            except* Exception as eg:
-                # ERROR CRÍTICO: Algo falló irreparablemente en un worker
-                # Esto NO debería pasar si el error handling inside funciona
-                for exc in eg.exceptions:
-                    logger.critical(f"Worker failed critically: {exc}")
-
-            # post-TaskGroup cleanup
-            self._notify_state_change("stopping", reason="mission_completed")
-
-            # Cleanup de recursos
-            await self._cleanup_after_taskgroup()
-
-            await self.state.release_mission_lock(self.navigation.domain, os.getpid())
+        # El navegador no se lanza aquí: LazyBrowserSession lo arranca en la
+        # primera escalada y lo cierra tras browser_idle_timeout_seconds
+
+        # Pools parse y write: se drenan y detienen en el cleanup
+        self.parse_stage.start()
+        self.write_stage.start()
+        try:
+            # ✅ USAR TASKGROUP PARA STRUCTURED CONCURRENCY
+            # Esto garantiza que todos los workers terminen juntos
+            async with asyncio.TaskGroup() as tg:
+                # Page workers
+                for _ in range(self.config.default_workers):
+                    tg.create_task(self._page_worker(self.browser))
+
+                # Asset workers
+                if self.extract_assets:
+                    for _ in range(self.config.asset_workers):
+                        tg.create_task(self._asset_worker())
+
+                # Monitor loop - corre en el TaskGroup también
+                # Este task monitorea el estado y puede iniciar shutdown
+                tg.create_task(self._monitor_loop())
+
+                # El TaskGroup espera aquí hasta que TODOS los tasks terminen
+                # Si cualquier task lanza excepción no manejada, se cancelan todos
+
+        except* asyncio.CancelledError:
+            # Shutdown controlado vía _shutdown_event
+            logger.info("TaskGroup cancelled (shutdown)")
+        except* Exception as eg:
+            # ERROR CRÍTICO: Algo falló irreparablemente en un worker
+            # Esto NO debería pasar si el error handling inside funciona
+            for exc in eg.exceptions:
+                logger.critical(f"Worker failed critically: {exc}")
+
+        # post-TaskGroup cleanup
+        self._notify_state_change("stopping", reason="mission_completed")
+
+        # Cleanup de recursos
+        await self._cleanup_after_taskgroup()
+        await self.browser.close()
+
+        await self.state.release_mission_lock(self.navigation.domain, os.getpid())
 
         self._notify_state_change("stopped", reason="mission_completed")
         await self.reporter.generate_summary()
         await self.http_cache.close()
+        await self.page_client.aclose()
+        await self.resolver.close()
 
     async def _monitor_loop(self) -> None:
         """Monitor loop que corre junto con los workers.
@@ -359,6 +581,7 @@ class EngineCore:
         completó naturalmente.
         """
         checks = 0
+        ticks = 0
         while not self._shutdown_event.is_set():
             # Verificar si está pausado
             if not self._pause_event.is_set():
@@ -367,7 +590,63 @@ class EngineCore:
             self._notify_ui()
             self._update_speed()
 
-            if (self.url_queue.qsize() + self.asset_queue.qsize()) == 0:
+            ticks += 1
+            if ticks % STAGE_METRICS_LOG_TICKS == 0:
+                logger.debug(
+                    "Pipeline stages: "
+                    + " | ".join(
+                        f"{m.name} q={m.queue_depth} busy={m.busy}/{m.workers} "
+                        f"util={m.utilization:.0%}"
+                        for m in self.get_stage_metrics()
+                    )
+                )
+                if self.memory.enabled:
+                    logger.debug(
+                        f"Memory: {self.memory.usage() / MB:.0f}/"
+                        f"{self.memory.budget_bytes / MB:.0f} MB, "
+                        f"accounted {self.memory.accounted()}"
+                    )
+                dns = self.resolver.get_stats()
+                logger.debug(
+                    f"DNS: {dns['hosts']} hosts cached, {dns['hits']} hits, "
+                    f"{dns['misses']} lookups, {dns['negative_hits']} negative hits, "
+                    f"{dns['prefetched']} prefetched"
+                )
+                budget = self.retry_budget.get_stats()
+                if budget["denied"]:
+                    logger.debug(
+                        f"Retry budget: {budget['tokens']:.1f} tokens, "
+                        f"{budget['retries']:.0f} retries, "
+                        f"{budget['denied']:.0f} denied"
+                    )
+                if self.circuit_breaker.trips:
+                    logger.debug(
+                        f"Circuit breakers: {self.circuit_breaker.trips} trips, "
+                        f"{self.circuit_breaker.probes} half-open probes"
+                    )
+                if self.page_client.hedges:
+                    logger.debug(
+                        f"Hedging: {self.page_client.hedges} hedges, "
+                        f"{self.page_client.hedge_wins} won by the hedge"
+                    )
+                if self.browser.running:
+                    browser = self.browser.get_stats()
+                    logger.debug(
+                        f"Browser: {browser['active_pages']} pages active, "
+                        f"render p50={browser['render_p50_ms']:.0f}ms "
+                        f"p95={browser['render_p95_ms']:.0f}ms, "
+                        f"{browser['blocked_requests']} requests blocked, "
+                        f"{browser['recycles']} recycles"
+                    )
+
+            await self.memory.check(in_flight=self._in_flight())
+            await self.browser.close_if_idle()
+
+            if (
+                self.url_queue.qsize() + self.asset_queue.qsize() == 0
+                and self._pipeline_pending() == 0
+                and not self._requeues
+            ):
                 checks += 1
                 if checks >= 5:
                     # Cola vacía por 5 ciclos = misión completada naturalmente
@@ -387,6 +666,9 @@ class EngineCore:
 
     async def _cleanup_after_taskgroup(self) -> None:
         """Cleanup después de que el TaskGroup terminó."""
+        await self._stop_stages(timeout=self.config.page_deadline_seconds)
+        await self._cancel_requeues()
+
         # Ensure all queue items are marked done
         try:
             await self.url_queue.join()
@@ -412,7 +694,7 @@ class EngineCore:
         if self._data_writer:
             await self._data_writer.close()
 
-    async def _page_worker(self, session: AsyncStealthySession) -> None:
+    async def _page_worker(self, session: BrowserFetcher) -> None:
         """Page worker con resiliencia - error handling inside.
 
         Este worker NUNCA debe lanzar una excepción no manejada.
@@ -435,23 +717,28 @@ class EngineCore:
             # ✅ RESILIENCIA: Wrapper seguro que captura TODO
             await self._safe_process_page(session, url)
 
-    async def _safe_process_page(self, session: AsyncStealthySession, url: str) -> None:
+    async def _safe_process_page(self, session: BrowserFetcher, url: str) -> None:
         """Wrapper seguro para procesamiento de página.
 
         Cualquier excepción aquí NO sale del worker.
         Patrón: Error Handling Inside.
         """
         try:
-            if not self.circuit_breaker.should_allow(self.navigation.domain):
+            # Bajo presión de memoria no se admiten fetches nuevos
+            await self.memory.wait_for_admission()
+
+            # Sin tomar la sonda de half-open: la toma el fetch real
+            if self.circuit_breaker.is_blocked(_host_of(url)):
                 await self.url_queue.put(url)
                 await asyncio.sleep(1)
                 return
 
-            async with self.semaphore:
+            async with self.traffic.slot("page"):
                 # Adaptive jitter
                 jitter = (os.urandom(1)[0] / 255) * DEFAULT_JITTER_MAX
                 await asyncio.sleep(self.config.request_delay + jitter)
-                await self._process_page(session, url)
+                with self._fetch_meter.track():
+                    await self._process_page(session, url)
 
         except asyncio.CancelledError:
             # ✅ Propagar CancelledError para shutdown limpio
@@ -495,6 +782,7 @@ class EngineCore:
         Cualquier excepción aquí NO sale del worker.
         """
         try:
+            await self.memory.wait_for_admission()
             await self._download_asset(asset_url)
         except asyncio.CancelledError:
             await self.state.update_status(asset_url, MigrationStatus.PENDING)
@@ -507,8 +795,13 @@ class EngineCore:
             except ValueError:
                 pass
 
-    async def _process_page(self, session: AsyncStealthySession, url: str) -> None:
-        """Procesa una página: fetch, extract, save, notify."""
+    async def _process_page(self, session: BrowserFetcher, url: str) -> None:
+        """Stage fetch de una página: fetch, links y traspaso al stage parse.
+
+        Link-first: los links descubiertos se admiten en la frontera justo
+        tras el fetch; limpieza y extracción siguen en el pool ``parse`` y la
+        escritura en el pool ``write``, así el worker vuelve a hacer fetch.
+        """
         # Esperar si está pausado
         await self._pause_event.wait()
 
@@ -519,81 +812,412 @@ class EngineCore:
             return
 
         start_time = asyncio.get_event_loop().time()
+        # Presupuesto de tiempo compartido por fetch, limpieza, extracción y guardado
+        deadline = Deadline.after(self.config.page_deadline_seconds)
+        stage = "fetch"
 
         try:
-            page = await self._fetch_page(session, url)
-            if not page:
-                raise Exception("Empty content")
+            async with asyncio.timeout_at(deadline.expires_at):
+                page = await self._fetch_page(session, url, deadline)
+                if not page:
+                    raise Exception("Empty content")
+
+                raw_html = self._extract_html(page)
+                # Ancho de banda de la clase "page" (cuenta tras el fetch: el
+                # siguiente fetch de la clase espera si se excedió)
+                await self.traffic.throttle("page", len(raw_html))
+                is_captcha, c_type = self.captcha_detector.detect(
+                    raw_html,
+                    status_code=getattr(page, "status", None),
+                    headers=getattr(page, "headers", None),
+                )
+                if is_captcha:
+                    await self.state.update_status(
+                        url, MigrationStatus.FAILED, f"CAPTCHA: {c_type}"
+                    )
+                    return
+
+                # Complejidad medida antes de cualquier parseo: un documento
+                # patológico no llega a prune_by_density, convert ni
+                # BeautifulSoup. Los nodos se cuentan en el loop (str.count):
+                # pasado ese límite ni el escaneo de profundidad va al pool
+                streamed = len(raw_html) > MAX_HTML_SIZE_BYTES
+                over_budget = (
+                    None
+                    if streamed
+                    else self.page_budget.exceeded_nodes(count_nodes(raw_html))
+                )
+                if over_budget is None:
+                    complexity = await self._run_cpu(
+                        assess_complexity, raw_html, self.page_budget
+                    )
+                    over_budget = self.page_budget.exceeded(
+                        complexity, streamed=streamed
+                    )
 
-            raw_html = self._extract_html(page)
-            is_captcha, c_type = self.captcha_detector.detect(raw_html)
-            if is_captcha:
-                await self.state.update_status(
-                    url, MigrationStatus.FAILED, f"CAPTCHA: {c_type}"
+                # Links primero: después la respuesta de scrapling (body + árbol
+                # lxml) ya no hace falta y se libera antes de extraer y escribir.
+                # El tope de links aplica también a las páginas en streaming
+                new_pages, new_assets = self.navigation.extract_links(
+                    page, url, max_links=self.page_budget.max_links
                 )
-                return
+                del page
+                # La frontera crece antes de pagar la extracción
+                await self._queue_discovered_links(new_pages, new_assets)
 
-            self.circuit_breaker.record_success(self.navigation.domain)
-            clean_html = pre_clean_html(raw_html)
+        except NonHTMLContentError as e:
+            await self._reroute_to_assets(url, e.content_type)
+            return
+        except Exception as e:
+            await self._handle_page_error(
+                url, self._as_deadline_error(e, url, stage, deadline)
+            )
+            return
 
-            async with asyncio.TaskGroup() as tg:
-                m_task = tg.create_task(self.metadata_extractor.extract(raw_html, url))
-                t_task = tg.create_task(self.text_extractor.extract(clean_html, url))
+        # Fuera del deadline: la espera por backpressure no es coste de la
+        # página, el tiempo que le queda se retoma al salir de la cola
+        await self.parse_stage.put(
+            FetchedPage(
+                url=url,
+                raw_html=raw_html,
+                over_budget=over_budget,
+                time_left=deadline.remaining(),
+                start_time=start_time,
+            )
+        )
 
-            metadata = m_task.result()
-            text_data = t_task.result()
+    async def _parse_page(self, item: FetchedPage) -> None:
+        """Stage parse: limpieza y extracción de una página descargada.
 
-            await self._save_markdown(url, metadata, text_data["markdown"])
+        La limpieza y la conversión corren en ``parse_executor``; el event loop
+        solo espera el resultado y sigue atendiendo fetch y write. El deadline
+        llega a los hilos como checkpoints entre fases (ver ``_run_cpu``).
+        """
+        url = item.url
+        raw_html, item.raw_html = item.raw_html, ""
+        raw_size = len(raw_html)
+        profile = self.config.profile
+        deadline = Deadline.after(
+            item.time_left, budget=self.config.page_deadline_seconds
+        )
+        stage = "clean"
 
-            # Enviar a la cola de persistencia
-            await self.queue_item_for_persistence(
-                {
-                    "url": url,
-                    "title": metadata.get("title"),
-                    "content": text_data["markdown"],
-                    "content_type": "text",
-                    "domain": self.navigation.domain,
-                    "metadata": metadata,
-                }
-            )
+        try:
+            async with asyncio.timeout_at(deadline.expires_at):
+                deadline.check(stage, url)
+                if item.over_budget:
+                    logger.warning(
+                        f"Pathological document {url} ({item.over_budget}): "
+                        "using degraded extraction"
+                    )
+                    metadata, text_data = await self._run_cpu(
+                        self._extract_degraded,
+                        raw_html,
+                        url,
+                        deadline.checkpoint(stage, url),
+                    )
+                    del raw_html
+                elif raw_size > MAX_HTML_SIZE_BYTES:
+                    # Página gigante: limpieza y conversión en streaming por chunks
+                    metadata, text_data = await self._run_cpu(
+                        self._extract_oversized,
+                        raw_html,
+                        url,
+                        deadline.checkpoint(stage, url),
+                    )
+                    del raw_html
+                else:
+                    # Limpieza con el plan aprendido para la plantilla de la página
+                    clean_html, template_id = await self._run_cpu(
+                        self.template_learner.clean,
+                        raw_html,
+                        sanitize=profile.sanitize_html,
+                        checkpoint=deadline.checkpoint(stage, url),
+                    )
+
+                    stage = "extract"
+                    deadline.check(stage, url)
+                    async with asyncio.TaskGroup() as tg:
+                        m_task = tg.create_task(
+                            self._run_cpu(self._extract_metadata, raw_html, url)
+                        )
+                        t_task = tg.create_task(
+                            self._run_cpu(
+                                self.text_extractor.extract_sync,
+                                clean_html,
+                                url,
+                                preferred_engine=self.template_learner.preferred_engine(
+                                    template_id
+                                ),
+                                fallbacks=profile.extraction_fallbacks,
+                                fix_text=profile.fix_text,
+                                checkpoint=deadline.checkpoint(stage, url),
+                            )
+                        )
+
+                    # Solo se conserva el markdown final mientras se esperan los sinks
+                    del raw_html, clean_html
 
-            new_pages, new_assets = self.navigation.extract_links(page, url)
-            await self._queue_discovered_links(new_pages, new_assets)
+                    metadata = m_task.result()
+                    text_data = t_task.result()
+                    self.template_learner.record_engine(
+                        template_id, text_data.get("engine", "unknown")
+                    )
 
-            await self.state.update_status(url, MigrationStatus.COMPLETED)
-            self.stats.record_page_success()
+        except asyncio.CancelledError:
+            await self.state.update_status(url, MigrationStatus.PENDING, immediate=True)
+            raise
+        except (TimeoutError, PageDeadlineExceeded) as e:
+            await self._handle_page_error(
+                url, self._as_deadline_error(e, url, stage, deadline)
+            )
+            return
+        except Exception as e:
+            # Los extractores ya degradan por su cuenta: esto es un fallo inesperado
+            logger.exception(f"[parse] Extraction failed for {url}")
+            await self._handle_page_error(url, e)
+            return
 
-            # Emitir actividad
-            elapsed_ms = (asyncio.get_event_loop().time() - start_time) * 1000
-            self._notify_activity(
+        await self.write_stage.put(
+            ExtractedPage(
                 url=url,
-                title=metadata.get("title", url),
-                engine=text_data.get("engine", "unknown"),
-                status="success",
-                elapsed_ms=elapsed_ms,
-                size_bytes=len(raw_html),
+                metadata=metadata,
+                text_data=text_data,
+                raw_size=raw_size,
+                time_left=deadline.remaining(),
+                start_time=item.start_time,
             )
+        )
 
-            # Actualizar velocidad
-            self._pages_since_last_check += 1
-            self._update_speed()
-            self._notify_ui()
+    async def _write_page(self, item: ExtractedPage) -> None:
+        """Stage write: markdown a disco, sink JSONL y estado en la DB."""
+        url, metadata, text_data = item.url, item.metadata, item.text_data
+        deadline = Deadline.after(
+            item.time_left, budget=self.config.page_deadline_seconds
+        )
+        stage = "save"
+
+        try:
+            async with asyncio.timeout_at(deadline.expires_at):
+                deadline.check(stage, url)
+                await self._save_markdown(url, metadata, text_data["markdown"])
+
+                # Enviar a la cola de persistencia (sink JSONL según el perfil)
+                if self.config.profile.jsonl_sink:
+                    await self.queue_item_for_persistence(
+                        ScrapedRecord(
+                            url=url,
+                            title=metadata.get("title"),
+                            content=text_data["markdown"],
+                            domain=self.navigation.domain,
+                            metadata=metadata,
+                        )
+                    )
+
+                await self.state.update_status(url, MigrationStatus.COMPLETED)
 
+        except asyncio.CancelledError:
+            await self.state.update_status(url, MigrationStatus.PENDING, immediate=True)
+            raise
+        except (OSError, PageDeadlineExceeded) as e:
+            # Disco o deadline (TimeoutError es un OSError)
+            await self._handle_page_error(
+                url, self._as_deadline_error(e, url, stage, deadline)
+            )
+            return
         except Exception as e:
+            logger.exception(f"[write] Saving failed for {url}")
             await self._handle_page_error(url, e)
+            return
+
+        self.stats.record_page_success()
+
+        # Emitir actividad
+        elapsed_ms = (asyncio.get_event_loop().time() - item.start_time) * 1000
+        self._notify_activity(
+            url=url,
+            title=metadata.get("title", url),
+            engine=text_data.get("engine", "unknown"),
+            status="success",
+            elapsed_ms=elapsed_ms,
+            size_bytes=item.raw_size,
+        )
+
+        # Actualizar velocidad
+        self._pages_since_last_check += 1
+        self._update_speed()
+        self._notify_ui()
+
+    @staticmethod
+    def _as_deadline_error(
+        error: Exception, url: str, stage: str, deadline: Deadline
+    ) -> Exception:
+        """Traduce el TimeoutError de ``timeout_at`` a la etapa que agotó el deadline."""
+        if isinstance(error, TimeoutError) and deadline.expired():
+            return PageDeadlineExceeded(url, stage, deadline.budget)
+        return error
+
+    async def _stop_stages(self, timeout: float) -> None:
+        """Drena y detiene los stages parse y write, en orden de pipeline."""
+        # Los workers cancelados esperan a su hilo (ver _run_cpu): al cerrar
+        # parse el pool ya no tiene trabajo de páginas en curso
+        await self.parse_stage.close(timeout)
+        self.parse_executor.shutdown(wait=False, cancel_futures=True)
+        await self.write_stage.close(timeout)
+
+    async def _run_cpu[T](
+        self, func: Callable[..., T], /, *args: Any, **kwargs: Any
+    ) -> T:
+        """Ejecuta trabajo de CPU del stage parse en ``parse_executor``.
+
+        Cancelar la espera (deadline, shutdown) no detiene el hilo: el trabajo
+        solo se abandona en sus checkpoints (``Deadline.checkpoint``), y una
+        fase en curso (un parseo, un ``convert``) corre hasta el final. Por eso
+        la cancelación espera a que el hilo termine antes de propagarse: el
+        worker del stage no toma otra página con el pool aún ocupado por esta.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self.parse_executor, partial(func, *args, **kwargs)
+        )
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await asyncio.wait([future])
+            if not future.cancelled():
+                # Resultado descartado: se consume para no loguearlo como perdido
+                future.exception()
+            raise
+
+    def _pipeline_pending(self) -> int:
+        """Páginas en fetch, en colas de stage o en proceso en parse/write."""
+        return (
+            self._fetch_meter.busy + self.parse_stage.pending + self.write_stage.pending
+        )
+
+    def _in_flight(self) -> int:
+        """Trabajo admitido que liberará memoria al terminar."""
+        return (
+            self._pipeline_pending() + self.traffic.in_flight + self.data_queue.qsize()
+        )
+
+    def _shrink_caches(self) -> None:
+        """Alivio de memoria: descarta la mitad de las cachés de dedup y metadata.
+
+        La deduplicación sigue siendo correcta: lo que sale de ``seen_urls``
+        se comprueba contra la DB antes de encolarse.
+        """
+        dropped = shrink_cache(self.seen_urls) + shrink_cache(self.seen_assets)
+        self.metadata_extractor.clear_cache()
+        logger.info(f"Memory relief: dropped {dropped} dedup cache entries")
+
+    async def _flush_writers(self) -> None:
+        """Alivio de memoria: vacía a disco el buffer del writer JSONL."""
+        if self._data_writer:
+            await self._data_writer.flush()
+
+    def get_stage_metrics(self) -> list[StageMetrics]:
+        """Profundidad de cola y utilización de cada stage del pipeline."""
+        return [
+            self._fetch_meter.snapshot(self.url_queue.qsize(), capacity=0),
+            self.parse_stage.metrics(),
+            self.write_stage.metrics(),
+        ]
+
+    def _extract_oversized(
+        self, raw_html: str, url: str, checkpoint: Callable[[], None] = no_checkpoint
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Extrae una página mayor que MAX_HTML_SIZE_BYTES sin truncarla.
+
+        El cleaner streaming alimenta la conversión a markdown chunk a chunk y
+        la metadata se extrae de su esqueleto (head, JSON-LD, headings) en vez
+        de volver a parsear el HTML completo.
+        """
+        cleaner = StreamingHTMLCleaner()
+        text_data = self.text_extractor.extract_stream_sync(
+            cleaner.iter_clean(raw_html),
+            url,
+            fix_text=self.config.profile.fix_text,
+            checkpoint=checkpoint,
+        )
+        checkpoint()
+        metadata = self._extract_metadata(cleaner.metadata_html(), url)
+        logger.info(
+            f"Oversized page streamed: {url} "
+            f"({len(raw_html)} chars, {cleaner.chunks_emitted} chunks)"
+        )
+        return metadata, text_data
+
+    def _extract_degraded(
+        self, raw_html: str, url: str, checkpoint: Callable[[], None] = no_checkpoint
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Extrae un documento fuera del presupuesto de complejidad sin parsearlo.
+
+        Metadata solo del ``<head>`` y texto por regex lineal: el coste no
+        depende del anidamiento ni del número de nodos.
+        """
+        metadata = self.metadata_extractor.extract_basic_sync(raw_html, url)
+        checkpoint()
+        text_data = self.text_extractor.extract_degraded_sync(
+            raw_html, url, fix_text=self.config.profile.fix_text
+        )
+        return metadata, text_data
+
+    def _extract_metadata(self, html: str, url: str) -> dict[str, Any]:
+        """Metadata completa o solo del ``<head>`` según el perfil de extracción."""
+        profile = self.config.profile
+        if not profile.full_metadata:
+            return self.metadata_extractor.extract_basic_sync(html, url)
+        return self.metadata_extractor.extract_sync(
+            html, url, structured_data=profile.structured_data
+        )
 
     async def _download_asset(self, asset_url: str) -> None:
-        async with self.semaphore:
+        traffic_class = asset_traffic_class(asset_url)
+        host = _host_of(asset_url)
+        if not self.circuit_breaker.should_allow(host):
+            # Host caído (p.ej. su CDN): ni se intenta; al reanudar se retoma
+            self.stats.record_asset_failure()
+            await self.state.update_status(
+                asset_url, MigrationStatus.FAILED, f"Circuit breaker open for {host}"
+            )
+            return
+        async with self.traffic.slot(traffic_class):
             try:
                 session = await self.http_cache.get_session()
                 async with session.get(
                     asset_url,
-                    headers={"Referer": self.navigation.base_url},
+                    headers={
+                        "Referer": self.navigation.base_url,
+                        **self.cookie_jar.headers_for(asset_url),
+                    },
                     timeout=aiohttp.ClientTimeout(total=60),
                 ) as resp:
+                    # El host respondió: solo un 502/503/504 cuenta como fallo suyo
+                    if resp.status in RETRYABLE_STATUSES:
+                        self.circuit_breaker.record_failure(host)
+                    else:
+                        self.circuit_breaker.record_success(host)
                     if resp.status == 200:
-                        content = await resp.read()
-                        await self.asset_extractor.extract(content, asset_url)
+                        # Lectura por chunks descontando el ancho de banda de la
+                        # clase; el cuerpo en memoria cuenta para el gobernador
+                        buffer = bytearray()
+                        buffered = 0
+                        try:
+                            async for chunk in resp.content.iter_chunked(
+                                ASSET_READ_CHUNK_BYTES
+                            ):
+                                buffer += chunk
+                                buffered += len(chunk)
+                                self.memory.reserve("asset_buffers", len(chunk))
+                                await self.traffic.throttle(traffic_class, len(chunk))
+                            content = bytes(buffer)
+                            del buffer
+                            await self.asset_extractor.extract(
+                                content, asset_url, content_type=resp.content_type
+                            )
+                        finally:
+                            self.memory.release("asset_buffers", buffered)
                         await self.state.update_status(
                             asset_url, MigrationStatus.COMPLETED
                         )
@@ -602,37 +1226,139 @@ class EngineCore:
                     else:
                         raise Exception(f"HTTP {resp.status}")
             except Exception as e:
+                if isinstance(e, (aiohttp.ClientConnectionError, TimeoutError)):
+                    self.circuit_breaker.record_failure(host)
                 self.stats.record_asset_failure()
                 await self.state.update_status(
                     asset_url, MigrationStatus.FAILED, str(e)
                 )
 
-    async def _fetch_page(self, session: AsyncStealthySession, url: str) -> Any:
+    async def _fetch_page(
+        self,
+        session: BrowserFetcher,
+        url: str,
+        deadline: Deadline | None = None,
+    ) -> Any:
         encoded_url = smart_url_normalize(url)
-        if self.use_browser_mode:
-            return await session.fetch(encoded_url, timeout=DEFAULT_BROWSER_TIMEOUT_MS)
-
-        resp = await AsyncFetcher.get(
-            encoded_url,
-            impersonate="chrome",
-            timeout=self.config.timeout_seconds,
-            headers={"Referer": self.navigation.base_url},
+        # Los timeouts de red (adaptativos por host) nunca superan lo que le
+        # queda a la página
+        remaining = deadline.remaining() if deadline is not None else None
+
+        if self.use_browser_mode or self.escalation.needs_browser(url):
+            return await self._browser_fetch(session, url, remaining)
+
+        # Clearance del navegador (Cookie + su User-Agent) si la hay
+        clearance = self.cookie_jar.headers_for(url)
+        headers = {"Referer": self.navigation.base_url, **clearance}
+        resp = await self.page_client.get(
+            encoded_url, headers=headers, timeout=remaining
         )
 
+        # Error del origen para esta URL: el transport no lo reintenta ni abre
+        # el circuito del host; la página sigue la política de reintentos propia
         if resp.status == 500:
             return None
         if resp.status in [403, 401, 429]:
-            self.use_browser_mode = True
-            self._notify_mode_change()
-            return await session.fetch(encoded_url, timeout=DEFAULT_BROWSER_TIMEOUT_MS)
+            # Este request se rinde en el navegador; la sección solo escala
+            # si los bloqueos se repiten
+            if self.escalation.record_block(url):
+                logger.warning(
+                    f"Escalating {self.escalation.section_of(url)} to browser "
+                    f"after HTTP {resp.status}"
+                )
+                self._notify_mode_change()
+            if clearance:
+                # La clearance ya no vale: el navegador obtendrá una nueva
+                for domain in self.cookie_jar.discard(url):
+                    await self.state.delete_domain_cookies(domain)
+            return await self._browser_fetch(session, url, remaining)
 
         if resp.status == 200:
+            if self.escalation.record_success(url):
+                logger.info(
+                    f"Fast path works again for {self.escalation.section_of(url)}, "
+                    "de-escalating"
+                )
+                self._notify_mode_change()
             return resp
         raise Exception(f"HTTP {resp.status}")
 
+    def _adaptive_timeouts(self, default: float) -> AdaptiveTimeouts:
+        config = self.config
+        return AdaptiveTimeouts(
+            default,
+            multiplier=config.timeout_multiplier,
+            floor=config.timeout_floor_seconds,
+            ceiling=max(config.timeout_ceiling_seconds, default),
+            enabled=config.adaptive_timeouts,
+        )
+
+    async def _browser_fetch(
+        self, session: BrowserFetcher, url: str, remaining: float | None = None
+    ) -> Any:
+        """Fetch con el navegador exportando su clearance al fast path."""
+        host = _host_of(url)
+        # Mismo circuit breaker que el fast path: un host caído no se renderiza
+        if not self.circuit_breaker.should_allow(host):
+            raise CircuitOpenError(host, self.circuit_breaker.retry_after(host))
+        timeout = self.browser_timeouts.for_host(host, cap=remaining).total
+        started = time.monotonic()
+        try:
+            page = await session.fetch(
+                smart_url_normalize(url), timeout=int(timeout * 1000)
+            )
+        except Exception:
+            # Los renders cuentan en la tasa de éxito igual que el fast path
+            self.retry_budget.record_failure()
+            self.circuit_breaker.record_failure(host)
+            elapsed = time.monotonic() - started
+            if elapsed >= timeout * 0.95:
+                # Probablemente el timeout del render: el host pudo volverse lento
+                self.browser_timeouts.record_timeout(host, elapsed)
+            raise
+        self.retry_budget.record_success()
+        self.circuit_breaker.record_success(host)
+        elapsed = time.monotonic() - started
+        self.browser_timeouts.record(host, elapsed, elapsed)
+        cookies = getattr(page, "cookies", None)
+        if not isinstance(cookies, (tuple, list)) or not cookies:
+            return page
+        request_headers = getattr(page, "request_headers", None)
+        changed = self.cookie_jar.update_from_browser(
+            url,
+            (c for c in cookies if isinstance(c, dict)),
+            request_headers if isinstance(request_headers, dict) else None,
+        )
+        for domain in changed:
+            entry = self.cookie_jar.get(domain)
+            if entry is not None:
+                await self.state.save_domain_cookies(
+                    domain, entry.encode_cookies(), entry.user_agent
+                )
+        if changed:
+            # Con cookies nuevas el fast path puede volver a funcionar ya
+            self.escalation.probe_soon(url)
+            logger.info(f"Browser clearance exported to fast path: {changed}")
+        return page
+
     def _extract_html(self, page: Any) -> str:
+        """Decodifica el body una sola vez con el charset de la respuesta."""
         raw = getattr(page, "raw_content", "") or getattr(page, "body", "")
-        return raw if isinstance(raw, str) else raw.decode("utf-8", errors="replace")
+        if isinstance(raw, str):
+            return raw
+        headers = getattr(page, "headers", None)
+        content_type = None
+        if isinstance(headers, dict):
+            content_type = next(
+                (v for k, v in headers.items() if str(k).lower() == "content-type"),
+                None,
+            )
+        encoding = getattr(page, "encoding", None)
+        return decode_html(
+            raw,
+            content_type=content_type if isinstance(content_type, str) else None,
+            default_encoding=encoding if isinstance(encoding, str) else None,
+        )
 
     async def _save_markdown(
         self, url: str, metadata: dict[str, Any], markdown: str
@@ -643,19 +1369,28 @@ class EngineCore:
         clean_path = rel_path.strip("/")  # Limpiar slashes extra
         path_slug = slugify(clean_path) if clean_path else "index"
 
-        enhanced = enhance_markdown_for_rag(
-            markdown=markdown, metadata=metadata, base_url=url, include_toc=True
-        )
-
-        frontmatter = yaml.dump(
-            filter_metadata_for_frontmatter(metadata), allow_unicode=True
+        frontmatter = dump_frontmatter(
+            filter_metadata_for_frontmatter(metadata), sort_keys=True
         )
-        content = f"---\n{frontmatter}---\n\n{enhanced}"
 
         content_dir = self.asset_extractor.data_dir / "content"
         content_dir.mkdir(parents=True, exist_ok=True)
 
-        return await write_compressed_markdown(content_dir / path_slug, content)
+        # Frontmatter + TOC + body con links absolutos en un único buffer,
+        # codificado una vez y pasado sin referencias extra al writer
+        profile = self.config.profile
+        return await write_compressed_markdown(
+            content_dir / path_slug,
+            render_markdown_document(
+                markdown,
+                metadata,
+                base_url=url,
+                frontmatter=frontmatter,
+                include_toc=profile.toc,
+                absolutize_links=profile.absolutize_links,
+            ).encode("utf-8"),
+            compression=profile.compression,
+        )
 
     async def _queue_discovered_links(
         self, new_pages: list[str], new_assets: list[str]
@@ -677,6 +1412,9 @@ class EngineCore:
         if not p_queue and not a_queue:
             return
 
+        # Los hosts nuevos se resuelven mientras las URLs esperan en cola
+        self.resolver.prefetch(urlsplit(u).hostname for u in p_queue + a_queue)
+
         async with asyncio.TaskGroup() as tg:
             tg.create_task(
                 self.state.add_urls_batch(
@@ -689,10 +1427,36 @@ class EngineCore:
             for a in a_queue:
                 tg.create_task(self.asset_queue.put(a))
 
+    async def _reroute_to_assets(self, url: str, content_type: str) -> None:
+        """Pasa al pipeline de assets una "página" que resultó no ser HTML."""
+        logger.info(f"Non-HTML response ({content_type}) for {url}: routed to assets")
+        self.stats.pages_total_count -= 1
+        await self.state.reclassify_url(url, "asset")
+        if not self.extract_assets or url in self.seen_assets:
+            return
+        self.seen_assets[url] = True
+        self.stats.assets_total_count += 1
+        await self.asset_queue.put(url)
+
     async def _handle_page_error(self, url: str, error: Exception) -> None:
-        """Maneja errores de procesamiento de página."""
-        self.circuit_breaker.record_failure(self.navigation.domain)
-        retries = await self.state.increment_retry(url)
+        """Maneja errores de procesamiento de página.
+
+        El circuit breaker ya lo alimentan los fetches (transport, navegador)
+        con cada intento: aquí no se vuelve a contar el fallo. Lo llaman los
+        workers de fetch, parse y write: el backoff de un reintento se
+        programa en el loop (``_schedule_requeue``) en vez de dormir en ellos.
+        """
+        if isinstance(error, CircuitOpenError):
+            # Host en pausa: la página vuelve a la cola sin gastar un intento
+            self._schedule_requeue(url, 1.0)
+            return
+        if isinstance(error, PageTooLargeError) or (
+            isinstance(error, PageDeadlineExceeded) and not error.retryable
+        ):
+            # El coste es del propio documento: no se reintenta
+            retries = self.config.max_retries
+        else:
+            retries = await self.state.increment_retry(url)
 
         # Emitir evento de error
         error_type = type(error).__name__
@@ -706,12 +1470,37 @@ class EngineCore:
         )
 
         if retries < self.config.max_retries:
-            await asyncio.sleep(float(2**retries))
-            await self.url_queue.put(url)
+            if not self.retry_budget.try_retry():
+                # El sitio falla en masa: no se gastan más requests en él. La
+                # página queda FAILED con intentos pendientes y se retoma al
+                # reanudar la misión
+                await self.state.update_status(
+                    url, MigrationStatus.FAILED, f"Retry budget exhausted: {error}"
+                )
+                self.stats.record_page_failure()
+                return
+            self._schedule_requeue(url, float(2**retries))
         else:
             await self.state.update_status(url, MigrationStatus.FAILED, str(error))
             self.stats.record_page_failure()
 
+    def _schedule_requeue(self, url: str, delay: float) -> None:
+        """Devuelve ``url`` a la cola tras ``delay`` segundos sin retener al worker."""
+
+        def requeue() -> None:
+            del self._requeues[handle]
+            self.url_queue.put_nowait(url)
+
+        handle = asyncio.get_running_loop().call_later(delay, requeue)
+        self._requeues[handle] = url
+
+    async def _cancel_requeues(self) -> None:
+        """Cancela los reintentos programados; las páginas se retoman al reanudar."""
+        requeues, self._requeues = self._requeues, {}
+        for handle, url in requeues.items():
+            handle.cancel()
+            await self.state.update_status(url, MigrationStatus.PENDING, immediate=True)
+
     async def _graceful_shutdown(self, workers: list[asyncio.Task[None]]) -> None:
         self._shutdown_event.set()
         for _ in range(len(self._page_workers)):
@@ -725,6 +1514,11 @@ class EngineCore:
                 if not w.done():
                     w.cancel()
 
+        # Páginas ya descargadas: terminar de extraer y escribir antes del drenaje
+        await self._stop_stages(timeout=MIN_SHUTDOWN_TIMEOUT_SECONDS)
+        await self._cancel_requeues()
+        await self.browser.close()
+
         # === PERSISTENCE DRAINAGE ===
         # 1. Send stop signal (None) to persistence queue
         await self.data_queue.put(None)  # type: ignore[arg-type]
@@ -758,7 +1552,7 @@ class EngineCore:
         if self.ui_callback:
             self.ui_callback.on_progress(self.get_stats())
             self.ui_callback.on_circuit_change(
-                self.circuit_breaker.get_state(self.navigation.domain)
+                self.circuit_breaker.get_state(self._mission_host)
             )
 
     def _force_ui_update(self, state: str, reason: str | None = None) -> None:
@@ -780,7 +1574,7 @@ class EngineCore:
 
     def _notify_mode_change(self) -> None:
         if self.ui_callback:
-            self.ui_callback.on_mode_change(self.use_browser_mode)
+            self.ui_callback.on_mode_change(self.browser_mode_active)
 
     def _notify_activity(
         self,
@@ -831,7 +1625,7 @@ class EngineCore:
         if self.ui_callback:
             self.ui_callback.on_state_change(
                 state=new_state,
-                mode="browser" if self.use_browser_mode else "stealth",
+                mode="browser" if self.browser_mode_active else "stealth",
                 previous_state=previous,
                 reason=reason,
             )
@@ -1001,14 +1795,12 @@ class EngineCore:
             Diccionario con: workers, request_delay, timeout, mode
         """
         return {
-            "workers": self.semaphore._value
-            if hasattr(self.semaphore, "_value")
-            else self.config.default_workers,
+            "workers": self.traffic.total_slots,
             "request_delay": int(
                 self.config.request_delay * 1000
             ),  # Convertir de segundos a ms
             "timeout": self.config.timeout_seconds,
-            "mode": "browser" if self.use_browser_mode else "stealth",
+            "mode": "browser" if self.browser_mode_active else "stealth",
         }
 
     def update_config(
@@ -1032,8 +1824,8 @@ class EngineCore:
             Diccionario con la configuración actualizada
         """
         if workers is not None and 1 <= workers <= 10:
-            # Recrear el semáforo con el nuevo valor
-            self.semaphore = asyncio.Semaphore(workers)
+            # Redimensionar el pool de slots (los presupuestos por clase se mantienen)
+            self.traffic.resize(workers)
             logger.info(f"Workers updated to {workers}")
 
         if request_delay is not None and request_delay >= 0:
@@ -1044,10 +1836,13 @@ class EngineCore:
 
         if timeout is not None and timeout >= 5:
             self.config.timeout_seconds = timeout
+            self.page_timeouts.default = timeout
             logger.info(f"Timeout updated to {timeout}s")
 
         if mode is not None:
             self.use_browser_mode = mode == "browser"
+            if not self.use_browser_mode:
+                self.escalation.reset()
             logger.info(f"Mode updated to {mode}")
 
         # scope no está implementado en la configuración actual
@@ -1113,6 +1908,8 @@ class EngineCore:
 
                 finally:
                     # SIEMPRE marcar como done, incluso si falló el write
+                    if item is not None:
+                        self.memory.release("data_queue", _record_size(item))
                     self.data_queue.task_done()
 
             except asyncio.TimeoutError:
@@ -1123,10 +1920,13 @@ class EngineCore:
 
         logger.info("Persistence worker stopped")
 
-    async def queue_item_for_persistence(self, item: dict[str, Any]) -> None:
+    async def queue_item_for_persistence(
+        self, item: dict[str, Any] | ScrapedRecord
+    ) -> None:
         """Añade un item a la cola de persistencia.
 
         Args:
-            item: Diccionario con los datos del item
+            item: ``ScrapedRecord`` interno o diccionario (se valida al escribir)
         """
         await self.data_queue.put(item)
+        self.memory.reserve("data_queue", _record_size(item))
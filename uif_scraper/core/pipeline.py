@@ -0,0 +1,199 @@
+"""Staged (SEDA) pipeline primitives for UIF Engine.
+
+Each stage owns a bounded queue and a separately sized worker pool. A full
+queue blocks the producer stage (backpressure), so every resource class
+(network, CPU, disk/DB) can be tuned to saturation on its own. Stages
+report queue depth and utilization through ``StageMeter`` and, given a
+``sizeof``, the payload bytes waiting in their queue.
+
+Workers are coroutines on the caller's event loop: the pool size bounds how
+many items are in flight, not how many CPU cores are used. A CPU-bound
+handler must hand its work to an executor of the same size (as the engine's
+parse stage does) or it stalls every other stage while it runs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+
+from loguru import logger
+
+from uif_scraper.core.types import StageMetrics
+
+# Ventana mínima para recalcular la utilización (evita ruido entre snapshots)
+_UTILIZATION_WINDOW_SECONDS = 1.0
+
+
+class StageMeter:
+    """Contabilidad O(1) de ocupación de un pool de workers.
+
+    El tiempo ocupado acumulado incluye el trabajo en curso
+    (``busy * now - suma de inicios activos``), así la utilización de una
+    ventana es exacta aunque un item tarde más que la ventana.
+    """
+
+    __slots__ = (
+        "_active_started",
+        "_busy_time",
+        "_utilization",
+        "_window_busy",
+        "_window_start",
+        "busy",
+        "name",
+        "processed",
+        "workers",
+    )
+
+    def __init__(self, name: str, workers: int) -> None:
+        self.name = name
+        self.workers = workers
+        self.busy = 0
+        self.processed = 0
+        self._busy_time = 0.0
+        self._active_started = 0.0
+        now = time.monotonic()
+        self._window_start = now
+        self._window_busy = 0.0
+        self._utilization = 0.0
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Marca un worker como ocupado mientras dura el bloque."""
+        started = time.monotonic()
+        self.busy += 1
+        self._active_started += started
+        try:
+            yield
+        finally:
+            self.busy -= 1
+            self._active_started -= started
+            self._busy_time += time.monotonic() - started
+            self.processed += 1
+
+    def _total_busy(self, now: float) -> float:
+        return self._busy_time + self.busy * now - self._active_started
+
+    def utilization(self) -> float:
+        """Fracción del pool ocupada en la última ventana (0.0 - 1.0)."""
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed >= _UTILIZATION_WINDOW_SECONDS and self.workers > 0:
+            total = self._total_busy(now)
+            self._utilization = min(
+                1.0, (total - self._window_busy) / (elapsed * self.workers)
+            )
+            self._window_start = now
+            self._window_busy = total
+        return self._utilization
+
+    def snapshot(self, queue_depth: int, capacity: int) -> StageMetrics:
+        return StageMetrics(
+            name=self.name,
+            workers=self.workers,
+            busy=self.busy,
+            queue_depth=queue_depth,
+            capacity=capacity,
+            processed=self.processed,
+            utilization=round(self.utilization(), 3),
+        )
+
+
+class _Stop:
+    """Marca de fin de stream para los workers de un stage."""
+
+
+_STOP = _Stop()
+
+
+class PipelineStage[T]:
+    """Stage con cola acotada y pool de workers propio.
+
+    El handler maneja sus propios errores (mismo patrón "error handling
+    inside" que los workers del engine); lo que escape se registra y el
+    worker sigue vivo.
+
+    Args:
+        name: Nombre del stage para métricas y logs
+        workers: Tamaño del pool
+        capacity: Máximo de items encolados; ``put`` bloquea al llenarse
+        handler: Corutina que procesa un item
+        sizeof: Bytes retenidos por un item (para ``queued_bytes``)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        workers: int,
+        capacity: int,
+        handler: Callable[[T], Awaitable[None]],
+        sizeof: Callable[[T], int] | None = None,
+    ) -> None:
+        self.name = name
+        self.capacity = capacity
+        self.meter = StageMeter(name, workers)
+        self._handler = handler
+        self._sizeof = sizeof
+        self.queued_bytes = 0
+        self._queue: asyncio.Queue[T | _Stop] = asyncio.Queue(maxsize=capacity)
+        self._tasks: list[asyncio.Task[None]] = []
+
+    @property
+    def pending(self) -> int:
+        """Items encolados o en proceso."""
+        return self._queue.qsize() + self.meter.busy
+
+    def start(self) -> None:
+        """Lanza el pool de workers (idempotente)."""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"{self.name}-{i}")
+            for i in range(self.meter.workers)
+        ]
+
+    async def put(self, item: T) -> None:
+        """Encola un item; bloquea mientras la cola está llena."""
+        await self._queue.put(item)
+        if self._sizeof is not None:
+            self.queued_bytes += self._sizeof(item)
+
+    async def _worker(self) -> None:
+        while True:
+            item = await self._queue.get()
+            try:
+                if isinstance(item, _Stop):
+                    return
+                if self._sizeof is not None:
+                    self.queued_bytes -= self._sizeof(item)
+                with self.meter.track():
+                    await self._handler(item)
+            except Exception:
+                # Los handlers manejan sus propios errores: esto es un bug
+                logger.exception(f"[{self.name}] Stage handler failed")
+            finally:
+                self._queue.task_done()
+
+    async def close(self, timeout: float | None = None) -> None:
+        """Procesa lo encolado y detiene los workers.
+
+        Las marcas de fin van detrás de los items pendientes (FIFO). Si no
+        terminan en ``timeout`` segundos, los workers se cancelan.
+        """
+        self.start()
+        tasks, self._tasks = self._tasks, []
+        try:
+            async with asyncio.timeout(timeout):
+                for _ in tasks:
+                    await self._queue.put(_STOP)
+                await asyncio.gather(*tasks)
+        except TimeoutError:
+            for task in tasks:
+                task.cancel()
+            await asyncio.wait(tasks)
+            logger.warning(f"[{self.name}] Workers cancelled after {timeout}s on close")
+
+    def metrics(self) -> StageMetrics:
+        return self.meter.snapshot(self._queue.qsize(), self.capacity)
@@ -2,21 +2,25 @@
 
 Pydantic models with frozen=True for immutability.
 Reference: AGENTS.md - model_config = {"frozen": True} OBLIGATORIO
+
+Los snapshots que se crean en el hot path (una vez por página) son
+msgspec Structs frozen: mismos campos y semántica, sin coste de validación.
 """
 
 from typing import Any
 
+import msgspec
 from pydantic import BaseModel, Field
 
 
-class EngineStats(BaseModel):
+class EngineStats(msgspec.Struct, frozen=True, kw_only=True):
     """Immutable snapshot of engine statistics.
 
-    Used for UI updates and progress tracking.
+    Used for UI updates and progress tracking. Built on every progress
+    notification, so it is a slotted msgspec Struct instead of a pydantic
+    model (all fields are counters produced by the engine itself).
     """
 
-    model_config = {"frozen": True}
-
     pages_completed: int = 0
     pages_total: int = 0
     assets_completed: int = 0
@@ -36,6 +40,43 @@ class EngineStats(BaseModel):
         return self.pages_completed / elapsed_seconds
 
 
+class StageMetrics(msgspec.Struct, frozen=True, kw_only=True):
+    """Snapshot of one pipeline stage (fetch, parse or write)."""
+
+    name: str
+    workers: int
+    busy: int = 0
+    queue_depth: int = 0
+    capacity: int = 0  # 0 = unbounded
+    processed: int = 0
+    utilization: float = 0.0  # Busy fraction of the pool in the last window
+
+
+class FetchedPage(msgspec.Struct, kw_only=True):
+    """Downloaded page waiting for extraction (fetch -> parse queue).
+
+    Mutable on purpose: the parse stage clears ``raw_html`` as soon as it
+    takes it, so the queue item does not pin the HTML during extraction.
+    """
+
+    url: str
+    raw_html: str
+    over_budget: str | None
+    time_left: float  # Page deadline budget left when enqueued
+    start_time: float
+
+
+class ExtractedPage(msgspec.Struct, frozen=True, kw_only=True):
+    """Extracted page waiting to be written (parse -> write queue)."""
+
+    url: str
+    metadata: dict[str, Any]
+    text_data: dict[str, Any]
+    raw_size: int
+    time_left: float
+    start_time: float
+
+
 class PageResult(BaseModel):
     """Result of processing a single page.
 
@@ -69,7 +110,7 @@ class DashboardState(BaseModel):
     This is what gets sent to the UI on each update.
     """
 
-    model_config = {"frozen": True}
+    model_config = {"frozen": True, "arbitrary_types_allowed": True}
 
     # Mission info
     base_url: str = ""
@@ -89,6 +130,9 @@ class DashboardState(BaseModel):
     # Timing
     elapsed_seconds: float = 0.0
 
+    # Pipeline stages (fetch, parse, write)
+    stages: list[StageMetrics] = Field(default_factory=list)
+
 
 class WorkerEvent(BaseModel):
     """Event emitted by workers for dashboard notification.
@@ -63,6 +63,18 @@ class StateManager:
                 )
                 """
             )
+            # Cookies de clearance del navegador por dominio (reutilizadas en
+            # el fast path entre ejecuciones)
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS domain_cookies (
+                    domain TEXT PRIMARY KEY,
+                    cookies TEXT NOT NULL,
+                    user_agent TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
             # Índices para queries comunes
             await db.execute(
                 "CREATE INDEX IF NOT EXISTS idx_status_type ON urls(status, type)"
@@ -214,6 +226,15 @@ class StateManager:
             if len(self._status_buffer) >= self._batch_size:
                 await self._flush_status_buffer()
 
+    async def reclassify_url(self, url: str, m_type: str) -> None:
+        """Cambia el tipo de una URL y la deja pendiente (p.ej. página → asset)."""
+        async with self.pool.acquire() as db:
+            await db.execute(
+                "UPDATE urls SET type = ?, status = ?, last_error = NULL WHERE url = ?",
+                (m_type, MigrationStatus.PENDING.value, url),
+            )
+            await db.commit()
+
     async def increment_retry(self, url: str) -> int:
         """Incrementa contador de reintentos y retorna el nuevo valor."""
         async with self.pool.acquire() as db:
@@ -322,3 +343,31 @@ class StateManager:
                 (domain, pid),
             )
             await db.commit()
+
+    async def save_domain_cookies(
+        self, domain: str, cookies_json: str, user_agent: str | None
+    ) -> None:
+        """Guarda (o reemplaza) las cookies de clearance de un dominio."""
+        async with self.pool.acquire() as db:
+            await db.execute(
+                """INSERT OR REPLACE INTO domain_cookies
+                   (domain, cookies, user_agent, updated_at)
+                   VALUES (?, ?, ?, CURRENT_TIMESTAMP)""",
+                (domain, cookies_json, user_agent),
+            )
+            await db.commit()
+
+    async def delete_domain_cookies(self, domain: str) -> None:
+        """Elimina las cookies de un dominio (clearance rechazada)."""
+        async with self.pool.acquire() as db:
+            await db.execute("DELETE FROM domain_cookies WHERE domain = ?", (domain,))
+            await db.commit()
+
+    async def load_domain_cookies(self) -> list[tuple[str, str, str | None]]:
+        """Cookies persistidas: filas ``(dominio, cookies JSON, user_agent)``."""
+        async with self.pool.acquire() as db:
+            async with db.execute(
+                "SELECT domain, cookies, user_agent FROM domain_cookies"
+            ) as cursor:
+                rows = await cursor.fetchall()
+        return [(row[0], row[1], row[2]) for row in rows]
@@ -1,14 +1,15 @@
+import mimetypes
 from pathlib import Path
 from typing import Any
 
 import aiofiles
-import ftfy
-import yaml
 from markitdown import MarkItDown
 
 from uif_scraper.extractors.base import IExtractor
 from uif_scraper.utils.url_utils import slugify
 from uif_scraper.utils.mmap_utils import mmap_file_info
+from uif_scraper.utils.serialization import dump_frontmatter
+from uif_scraper.utils.text_utils import fix_text
 
 
 class AssetExtractor(IExtractor):
@@ -23,7 +24,9 @@ class AssetExtractor(IExtractor):
         self._mmap_threshold = 50 * 1024 * 1024
         self._chunk_size = 8192
 
-    async def extract(self, content: bytes, url: str) -> dict[str, Any]:
+    async def extract(
+        self, content: bytes, url: str, content_type: str | None = None
+    ) -> dict[str, Any]:
         """Extrae y guarda un asset con manejo optimizado de memoria.
 
         Estrategias según tamaño:
@@ -34,12 +37,16 @@ class AssetExtractor(IExtractor):
         Args:
             content: Contenido binario del asset
             url: URL de origen
+            content_type: Content-Type de la respuesta; da la extensión cuando
+                la URL no la tiene
 
         Returns:
             Diccionario con paths locales y metadata de conversión.
         """
         parsed_url = Path(url)
         ext = parsed_url.suffix.lower()
+        if not ext and content_type:
+            ext = mimetypes.guess_extension(content_type.split(";")[0].strip()) or ""
         filename = f"{slugify(parsed_url.stem or 'asset')}{ext}"
 
         # Determine folder: docs for documents, images for media
@@ -85,7 +92,7 @@ class AssetExtractor(IExtractor):
         if ext in {".pdf", ".docx", ".pptx", ".xlsx"}:
             try:
                 conversion = self.md_converter.convert(str(local_path))
-                md_content = ftfy.fix_text(conversion.text_content)
+                md_content = fix_text(conversion.text_content)
                 md_path = local_path.with_suffix(".md")
 
                 metadata = {
@@ -94,7 +101,7 @@ class AssetExtractor(IExtractor):
                     "format": ext.lstrip(".").upper(),
                     "ingestion_engine": "UIF v3.0",
                 }
-                frontmatter = yaml.dump(metadata, allow_unicode=True, sort_keys=False)
+                frontmatter = dump_frontmatter(metadata)
 
                 # ASYNC FILE I/O para markdown
                 async with aiofiles.open(md_path, "w", encoding="utf-8") as f_md:
@@ -116,7 +123,7 @@ class AssetExtractor(IExtractor):
                     "format": "MARKDOWN",
                     "ingestion_engine": "UIF v3.0",
                 }
-                frontmatter = yaml.dump(metadata, allow_unicode=True, sort_keys=False)
+                frontmatter = dump_frontmatter(metadata)
 
                 # ASYNC FILE I/O para markdown
                 async with aiofiles.open(md_path, "w", encoding="utf-8") as f_md:
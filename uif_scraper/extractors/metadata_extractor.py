@@ -1,23 +1,28 @@
 from __future__ import annotations
 
-import hashlib
 import json
-from functools import lru_cache
+import threading
 from typing import Any
 from urllib.parse import urlparse
 
+from cachetools import LRUCache
 from html_to_markdown import (
     ConversionOptions,
     MetadataConfig,
     convert_with_metadata,
 )
 from pydantic import BaseModel, Field
+from selectolax.parser import HTMLParser
 
 from uif_scraper.extractors.base import IExtractor
 
 
 class DocumentHeader(BaseModel):
-    """Header extraído del documento para TOC."""
+    """Header extraído del documento para TOC.
+
+    Esquema de frontera (validación de datos externos). En el hot path los
+    headers viajan como dicts con las mismas claves: ``level``, ``text``, ``id``.
+    """
 
     model_config = {"frozen": True}
 
@@ -27,7 +32,11 @@ class DocumentHeader(BaseModel):
 
 
 class ExtendedMetadata(BaseModel):
-    """Metadata completa del documento para RAG optimizado."""
+    """Metadata completa del documento para RAG optimizado.
+
+    Esquema de frontera. ``MetadataExtractor`` produce directamente el dict
+    equivalente a ``ExtendedMetadata(...).model_dump()`` sin instanciarlo.
+    """
 
     model_config = {"frozen": True}
 
@@ -61,14 +70,25 @@ class ExtendedMetadata(BaseModel):
     headers: list[DocumentHeader] = Field(default_factory=list)
 
 
+_INGESTION_ENGINE: str = ExtendedMetadata.model_fields["ingestion_engine"].default
+
+# Cuánto HTML mirar en extract_basic si no aparece </head>
+_BASIC_HEAD_LIMIT = 64 * 1024
+
+
+def _normalize_title(title: Any) -> str:
+    """Recorta sufijos de sitio ("Página | Sitio", "Página - Sitio")."""
+    return str(title).split("|")[0].split(" - ")[0].strip()
+
+
 class MetadataExtractor(IExtractor):
     """Extractor de metadata con caché LRU para contenido repetido.
 
-    Usa functools.lru_cache que es:
-    - Thread-safe por defecto
-    - Más rápido que implementación custom
-    - Incluye cache_info() para monitoring
-    - maxsize configurable para controlar memoria
+    La clave de caché es compacta (hash del contenido, longitud, URL): el
+    HTML crudo no queda retenido en la caché, solo el dict de metadata.
+
+    Los métodos ``*_sync`` hacen el trabajo de CPU y son seguros entre hilos
+    (el engine los ejecuta en su pool de parse); los async los envuelven.
     """
 
     def __init__(self, cache_size: int = 1000):
@@ -79,13 +99,19 @@ class MetadataExtractor(IExtractor):
                        Cada entrada ~1KB, total ~1MB de memoria.
         """
         self._cache_size = cache_size
-        # Configurar caché dinámicamente
-        self._extract_metadata_cached = lru_cache(maxsize=cache_size)(
-            self._extract_metadata_pure
+        self._cache: LRUCache[tuple[int, int, str, bool], dict[str, Any]] = LRUCache(
+            maxsize=cache_size
         )
+        self._hits = 0
+        self._misses = 0
+        self._cache_lock = threading.Lock()
 
     def _extract_metadata_pure(
-        self, content_hash: str, content: str, url: str
+        self,
+        content_hash: str,
+        content: str,
+        url: str,
+        with_structured_data: bool = True,
     ) -> dict[str, Any]:
         """Extracción completa de metadata con html-to-markdown.
 
@@ -98,6 +124,7 @@ class MetadataExtractor(IExtractor):
             content_hash: Hash del contenido para caché
             content: HTML crudo
             url: URL de origen
+            with_structured_data: Si extraer JSON-LD / Microdata / RDFa
 
         Returns:
             Diccionario con metadata completa extraída
@@ -111,7 +138,7 @@ class MetadataExtractor(IExtractor):
             extract_headers=True,  # H1-H6 para TOC
             extract_links=False,  # No necesitamos links aquí
             extract_images=False,  # No necesitamos imágenes aquí
-            extract_structured_data=True,  # JSON-LD, Microdata, RDFa
+            extract_structured_data=with_structured_data,  # JSON-LD, Microdata, RDFa
         )
 
         # Convertir y extraer metadata (no usamos el markdown aquí)
@@ -166,7 +193,7 @@ class MetadataExtractor(IExtractor):
         # Prioridad: OG title > title tag > "Documento" (los tests esperan OG primero)
         title = og_title or doc_meta.get("title") or "Documento"
         if title:
-            title = str(title).split("|")[0].split(" - ")[0].strip()
+            title = _normalize_title(title)
 
         # Author: meta tag > "Desconocido"
         author = doc_meta.get("author") or "Desconocido"
@@ -213,45 +240,47 @@ class MetadataExtractor(IExtractor):
 
         # === HEADERS H1-H6 (para TOC - Fase B) ===
         # html-to-markdown ya extrae headers con nivel, texto, id
-        headers: list[DocumentHeader] = []
+        # (dicts planos: mismas claves que DocumentHeader, sin validar)
+        headers: list[dict[str, Any]] = []
         headers_raw = md_metadata.get("headers", [])
         for h in headers_raw:
             if isinstance(h, dict):
                 level = h.get("level", 1)
                 text = h.get("text", "")
-                header_id = h.get("id")
                 if text and 1 <= level <= 6:
-                    headers.append(
-                        DocumentHeader(
-                            level=level,
-                            text=text,
-                            id=header_id,
-                        )
-                    )
+                    headers.append({"level": level, "text": text, "id": h.get("id")})
 
         # === CONSTRUIR RESPONSE ===
-        metadata = ExtendedMetadata(
-            url=url,
-            title=title,
-            author=author,
-            date=date,
-            sitename=sitename,
-            description=description,
-            keywords=keywords,
-            og_title=og_title,
-            og_description=og_description,
-            og_image=og_image,
-            og_type=og_type,
-            twitter_card=twitter_card,
-            twitter_site=twitter_site,
-            twitter_title=twitter_title,
-            json_ld=json_ld,
-            headers=headers,
-        )
+        # Mismo orden de claves que ExtendedMetadata.model_dump()
+        return {
+            "url": url,
+            "title": title,
+            "author": author,
+            "date": date,
+            "sitename": sitename,
+            "ingestion_engine": _INGESTION_ENGINE,
+            "description": description,
+            "keywords": keywords,
+            "og_title": og_title,
+            "og_description": og_description,
+            "og_image": og_image,
+            "og_type": og_type,
+            "twitter_card": twitter_card,
+            "twitter_site": twitter_site,
+            "twitter_title": twitter_title,
+            "json_ld": json_ld,
+            "headers": headers,
+        }
 
-        return metadata.model_dump()
+    async def extract(
+        self, content: Any, url: str, structured_data: bool = True
+    ) -> dict[str, Any]:
+        """Extrae metadata con caché LRU automático (ver ``extract_sync``)."""
+        return self.extract_sync(content, url, structured_data)
 
-    async def extract(self, content: Any, url: str) -> dict[str, Any]:
+    def extract_sync(
+        self, content: Any, url: str, structured_data: bool = True
+    ) -> dict[str, Any]:
         """Extrae metadata con caché LRU automático.
 
         El caché usa hash del contenido para detectar duplicados,
@@ -261,6 +290,7 @@ class MetadataExtractor(IExtractor):
         Args:
             content: HTML crudo
             url: URL de origen
+            structured_data: Si extraer JSON-LD / Microdata / RDFa
 
         Returns:
             Diccionario con metadata extraída
@@ -268,13 +298,81 @@ class MetadataExtractor(IExtractor):
         if not content or not isinstance(content, str):
             return {}
 
-        # Hash del contenido para caché (primeros 10KB son suficientes)
-        content_hash = hashlib.md5(content[:10000].encode()).hexdigest()
+        # hash() de str no copia el contenido y queda cacheado en el objeto
+        key = (hash(content), len(content), url, structured_data)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._hits += 1
+                return cached
+            self._misses += 1
+
+        # La conversión va fuera del lock: otros hilos siguen extrayendo
+        result = self._extract_metadata_pure(
+            f"{key[0]:x}", content, url, structured_data
+        )
+        with self._cache_lock:
+            self._cache[key] = result
+        return result
 
-        # Extraer con caché
-        result = self._extract_metadata_cached(content_hash, content, url)
+    async def extract_basic(self, content: Any, url: str) -> dict[str, Any]:
+        """Metadata mínima del ``<head>`` (ver ``extract_basic_sync``)."""
+        return self.extract_basic_sync(content, url)
 
-        return result
+    def extract_basic_sync(self, content: Any, url: str) -> dict[str, Any]:
+        """Metadata mínima leyendo solo el ``<head>`` (perfil "fast").
+
+        Evita la conversión completa a markdown de ``convert_with_metadata``:
+        título, descripción, keywords y Open Graph básicos. Devuelve las
+        mismas claves que ``extract`` (sin headers ni JSON-LD).
+
+        Args:
+            content: HTML crudo
+            url: URL de origen
+
+        Returns:
+            Diccionario con metadata básica
+        """
+        if not content or not isinstance(content, str):
+            return {}
+
+        head_end = content.find("</head>", 0, _BASIC_HEAD_LIMIT * 4)
+        head_html = (
+            content[: head_end + 7] if head_end >= 0 else content[:_BASIC_HEAD_LIMIT]
+        )
+        tree = HTMLParser(head_html)
+
+        meta: dict[str, str] = {}
+        for node in tree.css("meta[content]"):
+            attrs = node.attributes
+            name = attrs.get("property") or attrs.get("name")
+            if name and name.lower() not in meta:
+                meta[name.lower()] = attrs.get("content") or ""
+
+        title_node = tree.css_first("title")
+        doc_title = title_node.text(strip=True) if title_node is not None else None
+        og_title = meta.get("og:title")
+        keywords_raw = meta.get("keywords", "")
+
+        return {
+            "url": url,
+            "title": _normalize_title(og_title or doc_title or "Documento"),
+            "author": meta.get("author") or "Desconocido",
+            "date": "N/A",
+            "sitename": meta.get("og:site_name") or urlparse(url).netloc,
+            "ingestion_engine": _INGESTION_ENGINE,
+            "description": meta.get("description"),
+            "keywords": [k.strip() for k in keywords_raw.split(",") if k.strip()],
+            "og_title": og_title,
+            "og_description": meta.get("og:description"),
+            "og_image": meta.get("og:image"),
+            "og_type": meta.get("og:type"),
+            "twitter_card": meta.get("twitter:card"),
+            "twitter_site": meta.get("twitter:site"),
+            "twitter_title": meta.get("twitter:title"),
+            "json_ld": None,
+            "headers": [],
+        }
 
     def get_cache_info(self) -> dict[str, Any]:
         """Obtiene estadísticas de caché para monitoring.
@@ -282,20 +380,21 @@ class MetadataExtractor(IExtractor):
         Returns:
             Diccionario con hits, misses, tamaño actual y máximo.
         """
-        info = self._extract_metadata_cached.cache_info()
+        total = self._hits + self._misses
         return {
-            "hits": info.hits,
-            "misses": info.misses,
-            "maxsize": info.maxsize if info.maxsize is not None else 0,
-            "currsize": info.currsize,
+            "hits": self._hits,
+            "misses": self._misses,
+            "maxsize": self._cache_size,
+            "currsize": len(self._cache),
             "hit_rate_percent": round(
-                (info.hits / (info.hits + info.misses) * 100)
-                if (info.hits + info.misses) > 0
-                else 0,
+                (self._hits / total * 100) if total > 0 else 0,
                 2,
             ),
         }
 
     def clear_cache(self) -> None:
         """Limpia completamente la caché de metadata."""
-        self._extract_metadata_cached.cache_clear()
+        with self._cache_lock:
+            self._cache.clear()
+            self._hits = 0
+            self._misses = 0
@@ -1,5 +1,6 @@
 import io
 import time
+from collections.abc import Callable, Iterable
 from typing import Any
 
 from bs4 import BeautifulSoup
@@ -8,9 +9,19 @@ from loguru import logger
 from markitdown import MarkItDown
 
 from uif_scraper.extractors.base import IExtractor
+from uif_scraper.utils.page_guard import degraded_text, no_checkpoint
+from uif_scraper.utils.template_learner import FALLBACK_ENGINES
 from uif_scraper.utils.text_utils import clean_text
 
 
+# Errores documentados de ``convert`` (core en Rust): HTML inválido o un panic
+_CONVERT_ERRORS = (ValueError, RuntimeError)
+
+
+class _SkippedAttempt(Exception):
+    """Intento de extracción omitido (motor aprendido o perfil de extracción)."""
+
+
 class TextExtractor(IExtractor):
     """Extractor de texto con fallback automático y métricas de performance.
 
@@ -18,6 +29,9 @@ class TextExtractor(IExtractor):
     - 18x más rápido que trafilatura (280 MB/s vs 15 MB/s)
     - Type hints completos para Python 3.12+
     - Mejor preservación de estructura semántica
+
+    Los métodos ``*_sync`` son el trabajo de CPU, sin estado compartido: el
+    engine los ejecuta en su pool de parse.
     """
 
     def __init__(self) -> None:
@@ -25,12 +39,46 @@ class TextExtractor(IExtractor):
         # Pre-crear opciones de conversión para reutilizar
         self._options = ConversionOptions(heading_style="atx")
 
-    async def extract(self, content: Any, url: str) -> dict[str, Any]:
+    async def extract(
+        self,
+        content: Any,
+        url: str,
+        preferred_engine: str | None = None,
+        fallbacks: bool = True,
+        fix_text: bool = True,
+    ) -> dict[str, Any]:
+        """Extrae texto como markdown con fallback (ver ``extract_sync``)."""
+        return self.extract_sync(
+            content,
+            url,
+            preferred_engine=preferred_engine,
+            fallbacks=fallbacks,
+            fix_text=fix_text,
+        )
+
+    def extract_sync(
+        self,
+        content: Any,
+        url: str,
+        preferred_engine: str | None = None,
+        fallbacks: bool = True,
+        fix_text: bool = True,
+        checkpoint: Callable[[], None] | None = None,
+    ) -> dict[str, Any]:
         """Extrae texto como markdown usando html-to-markdown con fallback.
 
         Args:
             content: HTML crudo a procesar
             url: URL de origen para logging y debugging
+            preferred_engine: Motor que ya ganó en esta plantilla de sitio
+                ("markitdown" o "beautifulsoup-parachute"): se saltan los
+                intentos previos que se sabe que no alcanzan
+            fallbacks: Si False (perfil "fast") se acepta la salida de
+                html-to-markdown aunque sea corta y, si está vacía, se pasa
+                directo al parachute sin MarkItDown
+            fix_text: Si pasar el markdown por ftfy
+            checkpoint: Se llama antes de cada fallback; puede lanzar para
+                abandonar la página (p.ej. deadline agotado)
 
         Returns:
             Diccionario con markdown extraído y motor utilizado.
@@ -40,11 +88,15 @@ class TextExtractor(IExtractor):
             logger.debug("Empty or invalid content for %s", url)
             return {"markdown": "", "engine": "none"}
 
+        check = checkpoint or no_checkpoint
         extracted_md: str | None = None
         engine = "html-to-markdown"
         error_context: dict[str, Any] = {}
 
         try:
+            if preferred_engine in FALLBACK_ENGINES:
+                raise _SkippedAttempt(preferred_engine)
+
             start_time = time.perf_counter()
             # Conversión HTML→Markdown con html-to-markdown (Rust core)
             extracted_md = convert(content, self._options)
@@ -72,6 +124,8 @@ class TextExtractor(IExtractor):
                         "content_length": len(content),
                     },
                 )
+        except _SkippedAttempt:
+            extracted_md = None
         except Exception as e:
             error_context = {
                 "url": url,
@@ -85,8 +139,12 @@ class TextExtractor(IExtractor):
 
         # NIVEL 2: Fallback a MarkItDown si html-to-markdown es insuficiente
         # Reducido de 250 a 100 chars para ser menos agresivo
-        if not extracted_md or len(extracted_md) < 100:
+        if not extracted_md or (fallbacks and len(extracted_md) < 100):
+            check()
             try:
+                if preferred_engine == "beautifulsoup-parachute" or not fallbacks:
+                    raise _SkippedAttempt(preferred_engine)
+
                 html_stream = io.BytesIO(content.encode("utf-8"))
                 conversion_result = self.md_converter.convert_stream(
                     html_stream, extension=".html"
@@ -114,6 +172,7 @@ class TextExtractor(IExtractor):
                 )
 
                 # NIVEL 3: Parachute con BeautifulSoup (siempre devuelve algo)
+                check()
                 try:
                     soup = BeautifulSoup(content, "lxml")
                     # Extraer texto visible, descartando scripts/styles
@@ -137,7 +196,7 @@ class TextExtractor(IExtractor):
                     extracted_md = f"[Content extraction failed for {url}]\n\nRaw HTML length: {len(content)} chars"
                     engine = "extraction-failed"
 
-        cleaned_markdown = clean_text(extracted_md)
+        cleaned_markdown = clean_text(extracted_md, fix_encoding=fix_text)
 
         # Log final result con longitud
         logger.debug(
@@ -150,3 +209,107 @@ class TextExtractor(IExtractor):
         )
 
         return {"markdown": cleaned_markdown, "engine": engine}
+
+    async def extract_stream(
+        self, chunks: Iterable[str], url: str, fix_text: bool = True
+    ) -> dict[str, Any]:
+        """Convierte HTML limpio por chunks (ver ``extract_stream_sync``)."""
+        return self.extract_stream_sync(chunks, url, fix_text=fix_text)
+
+    def extract_stream_sync(
+        self,
+        chunks: Iterable[str],
+        url: str,
+        fix_text: bool = True,
+        checkpoint: Callable[[], None] | None = None,
+    ) -> dict[str, Any]:
+        """Convierte a markdown HTML limpio que llega por chunks.
+
+        Pensado para páginas gigantes limpiadas con ``StreamingHTMLCleaner``:
+        cada chunk se convierte por separado y solo se acumula el markdown,
+        nunca el HTML completo.
+
+        Args:
+            chunks: Fragmentos de HTML limpio y bien formado
+            url: URL de origen para logging y debugging
+            fix_text: Si pasar el markdown por ftfy
+            checkpoint: Se llama antes de cada chunk; puede lanzar para
+                abandonar la página (p.ej. deadline agotado)
+
+        Returns:
+            Diccionario con markdown extraído y motor utilizado.
+        """
+        check = checkpoint or no_checkpoint
+        parts: list[str] = []
+        failed_chunks = 0
+        start_time = time.perf_counter()
+
+        for chunk in chunks:
+            check()
+            try:
+                markdown = convert(chunk, self._options)
+            except _CONVERT_ERRORS as e:
+                # Un chunk roto no invalida la página: texto plano de ese chunk
+                failed_chunks += 1
+                logger.debug(
+                    "html-to-markdown failed on chunk, using plain text",
+                    extra={"url": url, "error": str(e)},
+                )
+                markdown = BeautifulSoup(chunk, "lxml").get_text("\n", strip=True)
+            if markdown.strip():
+                parts.append(markdown.strip())
+
+        if not parts:
+            return {"markdown": "", "engine": "none"}
+
+        cleaned_markdown = clean_text("\n\n".join(parts), fix_encoding=fix_text)
+        logger.debug(
+            "Streaming text extraction completed",
+            extra={
+                "url": url,
+                "chunks": len(parts),
+                "failed_chunks": failed_chunks,
+                "duration_ms": round((time.perf_counter() - start_time) * 1000, 2),
+                "output_length": len(cleaned_markdown),
+            },
+        )
+        return {"markdown": cleaned_markdown, "engine": "html-to-markdown-streaming"}
+
+    async def extract_degraded(
+        self, content: Any, url: str, fix_text: bool = True
+    ) -> dict[str, Any]:
+        """Extracción sin árbol DOM (ver ``extract_degraded_sync``)."""
+        return self.extract_degraded_sync(content, url, fix_text=fix_text)
+
+    def extract_degraded_sync(
+        self, content: Any, url: str, fix_text: bool = True
+    ) -> dict[str, Any]:
+        """Extracción rápida para documentos fuera de presupuesto de complejidad.
+
+        No construye árbol DOM: ni poda por densidad, ni html-to-markdown, ni
+        parachute de BeautifulSoup, cuyo coste crece con el anidamiento.
+        Devuelve texto con headings markdown y un párrafo por bloque.
+
+        Args:
+            content: HTML crudo
+            url: URL de origen para logging y debugging
+            fix_text: Si pasar el texto por ftfy
+
+        Returns:
+            Diccionario con markdown extraído y motor utilizado.
+        """
+        if not content or not isinstance(content, str):
+            return {"markdown": "", "engine": "none"}
+
+        start_time = time.perf_counter()
+        cleaned_markdown = clean_text(degraded_text(content), fix_encoding=fix_text)
+        logger.debug(
+            "Degraded text extraction completed",
+            extra={
+                "url": url,
+                "input_length": len(content),
+                "duration_ms": round((time.perf_counter() - start_time) * 1000, 2),
+                "output_length": len(cleaned_markdown),
+            },
+        )
+        return {"markdown": cleaned_markdown, "engine": "degraded-text"}
@@ -1,5 +1,15 @@
 """Network infrastructure components for UIF."""
 
+from uif_scraper.infrastructure.network.page_client import (
+    NonHTMLContentError,
+    PageClient,
+    PageTooLargeError,
+)
 from uif_scraper.infrastructure.network.resilient_transport import ResilientTransport
 
-__all__ = ["ResilientTransport"]
+__all__ = [
+    "NonHTMLContentError",
+    "PageClient",
+    "PageTooLargeError",
+    "ResilientTransport",
+]
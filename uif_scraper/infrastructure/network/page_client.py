@@ -0,0 +1,364 @@
+"""Cliente HTTP de páginas con pool persistente sobre ResilientTransport.
+
+``AsyncFetcher.get`` crea una sesión curl por llamada: cada página paga DNS,
+TCP y handshake TLS. ``PageClient`` mantiene un único ``httpx.AsyncClient``
+durante la misión sobre el ``ResilientTransport`` (curl_cffi con
+impersonation, keep-alive y HTTP/2), así que las páginas del mismo host
+reutilizan conexiones y pasan por los reintentos y circuit breakers del
+transport.
+
+El body se lee en streaming tras mirar los headers:
+
+- Una respuesta 2xx cuyo ``Content-Type`` no es HTML (PDF, ZIP, vídeo detrás
+  de una URL sin extensión) se corta sin descargar el body y se señala con
+  ``NonHTMLContentError`` para que el engine la pase al pipeline de assets.
+- Un body que supera ``max_bytes`` (por ``Content-Length`` o mientras se lee)
+  se aborta con ``PageTooLargeError``.
+
+Con ``hedge_budget``, un request que no ha recibido headers cuando se
+cumple el p95 de latencia observado para su host lanza un segundo request
+(hedge) por otro pool de conexiones (``hedge_transport``). Gana la primera
+respuesta sana y la otra se cancela; un error o un 5xx (p.ej. el 504 del
+transport con los reintentos agotados) solo se devuelve si ninguno consigue
+otra cosa. No se cubren hosts con el circuit breaker fuera de "closed": en
+half-open el primario es la única sonda. El presupuesto acota la carga extra
+sobre el sitio.
+
+Los timeouts de connect, read y total salen de ``AdaptiveTimeouts``: un
+múltiplo del p99 reciente de cada host, entre un suelo y un techo, en vez
+de los mismos 30 s para un host que responde en 100 ms y para uno que
+tarda 20 s.
+
+Las respuestas se convierten a ``scrapling`` ``Response`` para que el resto
+del engine (captcha, links, extracción) no cambie.
+
+Uso:
+    client = PageClient(create_resilient_transport(impersonate="chrome"))
+    page = await client.get("https://example.com/", timeout=30.0)
+    print(page.status, page.css("title::text").get())
+
+    # Al finalizar la misión:
+    await client.aclose()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+import httpx
+from scrapling.engines.toolbelt.custom import Response
+
+from uif_scraper.infrastructure.network.resilient_transport import (
+    ResilientTransport,
+    measures_origin_latency,
+)
+from uif_scraper.utils.host_latency import AdaptiveTimeouts, HedgeBudget
+
+logger = logging.getLogger(__name__)
+
+# Hedging: cuantil de latencia del host tras el que sale el hedge, muestras
+# mínimas para fiarse de él y espera mínima (hosts muy rápidos no se cubren)
+HEDGE_QUANTILE = 0.95
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY_SECONDS = 0.05
+
+# Content-Types que el path de páginas procesa; el resto son assets
+HTML_CONTENT_TYPES = frozenset({"text/html", "application/xhtml+xml"})
+
+
+class NonHTMLContentError(Exception):
+    """La URL se pidió como página pero el servidor devuelve otro tipo."""
+
+    def __init__(self, url: str, content_type: str):
+        self.url = url
+        self.content_type = content_type
+        super().__init__(f"Non-HTML content at {url}: {content_type}")
+
+
+class PageTooLargeError(Exception):
+    """El body de la página supera el máximo permitido."""
+
+    def __init__(self, url: str, size: int, limit: int):
+        self.url = url
+        self.size = size
+        self.limit = limit
+        super().__init__(f"Page {url} exceeds {limit} bytes ({size}+ bytes)")
+
+
+def is_html_content_type(content_type: str | None) -> bool:
+    """True si el ``Content-Type`` es HTML (o no viene: se asume HTML)."""
+    if not content_type:
+        return True
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return not media_type or media_type in HTML_CONTENT_TYPES
+
+
+def to_scrapling_response(
+    response: httpx.Response, content: bytes | None = None
+) -> Response:
+    """Convierte una respuesta httpx en la ``Response`` de scrapling.
+
+    Args:
+        response: Respuesta httpx
+        content: Body ya leído en streaming (None = ``response.content``)
+    """
+    request = response.request
+    return Response(
+        url=str(response.url),
+        content=response.content if content is None else content,
+        status=response.status_code,
+        reason=response.reason_phrase,
+        cookies=dict(response.cookies),
+        headers=dict(response.headers),
+        request_headers=dict(request.headers),
+        encoding=response.charset_encoding or "utf-8",
+        method=request.method,
+        history=list(response.history),
+    )
+
+
+def _is_healthy(task: asyncio.Future[httpx.Response]) -> bool:
+    """True si el request terminó con una respuesta que no es un fallo."""
+    if task.exception() is not None:
+        return False
+    status = task.result().status_code
+    return status < 500 and status != 421
+
+
+class PageClient:
+    """Cliente de páginas con un pool de conexiones de vida de misión.
+
+    Args:
+        transport: Transport httpx (normalmente ``ResilientTransport``)
+        timeout: Timeout por defecto de cada request (segundos)
+        max_bytes: Tamaño máximo del body de una página (0 = sin límite)
+        timeouts: Timeouts adaptativos por host (None = siempre ``timeout``)
+        hedge_budget: Presupuesto de hedges (None = sin hedging)
+        hedge_transport: Transport de los hedges, con su propio pool para
+            que salgan por una conexión nueva (None = el mismo ``transport``)
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        timeout: float = 30.0,
+        max_bytes: int = 0,
+        timeouts: AdaptiveTimeouts | None = None,
+        hedge_budget: HedgeBudget | None = None,
+        hedge_transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self._transport = transport
+        self._timeout = timeout
+        self.max_bytes = max_bytes
+        self.timeouts = timeouts or AdaptiveTimeouts(timeout, enabled=False)
+        # Tiempo hasta headers por host: p99 de los timeouts y p95 del hedging
+        self.latency = self.timeouts.headers
+        self.hedge_budget = hedge_budget
+        self._hedge_transport = hedge_transport
+        # Circuit breaker del transport: no se cubren hosts en recuperación
+        self.circuit_breaker = (
+            transport.circuit_breaker
+            if isinstance(transport, ResilientTransport)
+            else None
+        )
+        self._client: httpx.AsyncClient | None = None
+        self._hedge_client: httpx.AsyncClient | None = None
+        self.requests = 0
+        self.non_html = 0
+        self.oversized = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = self._new_client(self._transport)
+            logger.debug("Created pooled page client")
+        return self._client
+
+    def _get_hedge_client(self) -> httpx.AsyncClient:
+        if self._hedge_transport is None:
+            return self._get_client()
+        if self._hedge_client is None or self._hedge_client.is_closed:
+            self._hedge_client = self._new_client(self._hedge_transport)
+        return self._hedge_client
+
+    def _new_client(self, transport: httpx.AsyncBaseTransport) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=self._timeout,
+            follow_redirects=True,
+        )
+
+    async def get(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> Response:
+        """GET de una página por el pool compartido.
+
+        Args:
+            url: URL ya normalizada
+            headers: Headers del request (Referer, Cookie, User-Agent...)
+            timeout: Techo de los timeouts de este request (None = el del
+                cliente); dentro de él manda ``timeouts``
+
+        Returns:
+            ``Response`` de scrapling con ``status``, ``headers`` y selectores.
+
+        Raises:
+            NonHTMLContentError: Respuesta 2xx que no es HTML (body sin leer).
+            PageTooLargeError: El body supera ``max_bytes``.
+        """
+        host = httpx.URL(url).host
+        limits = self.timeouts.for_host(
+            host, cap=timeout if timeout is not None else self._timeout
+        )
+        request_timeout = httpx.Timeout(limits.read, connect=limits.connect)
+        started = time.monotonic()
+        response: httpx.Response | None = None
+        try:
+            async with asyncio.timeout(limits.total):
+                delay = self._hedge_delay(host)
+                if delay is None:
+                    response = await self._send(
+                        self._get_client(), url, headers, request_timeout
+                    )
+                else:
+                    response = await self._send_hedged(
+                        url, headers, request_timeout, delay
+                    )
+                self.requests += 1
+                headers_elapsed = time.monotonic() - started
+                content = await self._read_response(response)
+        except TimeoutError:
+            self.timeouts.record_timeout(
+                host, time.monotonic() - started, headers=response is not None
+            )
+            raise
+        finally:
+            if response is not None:
+                # Cerrar sin leer el resto devuelve (o descarta) la conexión
+                await response.aclose()
+        # Solo respuestas del origen al primer intento: el 504 del transport
+        # con los reintentos agotados (o una respuesta tras reintentos) suma
+        # backoff y no la latencia del host
+        if measures_origin_latency(response):
+            self.timeouts.record(host, headers_elapsed, time.monotonic() - started)
+        return to_scrapling_response(response, content)
+
+    async def _read_response(self, response: httpx.Response) -> bytes:
+        """Comprueba el tipo de contenido y lee el body."""
+        content_type = response.headers.get("content-type")
+        if response.is_success and not is_html_content_type(content_type):
+            self.non_html += 1
+            raise NonHTMLContentError(str(response.url), content_type or "")
+        return await self._read_body(response)
+
+    @staticmethod
+    async def _send(
+        client: httpx.AsyncClient,
+        url: str,
+        headers: dict[str, str] | None,
+        timeout: httpx.Timeout,
+    ) -> httpx.Response:
+        """Envía el GET y vuelve en cuanto llegan los headers."""
+        request = client.build_request("GET", url, headers=headers, timeout=timeout)
+        return await client.send(request, stream=True)
+
+    def _hedge_delay(self, host: str) -> float | None:
+        """Espera antes del hedge para ``host`` (None = este request no se cubre)."""
+        if self.hedge_budget is None:
+            return None
+        self.hedge_budget.earn()
+        if (
+            self.circuit_breaker is not None
+            and self.circuit_breaker.get_state(host) != "closed"
+        ):
+            return None
+        p95 = self.latency.quantile(host, HEDGE_QUANTILE, HEDGE_MIN_SAMPLES)
+        if p95 is None:
+            return None
+        return max(p95, HEDGE_MIN_DELAY_SECONDS)
+
+    async def _send_hedged(
+        self,
+        url: str,
+        headers: dict[str, str] | None,
+        timeout: httpx.Timeout,
+        delay: float,
+    ) -> httpx.Response:
+        """Primario y, si no hay headers tras ``delay``, un hedge.
+
+        Gana la primera respuesta sana; si ambos fallan (error o respuesta
+        fallida) se devuelve la respuesta de cualquiera, o el error del
+        primario.
+        """
+        primary = asyncio.ensure_future(
+            self._send(self._get_client(), url, headers, timeout)
+        )
+        tasks = [primary]
+        winner: asyncio.Future[httpx.Response] | None = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and self.hedge_budget and self.hedge_budget.try_spend():
+                self.hedges += 1
+                tasks.append(
+                    asyncio.ensure_future(
+                        self._send(self._get_hedge_client(), url, headers, timeout)
+                    )
+                )
+            pending = set(tasks)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next((t for t in tasks if t in done and _is_healthy(t)), None)
+            if winner is None:
+                # Todos terminaron sin respuesta sana: mejor una respuesta
+                # (prioridad al primario) que un error
+                winner = next((t for t in tasks if t.exception() is None), None)
+        finally:
+            # El perdedor se cancela; si ya tenía respuesta, se cierra
+            losers = [t for t in tasks if t is not winner]
+            for task in losers:
+                task.cancel()
+            for result in await asyncio.gather(*losers, return_exceptions=True):
+                if isinstance(result, httpx.Response):
+                    await result.aclose()
+        if winner is None:
+            return primary.result()  # Todos fallaron: error del primario
+        if winner is not primary and _is_healthy(winner):
+            self.hedge_wins += 1
+        return winner.result()
+
+    async def _read_body(self, response: httpx.Response) -> bytes:
+        """Lee el body por chunks, abortando en cuanto supera ``max_bytes``."""
+        url = str(response.url)
+        if self.max_bytes:
+            declared = response.headers.get("content-length", "")
+            if declared.isdigit() and int(declared) > self.max_bytes:
+                self.oversized += 1
+                raise PageTooLargeError(url, int(declared), self.max_bytes)
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if self.max_bytes and len(body) > self.max_bytes:
+                self.oversized += 1
+                raise PageTooLargeError(url, len(body), self.max_bytes)
+        return bytes(body)
+
+    async def aclose(self) -> None:
+        """Cierra el cliente y el transport (fin de la misión)."""
+        for client in (self._client, self._hedge_client):
+            if client is not None and not client.is_closed:
+                await client.aclose()
+        self._client = None
+        self._hedge_client = None
+
+    @property
+    def is_active(self) -> bool:
+        """Verifica si el cliente está abierto."""
+        return self._client is not None and not self._client.is_closed
@@ -3,8 +3,10 @@
 Este módulo implementa un transport híbrido que:
 1. Usa curl_cffi como primary (TLS impersonation, Cloudflare evasion)
 2. Fallback automático a httpx nativo si curl_cffi falla
-3. Reintentos con Exponential Backoff + Jitter
-4. Circuit Breaker por dominio con LRU eviction
+3. Reintentos con Exponential Backoff + Jitter, acotados por un
+   ``RetryBudget`` que comparte con el resto de capas
+4. Circuit Breaker por dominio (``CircuitBreaker`` compartido con el engine y
+   los assets)
 5. Notifica eventos de red para visualización en la TUI
 
 Uso:
@@ -28,31 +30,69 @@ Uso:
 from __future__ import annotations
 
 import asyncio
+import importlib.util
 import logging
 import random
-import time
 from dataclasses import dataclass
 from typing import Any, Callable
 
 import httpx
+from cachetools import LRUCache
 from tenacity import (
     AsyncRetrying,
+    RetryCallState,
     retry_if_exception_type,
     stop_after_attempt,
     wait_exponential_jitter,
 )
+from tenacity.stop import stop_base
+
+from uif_scraper.utils.circuit_breaker import CircuitBreaker
+from uif_scraper.utils.dns_resolver import CachingResolver, is_ip_address
+from uif_scraper.utils.retry_budget import RetryBudget
 
 # ── CURL_CFFI SUPPORT (OPTIONAL) ─────────────────────────────────────────────
 try:
-    from httpx_curl_cffi import AsyncCurlTransport, CurlOpt
+    from httpx_curl_cffi import AsyncCurlTransport, CurlHttpVersion, CurlOpt
     CURL_CFFI_AVAILABLE = True
 except ImportError:
     CURL_CFFI_AVAILABLE = False
     AsyncCurlTransport = None  # type: ignore
+    CurlHttpVersion = None  # type: ignore
     CurlOpt = None  # type: ignore
 
+# ── HTTP/2 PARA EL FALLBACK HTTPX (OPTIONAL) ─────────────────────────────────
+H2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 logger = logging.getLogger(__name__)
 
+# Hosts cuya resolución se pasa a curl en cada request (CURLOPT_RESOLVE)
+PINNED_HOSTS_MAX = 128
+
+# Claves de ``response.extensions``: intentos que costó una respuesta del
+# origen, y marca de las respuestas generadas aquí (reintentos agotados)
+ATTEMPTS_EXTENSION = "uif_attempts"
+SYNTHETIC_EXTENSION = "uif_synthetic"
+
+# 5xx que indican un host saturado o caído: se reintentan y cuentan para el
+# circuit breaker. El resto (500, 501...) es la respuesta del origen para esa
+# URL concreta y se devuelve tal cual: reintentarla no la arregla y no debe
+# abrir el circuito de todo el host.
+RETRYABLE_STATUSES = frozenset({502, 503, 504})
+
+
+def measures_origin_latency(response: httpx.Response) -> bool:
+    """True si el tiempo del request es latencia real del origen.
+
+    Una respuesta sintética o que llegó tras reintentos incluye intentos
+    fallidos y backoff: no sirve para aprender la latencia del host.
+    """
+    extensions = response.extensions
+    return (
+        not extensions.get(SYNTHETIC_EXTENSION, False)
+        and extensions.get(ATTEMPTS_EXTENSION, 1) == 1
+    )
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CALLBACKS PARA LA TUI
@@ -131,127 +171,18 @@ class MaxRetriesExceededError(Exception):
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
-# CIRCUIT BREAKER SIMPLE (POR DOMINIO) CON LRU
+# PRESUPUESTO DE REINTENTOS
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
-class DomainCircuitBreaker:
-    """Circuit breaker simple por dominio con LRU.
-
-    Estados:
-    - closed: Operación normal
-    - open: Bloqueando peticiones por excesivos fallos
-    - half-open: Probando recuperación
-
-    Características:
-    - LRU eviction para prevenir fugas de memoria
-    - Máximo de dominios configurables (default 1000)
-    """
+class RetryBudgetStop(stop_base):
+    """Condición de stop de tenacity: sin saldo en el presupuesto no se reintenta."""
 
-    def __init__(
-        self,
-        fail_threshold: int = 5,
-        recovery_timeout: float = 60.0,
-        max_domains: int = 1000,
-    ) -> None:
-        self._fail_threshold = fail_threshold
-        self._recovery_timeout = recovery_timeout
-        self._max_domains = max_domains
-
-        # LRU cache usando OrderedDict
-        # El orden indica antigüedad: al final = más reciente
-        from collections import OrderedDict
-
-        self._failures: OrderedDict[str, int] = OrderedDict()
-        self._blocked_until: OrderedDict[str, float] = OrderedDict()
-
-    def _evict_if_needed(self) -> None:
-        """Evita el dominio menos reciente si alcanzamos el límite."""
-        # Limpiar dominios expirados primero
-        current_time = time.time()
-        expired = [
-            d
-            for d, blocked_until in self._blocked_until.items()
-            if blocked_until < current_time
-        ]
-        for d in expired:
-            del self._blocked_until[d]
-            if d in self._failures:
-                del self._failures[d]
-
-        # Si aún estamos lleno, eliminar el menos reciente
-        total_keys = len(self._failures) + len(self._blocked_until)
-        if total_keys >= self._max_domains:
-            # Eliminar el primer elemento (menos reciente)
-            if self._failures:
-                self._failures.popitem(last=False)
-            elif self._blocked_until:
-                self._blocked_until.popitem(last=False)
-
-    def _touch(self, domain: str) -> None:
-        """Marca el dominio como recientemente usado (para LRU)."""
-        # Mover al final si existe
-        if domain in self._failures:
-            self._failures.move_to_end(domain)
-        if domain in self._blocked_until:
-            self._blocked_until.move_to_end(domain)
-
-    def can_execute(self, domain: str) -> tuple[bool, float]:
-        """Verifica si se puede ejecutar una petición para el dominio.
+    def __init__(self, budget: RetryBudget) -> None:
+        self.budget = budget
 
-        Returns:
-            (puede_ejecutar, tiempo_restante)
-        """
-        # Asegurar espacio si es un dominio nuevo
-        if domain not in self._failures and domain not in self._blocked_until:
-            self._evict_if_needed()
-
-        if domain in self._blocked_until:
-            remaining = self._blocked_until[domain] - time.time()
-            if remaining > 0:
-                self._touch(domain)
-                return False, remaining
-            # Timeout expirado, pasar a half-open
-            self._failures[domain] = 0
-            del self._blocked_until[domain]
-            self._touch(domain)
-            return True, 0.0
-
-        self._touch(domain)
-        return True, 0.0
-
-    def record_success(self, domain: str) -> None:
-        """Registra éxito para el dominio."""
-        self._failures[domain] = 0
-        if domain in self._blocked_until:
-            del self._blocked_until[domain]
-        self._touch(domain)
-
-    def record_failure(self, domain: str) -> None:
-        """Registra fallo para el dominio."""
-        # Asegurar espacio
-        self._evict_if_needed()
-
-        self._failures[domain] = self._failures.get(domain, 0) + 1
-        self._touch(domain)
-
-        if self._failures[domain] >= self._fail_threshold:
-            self._blocked_until[domain] = time.time() + self._recovery_timeout
-            self._touch(domain)
-
-    def get_state(self, domain: str) -> str:
-        """Obtiene el estado actual del circuit breaker para el dominio."""
-        if domain in self._blocked_until:
-            if time.time() < self._blocked_until[domain]:
-                return "open"
-            return "half-open"
-        return "closed"
-
-    def get_failure_count(self, domain: str) -> int:
-        """Obtiene la cantidad de fallos consecutivos para el dominio."""
-        return self._failures.get(domain, 0)
-        """Obtiene la cantidad de fallos consecutivos para el dominio."""
-        return self._failures.get(domain, 0)
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        return not self.budget.try_retry()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -266,7 +197,7 @@ class ResilientTransport(httpx.AsyncBaseTransport):
     - ✅ curl_cffi como primary (TLS impersonation, Cloudflare evasion)
     - ✅ Fallback automático a httpx nativo si curl_cffi falla
     - Reintentos automáticos con Exponential Backoff + Jitter
-    - Circuit Breaker por dominio (no global) con LRU eviction
+    - Circuit Breaker por dominio (no global), compartible entre capas
     - Callbacks para eventos de red (retry, circuit state)
     - Completamente asíncrono (no bloquea la TUI)
 
@@ -282,6 +213,18 @@ class ResilientTransport(httpx.AsyncBaseTransport):
         on_circuit_change: Callback para cambios de estado del circuit breaker
         use_curl_cffi: Activar curl_cffi como backend primario (default: True)
         impersonate: Browser fingerprint para curl_cffi (default: "chrome120")
+        max_connections: Conexiones simultáneas del pool (keep-alive entre requests)
+        http2: Negociar HTTP/2 (multiplexado) cuando el servidor lo soporta
+        keepalive_expiry: Segundos que una conexión ociosa sigue en el pool
+        verify: Verificar el certificado TLS del servidor
+        resolver: Resolver DNS compartido (``CachingResolver``): curl usa sus
+            direcciones (caché y ``dns_overrides``) vía ``CURLOPT_RESOLVE``
+        retry_budget: Presupuesto de reintentos compartido (``RetryBudget``):
+            cada intento alimenta su tasa de éxito y, sin saldo, un fallo no
+            se reintenta
+        circuit_breaker: Registro de circuit breakers compartido con el
+            engine y los assets; sin él se crea uno propio con
+            ``circuit_threshold`` y ``circuit_timeout``
     """
 
     def __init__(
@@ -297,6 +240,13 @@ class ResilientTransport(httpx.AsyncBaseTransport):
         on_circuit_change: Any = None,
         use_curl_cffi: bool = True,  # ✅ NUEVO: Activar curl_cffi
         impersonate: str = "chrome120",  # ✅ NUEVO: Browser fingerprint
+        max_connections: int = 10,
+        http2: bool = True,
+        keepalive_expiry: float = 30.0,
+        verify: bool = True,
+        resolver: CachingResolver | None = None,
+        retry_budget: RetryBudget | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
     ) -> None:
         super().__init__()
         self._max_retries = max_retries
@@ -310,11 +260,30 @@ class ResilientTransport(httpx.AsyncBaseTransport):
         self.impersonate = impersonate
         self._curl_cffi_enabled = use_curl_cffi and CURL_CFFI_AVAILABLE
 
-        # Circuit breakers por dominio - NO global
-        self._circuit_breakers: dict[str, DomainCircuitBreaker] = {}
-        self._circuit_threshold = circuit_threshold
-        self._circuit_timeout = circuit_timeout
-        self._circuit_lock = asyncio.Lock()
+        # Pool persistente: las conexiones (y su sesión TLS) se reutilizan
+        self._max_connections = max_connections
+        self._http2 = http2
+        self._keepalive_expiry = keepalive_expiry
+        self._verify = verify
+
+        # DNS compartido: las entradas host:puerto:IPs se aplican a cada
+        # request de curl (curl_cffi lee este dict en cada perform)
+        self._resolver = resolver
+        self._pinned: LRUCache[str, str] = LRUCache(maxsize=PINNED_HOSTS_MAX)
+        # No vacío: curl_cffi copia un dict vacío (``curl_options or {}``) y
+        # perdería las actualizaciones de ``_pin_resolution``
+        self._curl_options: dict[Any, Any] = (
+            {CurlOpt.RESOLVE: []} if CURL_CFFI_AVAILABLE else {}
+        )
+
+        # Presupuesto de reintentos compartido con EngineCore
+        self._retry_budget = retry_budget
+
+        # Circuit breakers por dominio - NO global. Sin lock: el registro
+        # es síncrono y O(1)
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            threshold=circuit_threshold, timeout=circuit_timeout
+        )
 
         # Callbacks para la TUI
         self._on_retry_simple = on_retry
@@ -356,20 +325,38 @@ class ResilientTransport(httpx.AsyncBaseTransport):
 
         return wrapped
 
-    async def _get_circuit_breaker(self, domain: str) -> DomainCircuitBreaker:
-        """Obtiene o crea un circuit breaker para el dominio."""
-        async with self._circuit_lock:
-            if domain not in self._circuit_breakers:
-                self._circuit_breakers[domain] = DomainCircuitBreaker(
-                    fail_threshold=self._circuit_threshold,
-                    recovery_timeout=self._circuit_timeout,
-                )
-            return self._circuit_breakers[domain]
-
     def _extract_domain(self, url: httpx.URL) -> str:
         """Extrae el dominio de una URL."""
         return url.host or "unknown"
 
+    async def _pin_resolution(self, request: httpx.Request) -> None:
+        """Resuelve el host con el resolver compartido y lo fija en curl.
+
+        Raises:
+            httpx.ConnectError: El host no resuelve (reintentable como
+                cualquier fallo de conexión).
+        """
+        if self._resolver is None or not self._curl_cffi_enabled:
+            return
+        url = request.url
+        host = url.host
+        if not host or is_ip_address(host):
+            return
+        port = url.port or (443 if url.scheme == "https" else 80)
+        try:
+            addresses = await self._resolver.addresses(host)
+        except OSError as e:
+            raise httpx.ConnectError(
+                f"DNS resolution failed for {host}: {e}", request=request
+            ) from e
+        entry = f"{host}:{port}:" + ",".join(
+            f"[{ip}]" if ":" in ip else ip for ip in addresses
+        )
+        key = f"{host}:{port}"
+        if self._pinned.get(key) != entry:
+            self._pinned[key] = entry
+            self._curl_options[CurlOpt.RESOLVE] = list(self._pinned.values())
+
     def _calculate_wait_time(self, attempt: int) -> float:
         """Calcula el tiempo de espera para un intento dado."""
         exp_delay: float = min(self._base_delay * (2 ** (attempt - 1)), self._max_delay)
@@ -408,6 +395,49 @@ class ResilientTransport(httpx.AsyncBaseTransport):
             except Exception as e:
                 logger.error(f"Error in circuit callback: {e}")
 
+    async def _init_base_transport(self) -> httpx.AsyncBaseTransport:
+        async with self._transport_lock:
+            if self._base_transport is not None:
+                return self._base_transport
+            if self._curl_cffi_enabled:
+                # ✅ PRIMARY: curl_cffi con browser impersonation. El multi
+                # handle de curl mantiene las conexiones vivas entre
+                # requests y multiplexa HTTP/2 por host
+                self._base_transport = AsyncCurlTransport(
+                    impersonate=self.impersonate,
+                    default_headers=True,
+                    max_connections=self._max_connections,
+                    verify=self._verify,
+                    curl_options=self._curl_options,
+                    http_version=(
+                        CurlHttpVersion.V2TLS if self._http2 else CurlHttpVersion.V1_1
+                    ),
+                )
+                logger.info(
+                    f"Initialized AsyncCurlTransport with impersonate={self.impersonate}, "
+                    f"max_connections={self._max_connections}, http2={self._http2}"
+                )
+            else:
+                # ⚠️ FALLBACK: httpx nativo (sin TLS impersonation)
+                self._base_transport = httpx.AsyncHTTPTransport(
+                    verify=self._verify,
+                    http2=self._http2 and H2_AVAILABLE,
+                    limits=httpx.Limits(
+                        max_connections=self._max_connections,
+                        max_keepalive_connections=self._max_connections,
+                        keepalive_expiry=self._keepalive_expiry,
+                    ),
+                )
+                self._fallback_count += 1
+                self._last_fallback_reason = "curl_cffi_not_available"
+                logger.warning(
+                    f"🛡️ [NETWORK FALLBACK] curl_cffi not available "
+                    f"(use_curl_cffi={self.use_curl_cffi}, "
+                    f"CURL_CFFI_AVAILABLE={CURL_CFFI_AVAILABLE}), "
+                    f"using httpx native transport (fallback #{self._fallback_count})"
+                )
+            return self._base_transport
+
     async def handle_async_request(
         self,
         request: httpx.Request,
@@ -421,43 +451,29 @@ class ResilientTransport(httpx.AsyncBaseTransport):
         4. Circuit Breaker por dominio
 
         Este es el método principal que httpx llama cuando se hace una petición.
+
+        Raises:
+            CircuitOpenError: El circuito del dominio está abierto (o su sonda
+                de half-open ya está en vuelo). Se lanza en vez de devolver
+                un status HTTP para no confundirlo con uno real del origen.
         """
-        # Lazy init del transport base con lock para concurrencia
-        async with self._transport_lock:
-            if self._base_transport is None:
-                if self._curl_cffi_enabled:
-                    # ✅ PRIMARY: curl_cffi con browser impersonation
-                    self._base_transport = AsyncCurlTransport(
-                        impersonate=self.impersonate,
-                        default_headers=True,
-                        curl_options={CurlOpt.FRESH_CONNECT: True},  # Requerido para concurrencia
-                    )
-                    logger.info(f"Initialized AsyncCurlTransport with impersonate={self.impersonate}")
-                else:
-                    # ⚠️ FALLBACK: httpx nativo (sin TLS impersonation)
-                    self._base_transport = httpx.AsyncHTTPTransport()
-                    self._fallback_count += 1
-                    self._last_fallback_reason = "curl_cffi_not_available"
-                    logger.warning(
-                        f"🛡️ [NETWORK FALLBACK] curl_cffi not available "
-                        f"(use_curl_cffi={self.use_curl_cffi}, "
-                        f"CURL_CFFI_AVAILABLE={CURL_CFFI_AVAILABLE}), "
-                        f"using httpx native transport (fallback #{self._fallback_count})"
-                    )
+        # Lazy init del transport base; el lock solo se toma mientras no existe
+        base_transport = self._base_transport
+        if base_transport is None:
+            base_transport = await self._init_base_transport()
 
         domain = self._extract_domain(request.url)
-        circuit_breaker = await self._get_circuit_breaker(domain)
+        circuit_breaker = self.circuit_breaker
 
-        # Verificar circuit breaker
-        can_execute, retry_after = circuit_breaker.can_execute(domain)
-        if not can_execute:
+        # Verificar circuit breaker (en half-open, este request es la sonda)
+        if not circuit_breaker.should_allow(domain):
             logger.warning(f"Circuit open for {domain}, rejecting request")
-            return httpx.Response(
-                status_code=421,
-                content=f"Circuit breaker open for {domain}".encode(),
-                headers={"Retry-After": str(int(retry_after))},
-                request=request,
-            )
+            raise CircuitOpenError(domain, circuit_breaker.retry_after(domain))
+
+        # El presupuesto solo se consulta si aún quedan intentos
+        stop: stop_base = stop_after_attempt(self._max_retries)
+        if self._retry_budget is not None:
+            stop = stop | RetryBudgetStop(self._retry_budget)
 
         # Obtener estado anterior para callbacks
         old_state = circuit_breaker.get_state(domain)
@@ -474,7 +490,7 @@ class ResilientTransport(httpx.AsyncBaseTransport):
                         httpx.HTTPStatusError,
                     )
                 ),
-                stop=stop_after_attempt(self._max_retries),
+                stop=stop,
                 wait=wait_exponential_jitter(
                     initial=self._base_delay,
                     max=self._max_delay,
@@ -484,18 +500,20 @@ class ResilientTransport(httpx.AsyncBaseTransport):
             ):
                 with attempt:
                     try:
-                        # Verificar circuit breaker antes de cada intento
-                        can_execute, _ = circuit_breaker.can_execute(domain)
-                        if not can_execute:
-                            raise CircuitOpenError(domain, self._circuit_timeout)
+                        # Otro request (o el fallo de la sonda) abrió el
+                        # circuito durante el backoff
+                        if circuit_breaker.get_state(domain) == "open":
+                            raise CircuitOpenError(
+                                domain, circuit_breaker.retry_after(domain)
+                            )
+
+                        await self._pin_resolution(request)
 
                         # Ejecutar la petición
-                        response = await self._base_transport.handle_async_request(
-                            request
-                        )
+                        response = await base_transport.handle_async_request(request)
 
-                        # Verificar status codes que indican error
-                        if response.status_code >= 500:
+                        # Verificar status codes que indican host caído
+                        if response.status_code in RETRYABLE_STATUSES:
                             raise httpx.HTTPStatusError(
                                 f"Server error: {response.status_code}",
                                 request=request,
@@ -504,6 +522,8 @@ class ResilientTransport(httpx.AsyncBaseTransport):
 
                         # Éxito: registrar y retornar
                         circuit_breaker.record_success(domain)
+                        if self._retry_budget is not None:
+                            self._retry_budget.record_success()
 
                         # Notificar cambio de estado si hubo cambio
                         new_state = circuit_breaker.get_state(domain)
@@ -515,6 +535,10 @@ class ResilientTransport(httpx.AsyncBaseTransport):
                                 circuit_breaker.get_failure_count(domain),
                             )
 
+                        response.extensions = {
+                            **response.extensions,
+                            ATTEMPTS_EXTENSION: attempt.retry_state.attempt_number,
+                        }
                         return response
 
                     except (
@@ -526,6 +550,8 @@ class ResilientTransport(httpx.AsyncBaseTransport):
                     ) as e:
                         # Registrar fallo
                         circuit_breaker.record_failure(domain)
+                        if self._retry_budget is not None:
+                            self._retry_budget.record_failure()
 
                         # Notificar retry
                         attempt_num = attempt.retry_state.attempt_number
@@ -547,12 +573,7 @@ class ResilientTransport(httpx.AsyncBaseTransport):
                         raise
 
         except CircuitOpenError:
-            return httpx.Response(
-                status_code=421,
-                content=f"Circuit breaker open for {domain}".encode(),
-                headers={"Retry-After": str(int(self._circuit_timeout))},
-                request=request,
-            )
+            raise
 
         except Exception as e:
             # Agotaron los reintentos
@@ -561,6 +582,7 @@ class ResilientTransport(httpx.AsyncBaseTransport):
                 status_code=504,
                 content=str(e).encode(),
                 request=request,
+                extensions={SYNTHETIC_EXTENSION: True},
             )
 
         # Fallback: nunca debería llegar aquí pero mypy lo requiere
@@ -568,22 +590,20 @@ class ResilientTransport(httpx.AsyncBaseTransport):
             status_code=500,
             content=b"Internal error in resilient transport",
             request=request,
+            extensions={SYNTHETIC_EXTENSION: True},
         )
 
     async def aclose(self) -> None:
         """Cierra el transport y libera recursos."""
-        if self._base_transport:
-            await self._base_transport.aclose()
-
-        # Limpiar circuit breakers
-        async with self._circuit_lock:
-            self._circuit_breakers.clear()
+        async with self._transport_lock:
+            if self._base_transport:
+                await self._base_transport.aclose()
+            # Un request posterior abre un pool nuevo
+            self._base_transport = None
 
     def get_circuit_state(self, domain: str) -> str:
         """Obtiene el estado actual del circuit breaker para un dominio."""
-        if domain in self._circuit_breakers:
-            return self._circuit_breakers[domain].get_state(domain)
-        return "closed"
+        return self.circuit_breaker.get_state(domain)
 
     def get_fallback_status(self) -> dict[str, Any]:
         """Obtiene el estado del fallback para telemetría.
@@ -616,6 +636,12 @@ def create_resilient_transport(
     on_circuit_change: Any = None,
     use_curl_cffi: bool = True,  # ✅ NUEVO: Activar curl_cffi
     impersonate: str = "chrome120",  # ✅ NUEVO: Browser fingerprint
+    max_connections: int = 10,
+    http2: bool = True,
+    verify: bool = True,
+    resolver: CachingResolver | None = None,
+    retry_budget: RetryBudget | None = None,
+    circuit_breaker: CircuitBreaker | None = None,
 ) -> ResilientTransport:
     """Factory function para crear un ResilientTransport configurado.
 
@@ -631,6 +657,12 @@ def create_resilient_transport(
         on_circuit_change: Callback para cambios de circuit breaker
         use_curl_cffi: Activar curl_cffi como backend primario (default: True)
         impersonate: Browser fingerprint para TLS impersonation (default: "chrome120")
+        max_connections: Conexiones simultáneas del pool
+        http2: Negociar HTTP/2 cuando el servidor lo soporta
+        verify: Verificar el certificado TLS del servidor
+        resolver: Resolver DNS compartido (caché y ``dns_overrides``)
+        retry_budget: Presupuesto de reintentos compartido con el engine
+        circuit_breaker: Registro de circuit breakers compartido
 
     Returns:
         Instancia configurada de ResilientTransport
@@ -647,4 +679,10 @@ def create_resilient_transport(
         on_circuit_change=on_circuit_change,
         use_curl_cffi=use_curl_cffi,
         impersonate=impersonate,
+        max_connections=max_connections,
+        http2=http2,
+        verify=verify,
+        resolver=resolver,
+        retry_budget=retry_budget,
+        circuit_breaker=circuit_breaker,
     )
@@ -5,11 +5,13 @@ from uif_scraper.infrastructure.persistence.atomic_writer import (
     DataWriter,
     FailedItem,
     ScrapedItem,
+    ScrapedRecord,
 )
 
 __all__ = [
     "DataWriter",
     "ScrapedItem",
+    "ScrapedRecord",
     "FailedItem",
     "DataSavedEvent",
 ]
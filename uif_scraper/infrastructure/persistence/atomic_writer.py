@@ -6,6 +6,10 @@ Este módulo implementa un writer robusto que:
 3. Maneja escritura atómica (write → flush → rename)
 4. Separa items válidos de inválidos (failed_items.jsonl)
 
+Los items producidos por el propio engine viajan como ``ScrapedRecord``
+(msgspec Struct): ya son correctos por construcción, así que se bufferizan
+sin pasar por la validación Pydantic, que queda para datos externos.
+
 Uso:
     from uif_scraper.infrastructure.persistence import DataWriter, ScrapedItem
 
@@ -25,19 +29,22 @@ Uso:
 from __future__ import annotations
 
 import asyncio
-import json
 import time
 from collections import deque
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 import aiofiles
+import msgspec
 from pydantic import BaseModel, Field, ValidationError
 
 from loguru import logger
 
+from uif_scraper.utils.serialization import encode_jsonl
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # ESQUEMAS PYDANTIC
@@ -61,6 +68,22 @@ class ScrapedItem(BaseModel):
     metadata: dict[str, Any] = Field(default_factory=dict)
 
 
+class ScrapedRecord(msgspec.Struct, frozen=True, kw_only=True):
+    """Item interno del engine, mismos campos que ``ScrapedItem``.
+
+    Se construye una vez por página en el hot path: sin validación y con
+    slots. Se serializa a JSONL directamente (mismo orden de campos).
+    """
+
+    url: str
+    title: str | None = None
+    content: str
+    content_type: str = "text"
+    domain: str
+    extracted_at: datetime = msgspec.field(default_factory=datetime.now)
+    metadata: dict[str, Any] = msgspec.field(default_factory=dict)
+
+
 class FailedItem(BaseModel):
     """Esquema para items que fallaron la validación."""
 
@@ -126,7 +149,7 @@ class DataWriter:
         self._on_flush = on_flush
 
         # Buffer de items pendientes
-        self._buffer: deque[dict[str, Any]] = deque()
+        self._buffer: deque[dict[str, Any] | ScrapedRecord] = deque()
         self._failed_buffer: deque[dict[str, Any]] = deque()
 
         # Estado
@@ -161,11 +184,12 @@ class DataWriter:
         """Finaliza el writer haciendo flush final."""
         await self.close()
 
-    async def write(self, data: dict[str, Any] | BaseModel) -> bool:
+    async def write(self, data: dict[str, Any] | BaseModel | ScrapedRecord) -> bool:
         """Escribe un item al buffer (validando contra el esquema).
 
         Args:
-            data: Diccionario o modelo Pydantic
+            data: Diccionario, modelo Pydantic o ``ScrapedRecord`` interno
+                (este último se bufferiza tal cual, sin revalidar)
 
         Returns:
             True si se agregó al buffer, False si falló validación
@@ -173,6 +197,14 @@ class DataWriter:
         if self._closed:
             raise RuntimeError("Writer is closed")
 
+        if isinstance(data, ScrapedRecord):
+            async with self._buffer_lock:
+                self._buffer.append(data)
+                buffer_len = len(self._buffer)
+            if buffer_len >= self.buffer_size:
+                await self.flush()
+            return True
+
         # Convertir a dict si es Pydantic
         if isinstance(data, BaseModel):
             data_dict = data.model_dump()
@@ -253,7 +285,7 @@ class DataWriter:
     async def _write_atomic(
         self,
         path: Path,
-        data: list[dict[str, Any]],
+        data: Sequence[dict[str, Any] | ScrapedRecord],
     ) -> None:
         """Escribe datos de forma atómica.
 
@@ -269,11 +301,10 @@ class DataWriter:
 
         try:
             # Escribir a archivo temporal (dentro del context manager)
-            async with aiofiles.open(tmp_path, "w", encoding="utf-8") as f:
+            async with aiofiles.open(tmp_path, "wb") as f:
                 if self.format == "jsonl":
-                    for item in data:
-                        line = json.dumps(item, ensure_ascii=False, default=str)
-                        await f.write(line + "\n")
+                    # Todas las líneas en un solo buffer (encoder msgspec)
+                    await f.write(encode_jsonl(data))
                 # Flush interno del archivo
                 await f.flush()
 
@@ -357,6 +388,7 @@ class DataWriter:
 __all__ = [
     "DataWriter",
     "ScrapedItem",
+    "ScrapedRecord",
     "FailedItem",
     "DataSavedEvent",
 ]
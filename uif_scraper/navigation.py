@@ -69,19 +69,27 @@ class NavigationService:
         ).startswith("/")
 
     def extract_links(
-        self, html_parser: HTMLParserLike, current_url: str
+        self,
+        html_parser: HTMLParserLike,
+        current_url: str,
+        max_links: int | None = None,
     ) -> tuple[list[str], list[str]]:
         """Extrae links y assets de una página HTML.
 
         Args:
             html_parser: Parser HTML con método css() (selectolax, scrapling, etc.)
             current_url: URL actual para resolver links relativos.
+            max_links: Máximo de links e imágenes a resolver (documentos fuera
+                de presupuesto); None = todos.
 
         Returns:
             Tupla (nuevas_paginas, nuevos_assets) sin duplicados.
         """
         links = [str(node) for node in html_parser.css("a::attr(href)")]
         images = [str(node) for node in html_parser.css("img::attr(src)")]
+        if max_links is not None:
+            links = links[:max_links]
+            images = images[:max_links]
 
         new_pages: list[str] = []
         new_assets: list[str] = []
@@ -72,7 +72,7 @@ class RichDashboard:
 
     def _render_header(self) -> Panel:
         """Render header panel with mission info."""
-        mode = "BROWSER" if self._core.use_browser_mode else "STEALTH"
+        mode = "BROWSER" if self._core.browser_mode_active else "STEALTH"
         return Panel(
             f"🛸 [bold blue]MISIÓN:[/][white] {self._core.navigation.base_url} [/] | "
             f"[bold yellow]SCOPE:[/][white] {self._core.navigation.scope.value.upper()} [/] | "
@@ -0,0 +1,165 @@
+"""Escalada a navegador por host y prefijo de ruta.
+
+Un 403/401/429 en el fast path (``PageClient``) activaba el modo
+navegador para toda la misión, aunque fuera un único request limitado por
+rate. ``EscalationPolicy`` aprende qué secciones del sitio (host + primeros
+segmentos de la ruta) necesitan el navegador:
+
+- Una sección escala tras ``block_threshold`` bloqueos sin un éxito entre
+  medias; el resto del sitio sigue en el fast path.
+- Mientras está escalada, cada ``probe_interval`` segundos un request
+  vuelve a probar el fast path. Si funciona, la sección desescala; si se
+  bloquea otra vez, el intervalo se duplica hasta ``max_probe_interval``.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from cachetools import LRUCache
+
+
+def section_key(url: str, path_depth: int = 1) -> str:
+    """Sección de una URL: host + los primeros ``path_depth`` segmentos."""
+    parts = urlsplit(url)
+    segments = [s for s in parts.path.split("/") if s][:path_depth]
+    return f"{parts.netloc.lower()}/{'/'.join(segments)}"
+
+
+@dataclass(slots=True)
+class _Section:
+    strikes: int = 0
+    escalated: bool = False
+    probe_interval: float = 0.0
+    next_probe: float = 0.0
+
+
+class EscalationPolicy:
+    """Decide por sección si un fetch va por el fast path o por el navegador.
+
+    Args:
+        path_depth: Segmentos de ruta que definen una sección (0 = host)
+        block_threshold: Bloqueos seguidos que escalan una sección
+        probe_interval: Segundos entre re-probes del fast path
+        max_probe_interval: Techo del intervalo tras re-probes fallidos
+        max_sections: Secciones recordadas (LRU)
+        clock: Reloj monotónico (inyectable en tests)
+    """
+
+    def __init__(
+        self,
+        path_depth: int = 1,
+        block_threshold: int = 2,
+        probe_interval: float = 60.0,
+        max_probe_interval: float = 900.0,
+        max_sections: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.path_depth = path_depth
+        self.block_threshold = max(1, block_threshold)
+        self.probe_interval = probe_interval
+        self.max_probe_interval = max(probe_interval, max_probe_interval)
+        self._clock = clock
+        self._sections: LRUCache[str, _Section] = LRUCache(maxsize=max_sections)
+        self.escalations = 0
+        self.deescalations = 0
+        self.probes = 0
+
+    def section_of(self, url: str) -> str:
+        """Sección (host + prefijo) a la que pertenece la URL."""
+        return section_key(url, self.path_depth)
+
+    @property
+    def active(self) -> bool:
+        """True si alguna sección está escalada al navegador."""
+        return any(s.escalated for s in self._sections.values())
+
+    def escalated_sections(self) -> list[str]:
+        return [key for key, s in self._sections.items() if s.escalated]
+
+    def needs_browser(self, url: str) -> bool:
+        """True si la URL debe ir directamente al navegador.
+
+        En una sección escalada, el primer request tras vencer el intervalo
+        se deja pasar por el fast path como re-probe.
+        """
+        section = self._sections.get(self.section_of(url))
+        if section is None or not section.escalated:
+            return False
+        now = self._clock()
+        if now >= section.next_probe:
+            # Un solo re-probe por intervalo; el siguiente se programa ya por
+            # si este termina sin bloqueo ni éxito (timeout, 5xx)
+            section.next_probe = now + section.probe_interval
+            self.probes += 1
+            return False
+        return True
+
+    def probe_soon(self, url: str) -> None:
+        """Adelanta el re-probe de la sección (p.ej. hay cookies de clearance)."""
+        section = self._sections.get(self.section_of(url))
+        if section is not None and section.escalated:
+            section.next_probe = self._clock()
+
+    def record_block(self, url: str) -> bool:
+        """Registra un 403/401/429 del fast path.
+
+        Returns:
+            True si la sección acaba de escalar al navegador.
+        """
+        key = self.section_of(url)
+        section = self._sections.get(key)
+        if section is None:
+            section = _Section()
+            self._sections[key] = section
+        now = self._clock()
+
+        if section.escalated:
+            # Re-probe fallido: se espacian los siguientes
+            section.probe_interval = min(
+                section.probe_interval * 2, self.max_probe_interval
+            )
+            section.next_probe = now + section.probe_interval
+            return False
+
+        section.strikes += 1
+        if section.strikes < self.block_threshold:
+            return False
+        section.escalated = True
+        section.probe_interval = self.probe_interval
+        section.next_probe = now + self.probe_interval
+        self.escalations += 1
+        return True
+
+    def record_success(self, url: str) -> bool:
+        """Registra un fetch correcto por el fast path.
+
+        Returns:
+            True si la sección estaba escalada y vuelve al fast path.
+        """
+        key = self.section_of(url)
+        section = self._sections.get(key)
+        if section is None:
+            return False
+        # Sin bloqueos pendientes la sección no necesita estado
+        del self._sections[key]
+        if section.escalated:
+            self.deescalations += 1
+            return True
+        return False
+
+    def reset(self) -> None:
+        """Olvida todas las secciones (vuelta manual al modo stealth)."""
+        self._sections.clear()
+
+    def get_stats(self) -> dict[str, int]:
+        """Secciones escaladas y contadores para monitoring."""
+        return {
+            "escalated": len(self.escalated_sections()),
+            "escalations": self.escalations,
+            "deescalations": self.deescalations,
+            "probes": self.probes,
+        }
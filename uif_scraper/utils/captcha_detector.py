@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import re
+from collections.abc import Mapping
+from typing import Any
+
 from loguru import logger
 
 
@@ -9,9 +13,15 @@ class CaptchaDetector:
     """Detecta la presencia de CAPTCHAs y desafíos de seguridad en el HTML.
 
     Identifica firmas comunes de Cloudflare, reCAPTCHA, hCaptcha, etc.
+
+    Para que el coste sea casi nulo en páginas normales:
+    - Señales baratas (status, tamaño del body, headers de challenge) deciden
+      si vale la pena escanear el HTML.
+    - Todas las firmas se buscan en una sola pasada con un regex compilado.
+    - Solo se escanea el <head> y los primeros ``scan_bytes`` del documento.
     """
 
-    # Firmas comunes de desafíos de seguridad
+    # Firmas comunes de desafíos de seguridad (orden = prioridad)
     SIGNATURES = {
         "cloudflare_turnstile": [
             "cf-turnstile-wrapper",
@@ -38,11 +48,94 @@ class CaptchaDetector:
         ],
     }
 
-    def detect(self, html: str) -> tuple[bool, str | None]:
+    # Status codes con los que los WAF suelen servir un challenge
+    CHALLENGE_STATUS_CODES = frozenset({401, 403, 429, 503})
+
+    # Headers que solo aparecen en respuestas de challenge
+    CHALLENGE_HEADERS = frozenset(
+        {
+            "cf-mitigated",
+            "cf-chl-bypass",
+            "x-amzn-waf-action",
+            "x-datadome",
+            "x-sucuri-block",
+        }
+    )
+
+    def __init__(
+        self,
+        scan_bytes: int = 32 * 1024,
+        small_body_bytes: int = 16 * 1024,
+        max_head_bytes: int = 256 * 1024,
+    ) -> None:
+        """Inicializa el detector y compila el matcher multi-patrón.
+
+        Args:
+            scan_bytes: Bytes iniciales del documento a escanear
+            small_body_bytes: Bodies más pequeños se consideran sospechosos
+                (las páginas de challenge son mínimas)
+            max_head_bytes: Límite para buscar el cierre de ``</head>``
+        """
+        self._scan_bytes = scan_bytes
+        self._small_body_bytes = small_body_bytes
+        self._max_head_bytes = max_head_bytes
+
+        # marcador (lowercase) -> (prioridad, tipo, marcador original)
+        self._markers: dict[str, tuple[int, str, str]] = {}
+        for priority, (challenge_type, markers) in enumerate(self.SIGNATURES.items()):
+            for marker in markers:
+                self._markers.setdefault(
+                    marker.lower(), (priority, challenge_type, marker)
+                )
+
+        # Alternancia con los marcadores más largos primero para que
+        # "g-recaptcha" gane a "captcha" en la misma posición
+        alternation = "|".join(
+            re.escape(m) for m in sorted(self._markers, key=len, reverse=True)
+        )
+        self._pattern = re.compile(alternation, re.IGNORECASE)
+
+    def is_suspect(
+        self,
+        body_size: int,
+        status_code: int | None = None,
+        headers: Mapping[str, Any] | None = None,
+    ) -> bool:
+        """Decide con señales baratas si la respuesta puede ser un challenge.
+
+        Args:
+            body_size: Longitud del body
+            status_code: Status HTTP de la respuesta (None si se desconoce)
+            headers: Headers de la respuesta (None si se desconocen)
+
+        Returns:
+            True si merece la pena escanear el HTML.
+        """
+        if status_code is None and headers is None:
+            # Sin señales de transporte: no podemos descartar nada
+            return True
+        if status_code in self.CHALLENGE_STATUS_CODES:
+            return True
+        if body_size < self._small_body_bytes:
+            return True
+        if headers:
+            for name in headers:
+                if str(name).lower() in self.CHALLENGE_HEADERS:
+                    return True
+        return False
+
+    def detect(
+        self,
+        html: str,
+        status_code: int | None = None,
+        headers: Mapping[str, Any] | None = None,
+    ) -> tuple[bool, str | None]:
         """Analiza el HTML en busca de desafíos de seguridad.
 
         Args:
             html: Contenido HTML a analizar
+            status_code: Status HTTP de la respuesta (opcional)
+            headers: Headers de la respuesta (opcional)
 
         Returns:
             Tuple con (bool: detectado, str: tipo de desafío o None)
@@ -50,14 +143,27 @@ class CaptchaDetector:
         if not html:
             return False, None
 
-        html_lower = html.lower()
+        if not self.is_suspect(len(html), status_code, headers):
+            return False, None
 
-        for challenge_type, markers in self.SIGNATURES.items():
-            for marker in markers:
-                if marker.lower() in html_lower:
-                    logger.warning(
-                        f"Detección de anti-scraping: {challenge_type} (marcador: {marker})"
-                    )
-                    return True, challenge_type
+        # Ventana de escaneo: <head> completo + primeros N KB
+        limit = self._scan_bytes
+        head_end = html.find("</head>", 0, self._max_head_bytes)
+        limit = max(limit, head_end)
+
+        best: tuple[int, str, str] | None = None
+        for match in self._pattern.finditer(html, 0, limit):
+            hit = self._markers[match.group(0).lower()]
+            if best is None or hit[0] < best[0]:
+                best = hit
+                if hit[0] == 0:
+                    break
+
+        if best is None:
+            return False, None
 
-        return False, None
+        _, challenge_type, marker = best
+        logger.warning(
+            f"Detección de anti-scraping: {challenge_type} (marcador: {marker})"
+        )
+        return True, challenge_type
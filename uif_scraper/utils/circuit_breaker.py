@@ -1,37 +1,110 @@
+"""Per-domain circuit breaker registry shared by every network layer.
+
+One instance is shared by ``ResilientTransport`` (page fast path and hedges),
+``EngineCore`` (browser renders) and the asset downloader, so all of them
+see, and report to the TUI, the same state for a host.
+
+- O(1) per call: circuits live in an LRU keyed by domain; healthy domains
+  that never failed don't even get an entry.
+- No locks: every method is synchronous (no ``await``), so inside the event
+  loop each call is atomic.
+- Bounded memory: at most ``max_domains`` circuits, the least recently used
+  one is evicted.
+- Half-open with a single probe: once the open timeout expires exactly one
+  caller is let through; everyone else is rejected until that probe reports
+  back (success closes, failure re-opens). A probe that never reports is
+  considered lost after ``timeout`` seconds and another caller gets a turn.
+"""
+
 import time
 
+from cachetools import LRUCache
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class _Circuit:
+    __slots__ = ("failures", "open_until", "probe_until", "state")
+
+    def __init__(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self.open_until = 0.0
+        self.probe_until = 0.0
+
 
 class CircuitBreaker:
     """Circuit breaker pattern for protecting against cascading failures.
 
-    Tracks failures per domain and blocks requests when threshold is exceeded.
+    Tracks consecutive failures per domain and blocks requests when the
+    threshold is exceeded.
+
+    Args:
+        threshold: Consecutive failures that open the circuit
+        timeout: Seconds the circuit stays open before a probe is allowed
+        max_domains: Circuits kept in memory (LRU)
     """
 
-    __slots__ = ("threshold", "timeout", "failures", "blocked_until")
+    __slots__ = ("_circuits", "probes", "threshold", "timeout", "trips")
 
-    def __init__(self, threshold: int = 5, timeout: float = 300.0):
+    def __init__(
+        self, threshold: int = 5, timeout: float = 60.0, max_domains: int = 4096
+    ):
         self.threshold = threshold
         self.timeout = timeout
-        self.failures: dict[str, int] = {}
-        self.blocked_until: dict[str, float] = {}
+        self._circuits: LRUCache[str, _Circuit] = LRUCache(maxsize=max_domains)
+        self.trips = 0
+        self.probes = 0
 
     def should_allow(self, domain: str) -> bool:
-        if domain in self.blocked_until:
-            if time.time() < self.blocked_until[domain]:
+        """Whether a request to ``domain`` may go out now.
+
+        In half-open state a True answer makes the caller the probe: it must
+        report the outcome with ``record_success`` or ``record_failure``.
+        """
+        circuit = self._circuits.get(domain)
+        if circuit is None or circuit.state == CLOSED:
+            return True
+        now = time.monotonic()
+        if circuit.state == OPEN:
+            if now < circuit.open_until:
                 return False
-            del self.blocked_until[domain]
-            self.failures[domain] = 0
+            circuit.state = HALF_OPEN
+        elif now < circuit.probe_until:
+            return False  # Probe in flight
+        circuit.probe_until = now + self.timeout
+        self.probes += 1
         return True
 
+    def is_blocked(self, domain: str) -> bool:
+        """Whether ``should_allow`` would reject now, without taking the probe."""
+        circuit = self._circuits.get(domain)
+        if circuit is None or circuit.state == CLOSED:
+            return False
+        now = time.monotonic()
+        if circuit.state == OPEN:
+            return now < circuit.open_until
+        return now < circuit.probe_until
+
     def record_failure(self, domain: str) -> None:
-        self.failures[domain] = self.failures.get(domain, 0) + 1
-        if self.failures[domain] >= self.threshold:
-            self.blocked_until[domain] = time.time() + self.timeout
+        circuit = self._circuits.get(domain)
+        if circuit is None:
+            circuit = self._circuits[domain] = _Circuit()
+        circuit.failures += 1
+        if circuit.state == HALF_OPEN or (
+            circuit.state == CLOSED and circuit.failures >= self.threshold
+        ):
+            circuit.state = OPEN
+            circuit.open_until = time.monotonic() + self.timeout
+            self.trips += 1
 
     def record_success(self, domain: str) -> None:
-        self.failures[domain] = 0
-        if domain in self.blocked_until:
-            del self.blocked_until[domain]
+        circuit = self._circuits.get(domain)
+        if circuit is not None:
+            circuit.state = CLOSED
+            circuit.failures = 0
 
     def get_state(self, domain: str) -> str:
         """Get circuit breaker state for a domain.
@@ -39,11 +112,28 @@ class CircuitBreaker:
         Returns:
             "closed" - normal operation
             "open" - blocked, rejecting requests
-            "half-open" - recovering, allowing test requests
+            "half-open" - recovering, allowing a single probe request
         """
-        if domain in self.blocked_until:
-            if time.time() < self.blocked_until[domain]:
-                return "open"
-            # Expired, entering half-open
-            return "half-open"
-        return "closed"
+        circuit = self._circuits.get(domain)
+        if circuit is None:
+            return CLOSED
+        if circuit.state == OPEN and time.monotonic() >= circuit.open_until:
+            return HALF_OPEN
+        return circuit.state
+
+    def get_failure_count(self, domain: str) -> int:
+        circuit = self._circuits.get(domain)
+        return circuit.failures if circuit is not None else 0
+
+    def retry_after(self, domain: str) -> float:
+        """Seconds until ``domain`` may accept a request again (0 if it may now)."""
+        circuit = self._circuits.get(domain)
+        if circuit is None or circuit.state == CLOSED:
+            return 0.0
+        until = circuit.open_until if circuit.state == OPEN else circuit.probe_until
+        return max(0.0, until - time.monotonic())
+
+    @property
+    def failures(self) -> dict[str, int]:
+        """Consecutive failures per tracked domain (snapshot)."""
+        return {domain: c.failures for domain, c in self._circuits.items()}
@@ -0,0 +1,176 @@
+"""Cookies de clearance compartidas entre el navegador y el fast path.
+
+Cuando ``AsyncStealthySession`` resuelve un challenge (``cf_clearance`` y
+cookies de sesión), esas cookies se quedaban dentro del navegador y el
+fast path (``PageClient``) seguía recibiendo 403. ``ClearanceJar``
+guarda por dominio las cookies del navegador y el User-Agent con el que se
+obtuvieron (la clearance va ligada al UA) para reutilizarlas en requests
+baratos. Se serializa por dominio para persistirse en ``state.db``.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+import msgspec
+
+
+class StoredCookie(msgspec.Struct, frozen=True):
+    """Cookie exportada del navegador (campos de Playwright que se usan)."""
+
+    name: str
+    value: str
+    path: str = "/"
+    expires: float = -1.0  # -1 = cookie de sesión
+
+    def expired(self, now: float) -> bool:
+        return 0 < self.expires <= now
+
+
+_COOKIES_DECODER = msgspec.json.Decoder(list[StoredCookie])
+
+
+@dataclass(slots=True)
+class DomainClearance:
+    """Cookies y User-Agent de un dominio."""
+
+    cookies: dict[str, StoredCookie] = field(default_factory=dict)
+    user_agent: str | None = None
+
+    def encode_cookies(self) -> str:
+        return msgspec.json.encode(list(self.cookies.values())).decode("utf-8")
+
+
+def _host_suffixes(host: str) -> Iterable[str]:
+    """``a.b.example.com`` → ``a.b.example.com``, ``b.example.com``, ``example.com``."""
+    labels = host.split(".")
+    for i in range(max(1, len(labels) - 1)):
+        yield ".".join(labels[i:])
+
+
+class ClearanceJar:
+    """Jar de cookies por dominio alimentado por las respuestas del navegador."""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._domains: dict[str, DomainClearance] = {}
+        self._clock = clock
+
+    def __len__(self) -> int:
+        return len(self._domains)
+
+    def update_from_browser(
+        self,
+        url: str,
+        cookies: Iterable[Mapping[str, Any]],
+        request_headers: Mapping[str, Any] | None = None,
+    ) -> list[str]:
+        """Importa las cookies de una respuesta del navegador.
+
+        Args:
+            url: URL que se renderizó
+            cookies: Cookies del contexto de Playwright (``name``, ``value``,
+                ``domain``, ``path``, ``expires``)
+            request_headers: Headers que envió el navegador (User-Agent)
+
+        Returns:
+            Dominios cuyo contenido cambió (para persistirlos).
+        """
+        host = (urlsplit(url).hostname or "").lower()
+        user_agent = None
+        for key, value in (request_headers or {}).items():
+            if str(key).lower() == "user-agent" and isinstance(value, str):
+                user_agent = value
+        changed: list[str] = []
+        for raw in cookies:
+            name, value = raw.get("name"), raw.get("value")
+            if not isinstance(name, str) or not isinstance(value, str):
+                continue
+            domain = str(raw.get("domain") or host).lstrip(".").lower()
+            # Solo cookies que aplican al host renderizado
+            if not domain or not (host == domain or host.endswith("." + domain)):
+                continue
+            cookie = StoredCookie(
+                name=name,
+                value=value,
+                path=str(raw.get("path") or "/"),
+                expires=float(raw.get("expires") or -1.0),
+            )
+            entry = self._domains.setdefault(domain, DomainClearance())
+            if entry.cookies.get(name) != cookie or (
+                user_agent and entry.user_agent != user_agent
+            ):
+                entry.cookies[name] = cookie
+                if user_agent:
+                    entry.user_agent = user_agent
+                if domain not in changed:
+                    changed.append(domain)
+        return changed
+
+    def _matches(self, url: str) -> Iterable[tuple[str, DomainClearance, str]]:
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+        path = parts.path or "/"
+        for suffix in _host_suffixes(host):
+            entry = self._domains.get(suffix)
+            if entry is not None:
+                yield suffix, entry, path
+
+    def cookies_for(self, url: str) -> dict[str, str]:
+        """Cookies vigentes que el navegador enviaría a ``url``."""
+        now = self._clock()
+        result: dict[str, str] = {}
+        for _, entry, path in self._matches(url):
+            for cookie in entry.cookies.values():
+                if cookie.expired(now) or not path.startswith(cookie.path):
+                    continue
+                # El dominio más específico gana (se recorre primero)
+                result.setdefault(cookie.name, cookie.value)
+        return result
+
+    def user_agent_for(self, url: str) -> str | None:
+        """User-Agent con el que se obtuvieron las cookies de ``url``."""
+        for _, entry, _ in self._matches(url):
+            if entry.user_agent:
+                return entry.user_agent
+        return None
+
+    def headers_for(self, url: str) -> dict[str, str]:
+        """Headers ``Cookie`` y ``User-Agent`` para clientes sin jar propio."""
+        headers: dict[str, str] = {}
+        cookies = self.cookies_for(url)
+        if cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in cookies.items())
+            user_agent = self.user_agent_for(url)
+            if user_agent:
+                headers["User-Agent"] = user_agent
+        return headers
+
+    def discard(self, url: str) -> list[str]:
+        """Descarta las cookies aplicables a ``url`` (la clearance ya no vale).
+
+        Returns:
+            Dominios descartados.
+        """
+        domains = [domain for domain, _, _ in self._matches(url)]
+        for domain in domains:
+            del self._domains[domain]
+        return domains
+
+    def get(self, domain: str) -> DomainClearance | None:
+        return self._domains.get(domain)
+
+    def load(self, rows: Iterable[tuple[str, str, str | None]]) -> None:
+        """Carga filas persistidas ``(dominio, cookies JSON, user_agent)``."""
+        now = self._clock()
+        for domain, cookies_json, user_agent in rows:
+            try:
+                cookies = _COOKIES_DECODER.decode(cookies_json)
+            except msgspec.DecodeError:
+                continue
+            live = {c.name: c for c in cookies if not c.expired(now)}
+            if live:
+                self._domains[domain] = DomainClearance(live, user_agent)
@@ -22,7 +22,7 @@ import aiofiles
 
 async def write_compressed_markdown(
     path: Path,
-    content: str,
+    content: str | bytes,
     compression: str = "zstd",
     compression_level: int = 3,
 ) -> Path:
@@ -30,7 +30,7 @@ async def write_compressed_markdown(
 
     Args:
         path: Path base (sin extensión)
-        content: Contenido markdown
+        content: Contenido markdown (str o bytes UTF-8 ya codificados)
         compression: Algoritmo ("zstd", "gzip", o "none")
         compression_level: Nivel de compresión (1-9, 3 es balance óptimo)
 
@@ -42,13 +42,16 @@ async def write_compressed_markdown(
         - gzip nivel 6: 0.45s, ratio 38%
         - brotli nivel 4: 204s, ratio 65% (NO USAR para archivos grandes)
     """
-    content_bytes = content.encode("utf-8")
+    content_bytes = content.encode("utf-8") if isinstance(content, str) else content
+    del content
 
     if compression == "zstd" and ZSTD_AVAILABLE:
         # Zstandard: mejor balance velocidad/ratio
         compressed_path = path.with_suffix(".md.zst")
         cctx = zstd.ZstdCompressor(level=compression_level)
         compressed_content = cctx.compress(content_bytes)
+        # Durante el await solo vive el buffer comprimido
+        del content_bytes
         async with aiofiles.open(compressed_path, "wb") as f:
             await f.write(compressed_content)
             await f.flush()  # CRITICAL: Explicit flush to ensure write completes
@@ -57,16 +60,18 @@ async def write_compressed_markdown(
     elif compression == "gzip":
         # Gzip: fallback compatible
         compressed_path = path.with_suffix(".md.gz")
+        compressed_content = gzip.compress(content_bytes, compresslevel=6)
+        del content_bytes
         async with aiofiles.open(compressed_path, "wb") as f:
-            await f.write(gzip.compress(content_bytes, compresslevel=6))
+            await f.write(compressed_content)
             await f.flush()  # CRITICAL: Explicit flush to ensure write completes
         return compressed_path
 
     else:
         # Sin compresión
         md_path = path.with_suffix(".md")
-        async with aiofiles.open(md_path, "w", encoding="utf-8") as f:
-            await f.write(content)
+        async with aiofiles.open(md_path, "wb") as f:
+            await f.write(content_bytes)
             await f.flush()  # CRITICAL: Explicit flush to ensure write completes
         return md_path
 
@@ -0,0 +1,233 @@
+"""Resolver DNS asíncrono compartido con caché positiva, negativa y prefetch.
+
+El downloader de assets (aiohttp, ``ttl_dns_cache``) y el fast path de
+páginas (curl) resolvían cada uno por su lado, y un host caído se volvía a
+resolver en cada request. ``CachingResolver`` es la única fuente de DNS de
+la misión:
+
+- Caché positiva con TTL fijo (``getaddrinfo`` no expone el TTL del
+  registro) y caché negativa más corta para hosts que no resuelven.
+- Una sola resolución en vuelo por host: los requests concurrentes la
+  comparten.
+- ``prefetch`` resuelve en segundo plano los hosts recién descubiertos,
+  antes de que llegue su primer fetch.
+- ``overrides`` (``dns_overrides`` de la config) fija la IP de un host, p.ej.
+  para apuntar un dominio a un servidor local en tests.
+
+Implementa ``aiohttp.abc.AbstractResolver`` para el ``TCPConnector``;
+``ResilientTransport`` lo usa vía ``addresses`` para alimentar
+``CURLOPT_RESOLVE``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import socket
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+
+from aiohttp.abc import AbstractResolver, ResolveResult
+from cachetools import TTLCache
+
+# (familia, IP) por dirección resuelta
+Addresses = tuple[tuple[int, str], ...]
+LookupFn = Callable[[str, int], Awaitable[Addresses]]
+
+_NUMERIC_FLAGS = socket.AI_NUMERICHOST | socket.AI_NUMERICSERV
+_AI_ADDRCONFIG = socket.AI_ADDRCONFIG
+if hasattr(socket, "AI_MASK"):
+    _AI_ADDRCONFIG &= socket.AI_MASK
+
+
+def is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+    except ValueError:
+        return False
+    return True
+
+
+def _family_of(ip: str) -> int:
+    return socket.AF_INET6 if ipaddress.ip_address(ip).version == 6 else socket.AF_INET
+
+
+async def _getaddrinfo(host: str, family: int) -> Addresses:
+    infos = await asyncio.get_running_loop().getaddrinfo(
+        host, 0, type=socket.SOCK_STREAM, family=family, flags=_AI_ADDRCONFIG
+    )
+    addresses: list[tuple[int, str]] = []
+    for info_family, _, _, _, sockaddr in infos:
+        # IPv6 link-local (con scope id) no es alcanzable desde curl: se omite
+        if info_family == socket.AF_INET6 and (len(sockaddr) < 4 or sockaddr[3]):
+            continue
+        entry = (int(info_family), str(sockaddr[0]))
+        if entry not in addresses:
+            addresses.append(entry)
+    return tuple(addresses)
+
+
+class CachingResolver(AbstractResolver):
+    """Resolver compartido por aiohttp y curl con caché y overrides.
+
+    Args:
+        overrides: Host → IP fija (sin resolución)
+        ttl: Segundos que una resolución correcta sigue en caché
+        negative_ttl: Segundos que se recuerda que un host no resuelve
+        max_hosts: Hosts recordados por cada caché
+        prefetch_concurrency: Resoluciones de prefetch simultáneas
+        lookup: Resolución real ``(host, familia) -> direcciones`` (inyectable
+            en tests; por defecto ``getaddrinfo`` del event loop)
+    """
+
+    def __init__(
+        self,
+        overrides: Mapping[str, str] | None = None,
+        ttl: float = 300.0,
+        negative_ttl: float = 30.0,
+        max_hosts: int = 4096,
+        prefetch_concurrency: int = 8,
+        lookup: LookupFn | None = None,
+    ) -> None:
+        self._overrides = {
+            host.lower().rstrip("."): ip for host, ip in (overrides or {}).items()
+        }
+        for ip in self._overrides.values():
+            ipaddress.ip_address(ip)  # ValueError con un override mal escrito
+        self._cache: TTLCache[tuple[str, int], Addresses] = TTLCache(
+            maxsize=max_hosts, ttl=ttl
+        )
+        self._failures: TTLCache[tuple[str, int], tuple[int, str]] = TTLCache(
+            maxsize=max_hosts, ttl=negative_ttl
+        )
+        self._pending: dict[tuple[str, int], asyncio.Future[Addresses]] = {}
+        self._lookup = lookup or _getaddrinfo
+        self._prefetch_slots = asyncio.Semaphore(prefetch_concurrency)
+        self._prefetch_tasks: set[asyncio.Task[None]] = set()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.prefetched = 0
+
+    def is_known(self, host: str, family: int = socket.AF_UNSPEC) -> bool:
+        """True si el host no necesita resolverse (override, caché o en vuelo)."""
+        host = host.lower().rstrip(".")
+        key = (host, family)
+        return (
+            host in self._overrides
+            or is_ip_address(host)
+            or key in self._cache
+            or key in self._failures
+            or key in self._pending
+        )
+
+    async def lookup(self, host: str, family: int = socket.AF_UNSPEC) -> Addresses:
+        """Direcciones de ``host``.
+
+        Raises:
+            socket.gaierror: El host no resuelve (también desde la caché negativa).
+        """
+        host = host.lower().rstrip(".")
+        override = self._overrides.get(host)
+        if override is not None:
+            self.hits += 1
+            return ((_family_of(override), override),)
+        key = (host, family)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        failure = self._failures.get(key)
+        if failure is not None:
+            self.negative_hits += 1
+            raise socket.gaierror(*failure)
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._resolve(key))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda f: self._forget(key, f))
+        # Un caller cancelado no cancela la resolución que comparten los demás
+        return await asyncio.shield(pending)
+
+    async def _resolve(self, key: tuple[str, int]) -> Addresses:
+        self.misses += 1
+        host, family = key
+        try:
+            addresses = await self._lookup(host, family)
+        except OSError as e:
+            failure = (e.errno or socket.EAI_NONAME, e.strerror or str(e))
+            self._failures[key] = failure
+            raise socket.gaierror(*failure) from e
+        if not addresses:
+            failure = (socket.EAI_NONAME, f"No address found for {host}")
+            self._failures[key] = failure
+            raise socket.gaierror(*failure)
+        self._cache[key] = addresses
+        return addresses
+
+    def _forget(self, key: tuple[str, int], future: asyncio.Future[Addresses]) -> None:
+        self._pending.pop(key, None)
+        if not future.cancelled():
+            future.exception()  # Evita "exception was never retrieved"
+
+    async def addresses(self, host: str) -> list[str]:
+        """IPs de ``host`` (para ``CURLOPT_RESOLVE``)."""
+        return [ip for _, ip in await self.lookup(host)]
+
+    async def resolve(
+        self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET
+    ) -> list[ResolveResult]:
+        """Interfaz de ``aiohttp.abc.AbstractResolver``."""
+        return [
+            ResolveResult(
+                hostname=host,
+                host=ip,
+                port=port,
+                family=addr_family,
+                proto=socket.IPPROTO_TCP,
+                flags=_NUMERIC_FLAGS,
+            )
+            for addr_family, ip in await self.lookup(host, family)
+        ]
+
+    def prefetch(self, hosts: Iterable[str | None]) -> int:
+        """Resuelve en segundo plano los hosts que aún no están en caché.
+
+        Returns:
+            Número de resoluciones lanzadas.
+        """
+        scheduled = 0
+        for host in set(hosts):
+            if not host or self.is_known(host):
+                continue
+            task = asyncio.get_running_loop().create_task(self._prefetch(host))
+            self._prefetch_tasks.add(task)
+            task.add_done_callback(self._prefetch_tasks.discard)
+            scheduled += 1
+        return scheduled
+
+    async def _prefetch(self, host: str) -> None:
+        async with self._prefetch_slots:
+            try:
+                await self.lookup(host)
+            except OSError:
+                return  # Queda en la caché negativa
+            self.prefetched += 1
+
+    async def close(self) -> None:
+        """Cancela los prefetch pendientes."""
+        for task in list(self._prefetch_tasks):
+            task.cancel()
+        if self._prefetch_tasks:
+            await asyncio.gather(*self._prefetch_tasks, return_exceptions=True)
+
+    def get_stats(self) -> dict[str, int]:
+        """Aciertos, fallos y hosts en caché para monitoring."""
+        return {
+            "hosts": len(self._cache),
+            "failed_hosts": len(self._failures),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "prefetched": self.prefetched,
+        }
@@ -0,0 +1,245 @@
+"""Latencia observada por host: hedging y timeouts adaptativos.
+
+``HostLatencyTracker`` mantiene por host un ``LatencySketch``: un histograma
+logarítmico en streaming (estilo DDSketch) que responde cuantiles (p50, p95,
+p99...) con error relativo acotado, en memoria fija y O(1) por muestra. Los
+pesos decaen a la mitad cada ``half_life`` muestras, así que los cuantiles
+siguen la latencia reciente del host.
+
+Lo usan:
+
+- ``PageClient`` para decidir cuándo un request va lento respecto a lo
+  habitual en su host y merece un request de cobertura (hedge).
+- ``AdaptiveTimeouts`` para fijar los timeouts de connect, read y total de
+  cada host como múltiplo de su p99, entre un suelo y un techo.
+
+``HedgeBudget`` acota la carga extra de los hedges: cada request suma
+``ratio`` tokens (hasta ``burst``) y cada hedge gasta uno, así que a largo
+plazo los hedges nunca superan ``ratio`` de los requests.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+from cachetools import LRUCache
+
+# Muestras tras las que los pesos del sketch se reducen a la mitad
+LATENCY_HALF_LIFE = 128
+# Error relativo de los cuantiles (2% → ~300 buckets entre 1 ms y 5 min)
+LATENCY_RELATIVE_ACCURACY = 0.02
+# Latencias por debajo de esto caen en el mismo bucket
+MIN_LATENCY_SECONDS = 1e-4
+# Peso bajo el que un bucket decaído se descarta
+_MIN_BUCKET_WEIGHT = 1e-3
+
+
+class LatencySketch:
+    """Histograma de buckets logarítmicos con decaimiento exponencial.
+
+    Args:
+        relative_accuracy: Error relativo máximo de un cuantil
+        half_life: Muestras tras las que los pesos se reducen a la mitad
+    """
+
+    __slots__ = (
+        "_buckets",
+        "_gamma",
+        "_log_gamma",
+        "_since_decay",
+        "half_life",
+        "samples",
+    )
+
+    def __init__(
+        self,
+        relative_accuracy: float = LATENCY_RELATIVE_ACCURACY,
+        half_life: int = LATENCY_HALF_LIFE,
+    ) -> None:
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: dict[int, float] = {}
+        self._since_decay = 0
+        self.half_life = half_life
+        self.samples = 0
+
+    def add(self, seconds: float) -> None:
+        key = math.ceil(math.log(max(seconds, MIN_LATENCY_SECONDS)) / self._log_gamma)
+        self._buckets[key] = self._buckets.get(key, 0.0) + 1.0
+        self.samples += 1
+        self._since_decay += 1
+        if self._since_decay >= self.half_life:
+            self._since_decay = 0
+            self._buckets = {
+                k: w / 2
+                for k, w in self._buckets.items()
+                if w / 2 >= _MIN_BUCKET_WEIGHT
+            }
+
+    def quantile(self, q: float) -> float | None:
+        """Cuantil ``q`` (0-1) de las muestras, ponderado por recencia."""
+        if not self._buckets:
+            return None
+        rank = q * sum(self._buckets.values())
+        cumulative = 0.0
+        keys = sorted(self._buckets)
+        for key in keys:
+            cumulative += self._buckets[key]
+            if cumulative >= rank:
+                break
+        # Punto medio (en escala relativa) del bucket
+        return 2 * self._gamma**key / (self._gamma + 1)
+
+
+class HostLatencyTracker:
+    """Sketch de latencias por host.
+
+    Args:
+        half_life: Muestras tras las que pesan la mitad (recencia)
+        max_hosts: Hosts recordados (LRU)
+    """
+
+    def __init__(
+        self, half_life: int = LATENCY_HALF_LIFE, max_hosts: int = 1024
+    ) -> None:
+        self.half_life = half_life
+        self._sketches: LRUCache[str, LatencySketch] = LRUCache(maxsize=max_hosts)
+
+    def record(self, host: str, seconds: float) -> None:
+        """Registra la latencia de un request a ``host``."""
+        sketch = self._sketches.get(host)
+        if sketch is None:
+            sketch = self._sketches[host] = LatencySketch(half_life=self.half_life)
+        sketch.add(seconds)
+
+    def count(self, host: str) -> int:
+        """Muestras registradas para ``host``."""
+        sketch = self._sketches.get(host)
+        return sketch.samples if sketch else 0
+
+    def quantile(self, host: str, q: float, min_samples: int = 1) -> float | None:
+        """Cuantil ``q`` de la latencia de ``host``.
+
+        Returns:
+            Segundos, o None si hay menos de ``min_samples`` muestras.
+        """
+        sketch = self._sketches.get(host)
+        if sketch is None or sketch.samples < min_samples:
+            return None
+        return sketch.quantile(q)
+
+
+@dataclass(frozen=True, slots=True)
+class HostTimeouts:
+    """Timeouts de un request (segundos)."""
+
+    connect: float
+    read: float
+    total: float
+
+
+class AdaptiveTimeouts:
+    """Timeouts por host como múltiplo de su p99 reciente.
+
+    ``read`` (y ``connect``, que nunca tarda más que los headers) sale del
+    p99 del tiempo hasta headers; ``total`` del p99 del request completo.
+    Hasta reunir ``min_samples`` muestras de un host se usa ``default``.
+
+    Un request que agota su timeout se registra con el tiempo consumido: si
+    el host se vuelve más lento, sus timeouts crecen en vez de cortar cada
+    request para siempre.
+
+    Args:
+        default: Timeout de hosts sin historial (segundos)
+        multiplier: Múltiplo del p99
+        floor: Timeout mínimo
+        ceiling: Timeout máximo
+        min_samples: Muestras para fiarse del p99 de un host
+        quantile: Cuantil de referencia
+        enabled: False = siempre ``default``
+    """
+
+    def __init__(
+        self,
+        default: float,
+        multiplier: float = 3.0,
+        floor: float = 2.0,
+        ceiling: float = 60.0,
+        min_samples: int = 20,
+        quantile: float = 0.99,
+        enabled: bool = True,
+    ) -> None:
+        self.default = default
+        self.multiplier = multiplier
+        self.floor = floor
+        self.ceiling = ceiling
+        self.min_samples = min_samples
+        self.q = quantile
+        self.enabled = enabled
+        self.headers = HostLatencyTracker()
+        self.total = HostLatencyTracker()
+        self.timeouts = 0
+
+    def record(self, host: str, headers_seconds: float, total_seconds: float) -> None:
+        """Registra un request completado."""
+        self.headers.record(host, headers_seconds)
+        self.total.record(host, total_seconds)
+
+    def record_timeout(self, host: str, elapsed: float, headers: bool = False) -> None:
+        """Registra un request cortado por timeout tras ``elapsed`` segundos.
+
+        Args:
+            headers: True si los headers llegaron antes del corte
+        """
+        self.timeouts += 1
+        if not headers:
+            self.headers.record(host, elapsed)
+        self.total.record(host, elapsed)
+
+    def for_host(self, host: str, cap: float | None = None) -> HostTimeouts:
+        """Timeouts para el siguiente request a ``host``.
+
+        Args:
+            cap: Techo adicional (p.ej. lo que le queda al deadline de la página)
+        """
+        limit = self.ceiling if cap is None else min(self.ceiling, cap)
+        default = self.default if cap is None else min(self.default, cap)
+        if not self.enabled:
+            return HostTimeouts(default, default, default)
+        headers_p99 = self.headers.quantile(host, self.q, self.min_samples)
+        total_p99 = self.total.quantile(host, self.q, self.min_samples)
+        if headers_p99 is None or total_p99 is None:
+            return HostTimeouts(default, default, default)
+        read = min(max(self.multiplier * headers_p99, self.floor), limit)
+        total = min(max(self.multiplier * total_p99, self.floor, read), limit)
+        return HostTimeouts(connect=read, read=read, total=total)
+
+
+class HedgeBudget:
+    """Token bucket que limita los hedges a una fracción de los requests.
+
+    Args:
+        ratio: Hedges permitidos por request (0.05 = 5% de carga extra)
+        burst: Tokens máximos acumulados
+    """
+
+    def __init__(self, ratio: float = 0.05, burst: float = 10.0) -> None:
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst
+
+    def earn(self) -> None:
+        """Un request primario suma ``ratio`` tokens."""
+        self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Gasta un token para un hedge si hay saldo."""
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Callable
 from dataclasses import dataclass
 
 import nh3
@@ -18,9 +19,9 @@ class DensityThresholds:
     VERY_HIGH_DENSITY_MAX_LENGTH: int = 800
 
 
-# Selector combinado para eliminación en una sola pasada (10-15x más rápido)
-_COMBINED_REMOVAL_SELECTOR = ",".join(
-    [
+# Reglas de eliminación de boilerplate (compartidas con el cleaner streaming)
+REMOVAL_TAGS = frozenset(
+    {
         "script",
         "style",
         "iframe",
@@ -32,12 +33,17 @@ _COMBINED_REMOVAL_SELECTOR = ",".join(
         "footer",
         "header",
         "nav",
-        ".cookie-consent",
-        ".ads",
-        ".sidebar",
-        ".popup",
-        "#menu",
-        ".menu",
+    }
+)
+REMOVAL_CLASSES = frozenset({"cookie-consent", "ads", "sidebar", "popup", "menu"})
+REMOVAL_IDS = frozenset({"menu"})
+
+# Selector combinado para eliminación en una sola pasada (10-15x más rápido)
+_COMBINED_REMOVAL_SELECTOR = ",".join(
+    [
+        *sorted(REMOVAL_TAGS),
+        *(f".{c}" for c in sorted(REMOVAL_CLASSES)),
+        *(f"#{i}" for i in sorted(REMOVAL_IDS)),
     ]
 )
 
@@ -57,31 +63,77 @@ def get_text_density(node: Node) -> float:
     return link_text_len / total_text_len
 
 
+# Tags candidatos a poda por densidad (en este orden)
+DENSITY_PRUNE_TAGS = ("div", "section", "ul", "table", "aside")
+
+
 def prune_by_density(
-    tree: HTMLParser, thresholds: DensityThresholds = DensityThresholds()
+    tree: HTMLParser,
+    thresholds: DensityThresholds = DensityThresholds(),
+    on_candidate: Callable[[Node, bool], None] | None = None,
 ) -> None:
-    """Podar nodos con baja densidad de texto (contenido boilerplate)."""
-    for tag in ["div", "section", "ul", "table", "aside"]:
+    """Podar nodos con baja densidad de texto (contenido boilerplate).
+
+    Args:
+        tree: Árbol a podar in-place
+        thresholds: Umbrales de densidad
+        on_candidate: Callback opcional ``(node, pruned)`` para cada nodo
+            evaluado, llamado antes de eliminarlo (lo usa el template learner)
+    """
+    for tag in DENSITY_PRUNE_TAGS:
         for node in tree.css(tag):
-            text_content = node.text(deep=True, separator=" ", strip=True)
-            if len(text_content) < thresholds.MIN_TEXT_LENGTH:
-                continue
-
-            density = get_text_density(node)
-
-            if (
-                density > thresholds.HIGH_DENSITY_THRESHOLD
-                and len(text_content) < thresholds.HIGH_DENSITY_MAX_LENGTH
-            ):
-                if not node.css("img"):
-                    node.decompose()
-            elif (
-                density > thresholds.VERY_HIGH_DENSITY_THRESHOLD
-                and len(text_content) < thresholds.VERY_HIGH_DENSITY_MAX_LENGTH
-            ):
+            pruned = is_low_density(node, thresholds)
+            if on_candidate is not None:
+                on_candidate(node, pruned)
+            if pruned:
                 node.decompose()
 
 
+def is_low_density(node: Node, thresholds: DensityThresholds | None = None) -> bool:
+    """Si ``prune_by_density`` podaría el nodo (boilerplate de enlaces)."""
+    if thresholds is None:
+        thresholds = DensityThresholds()
+    text_content = node.text(deep=True, separator=" ", strip=True)
+    if len(text_content) < thresholds.MIN_TEXT_LENGTH:
+        return False
+
+    density = get_text_density(node)
+    if (
+        density > thresholds.HIGH_DENSITY_THRESHOLD
+        and len(text_content) < thresholds.HIGH_DENSITY_MAX_LENGTH
+    ):
+        return not node.css("img")
+    return (
+        density > thresholds.VERY_HIGH_DENSITY_THRESHOLD
+        and len(text_content) < thresholds.VERY_HIGH_DENSITY_MAX_LENGTH
+    )
+
+
+def truncate_html(raw_html: str, max_size: int) -> str:
+    """Trunca HTML gigantesco intentando cortar tras un tag de cierre."""
+    if len(raw_html) <= max_size:
+        return raw_html
+
+    # Early rejection para HTML gigantesco (previene OOM en páginas maliciosas)
+    logger.warning(f"HTML too large ({len(raw_html)} bytes), truncating to {max_size}")
+    raw_html = raw_html[:max_size]
+    # Intentar cortar en un tag de cierre para no romper parsing
+    last_close = raw_html.rfind(">")
+    if last_close > max_size * 0.9:
+        raw_html = raw_html[: last_close + 1]
+    return raw_html
+
+
+def serialize_clean(tree: HTMLParser, sanitize: bool = True) -> str:
+    """Serializa el árbol ya podado y (por defecto) lo sanitiza con nh3."""
+    # Defensive: tree.html puede ser None si el parsing falla
+    html_content = tree.html
+    if html_content is None:
+        return ""
+
+    return nh3.clean(html_content) if sanitize else html_content
+
+
 def pre_clean_html(raw_html: str, max_size: int = 5 * 1024 * 1024) -> str:
     """Limpia HTML eliminando tags irrelevantes y contenido boilerplate.
 
@@ -96,18 +148,7 @@ def pre_clean_html(raw_html: str, max_size: int = 5 * 1024 * 1024) -> str:
     if not raw_html:
         return ""
 
-    # Early rejection para HTML gigantesco (previene OOM en páginas maliciosas)
-    if len(raw_html) > max_size:
-        logger.warning(
-            f"HTML too large ({len(raw_html)} bytes), truncating to {max_size}"
-        )
-        raw_html = raw_html[:max_size]
-        # Intentar cortar en un tag de cierre para no romper parsing
-        last_close = raw_html.rfind(">")
-        if last_close > max_size * 0.9:
-            raw_html = raw_html[: last_close + 1]
-
-    tree = HTMLParser(raw_html)
+    tree = HTMLParser(truncate_html(raw_html, max_size))
 
     # Selector combinado: una sola iteración sobre el árbol (10-15x más rápido)
     for node in tree.css(_COMBINED_REMOVAL_SELECTOR):
@@ -115,9 +156,4 @@ def pre_clean_html(raw_html: str, max_size: int = 5 * 1024 * 1024) -> str:
 
     prune_by_density(tree)
 
-    # Defensive: tree.html puede ser None si el parsing falla
-    html_content = tree.html
-    if html_content is None:
-        return ""
-
-    return nh3.clean(html_content)
+    return serialize_clean(tree)
@@ -8,6 +8,7 @@ from typing import Optional
 
 import aiohttp
 import certifi
+from aiohttp.abc import AbstractResolver
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +41,7 @@ class HTTPSessionCache:
         timeout_connect: float = 10.0,
         timeout_read: float = 20.0,
         verify_ssl: bool = True,
+        resolver: Optional[AbstractResolver] = None,
     ):
         """Inicializa caché de sesiones HTTP.
 
@@ -50,6 +52,8 @@ class HTTPSessionCache:
             timeout_connect: Timeout para establecimiento de conexión
             timeout_read: Timeout para lectura de respuesta
             verify_ssl: Si se debe verificar el certificado SSL (por defecto True)
+            resolver: Resolver DNS compartido (p.ej. ``CachingResolver``); sin
+                él se usa la caché DNS propia de aiohttp
         """
         self._session: Optional[aiohttp.ClientSession] = None
         self._max_pool_size = max_pool_size
@@ -58,6 +62,7 @@ class HTTPSessionCache:
         self._timeout_connect = timeout_connect
         self._timeout_read = timeout_read
         self._verify_ssl = verify_ssl
+        self._resolver = resolver
         self._connector: Optional[aiohttp.TCPConnector] = None
 
     def _create_connector(self) -> aiohttp.TCPConnector:
@@ -69,8 +74,9 @@ class HTTPSessionCache:
         return aiohttp.TCPConnector(
             limit=self._max_pool_size,  # Total conexiones simultáneas
             limit_per_host=self._max_per_host,  # Por dominio
+            resolver=self._resolver,
             ttl_dns_cache=300,  # DNS cache 5 min
-            use_dns_cache=True,
+            use_dns_cache=self._resolver is None,  # El resolver ya cachea
             enable_cleanup_closed=True,  # Limpia conexiones cerradas
             force_close=False,  # Reutiliza conexiones
             keepalive_timeout=30,  # Keep-alive 30s
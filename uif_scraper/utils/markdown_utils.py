@@ -3,27 +3,49 @@
 This module provides utilities for enhancing markdown output:
 - TOC (Table of Contents) generation from headers
 - Relative URL resolution for clickable links
+- Single-pass rendering of the final document (frontmatter + TOC + body)
 
 Reference: AGENTS.md - Single Responsibility Principle
 """
 
 from __future__ import annotations
 
+import io
 import re
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from uif_scraper.extractors.metadata_extractor import DocumentHeader
 
+# Links inline e imágenes en un solo patrón: group(1)="!" si es imagen
+_LINK_PATTERN = re.compile(r"(!?)\[([^\]]*)\]\(([^)]+)\)")
+
+# Primera línea con texto que no es un heading (punto de inserción del TOC)
+_FIRST_TEXT_LINE_PATTERN = re.compile(r"^(?!#)[^\n]*\S", re.MULTILINE)
+
+_ANCHOR_SPACES_PATTERN = re.compile(r"\s+")
+_ANCHOR_INVALID_PATTERN = re.compile(r"[^a-z0-9\-]")
+_ANCHOR_DASHES_PATTERN = re.compile(r"-+")
+
+HeaderLike = DocumentHeader | Mapping[str, Any]
+
+
+def _header_fields(header: HeaderLike) -> tuple[int, str, str | None]:
+    """Lee (level, text, id) de un header sin reconstruir modelos."""
+    if isinstance(header, Mapping):
+        return header.get("level", 1), header.get("text", ""), header.get("id")
+    return header.level, header.text, header.id
+
 
 def generate_toc(
-    headers: list[DocumentHeader],
+    headers: Sequence[HeaderLike],
     max_level: int = 3,
     title: str = "Tabla de Contenidos",
 ) -> str:
     """Genera TOC (Table of Contents) en markdown desde headers extraídos.
 
     Args:
-        headers: Lista de DocumentHeader con level, text, id
+        headers: Lista de DocumentHeader (o dicts) con level, text, id
         max_level: Nivel máximo de header a incluir (1-6, default 3)
         title: Título de la sección TOC
 
@@ -44,22 +66,24 @@ def generate_toc(
     if not headers:
         return ""
 
-    # Filtrar headers por nivel máximo
-    filtered_headers = [h for h in headers if 1 <= h.level <= max_level]
-
-    if not filtered_headers:
-        return ""
-
     toc_lines = [f"## {title}\n"]
 
-    for header in filtered_headers:
+    for header in headers:
+        level, text, header_id = _header_fields(header)
+        # Filtrar headers por nivel máximo
+        if not 1 <= level <= max_level:
+            continue
+
         # Indentación basada en nivel (level 1 = 0 indent, level 2 = 2 spaces, etc.)
-        indent = "  " * (header.level - 1)
+        indent = "  " * (level - 1)
 
         # Generar anchor: usar id si existe, si no generar desde texto
-        anchor = header.id or _slugify_anchor(header.text)
+        anchor = header_id or _slugify_anchor(text)
 
-        toc_lines.append(f"{indent}- [{header.text}](#{anchor})")
+        toc_lines.append(f"{indent}- [{text}](#{anchor})")
+
+    if len(toc_lines) == 1:
+        return ""
 
     return "\n".join(toc_lines) + "\n"
 
@@ -76,11 +100,11 @@ def _slugify_anchor(text: str) -> str:
     # Lowercase
     slug = text.lower()
     # Reemplazar espacios con guiones
-    slug = re.sub(r"\s+", "-", slug)
+    slug = _ANCHOR_SPACES_PATTERN.sub("-", slug)
     # Remover caracteres no alfanuméricos (excepto guiones)
-    slug = re.sub(r"[^a-z0-9\-]", "", slug)
+    slug = _ANCHOR_INVALID_PATTERN.sub("", slug)
     # Remover guiones múltiples
-    slug = re.sub(r"-+", "-", slug)
+    slug = _ANCHOR_DASHES_PATTERN.sub("-", slug)
     # Remover guiones al inicio/final
     slug = slug.strip("-")
     return slug or "section"
@@ -111,41 +135,19 @@ def resolve_relative_links(markdown: str, base_url: str) -> str:
     if not markdown or not base_url:
         return markdown
 
-    # Pattern para links inline: [text](url)
-    # Captura: group(1)=text, group(2)=url
-    inline_link_pattern = r"\[([^\]]+)\]\(([^)]+)\)"
-
-    def replace_inline_link(match: re.Match[str]) -> str:
-        text = match.group(1)
-        url = match.group(2)
-
-        # Skip si ya es absoluto o especial
-        if _is_special_url(url):
-            return match.group(0)
-
-        # Resolver URL relativa
-        absolute_url = _resolve_url(base_url, url)
-        return f"[{text}]({absolute_url})"
-
-    # Pattern para imágenes: ![alt](url)
-    image_pattern = r"!\[([^\]]*)\]\(([^)]+)\)"
+    # Una sola pasada con regex compilado (imágenes y links a la vez)
+    return _LINK_PATTERN.sub(lambda m: _rewrite_link(m, base_url), markdown)
 
-    def replace_image_link(match: re.Match[str]) -> str:
-        alt = match.group(1)
-        url = match.group(2)
 
-        if _is_special_url(url):
-            return match.group(0)
+def _rewrite_link(match: re.Match[str], base_url: str) -> str:
+    """Reescribe un link/imagen a URL absoluta si es relativo."""
+    bang, text, url = match.group(1, 2, 3)
 
-        absolute_url = _resolve_url(base_url, url)
-        return f"![{alt}]({absolute_url})"
+    # Links sin texto no se tocan (sí las imágenes sin alt)
+    if (not bang and not text) or _is_special_url(url):
+        return match.group(0)
 
-    # Procesar imágenes primero (para no confundir con links)
-    result = re.sub(image_pattern, replace_image_link, markdown)
-    # Luego procesar links
-    result = re.sub(inline_link_pattern, replace_inline_link, result)
-
-    return result
+    return f"{bang}[{text}]({_resolve_url(base_url, url)})"
 
 
 def _is_special_url(url: str) -> bool:
@@ -236,18 +238,92 @@ def _resolve_url(base_url: str, relative_url: str) -> str:
     return base_path
 
 
+def _toc_insert_offset(markdown: str) -> int:
+    """Offset de la primera línea con texto que no es heading (0 si no hay)."""
+    match = _FIRST_TEXT_LINE_PATTERN.search(markdown)
+    return match.start() if match else 0
+
+
+def render_markdown_document(
+    markdown: str,
+    metadata: Mapping[str, Any],
+    base_url: str,
+    frontmatter: str | None = None,
+    toc_max_level: int = 3,
+    include_toc: bool = True,
+    absolutize_links: bool = True,
+) -> str:
+    """Construye el documento final en un único buffer y una sola pasada.
+
+    Escribe en orden: frontmatter, body con links absolutos y el TOC
+    insertado en su sitio (antes de la primera línea de texto que no es
+    heading). Evita el split/join por líneas y las copias intermedias del
+    documento completo.
+
+    Args:
+        markdown: Contenido markdown original
+        metadata: Metadata del documento (puede incluir 'headers')
+        base_url: URL base para resolver links
+        frontmatter: YAML ya serializado (sin delimitadores) o None
+        toc_max_level: Nivel máximo de headers en TOC
+        include_toc: Si incluir TOC
+        absolutize_links: Si resolver links relativos contra ``base_url``
+
+    Returns:
+        Documento final listo para persistir
+    """
+    out = io.StringIO()
+    if frontmatter is not None:
+        out.write("---\n")
+        out.write(frontmatter)
+        out.write("---\n\n")
+
+    if not markdown:
+        out.write(markdown)
+        return out.getvalue()
+
+    toc = ""
+    if include_toc:
+        headers = metadata.get("headers")
+        if headers:
+            toc = generate_toc(headers, max_level=toc_max_level)
+    toc_offset = _toc_insert_offset(markdown) if toc else -1
+
+    pos = 0
+    rewrite = absolutize_links and base_url
+    for match in _LINK_PATTERN.finditer(markdown) if rewrite else ():
+        start = match.start()
+        if 0 <= toc_offset <= start:
+            out.write(markdown[pos:toc_offset])
+            out.write(f"\n{toc}\n\n")
+            pos = max(pos, toc_offset)
+            toc_offset = -1
+        out.write(markdown[pos:start])
+        out.write(_rewrite_link(match, base_url))
+        pos = match.end()
+
+    if toc_offset >= 0:
+        out.write(markdown[pos:toc_offset])
+        out.write(f"\n{toc}\n\n")
+        pos = max(pos, toc_offset)
+    out.write(markdown[pos:])
+
+    return out.getvalue()
+
+
 def enhance_markdown_for_rag(
     markdown: str,
     metadata: dict[str, Any],
     base_url: str,
     toc_max_level: int = 3,
     include_toc: bool = True,
+    absolutize_links: bool = True,
 ) -> str:
     """Pipeline completo de enhancement de markdown para RAG.
 
     Aplica:
     1. Generación de TOC (si hay headers y include_toc=True)
-    2. Resolución de links relativos
+    2. Resolución de links relativos (si absolutize_links=True)
 
     Args:
         markdown: Contenido markdown original
@@ -255,6 +331,7 @@ def enhance_markdown_for_rag(
         base_url: URL base para resolver links
         toc_max_level: Nivel máximo de headers en TOC
         include_toc: Si incluir TOC al inicio
+        absolutize_links: Si resolver links relativos
 
     Returns:
         Markdown enhanced para RAG
@@ -262,33 +339,11 @@ def enhance_markdown_for_rag(
     if not markdown:
         return markdown
 
-    result = markdown
-
-    # 1. Resolver links relativos
-    result = resolve_relative_links(result, base_url)
-
-    # 2. Agregar TOC si hay headers
-    if include_toc and "headers" in metadata:
-        headers_data = metadata["headers"]
-        if headers_data:
-            # Convertir dicts a DocumentHeader si es necesario
-            headers = [
-                DocumentHeader(**h) if isinstance(h, dict) else h for h in headers_data
-            ]
-            toc = generate_toc(headers, max_level=toc_max_level)
-            if toc:
-                # Insertar TOC después del primer párrafo si existe
-                # o al inicio si no hay párrafos claros
-                lines = result.split("\n")
-                insert_pos = 0
-
-                # Buscar dónde insertar (después del primer bloque de texto)
-                for i, line in enumerate(lines):
-                    if line.strip() and not line.startswith("#"):
-                        insert_pos = i
-                        break
-
-                lines.insert(insert_pos, "\n" + toc + "\n")
-                result = "\n".join(lines)
-
-    return result
+    return render_markdown_document(
+        markdown,
+        metadata,
+        base_url,
+        toc_max_level=toc_max_level,
+        include_toc=include_toc,
+        absolutize_links=absolutize_links,
+    )
@@ -0,0 +1,307 @@
+"""Gobernador de memoria global: backpressure por RSS y bytes contabilizados.
+
+Las colas del engine (URLs, assets, persistencia) no tienen tope y los
+payloads (HTML, markdown, cuerpos de assets) viven en memoria mientras
+cruzan el pipeline: en misiones largas o VMs pequeñas el proceso acaba
+muerto por el OOM killer. ``MemoryGovernor`` compara el uso con un
+presupuesto y aplica presión en dos umbrales con histéresis:
+
+- Por encima de ``high_watermark``: pausa la admisión de nuevos fetches y
+  ejecuta las acciones de alivio registradas (encoger cachés, flush de
+  writers) como mucho una vez cada ``relief_interval`` segundos.
+- Por debajo de ``low_watermark``: reanuda la admisión.
+
+El uso es ``max(RSS, RSS base + bytes contabilizados)``: el RSS no baja al
+liberar (el allocator retiene páginas) y los bytes contabilizados en colas
+y buffers son exactos, así que cualquiera de los dos puede adelantarse.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import inspect
+import os
+import sys
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, MutableMapping
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+MB = 1024 * 1024
+
+# Fracción de la memoria del sistema (o del cgroup) usada como presupuesto
+# cuando no se configura uno explícito
+DEFAULT_BUDGET_FRACTION = 0.8
+
+# Límites de memoria del cgroup (v2 y v1): en contenedores la RAM del host
+# no es la que el OOM killer respeta
+_CGROUP_LIMIT_FILES = (
+    Path("/sys/fs/cgroup/memory.max"),
+    Path("/sys/fs/cgroup/memory/memory.limit_in_bytes"),
+)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+ReliefAction = Callable[[], Awaitable[None] | None]
+
+
+def detect_memory_limit() -> int:
+    """Memoria disponible para el proceso: la del sistema o la del cgroup.
+
+    Returns:
+        Bytes, o 0 si la plataforma no permite detectarla.
+    """
+    try:
+        limit = os.sysconf("SC_PHYS_PAGES") * _PAGE_SIZE
+    except (AttributeError, ValueError, OSError):
+        return 0
+    for path in _CGROUP_LIMIT_FILES:
+        try:
+            value = path.read_text().strip()
+        except OSError:
+            continue
+        if value.isdigit():
+            limit = min(limit, int(value))
+    return limit
+
+
+def resolve_memory_budget(budget_mb: int | None) -> int:
+    """Presupuesto en bytes: ``None`` = automático, ``0`` = desactivado.
+
+    El modo automático queda desactivado si no se puede detectar la memoria.
+    """
+    if budget_mb is None:
+        return int(detect_memory_limit() * DEFAULT_BUDGET_FRACTION)
+    return budget_mb * MB
+
+
+def _process_rss() -> int:
+    """RSS actual del proceso (sin dependencias: ``/proc`` o ``getrusage``)."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        # Sin medida de RSS: el gobernador usa solo los bytes contabilizados
+        return 0
+    # Sin /proc (macOS): el pico de RSS es la mejor cota disponible
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def process_tree_rss(root: int | None = None) -> int:
+    """RSS sumado de los procesos descendientes de ``root`` (por defecto este).
+
+    El navegador (driver de Playwright y procesos de Chromium) vive fuera
+    del proceso y su memoria no aparece en el RSS propio.
+
+    Returns:
+        Bytes, o 0 sin ``/proc``.
+    """
+    root = root or os.getpid()
+    children: dict[int, list[int]] = {}
+    rss: dict[int, int] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return 0
+    for name in entries:
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue  # El proceso terminó mientras se recorría
+        # El nombre del proceso puede tener espacios: los campos van tras ')'
+        fields = stat[stat.rfind(b")") + 2 :].split()
+        try:
+            ppid, pages = int(fields[1]), int(fields[21])
+        except (IndexError, ValueError):
+            continue
+        pid = int(name)
+        children.setdefault(ppid, []).append(pid)
+        rss[pid] = pages * _PAGE_SIZE
+
+    total = 0
+    pending = list(children.get(root, ()))
+    while pending:
+        pid = pending.pop()
+        total += rss.get(pid, 0)
+        pending.extend(children.get(pid, ()))
+    return total
+
+
+def shrink_cache(cache: MutableMapping[Any, Any], fraction: float = 0.5) -> int:
+    """Descarta entradas de una caché cachetools hasta dejar ``1 - fraction``.
+
+    ``popitem`` de LRU/TTL descarta primero las menos usadas o más antiguas.
+
+    Returns:
+        Número de entradas descartadas.
+    """
+    target = int(len(cache) * (1 - fraction))
+    dropped = 0
+    while len(cache) > target:
+        try:
+            cache.popitem()
+        except KeyError:
+            break
+        dropped += 1
+    return dropped
+
+
+class MemoryGovernor:
+    """Presión de memoria global con pausa de admisión y acciones de alivio.
+
+    Args:
+        budget_bytes: Presupuesto de memoria del proceso (0 = desactivado)
+        high_watermark: Fracción del presupuesto que activa la presión
+        low_watermark: Fracción por debajo de la cual se reanuda la admisión
+        relief_interval: Segundos mínimos entre rondas de alivio
+        rss_reader: Lector del RSS del proceso (inyectable en tests)
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int,
+        high_watermark: float = 0.85,
+        low_watermark: float = 0.70,
+        relief_interval: float = 5.0,
+        rss_reader: Callable[[], int] | None = None,
+    ) -> None:
+        self.budget_bytes = budget_bytes
+        self.high_watermark = high_watermark
+        self.low_watermark = min(low_watermark, high_watermark)
+        self.relief_interval = relief_interval
+        self._rss_reader = rss_reader or _process_rss
+        self.baseline_rss = self._rss_reader()
+        self.rss = self.baseline_rss
+        self._accounted: Counter[str] = Counter()
+        self._gauges: dict[str, Callable[[], int]] = {}
+        self._relief: dict[str, ReliefAction] = {}
+        self._admission = asyncio.Event()
+        self._admission.set()
+        self._last_relief = float("-inf")
+        self.pauses = 0
+        self.reliefs = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget_bytes > 0
+
+    @property
+    def paused(self) -> bool:
+        """True mientras la admisión de fetches está pausada por presión."""
+        return not self._admission.is_set()
+
+    # --- Contabilidad -----------------------------------------------------
+
+    def reserve(self, kind: str, nbytes: int) -> None:
+        """Suma ``nbytes`` retenidos en memoria bajo la categoría ``kind``."""
+        self._accounted[kind] += nbytes
+
+    def release(self, kind: str, nbytes: int) -> None:
+        """Descuenta ``nbytes`` de ``kind`` (nunca por debajo de cero)."""
+        self._accounted[kind] = max(0, self._accounted[kind] - nbytes)
+
+    def register_gauge(self, name: str, gauge: Callable[[], int]) -> None:
+        """Registra una medida de bytes que se lee en cada ``check``.
+
+        Para colas o buffers cuyo tamaño ya se conoce sin contabilidad
+        incremental (p.ej. ``qsize() * tamaño estimado``).
+        """
+        self._gauges[name] = gauge
+
+    def register_relief(self, name: str, action: ReliefAction) -> None:
+        """Registra una acción de alivio (síncrona o corutina)."""
+        self._relief[name] = action
+
+    def accounted(self) -> dict[str, int]:
+        """Bytes contabilizados por categoría, incluidos los gauges."""
+        totals = {kind: n for kind, n in self._accounted.items() if n}
+        for name, gauge in self._gauges.items():
+            totals[name] = totals.get(name, 0) + gauge()
+        return totals
+
+    def usage(self) -> int:
+        """Uso estimado en bytes con el último RSS leído."""
+        return max(self.rss, self.baseline_rss + sum(self.accounted().values()))
+
+    # --- Presión ----------------------------------------------------------
+
+    async def wait_for_admission(self) -> None:
+        """Bloquea mientras la admisión está pausada por presión de memoria."""
+        await self._admission.wait()
+
+    async def check(self, in_flight: int) -> None:
+        """Mide el uso y aplica o levanta la presión.
+
+        Args:
+            in_flight: Trabajo ya admitido que puede liberar memoria al
+                terminar. Sin trabajo en vuelo pausar no libera nada (y la
+                misión no avanzaría), así que la admisión sigue abierta.
+        """
+        if not self.enabled:
+            return
+        self.rss = self._rss_reader()
+        usage = self.usage()
+
+        if usage >= self.budget_bytes * self.high_watermark:
+            if not self.paused and in_flight > 0:
+                self._admission.clear()
+                self.pauses += 1
+                logger.warning(
+                    f"Memory pressure: {usage / MB:.0f}/{self.budget_bytes / MB:.0f} MB"
+                    f" (rss {self.rss / MB:.0f} MB), pausing fetch admission"
+                )
+            now = time.monotonic()
+            if now - self._last_relief >= self.relief_interval:
+                self._last_relief = now
+                await self._run_relief()
+        elif self.paused and usage <= self.budget_bytes * self.low_watermark:
+            self._admission.set()
+            logger.info(
+                f"Memory pressure relieved ({usage / MB:.0f} MB), resuming fetch"
+            )
+
+        if self.paused and in_flight == 0:
+            self._admission.set()
+            logger.warning(
+                f"Memory over budget ({usage / MB:.0f} MB) with nothing in flight: "
+                "resuming fetch admission"
+            )
+
+    async def _run_relief(self) -> None:
+        self.reliefs += 1
+        for name, action in self._relief.items():
+            try:
+                result = action()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                # Una acción rota no impide las siguientes ni el gc.collect()
+                logger.exception(f"Memory relief '{name}' failed")
+        gc.collect()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Presupuesto, uso y bytes contabilizados para monitoring."""
+        return {
+            "budget_bytes": self.budget_bytes,
+            "rss_bytes": self.rss,
+            "usage_bytes": self.usage(),
+            "accounted": self.accounted(),
+            "paused": self.paused,
+            "pauses": self.pauses,
+            "reliefs": self.reliefs,
+        }
@@ -0,0 +1,278 @@
+"""Guardas por página: deadline entre etapas y complejidad del documento.
+
+Una sola página rota o maliciosa (tablas anidadas miles de niveles, 200k
+links, un SVG inline gigante) puede ocupar un worker durante segundos: el
+parser HTML es cuadrático con el anidamiento y ``prune_by_density``,
+``convert`` o el parachute de BeautifulSoup recorren el árbol completo.
+
+- ``assess_complexity`` mide el documento sin parsearlo (conteos y un
+  escaneo lineal de tags en memoria constante, que se corta en cuanto se
+  supera el presupuesto) para decidir antes de pagar el parseo.
+- ``count_nodes`` es su parte en C (``str.count``): el engine la evalúa en
+  el event loop y un documento con demasiados nodos va directo a la
+  extracción degradada, sin escaneo ni parseo en el pool.
+- ``PageBudget`` define los límites; un documento fuera de presupuesto se
+  extrae con ``degraded_text`` (regex lineal, sin árbol DOM).
+- ``Deadline`` es el presupuesto de tiempo de la página, compartido por
+  fetch, limpieza, extracción y guardado.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import html
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from itertools import islice
+
+# Tags sin cierre o con cierre opcional: no suman profundidad (un <li> o
+# <p> sin cerrar no es anidamiento real y dispararía falsos positivos)
+_FLAT_TAGS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "source",
+        "track",
+        "wbr",
+        "p",
+        "li",
+        "dt",
+        "dd",
+        "option",
+        "tr",
+        "td",
+        "th",
+        "thead",
+        "tbody",
+        "tfoot",
+    }
+)
+
+# Scripts, estilos y comentarios se saltan enteros: su contenido no son tags.
+# Los tags planos y los ``<tag/>`` ni siquiera llegan a Python: el bucle de
+# profundidad solo ve aperturas y cierres que cuentan (grupo 1 = "/" o "").
+# Sin IGNORECASE global, que duplica el coste del lookahead: los tags planos
+# van en minúsculas y mayúsculas
+_FLAT_ALTERNATION = "|".join(sorted(_FLAT_TAGS | {tag.upper() for tag in _FLAT_TAGS}))
+_TAG_PATTERN = re.compile(
+    r"<(?:(?i:script|style)\b[^>]*>.*?</(?i:script|style)\s*>|!--.*?-->"
+    r"|(/?)(?!(?:" + _FLAT_ALTERNATION + r")[\s/>])[a-zA-Z][^>]*(?<!/)>)",
+    re.DOTALL,
+)
+_LINK_PATTERN = re.compile(r"<a[\s>]", re.IGNORECASE)
+
+# Extractor degradado: bloques sin texto útil, headings, bloques y tags
+_DROP_BLOCKS_PATTERN = re.compile(
+    r"<(script|style|svg|noscript|template|iframe|head)\b.*?</\1\s*>|<!--.*?-->",
+    re.DOTALL | re.IGNORECASE,
+)
+_HEADING_PATTERN = re.compile(r"<h([1-6])\b[^>]*>", re.IGNORECASE)
+_BLOCK_PATTERN = re.compile(
+    r"</?(?:p|div|br|li|tr|h[1-6]|table|section|article|main|header|footer"
+    r"|ul|ol|pre|blockquote|dt|dd)\b[^>]*>",
+    re.IGNORECASE,
+)
+_ANY_TAG_PATTERN = re.compile(r"<[^>]*>")
+_SPACES_PATTERN = re.compile(r"[ \t\r\f\v]+")
+
+
+@dataclass(frozen=True, slots=True)
+class DocumentComplexity:
+    """Medidas baratas de un documento HTML (estimaciones, no un DOM)."""
+
+    size: int
+    nodes: int
+    max_depth: int
+    links: int
+
+
+@dataclass(frozen=True, slots=True)
+class PageBudget:
+    """Límites de complejidad por encima de los cuales se degrada la extracción."""
+
+    max_nodes: int = 100_000
+    max_depth: int = 256
+    max_links: int = 20_000
+
+    def exceeded(
+        self, complexity: DocumentComplexity, streamed: bool = False
+    ) -> str | None:
+        """Motivo por el que el documento excede el presupuesto (None = dentro).
+
+        Args:
+            complexity: Medidas del documento
+            streamed: Página gigante que se procesa en streaming por chunks:
+                nodos y links no la desvían a la extracción degradada (el
+                streaming no construye el árbol completo y los links ya se
+                recortan a ``max_links`` al extraerlos)
+        """
+        if complexity.max_depth > self.max_depth:
+            return f"depth {complexity.max_depth} > {self.max_depth}"
+        if streamed:
+            return None
+        if complexity.links > self.max_links:
+            return f"links {complexity.links} > {self.max_links}"
+        return self.exceeded_nodes(complexity.nodes)
+
+    def exceeded_nodes(self, nodes: int) -> str | None:
+        """Motivo si ``nodes`` supera ``max_nodes`` (None = dentro).
+
+        Con ``count_nodes`` decide antes del escaneo de profundidad: un
+        documento con demasiados nodos no llega al pool de parse.
+        """
+        if nodes > self.max_nodes:
+            return f"nodes {nodes} > {self.max_nodes}"
+        return None
+
+
+def count_nodes(raw_html: str) -> int:
+    """Estimación de nodos con ``str.count`` (en C), barata para el event loop."""
+    return raw_html.count("<") - raw_html.count("</")
+
+
+def assess_complexity(
+    raw_html: str, budget: PageBudget | None = None
+) -> DocumentComplexity:
+    """Mide nodos, profundidad de anidamiento y links sin parsear el HTML.
+
+    Nodos con ``str.count`` (en C); profundidad con un contador sobre
+    ``finditer`` de las aperturas y cierres de tags con cierre obligatorio,
+    así que es una cota aproximada del árbol real. Memoria constante: no se
+    materializa ninguna lista de tags.
+
+    Args:
+        raw_html: Documento a medir
+        budget: Si se indica, el escaneo se corta al superar ``max_depth`` y
+            el conteo de links al superar ``max_links``: esas medidas pasan a
+            ser cotas inferiores (``límite + 1``), suficientes para decidir
+    """
+    if not raw_html:
+        return DocumentComplexity(size=0, nodes=0, max_depth=0, links=0)
+
+    depth_limit = budget.max_depth if budget is not None else None
+    nodes = count_nodes(raw_html)
+    depth = max_depth = 0
+    if nodes > 0:
+        for match in _TAG_PATTERN.finditer(raw_html):
+            closing = match.group(1)
+            if closing is None:
+                continue  # script, style o comentario
+            if closing:
+                if depth > 0:
+                    depth -= 1
+                continue
+            depth += 1
+            if depth > max_depth:
+                max_depth = depth
+                if depth_limit is not None and max_depth > depth_limit:
+                    break
+
+    links_found = _LINK_PATTERN.finditer(raw_html)
+    if budget is not None:
+        links_found = islice(links_found, budget.max_links + 1)
+
+    return DocumentComplexity(
+        size=len(raw_html),
+        nodes=nodes,
+        max_depth=max_depth,
+        links=sum(1 for _ in links_found),
+    )
+
+
+def degraded_text(raw_html: str) -> str:
+    """Texto visible del documento en una pasada de regex, sin árbol DOM.
+
+    Pensado para documentos fuera de presupuesto: conserva headings como
+    markdown y un párrafo por bloque, descarta scripts, estilos y SVG.
+    Coste lineal aunque el anidamiento sea de miles de niveles.
+    """
+    text = _DROP_BLOCKS_PATTERN.sub(" ", raw_html)
+    text = _HEADING_PATTERN.sub(lambda m: "\n" + "#" * int(m.group(1)) + " ", text)
+    text = _BLOCK_PATTERN.sub("\n", text)
+    text = html.unescape(_ANY_TAG_PATTERN.sub(" ", text))
+    lines = (_SPACES_PATTERN.sub(" ", line).strip() for line in text.split("\n"))
+    return "\n\n".join(line for line in lines if line)
+
+
+class PageDeadlineExceeded(Exception):
+    """Excepción lanzada cuando una página agota su presupuesto de tiempo."""
+
+    def __init__(self, url: str, stage: str, budget: float) -> None:
+        self.url = url
+        self.stage = stage
+        self.budget = budget
+        # Un timeout de red puede ser transitorio; uno en limpieza o
+        # extracción es del propio documento y reintentarlo no ayuda
+        self.retryable = stage == "fetch"
+        super().__init__(
+            f"Page deadline ({budget:.1f}s) exceeded at stage '{stage}' for {url}"
+        )
+
+
+def no_checkpoint() -> None:
+    """Checkpoint por defecto del trabajo de CPU sin deadline: nunca interrumpe."""
+
+
+@dataclass(frozen=True, slots=True)
+class Deadline:
+    """Instante límite de una página en el reloj del event loop.
+
+    Usa ``loop.time()`` para poder pasarse directamente a
+    ``asyncio.timeout_at`` y acotar los timeouts de cada etapa.
+    """
+
+    expires_at: float
+    budget: float
+
+    @classmethod
+    def after(cls, seconds: float, budget: float | None = None) -> Deadline:
+        """Deadline a ``seconds`` segundos desde ahora.
+
+        Args:
+            seconds: Tiempo disponible
+            budget: Presupuesto total de la página si ``seconds`` es solo lo
+                que queda de él (p.ej. al retomarla en otro stage)
+        """
+        return cls(
+            asyncio.get_running_loop().time() + seconds,
+            seconds if budget is None else budget,
+        )
+
+    def remaining(self) -> float:
+        """Segundos restantes (nunca negativo)."""
+        return max(0.0, self.expires_at - asyncio.get_running_loop().time())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def check(self, stage: str, url: str = "") -> None:
+        """Lanza ``PageDeadlineExceeded`` si no queda tiempo antes de ``stage``."""
+        if self.expired():
+            raise PageDeadlineExceeded(url, stage, self.budget)
+
+    def checkpoint(self, stage: str, url: str = "") -> Callable[[], None]:
+        """``check`` invocable desde los hilos del pool de parse.
+
+        ``loop.time()`` solo se lee desde el event loop: el tiempo restante se
+        traslada a ``time.monotonic()`` al crear el checkpoint. El trabajo de
+        CPU lo llama entre fases para abandonar una página sin deadline, ya
+        que un hilo no se puede cancelar desde fuera.
+        """
+        cutoff = time.monotonic() + self.remaining()
+        budget = self.budget
+
+        def check() -> None:
+            if time.monotonic() >= cutoff:
+                raise PageDeadlineExceeded(url, stage, budget)
+
+        return check
@@ -0,0 +1,78 @@
+"""Presupuesto de reintentos compartido por todas las capas de la misión.
+
+Cada capa reintentaba por su cuenta: ``ResilientTransport`` hasta
+``max_retries`` intentos por request y ``EngineCore`` otra vez hasta
+``max_retries`` veces la página entera, así que un sitio caído recibía
+hasta 9 requests por URL justo cuando menos podía atenderlos.
+
+``RetryBudget`` es un token bucket ligado a la tasa de éxito (el esquema de
+retry throttling de gRPC): cada request correcto suma ``ratio`` tokens (hasta
+``max_tokens``) y cada fallo resta uno. Solo se reintenta mientras el saldo
+supera la mitad del bucket, de modo que:
+
+- Con fallos sueltos el saldo apenas baja y los reintentos funcionan igual.
+- Si la mayoría de requests falla, el saldo se agota en pocos fallos y los
+  reintentos se cortan en todas las capas a la vez; vuelven solos cuando
+  los éxitos rellenan el bucket.
+"""
+
+from __future__ import annotations
+
+
+class RetryBudget:
+    """Token bucket de reintentos alimentado por los éxitos.
+
+    Args:
+        ratio: Tokens que suma cada request correcto (0.1 = un reintento
+            sostenido por cada 10 éxitos)
+        max_tokens: Capacidad del bucket; se reintenta con saldo > la mitad
+        enabled: False = reintentar siempre (comportamiento previo)
+    """
+
+    __slots__ = ("_tokens", "denied", "enabled", "max_tokens", "ratio", "retries")
+
+    def __init__(
+        self, ratio: float = 0.1, max_tokens: float = 10.0, enabled: bool = True
+    ) -> None:
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.enabled = enabled
+        self._tokens = max_tokens
+        self.retries = 0
+        self.denied = 0
+
+    def record_success(self) -> None:
+        """Un request correcto suma ``ratio`` tokens."""
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def record_failure(self) -> None:
+        """Un request fallido (primer intento o reintento) resta un token."""
+        self._tokens = max(0.0, self._tokens - 1.0)
+
+    def can_retry(self) -> bool:
+        """True si el saldo permite reintentar (no consume nada)."""
+        return not self.enabled or self._tokens > self.max_tokens / 2
+
+    def try_retry(self) -> bool:
+        """Decide un reintento y lo contabiliza.
+
+        El reintento no gasta tokens aquí: si vuelve a fallar, su
+        ``record_failure`` los descuenta.
+        """
+        if self.can_retry():
+            self.retries += 1
+            return True
+        self.denied += 1
+        return False
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def get_stats(self) -> dict[str, float]:
+        """Saldo y reintentos concedidos/denegados para monitoring."""
+        return {
+            "tokens": self._tokens,
+            "retries": self.retries,
+            "denied": self.denied,
+        }
@@ -0,0 +1,127 @@
+"""Serialización rápida para los sinks por página (JSONL y frontmatter YAML).
+
+- JSONL: encoder msgspec precompilado, todas las líneas en un solo buffer.
+- Frontmatter: emisor YAML mínimo para mappings planos (escalares y listas
+  de escalares), que es lo único que producen ``FRONTMATTER_FIELDS`` y los
+  assets. Cualquier otro tipo cae a ``yaml.dump`` para no perder datos.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import msgspec
+import yaml
+
+# enc_hook=str replica el ``default=str`` de json.dumps para tipos desconocidos
+_JSON_ENCODER = msgspec.json.Encoder(enc_hook=str)
+
+# Strings que se pueden emitir sin comillas: empiezan por letra y solo
+# contienen caracteres que YAML no interpreta (sin ": ", " #" ni ":"/espacio
+# al final)
+_PLAIN_SAFE_PATTERN = re.compile(r"[^\W\d_][\w\-./:?=&%+~@ ]*")
+
+# Palabras que YAML 1.1 resuelve como bool/null si van sin comillas
+_YAML_RESERVED = frozenset(
+    {"y", "n", "yes", "no", "true", "false", "on", "off", "null", "~"}
+)
+
+# Caracteres que PyYAML no acepta literales o trata como saltos de línea
+_YAML_UNSAFE_CHARS_PATTERN = re.compile(
+    "[\x7f-\x9f\u2028\u2029\ud800-\udfff\ufffe\uffff]"
+)
+
+
+class _UnsupportedValue(Exception):
+    """Valor que el emisor mínimo no sabe representar."""
+
+
+def encode_json(item: Any) -> bytes:
+    """Codifica un objeto a JSON (UTF-8, sin escapar no-ASCII)."""
+    return _JSON_ENCODER.encode(item)
+
+
+def encode_jsonl(items: Iterable[Any]) -> bytes:
+    """Codifica items como JSON Lines en un único buffer."""
+    return _JSON_ENCODER.encode_lines(list(items))
+
+
+def _yaml_string(value: str) -> str:
+    if (
+        _PLAIN_SAFE_PATTERN.fullmatch(value)
+        and not value.endswith((" ", ":"))
+        and ": " not in value
+        and " #" not in value
+        and value.lower() not in _YAML_RESERVED
+    ):
+        return value
+    # Un string JSON es un escalar YAML double-quoted válido
+    try:
+        quoted = _JSON_ENCODER.encode(value).decode("utf-8")
+    except UnicodeEncodeError as e:  # surrogates sueltos
+        raise _UnsupportedValue("str") from e
+    return _YAML_UNSAFE_CHARS_PATTERN.sub(lambda m: f"\\u{ord(m.group(0)):04x}", quoted)
+
+
+def _yaml_scalar(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ".nan"
+        if math.isinf(value):
+            return ".inf" if value > 0 else "-.inf"
+        text = repr(value)
+        # YAML 1.1 exige el punto decimal en la notación exponencial
+        if "e" in text and "." not in text:
+            text = text.replace("e", ".0e", 1)
+        return text
+    if isinstance(value, str):
+        return _yaml_string(value)
+    raise _UnsupportedValue(type(value).__name__)
+
+
+def dump_frontmatter(data: Mapping[str, Any], sort_keys: bool = False) -> str:
+    """Serializa un mapping plano como YAML block style.
+
+    Equivale a ``yaml.dump(data, allow_unicode=True)`` en contenido (la
+    salida se carga con ``yaml.safe_load`` al mismo dict) pero sin pasar por
+    el representer/emitter de PyYAML.
+
+    Args:
+        data: Mapping con valores escalares o listas de escalares
+        sort_keys: Ordenar claves alfabéticamente (como ``yaml.dump``)
+
+    Returns:
+        YAML terminado en newline (sin delimitadores ``---``)
+    """
+    keys = sorted(data) if sort_keys else list(data)
+    lines: list[str] = []
+    try:
+        for key in keys:
+            value = data[key]
+            name = _yaml_scalar(key) if isinstance(key, str) else None
+            if name is None:
+                raise _UnsupportedValue(type(key).__name__)
+            if isinstance(value, (list, tuple)):
+                if not value:
+                    lines.append(f"{name}: []")
+                    continue
+                lines.append(f"{name}:")
+                lines.extend(f"- {_yaml_scalar(v)}" for v in value)
+            else:
+                lines.append(f"{name}: {_yaml_scalar(value)}")
+    except _UnsupportedValue:
+        return yaml.dump(dict(data), allow_unicode=True, sort_keys=sort_keys)
+
+    if not lines:
+        return "{}\n"
+    lines.append("")
+    return "\n".join(lines)
@@ -0,0 +1,425 @@
+"""Limpieza HTML en streaming para páginas gigantes.
+
+``pre_clean_html`` construye un árbol selectolax completo y trunca lo que
+pase de ``MAX_HTML_SIZE_BYTES``: las páginas generadas enormes (referencias
+de API, changelogs) perdían contenido o disparaban la memoria.
+
+``StreamingHTMLCleaner`` tokeniza el HTML incrementalmente, descarta los
+subárboles de las reglas de eliminación mientras los lee y emite HTML limpio
+en chunks de tamaño acotado. Cada chunk se cierra con los tags abiertos y el
+siguiente los reabre, así se puede parsear, podar por densidad y convertir a
+markdown por separado. La memoria de trabajo depende del tamaño de chunk, no
+del de la página.
+
+Además conserva un esqueleto para metadata (``<head>`` útil, JSON-LD y
+headings) que sustituye al HTML completo en ``MetadataExtractor``.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+from selectolax.parser import HTMLParser
+
+from uif_scraper.utils.html_cleaner import (
+    REMOVAL_CLASSES,
+    REMOVAL_IDS,
+    REMOVAL_TAGS,
+    DensityThresholds,
+    prune_by_density,
+    serialize_clean,
+)
+
+# Elementos sin contenido (nunca se apilan)
+VOID_TAGS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+    }
+)
+
+# Elementos cuyo contenido es texto crudo (no se tokeniza)
+RAW_TEXT_TAGS = frozenset({"script", "style", "textarea", "title"})
+
+# Cierre implícito: abrir la clave cierra el elemento abierto si está en el set
+_IMPLICIT_CLOSE = {
+    "li": frozenset({"li"}),
+    "dt": frozenset({"dt", "dd"}),
+    "dd": frozenset({"dt", "dd"}),
+    "tr": frozenset({"tr", "td", "th"}),
+    "td": frozenset({"td", "th"}),
+    "th": frozenset({"td", "th"}),
+    "option": frozenset({"option"}),
+    "p": frozenset({"p"}),
+}
+
+# Bloques que cierran un <p> abierto
+_CLOSES_P = frozenset(
+    {
+        "address",
+        "article",
+        "aside",
+        "blockquote",
+        "div",
+        "dl",
+        "fieldset",
+        "figure",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "hr",
+        "main",
+        "ol",
+        "pre",
+        "section",
+        "table",
+        "ul",
+    }
+)
+
+HEADING_TAGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+
+# Cierres tras los que se puede cortar un chunk sin partir texto
+_CHUNK_BOUNDARY_TAGS = _CLOSES_P | {"p", "li", "tr", "dd"}
+
+# Dentro de estos no se corta (un heading o un bloque de código partidos)
+_NO_SPLIT_TAGS = HEADING_TAGS | {"pre"}
+
+# Tags vacíos del <head> relevantes para MetadataExtractor
+_HEAD_METADATA_TAGS = frozenset({"meta", "link", "base"})
+
+_START_TAG_PATTERN = re.compile(
+    r"<([a-zA-Z][^\s/>]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>"
+)
+_END_TAG_PATTERN = re.compile(r"</([a-zA-Z][^\s/>]*)[^>]*>")
+_ATTR_PATTERN = re.compile(
+    r"([^\s=/>]+)(?:\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+)))?"
+)
+_RAW_TEXT_END = {
+    tag: re.compile(rf"</{tag}\s*>", re.IGNORECASE) for tag in RAW_TEXT_TAGS
+}
+
+DEFAULT_CHUNK_SIZE = 256 * 1024
+DEFAULT_FEED_SIZE = 64 * 1024
+# Un "<" sin cerrar a menos de esto del final del buffer espera al siguiente feed
+_MAX_PENDING_TAG = 8 * 1024
+# Tope del esqueleto de metadata (head + JSON-LD + headings)
+MAX_METADATA_SKELETON = 1024 * 1024
+
+
+def _parse_attrs(raw: str) -> dict[str, str]:
+    """Atributos de un start tag (el primero gana si se repiten)."""
+    attrs: dict[str, str] = {}
+    for match in _ATTR_PATTERN.finditer(raw):
+        name = match.group(1).lower()
+        if name not in attrs:
+            attrs[name] = match.group(2) or match.group(3) or match.group(4) or ""
+    return attrs
+
+
+class StreamingHTMLCleaner:
+    """Cleaner incremental equivalente a ``pre_clean_html`` por chunks.
+
+    Args:
+        chunk_size: Tamaño objetivo (caracteres) de cada chunk emitido
+        thresholds: Umbrales de la poda por densidad aplicada a cada chunk
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        thresholds: DensityThresholds | None = None,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.thresholds = thresholds or DensityThresholds()
+        self._pending = ""
+        self._raw_text_tag: str | None = None
+        # Pila de elementos abiertos: (tag, start tag original o None si se omite)
+        self._stack: list[tuple[str, str | None]] = []
+        self._skip_level: int | None = None
+        self._no_split_depth = 0
+        self._head_open = False
+        self._buffer: list[str] = []
+        self._buffer_len = 0
+        self._prefix = ""
+        self._ready: deque[str] = deque()
+        # Esqueleto de metadata
+        self._html_tag = "<html>"
+        self._head_parts: list[str] = []
+        self._body_parts: list[str] = []
+        self._skeleton_len = 0
+        self._capture: str | None = None
+        self._capture_parts: list[str] | None = None
+        self.chunks_emitted = 0
+
+    # --- API pública -----------------------------------------------------
+
+    def iter_clean(
+        self, source: str | Iterable[str], feed_size: int = DEFAULT_FEED_SIZE
+    ) -> Iterator[str]:
+        """Alimenta el tokenizer y produce chunks de HTML limpio y sanitizado."""
+        pieces: Iterable[str]
+        if isinstance(source, str):
+            pieces = (
+                source[i : i + feed_size] for i in range(0, len(source), feed_size)
+            )
+        else:
+            pieces = source
+
+        for piece in pieces:
+            self.feed(piece)
+            yield from self._drain()
+
+        self.close()
+        yield from self._drain()
+
+    def feed(self, text: str) -> None:
+        """Tokeniza ``text``; lo que quede a medias espera al siguiente feed."""
+        data = self._pending + text if self._pending else text
+        self._pending = data[self._tokenize(data, final=False) :]
+
+    def close(self) -> None:
+        """Procesa lo pendiente y cierra el último chunk."""
+        if self._pending:
+            data, self._pending = self._pending, ""
+            self._tokenize(data, final=True)
+        self._flush()
+
+    def metadata_html(self) -> str:
+        """HTML reducido con lo que necesita ``MetadataExtractor``."""
+        return (
+            f"{self._html_tag}<head>{''.join(self._head_parts)}</head>"
+            f"<body>{''.join(self._body_parts)}</body></html>"
+        )
+
+    # --- Tokenizer ---------------------------------------------------------
+
+    def _tokenize(self, data: str, final: bool) -> int:
+        """Procesa ``data`` y devuelve hasta dónde se consumió."""
+        pos = 0
+        end = len(data)
+        while pos < end:
+            if self._raw_text_tag is not None:
+                match = _RAW_TEXT_END[self._raw_text_tag].search(data, pos)
+                if match is None:
+                    # Texto crudo sin cierre aún: consumir salvo un posible "</tag"
+                    keep = 0 if final else len(self._raw_text_tag) + 8
+                    cut = max(pos, end - keep)
+                    self._handle_data(data[pos:cut])
+                    return cut
+                self._handle_data(data[pos : match.start()])
+                self._handle_endtag(self._raw_text_tag)
+                self._raw_text_tag = None
+                pos = match.end()
+                continue
+
+            lt = data.find("<", pos)
+            if lt == -1:
+                self._handle_data(data[pos:])
+                return end
+            if lt > pos:
+                self._handle_data(data[pos:lt])
+                pos = lt
+
+            nxt = data[lt + 1 : lt + 2]
+            if nxt in ("!", "?"):
+                # Comentarios, doctype, CDATA e instrucciones: se descartan
+                terminator = "-->" if data.startswith("<!--", lt) else ">"
+                close = data.find(terminator, lt + 2)
+                if close == -1:
+                    return end if final else lt
+                pos = close + len(terminator)
+                continue
+
+            is_end = nxt == "/"
+            match = (_END_TAG_PATTERN if is_end else _START_TAG_PATTERN).match(data, lt)
+            if match is None:
+                if not final and end - lt < _MAX_PENDING_TAG:
+                    return lt
+                # "<" suelto: es texto
+                self._handle_data("&lt;")
+                pos = lt + 1
+                continue
+
+            tag = match.group(1).lower()
+            if is_end:
+                self._handle_endtag(tag)
+            else:
+                raw_attrs = match.group(2)
+                self._handle_starttag(tag, match.group(0), raw_attrs)
+                if tag in RAW_TEXT_TAGS and not raw_attrs.endswith("/"):
+                    self._raw_text_tag = tag
+            pos = match.end()
+        return pos
+
+    # --- Chunks ------------------------------------------------------------
+
+    def _drain(self) -> Iterator[str]:
+        while self._ready:
+            tree = HTMLParser(self._ready.popleft())
+            prune_by_density(tree, self.thresholds)
+            cleaned = serialize_clean(tree)
+            if cleaned.strip():
+                self.chunks_emitted += 1
+                yield cleaned
+
+    def _emit(self, text: str) -> None:
+        if self._skip_level is not None:
+            return
+        self._buffer.append(text)
+        self._buffer_len += len(text)
+
+    def _flush(self) -> None:
+        """Cierra los tags abiertos en el chunk actual y los reabre en el siguiente."""
+        if not self._buffer:
+            return
+        kept = [(tag, start) for tag, start in self._stack if start is not None]
+        closing = "".join(f"</{tag}>" for tag, _ in reversed(kept))
+        self._ready.append(self._prefix + "".join(self._buffer) + closing)
+        self._prefix = "".join(start for _, start in kept)
+        self._buffer = []
+        self._buffer_len = 0
+
+    def _maybe_flush(self, at_boundary: bool) -> None:
+        # Preferir cortes tras un cierre de bloque; forzar si el buffer crece
+        if self._skip_level is not None:
+            return
+        if at_boundary and self._no_split_depth == 0:
+            limit = self.chunk_size
+        else:
+            limit = self.chunk_size * 4
+        if self._buffer_len >= limit:
+            self._flush()
+
+    # --- Esqueleto de metadata -----------------------------------------
+
+    def _add_skeleton(self, parts: list[str], text: str) -> None:
+        if self._skeleton_len + len(text) > MAX_METADATA_SKELETON:
+            return
+        parts.append(text)
+        self._skeleton_len += len(text)
+
+    def _end_capture(self) -> None:
+        if self._capture is None or self._capture_parts is None:
+            return
+        target = self._head_parts if self._capture == "title" else self._body_parts
+        self._capture_parts.append(f"</{self._capture}>")
+        self._add_skeleton(target, "".join(self._capture_parts))
+        self._capture = None
+        self._capture_parts = None
+
+    # --- Handlers ------------------------------------------------------
+
+    def _is_removed(self, tag: str, attrs: dict[str, str]) -> bool:
+        if tag in REMOVAL_TAGS:
+            return True
+        classes = attrs.get("class")
+        if classes and not REMOVAL_CLASSES.isdisjoint(classes.split()):
+            return True
+        return attrs.get("id") in REMOVAL_IDS
+
+    def _close_to(self, index: int) -> None:
+        """Cierra los elementos de la pila desde ``index`` hasta el tope."""
+        while len(self._stack) > index:
+            tag, start = self._stack.pop()
+            if tag == self._capture:
+                self._end_capture()
+            if tag in _NO_SPLIT_TAGS:
+                self._no_split_depth -= 1
+            elif tag == "head":
+                self._head_open = False
+            if self._skip_level is not None and len(self._stack) <= self._skip_level:
+                self._skip_level = None
+            elif start is not None:
+                self._emit(f"</{tag}>")
+
+    def _handle_starttag(self, tag: str, start: str, raw_attrs: str) -> None:
+        if tag == "html":
+            self._html_tag = start
+            return
+        if tag in ("head", "body") and any(t == tag for t, _ in self._stack):
+            return
+
+        # Cierres implícitos (li, p, td...) para no anidar sin fin
+        if self._stack:
+            top = self._stack[-1][0]
+            if top in _IMPLICIT_CLOSE.get(tag, ()) or (top == "p" and tag in _CLOSES_P):
+                self._close_to(len(self._stack) - 1)
+
+        attrs = _parse_attrs(raw_attrs) if raw_attrs.strip(" /") else {}
+
+        # Esqueleto de metadata: head útil, JSON-LD y headings
+        if self._head_open and tag in _HEAD_METADATA_TAGS:
+            self._add_skeleton(self._head_parts, start)
+        elif self._capture is None and (
+            tag in HEADING_TAGS
+            or (tag == "title" and self._head_open)
+            or (tag == "script" and "ld+json" in attrs.get("type", ""))
+        ):
+            self._capture = tag
+            self._capture_parts = [start]
+
+        removed = self._skip_level is None and self._is_removed(tag, attrs)
+        if tag in VOID_TAGS or raw_attrs.endswith("/"):
+            # Vacío o auto-cerrado (<br/>, <path/>): no se apila
+            if not removed:
+                self._emit(start if tag in VOID_TAGS else f"<{tag}></{tag}>")
+                self._maybe_flush(at_boundary=False)
+            return
+
+        if tag in _NO_SPLIT_TAGS:
+            self._no_split_depth += 1
+        elif tag == "head":
+            self._head_open = True
+
+        if removed:
+            self._skip_level = len(self._stack)
+            self._stack.append((tag, None))
+            return
+
+        kept = self._skip_level is None
+        self._stack.append((tag, start if kept else None))
+        self._emit(start)
+        self._maybe_flush(at_boundary=False)
+
+    def _handle_endtag(self, tag: str) -> None:
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                self._close_to(i)
+                self._maybe_flush(at_boundary=tag in _CHUNK_BOUNDARY_TAGS)
+                return
+        if tag == self._capture:
+            self._end_capture()
+
+    def _handle_data(self, data: str) -> None:
+        if not data:
+            return
+        if self._capture_parts is not None:
+            self._capture_parts.append(data)
+        if self._skip_level is None:
+            self._emit(data)
+            self._maybe_flush(at_boundary=False)
+
+
+def stream_clean_html(
+    raw_html: str | Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    """Atajo: chunks de HTML limpio para una página completa o un stream."""
+    return StreamingHTMLCleaner(chunk_size=chunk_size).iter_clean(raw_html)
@@ -0,0 +1,411 @@
+"""Aprendizaje de plantillas de sitio para cachear la limpieza de boilerplate.
+
+Las páginas de un mismo sitio comparten plantilla (header, sidebar, menús,
+widgets relacionados). En vez de pagar en cada página la poda por densidad
+y los fallbacks de extracción, el learner:
+
+1. Calcula un fingerprint estructural (tag-path de los primeros niveles
+   del ``<body>``) para agrupar páginas por plantilla.
+2. Durante las primeras ``learn_pages`` páginas de cada plantilla observa
+   qué subárboles poda ``prune_by_density`` y qué motor de extracción gana.
+3. Después aplica un plan cacheado: elimina directamente los subárboles que
+   fueron boilerplate en todas las páginas observadas y sugiere el motor
+   ganador para saltarse intentos de fallback inútiles.
+
+Las rutas aprendidas son posicionales (``:nth-child``) y cada nodo que
+señalan se comprueba con el mismo criterio de densidad antes de eliminarlo.
+Si una página se aparta de la plantilla (la ruta no existe, señala varios
+nodos o uno con contenido real) se le aplica la poda por densidad completa,
+como en ``pre_clean_html``: el plan nunca elimina contenido que la poda
+conservaría.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import cast
+
+from cachetools import LRUCache
+from loguru import logger
+from selectolax.parser import HTMLParser, Node
+
+from uif_scraper.utils.html_cleaner import (
+    _COMBINED_REMOVAL_SELECTOR,
+    DENSITY_PRUNE_TAGS,
+    is_low_density,
+    prune_by_density,
+    serialize_clean,
+    truncate_html,
+)
+from uif_scraper.utils.page_guard import no_checkpoint
+
+# Tags que definen la estructura de una plantilla (el contenido no cuenta)
+STRUCTURAL_TAGS = frozenset(
+    {
+        "div",
+        "section",
+        "main",
+        "article",
+        "aside",
+        "header",
+        "footer",
+        "nav",
+        "ul",
+        "ol",
+        "table",
+        "form",
+    }
+)
+
+# Motores de TextExtractor que implican saltarse el intento principal
+FALLBACK_ENGINES = frozenset({"markitdown", "beautifulsoup-parachute"})
+
+# Solo ids/clases que son identificadores CSS válidos sin escapar
+_CSS_IDENT_PATTERN = re.compile(r"-?[A-Za-z_][\w-]*")
+
+
+@dataclass(frozen=True, slots=True)
+class RemovalPlan:
+    """Plan de limpieza aprendido para una plantilla."""
+
+    boilerplate_paths: tuple[str, ...]  # Rutas posicionales (``node_path``)
+    needs_density_pass: bool  # Poda inestable: seguir evaluando densidad
+
+
+@dataclass(slots=True)
+class _TemplateState:
+    pages: int = 0
+    seen: Counter[str] = field(default_factory=Counter)
+    pruned: Counter[str] = field(default_factory=Counter)
+    support: Counter[str] = field(default_factory=Counter)
+    engines: Counter[str] = field(default_factory=Counter)
+    plan: RemovalPlan | None = None
+    preferred_engine: str | None = None
+
+
+def _node_step(node: Node) -> str:
+    """Paso de selector CSS para un nodo: ``tag#id.clase1.clase2``."""
+    step = node.tag or ""
+    attrs = node.attributes
+    node_id = attrs.get("id")
+    if node_id and _CSS_IDENT_PATTERN.fullmatch(node_id):
+        step += f"#{node_id}"
+    classes = attrs.get("class")
+    if classes:
+        step += "".join(
+            f".{c}" for c in classes.split() if _CSS_IDENT_PATTERN.fullmatch(c)
+        )
+    return step
+
+
+def _node_key(node: Node) -> int:
+    """Identidad del nodo en el árbol para usarlo como clave.
+
+    ``Node.__eq__`` compara el HTML serializado (un hit de dict sobre un
+    ancestro grande cuesta tanto como serializar la página). ``mem_id`` es
+    un int en runtime aunque el stub lo declare como método.
+    """
+    return cast(int, node.mem_id)
+
+
+def _has_ancestor_in(node: Node, keys: set[int]) -> bool:
+    parent = node.parent
+    while parent is not None:
+        if _node_key(parent) in keys:
+            return True
+        parent = parent.parent
+    return False
+
+
+class _PathIndex:
+    """Rutas de ``node_path`` para muchos nodos de un mismo árbol en O(n).
+
+    Los hijos de cada padre se enumeran una sola vez (la posición de todos
+    queda cacheada) y la ruta de un nodo reutiliza la de su padre: recorrer
+    los hermanos por cada nodo era cuadrático en páginas anchas.
+    """
+
+    __slots__ = ("_paths", "_positions")
+
+    def __init__(self) -> None:
+        self._paths: dict[int, str] = {}
+        self._positions: dict[int, int] = {}
+
+    def _position(self, node: Node) -> int:
+        """Posición del nodo entre sus hermanos elemento (la de ``:nth-child``)."""
+        key = _node_key(node)
+        position = self._positions.get(key)
+        if position is not None:
+            return position
+        parent = node.parent
+        if parent is None:
+            return 1
+        index = 0
+        for sibling in parent.iter():
+            if sibling.tag.startswith("_"):
+                continue  # Comentarios: no cuentan para :nth-child
+            index += 1
+            self._positions[_node_key(sibling)] = index
+        return self._positions.get(key, 1)
+
+    def path(self, node: Node) -> str:
+        # Subir hasta body o hasta un ancestro con la ruta ya calculada
+        pending: list[Node] = []
+        current: Node | None = node
+        prefix = "body"
+        while current is not None and current.tag not in ("body", "html", "-undef"):
+            cached = self._paths.get(_node_key(current))
+            if cached is not None:
+                prefix = cached
+                break
+            pending.append(current)
+            current = current.parent
+
+        for step_node in reversed(pending):
+            prefix = (
+                f"{prefix} > {_node_step(step_node)}"
+                f":nth-child({self._position(step_node)})"
+            )
+            self._paths[_node_key(step_node)] = prefix
+        return prefix
+
+
+def node_path(node: Node) -> str:
+    """Selector CSS desde ``body`` hasta el nodo con su posición en cada nivel.
+
+    ``tag#id.clase:nth-child(n)``: con la posición, la ruta señala un único
+    nodo y no cualquier hermano con la misma forma (p.ej. una lista de
+    contenido junto a la de links relacionados).
+    """
+    return _PathIndex().path(node)
+
+
+class TemplateLearner:
+    """Aprende y cachea planes de limpieza por plantilla de página.
+
+    ``clean`` se llama desde los hilos del pool de parse: el parseo y la poda
+    van sin lock; solo la contabilidad de plantillas se serializa.
+
+    Args:
+        learn_pages: Páginas observadas por plantilla antes de fijar el plan
+        fingerprint_depth: Niveles del ``<body>`` que entran en el fingerprint
+        max_templates: Plantillas recordadas (LRU)
+    """
+
+    def __init__(
+        self,
+        learn_pages: int = 3,
+        fingerprint_depth: int = 3,
+        max_templates: int = 256,
+    ) -> None:
+        self.learn_pages = learn_pages
+        self.fingerprint_depth = fingerprint_depth
+        self._templates: LRUCache[str, _TemplateState] = LRUCache(maxsize=max_templates)
+        self.plan_hits = 0
+        self.plan_fallbacks = 0
+        self.learning_pages = 0
+        self._lock = threading.Lock()
+
+    def fingerprint(self, tree: HTMLParser) -> str:
+        """Firma estructural de los primeros niveles del ``<body>``.
+
+        Solo cuenta tags estructurales (con id/clases) y colapsa hermanos
+        consecutivos idénticos, así dos páginas con distinto número de
+        párrafos o items comparten firma.
+        """
+        body = tree.body
+        if body is None:
+            return "empty"
+
+        tokens: list[str] = []
+
+        def walk(node: Node, depth: int) -> None:
+            previous = None
+            for child in node.iter():
+                if child.tag not in STRUCTURAL_TAGS:
+                    continue
+                step = _node_step(child)
+                if step == previous:
+                    continue
+                previous = step
+                tokens.append(f"{depth}:{step}")
+                if depth < self.fingerprint_depth:
+                    walk(child, depth + 1)
+
+        walk(body, 1)
+        return hashlib.blake2b(
+            "|".join(tokens).encode("utf-8"), digest_size=8
+        ).hexdigest()
+
+    def _state(self, template_id: str) -> _TemplateState:
+        state = self._templates.get(template_id)
+        if state is None:
+            state = _TemplateState()
+            self._templates[template_id] = state
+        return state
+
+    def clean(
+        self,
+        raw_html: str,
+        max_size: int = 5 * 1024 * 1024,
+        sanitize: bool = True,
+        checkpoint: Callable[[], None] | None = None,
+    ) -> tuple[str, str]:
+        """Equivalente a ``pre_clean_html`` con plan cacheado por plantilla.
+
+        Args:
+            raw_html: HTML crudo
+            max_size: Tamaño máximo antes de truncar
+            sanitize: Si sanitizar la salida con nh3 (el perfil "fast" no lo hace)
+            checkpoint: Se llama entre fases (parseo, poda, serialización);
+                puede lanzar para abandonar la página (p.ej. deadline agotado)
+
+        Returns:
+            Tupla (HTML limpio, id de plantilla).
+        """
+        if not raw_html:
+            return "", "empty"
+
+        check = checkpoint or no_checkpoint
+        tree = HTMLParser(truncate_html(raw_html, max_size))
+        check()
+        template_id = self.fingerprint(tree)
+        with self._lock:
+            plan = self._state(template_id).plan
+            if plan is not None:
+                self.plan_hits += 1
+            else:
+                self.learning_pages += 1
+
+        for node in tree.css(_COMBINED_REMOVAL_SELECTOR):
+            node.decompose()
+
+        if plan is not None:
+            # Plan aprendido: densidad solo de los nodos del plan, no del árbol
+            if not self._apply_plan(tree, plan) or plan.needs_density_pass:
+                check()
+                prune_by_density(tree)
+            check()
+            return serialize_clean(tree, sanitize), template_id
+
+        # Rutas calculadas antes de podar: las posiciones son las del árbol
+        # que verá el plan (la poda desplazaría a los hermanos siguientes)
+        index = _PathIndex()
+        paths = {
+            _node_key(node): index.path(node)
+            for tag in DENSITY_PRUNE_TAGS
+            for node in tree.css(tag)
+        }
+        page_seen: Counter[str] = Counter()
+        page_pruned: Counter[str] = Counter()
+
+        def observe(node: Node, pruned: bool) -> None:
+            path = paths[_node_key(node)]
+            page_seen[path] += 1
+            if pruned:
+                page_pruned[path] += 1
+
+        prune_by_density(tree, on_candidate=observe)
+        # Una página abandonada no cuenta para el aprendizaje
+        check()
+
+        with self._lock:
+            state = self._state(template_id)
+            if state.plan is None:
+                state.pages += 1
+                state.seen.update(page_seen)
+                state.pruned.update(page_pruned)
+                state.support.update(page_seen.keys())
+                if state.pages >= self.learn_pages:
+                    state.plan = self._build_plan(template_id, state)
+
+        return serialize_clean(tree, sanitize), template_id
+
+    def _apply_plan(self, tree: HTMLParser, plan: RemovalPlan) -> bool:
+        """Elimina los subárboles del plan; False si la página se aparta de él.
+
+        Todas las rutas se resuelven antes de eliminar nada, sobre el mismo
+        árbol en el que se aprendieron. Cada una debe señalar un único nodo
+        que la poda por densidad también eliminaría.
+        """
+        doomed: list[Node] = []
+        conforms = True
+        for path in plan.boilerplate_paths:
+            nodes = tree.css(path)
+            if len(nodes) == 1 and is_low_density(nodes[0]):
+                doomed.append(nodes[0])
+            else:
+                conforms = False
+
+        # Un nodo dentro de otro del plan ya se va con su ancestro
+        doomed_keys = {_node_key(node) for node in doomed}
+        outermost = [node for node in doomed if not _has_ancestor_in(node, doomed_keys)]
+        for node in outermost:
+            node.decompose()
+
+        if not conforms:
+            with self._lock:
+                self.plan_fallbacks += 1
+        return conforms
+
+    def _build_plan(self, template_id: str, state: _TemplateState) -> RemovalPlan:
+        """Fija el plan: subárboles podados siempre y en todas las páginas."""
+        stable = tuple(
+            sorted(
+                path
+                for path, pruned in state.pruned.items()
+                if pruned == state.seen[path] and state.support[path] == state.pages
+            )
+        )
+        # Si una ruta se podó a veces sí y a veces no, la plantilla varía:
+        # se mantiene la poda por densidad además del plan
+        unstable = any(
+            0 < state.pruned[path] < seen
+            or (state.pruned[path] and state.support[path] < state.pages)
+            for path, seen in state.seen.items()
+        )
+        logger.debug(
+            f"Template {template_id} learned after {state.pages} pages: "
+            f"{len(stable)} boilerplate subtrees, density_pass={unstable}"
+        )
+        return RemovalPlan(
+            boilerplate_paths=stable,
+            needs_density_pass=unstable,
+        )
+
+    def record_engine(self, template_id: str, engine: str) -> None:
+        """Registra el motor que ganó la extracción para una plantilla."""
+        with self._lock:
+            state = self._templates.get(template_id)
+            if state is None or state.preferred_engine is not None:
+                return
+            state.engines[engine] += 1
+            total = sum(state.engines.values())
+            if total < self.learn_pages:
+                return
+            winner, count = state.engines.most_common(1)[0]
+            if count == total and winner in FALLBACK_ENGINES:
+                state.preferred_engine = winner
+
+    def preferred_engine(self, template_id: str) -> str | None:
+        """Motor a usar directamente para la plantilla (None = flujo normal)."""
+        with self._lock:
+            state = self._templates.get(template_id)
+        return state.preferred_engine if state is not None else None
+
+    def get_stats(self) -> dict[str, int]:
+        """Estadísticas del learner para monitoring."""
+        with self._lock:
+            templates = list(self._templates.values())
+        return {
+            "templates": len(templates),
+            "learned": sum(1 for t in templates if t.plan is not None),
+            "plan_hits": self.plan_hits,
+            "plan_fallbacks": self.plan_fallbacks,
+            "learning_pages": self.learning_pages,
+        }
@@ -1,18 +1,158 @@
+import codecs
 import re
+import unicodedata
 
 import ftfy
+from ftfy.badness import is_bad
+from ftfy.chardata import CONTROL_CHARS, HTML_ENTITY_RE, LIGATURES, WIDTH_MAP
+from ftfy.fixes import uncurl_quotes
 
 # Regex compilado para mejor performance (20% más rápido)
 _NEWLINE_PATTERN = re.compile(r"\n{3,}")
 
+# <meta charset="..."> o <meta http-equiv=... content="...; charset=...">
+_META_CHARSET_PATTERN = re.compile(
+    rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE
+)
 
-def clean_text(text: str, max_chunk_size: int = 100000) -> str:
+_HEADER_CHARSET_PATTERN = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+
+# Ventana de sniffing del charset (el estándar HTML usa 1024 bytes)
+_CHARSET_SNIFF_BYTES = 1024
+
+
+def _build_ftfy_trigger_pattern() -> re.Pattern[str]:
+    """Compila un regex con todo lo que ftfy modificaría fuera de la mojibake.
+
+    Se construye desde las tablas de ftfy para seguir su versión instalada:
+    controles, ligaduras, caracteres fullwidth, C1, saltos de línea no Unix,
+    surrogates, escapes de terminal y entidades HTML.
+    """
+    codepoints = set(CONTROL_CHARS) | set(LIGATURES) | set(WIDTH_MAP)
+    chars = "".join(re.escape(chr(cp)) for cp in sorted(codepoints))
+    return re.compile(
+        f"[{chars}\\x1b\\r\\x80-\\x9f\\u2028\\u2029\\ud800-\\udfff]"
+        f"|{HTML_ENTITY_RE.pattern}"
+    )
+
+
+def _build_mojibake_pattern() -> re.Pattern[str]:
+    """Compila un regex para la firma de UTF-8 decodificado como 1 byte.
+
+    La mojibake típica es un byte líder UTF-8 (0xC2-0xF4) seguido de un byte
+    de continuación (0x80-0xBF), ambos leídos como latin-1, cp1252 o
+    mac_roman. Es solo un pre-filtro barato: la decisión final es de
+    ``is_bad`` de ftfy.
+    """
+    lead: set[str] = set()
+    continuation: set[str] = set()
+    for encoding in ("latin-1", "cp1252", "mac_roman"):
+        lead |= set(bytes(range(0xC2, 0xF5)).decode(encoding, errors="ignore"))
+        continuation |= set(bytes(range(0x80, 0xC0)).decode(encoding, errors="ignore"))
+
+    def char_class(chars: set[str]) -> str:
+        return "".join(re.escape(c) for c in sorted(chars))
+
+    return re.compile(f"[{char_class(lead)}][{char_class(continuation)}]")
+
+
+_FTFY_TRIGGER_PATTERN = _build_ftfy_trigger_pattern()
+_MOJIBAKE_PATTERN = _build_mojibake_pattern()
+_CURLY_QUOTES_PATTERN = re.compile("[\u02bc\u2018-\u201f]")
+
+
+def needs_ftfy(text: str) -> bool:
+    """Detecta si ``ftfy.fix_text`` podría cambiar algo más que las comillas.
+
+    Chequeos baratos (en C) en orden de coste:
+    1. Caracteres que disparan algún fixer de ftfy (controles, C1, \\r, ...)
+    2. Normalización NFC, solo si hay no-ASCII
+    3. Secuencias líder+continuación y, si aparecen, ``is_bad`` de ftfy
+
+    Returns:
+        True si el texto debe pasar por ftfy.
+    """
+    if _FTFY_TRIGGER_PATTERN.search(text):
+        return True
+    if text.isascii():
+        return False
+    if not unicodedata.is_normalized("NFC", text):
+        return True
+    return _MOJIBAKE_PATTERN.search(text) is not None and is_bad(text)
+
+
+def fix_text(text: str) -> str:
+    """Equivalente a ``ftfy.fix_text`` con fast path para texto ya limpio.
+
+    La mayoría de páginas decodificadas en UTF-8 no tienen mojibake; en ese
+    caso lo único que ftfy haría es enderezar comillas tipográficas, que se
+    aplica directamente sin pasar por el pipeline completo.
+    """
+    if needs_ftfy(text):
+        return ftfy.fix_text(text)
+    if _CURLY_QUOTES_PATTERN.search(text):
+        return uncurl_quotes(text)
+    return text
+
+
+def _lookup_codec(name: str | None) -> str | None:
+    """Normaliza el nombre de un charset o None si Python no lo conoce."""
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip()).name
+    except LookupError:
+        return None
+
+
+def decode_html(
+    body: bytes,
+    content_type: str | None = None,
+    default_encoding: str | None = None,
+) -> str:
+    """Decodifica el body HTML a ``str`` una sola vez con el charset correcto.
+
+    Prioridad (como los navegadores): BOM UTF-8 > charset del header
+    Content-Type > ``<meta charset>`` en los primeros 1024 bytes > charset
+    por defecto del cliente HTTP > UTF-8. Los bytes inválidos se reemplazan
+    en vez de abortar.
+
+    Args:
+        body: Bytes crudos de la respuesta
+        content_type: Valor del header Content-Type (si se conoce)
+        default_encoding: Charset que asumió el cliente HTTP
+
+    Returns:
+        HTML decodificado.
+    """
+    if body.startswith(codecs.BOM_UTF8):
+        return body[len(codecs.BOM_UTF8) :].decode("utf-8", errors="replace")
+
+    codec = None
+    if content_type:
+        match = _HEADER_CHARSET_PATTERN.search(content_type)
+        if match:
+            codec = _lookup_codec(match.group(1))
+    if codec is None:
+        meta_match = _META_CHARSET_PATTERN.search(body, 0, _CHARSET_SNIFF_BYTES)
+        if meta_match:
+            codec = _lookup_codec(meta_match.group(1).decode("ascii", errors="ignore"))
+    if codec is None:
+        codec = _lookup_codec(default_encoding)
+
+    return body.decode(codec or "utf-8", errors="replace")
+
+
+def clean_text(
+    text: str, max_chunk_size: int = 100000, fix_encoding: bool = True
+) -> str:
     """Limpia y normaliza texto con soporte para textos grandes.
 
     Args:
         text: Texto a limpiar
         max_chunk_size: Tamaño máximo por chunk para procesamiento.
                        Textos más grandes se procesan en partes.
+        fix_encoding: Si pasar el texto por ftfy (False = solo newlines)
 
     Returns:
         Texto limpio con encoding corregido y newlines normalizados.
@@ -20,15 +160,19 @@ def clean_text(text: str, max_chunk_size: int = 100000) -> str:
     if not text:
         return ""
 
+    if not fix_encoding:
+        return _NEWLINE_PATTERN.sub("\n\n", text).strip()
+
     # Para textos muy largos, procesar por chunks para mejor uso de memoria
     if len(text) <= max_chunk_size:
-        text = ftfy.fix_text(text)
+        text = fix_text(text)
     else:
         # Procesar en chunks para evitar picos de memoria
+        # (el fast path se decide por chunk: solo los sospechosos van a ftfy)
         chunks = [
             text[i : i + max_chunk_size] for i in range(0, len(text), max_chunk_size)
         ]
-        text = "".join(ftfy.fix_text(chunk) for chunk in chunks)
+        text = "".join(fix_text(chunk) for chunk in chunks)
 
     # Regex compilado es 20% más rápido
     text = _NEWLINE_PATTERN.sub("\n\n", text).strip()
@@ -0,0 +1,202 @@
+"""Presupuestos de tráfico por clase: páginas, documentos e imágenes.
+
+Páginas y assets compartían un único semáforo: una ráfaga de PDFs grandes
+dejaba sin slots al fetch de HTML y las páginas con muchas imágenes
+frenaban el descubrimiento. ``TrafficScheduler`` reparte un pool de slots
+entre clases de tráfico:
+
+- Concurrencia por clase (``max_slots``) y suelo reservado (``min_slots``):
+  los slots reservados de una clase que no los usa no se prestan, así los
+  assets nunca bajan el fetch de páginas por debajo de su suelo.
+- Reparto ponderado: al liberarse un slot lo recibe la clase en espera con
+  menor ocupación relativa a su peso (``in_flight / weight``).
+- Ancho de banda por clase con un token bucket en bytes/s.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from pathlib import PurePosixPath
+from typing import Literal
+from urllib.parse import urlparse
+
+from pydantic import BaseModel
+
+TrafficClassName = Literal["page", "document", "image"]
+
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp"})
+
+
+class TrafficBudget(BaseModel):
+    """Presupuesto de una clase de tráfico."""
+
+    model_config = {"frozen": True}
+
+    weight: float = 1.0
+    min_slots: int = 0  # Reservados aunque la clase esté ociosa
+    max_slots: int | None = None  # None = todo el pool
+    bandwidth_kbps: int = 0  # 0 = sin límite
+
+
+def asset_traffic_class(url: str) -> TrafficClassName:
+    """Clase de tráfico de un asset según su extensión."""
+    suffix = PurePosixPath(urlparse(url).path).suffix.lower()
+    return "image" if suffix in IMAGE_EXTENSIONS else "document"
+
+
+class _ClassState:
+    __slots__ = (
+        "bytes_total",
+        "in_flight",
+        "last_refill",
+        "max_slots",
+        "min_slots",
+        "rate",
+        "tokens",
+        "waiters",
+        "weight",
+    )
+
+    def __init__(self, budget: TrafficBudget, total_slots: int) -> None:
+        self.weight = max(budget.weight, 1e-6)
+        self.min_slots = 0
+        self.max_slots = 0
+        self.resize(budget, total_slots)
+        self.rate = budget.bandwidth_kbps * 1024
+        self.tokens = float(self.rate)  # Ráfaga inicial de 1s
+        self.last_refill = time.monotonic()
+        self.in_flight = 0
+        self.bytes_total = 0
+        self.waiters: deque[asyncio.Future[None]] = deque()
+
+    def resize(self, budget: TrafficBudget, total_slots: int) -> None:
+        # Un suelo no puede reservar el pool entero: el resto de clases se
+        # quedaría sin slots y la misión no terminaría nunca
+        self.min_slots = min(budget.min_slots, max(0, total_slots - 1))
+        self.max_slots = min(budget.max_slots or total_slots, total_slots)
+
+
+class TrafficScheduler:
+    """Pool de slots compartido con reparto ponderado entre clases de tráfico.
+
+    Args:
+        total_slots: Slots concurrentes del pool (p.ej. ``default_workers``)
+        budgets: Presupuesto por clase de tráfico
+    """
+
+    def __init__(
+        self, total_slots: int, budgets: Mapping[TrafficClassName, TrafficBudget]
+    ) -> None:
+        self.total_slots = total_slots
+        self._budgets = dict(budgets)
+        self._classes = {
+            name: _ClassState(budget, total_slots) for name, budget in budgets.items()
+        }
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Slots en uso entre todas las clases."""
+        return self._in_flight
+
+    def resize(self, total_slots: int) -> None:
+        """Cambia el tamaño del pool en caliente (los slots en uso se respetan)."""
+        self.total_slots = total_slots
+        for name, state in self._classes.items():
+            state.resize(self._budgets[name], total_slots)
+        self._dispatch()
+
+    def _can_run(self, name: TrafficClassName) -> bool:
+        state = self._classes[name]
+        if state.in_flight >= state.max_slots:
+            return False
+        # Slots reservados por las otras clases que aún no los usan
+        reserved = sum(
+            max(0, other.min_slots - other.in_flight)
+            for other_name, other in self._classes.items()
+            if other_name != name
+        )
+        return self.total_slots - self._in_flight - reserved > 0
+
+    def _dispatch(self) -> None:
+        """Concede slots libres a las clases en espera, por menor cuota ponderada."""
+        while True:
+            best: _ClassState | None = None
+            for name, state in self._classes.items():
+                while state.waiters and state.waiters[0].done():
+                    state.waiters.popleft()  # Esperas canceladas
+                if not state.waiters or not self._can_run(name):
+                    continue
+                if best is None or (
+                    state.in_flight / state.weight < best.in_flight / best.weight
+                ):
+                    best = state
+            if best is None:
+                return
+            best.in_flight += 1
+            self._in_flight += 1
+            best.waiters.popleft().set_result(None)
+
+    async def acquire(self, name: TrafficClassName) -> None:
+        state = self._classes[name]
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        state.waiters.append(future)
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot concedido justo al cancelar: se devuelve
+                self.release(name)
+            raise
+
+    def release(self, name: TrafficClassName) -> None:
+        state = self._classes[name]
+        state.in_flight -= 1
+        self._in_flight -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, name: TrafficClassName) -> AsyncIterator[None]:
+        """Ocupa un slot de la clase mientras dura el bloque."""
+        await self.acquire(name)
+        try:
+            yield
+        finally:
+            self.release(name)
+
+    async def throttle(self, name: TrafficClassName, nbytes: int) -> None:
+        """Descuenta ``nbytes`` del ancho de banda de la clase y espera si se excede.
+
+        El bucket admite deuda: consumidores concurrentes esperan en
+        proporción a los bytes que cada uno añadió, así el agregado de la
+        clase respeta la tasa configurada.
+        """
+        state = self._classes[name]
+        state.bytes_total += nbytes
+        if not state.rate:
+            return
+        now = time.monotonic()
+        state.tokens = min(
+            float(state.rate), state.tokens + (now - state.last_refill) * state.rate
+        )
+        state.last_refill = now
+        state.tokens -= nbytes
+        if state.tokens < 0:
+            await asyncio.sleep(-state.tokens / state.rate)
+
+    def get_stats(self) -> dict[str, dict[str, int]]:
+        """Slots en uso, esperas y bytes por clase para monitoring."""
+        return {
+            name: {
+                "in_flight": state.in_flight,
+                "waiting": sum(1 for w in state.waiters if not w.done()),
+                "max_slots": state.max_slots,
+                "bytes": state.bytes_total,
+            }
+            for name, state in self._classes.items()
+        }